@@ -36,6 +36,7 @@ from rally import consts
 from rally.deployment import engine as deploy_engine
 from rally import exceptions
 from rally.task import engine
+from rally.task import types
 from rally.verification import context as vcontext
 from rally.verification import manager as vmanager
 from rally.verification import reporter as vreporter
@@ -228,16 +229,19 @@ class _Task(APIGroup):
     def get(self, task_id):
         return self._get(task_id).to_dict()
 
-    def get_detailed(self, task_id, extended_results=False):
+    def get_detailed(self, task_id, extended_results=False,
+                     lazy_results=False):
         """Get detailed task data.
 
         :param task_id: str task UUID
         :param extended_results: whether to return task data as dict
                                  with extended results
+        :param lazy_results: whether to load iterations data of workloads
+                             chunk by chunk while it is iterated over
         :returns: rally.common.db.sqlalchemy.models.Task
         :returns: dict
         """
-        task = objects.Task.get_detailed(task_id)
+        task = objects.Task.get_detailed(task_id, lazy_results=lazy_results)
         if task and extended_results:
             task = dict(task)
             task["results"] = objects.Task.extend_results(task["results"])
@@ -369,9 +373,11 @@ class _Task(APIGroup):
         deployment = objects.Deployment.get(deployment)
 
         benchmark_engine = engine.TaskEngine(config, task, deployment)
-        benchmark_engine.validate()
+        with types.resolution_cache():
+            benchmark_engine.validate()
 
-    def start(self, deployment, config, task=None, abort_on_sla_failure=False):
+    def start(self, deployment, config, task=None, abort_on_sla_failure=False,
+              profile=False):
         """Validate and start a task.
 
         Task is a list of benchmarks that will be called one by one, results of
@@ -384,6 +390,9 @@ class _Task(APIGroup):
             be created
         :param abort_on_sla_failure: If set to True, the task execution will
                                      stop when any SLA check for it fails
+        :param profile: If set to True, Rally itself is profiled while
+                        running the workloads and the profiles are saved
+                        with their results
         """
         if task and isinstance(task, objects.Task):
             LOG.warning("Transmitting task object in `task start` is "
@@ -409,25 +418,28 @@ class _Task(APIGroup):
         if task is None:
             task = objects.Task(deployment_uuid=deployment["uuid"])
 
-        benchmark_engine = engine.TaskEngine(
-            config, task, deployment,
-            abort_on_sla_failure=abort_on_sla_failure)
+        # resources resolved while validating are reused by the run
+        with types.resolution_cache():
+            benchmark_engine = engine.TaskEngine(
+                config, task, deployment,
+                abort_on_sla_failure=abort_on_sla_failure)
 
-        benchmark_engine.validate()
+            benchmark_engine.validate()
 
-        LOG.info("Task %s config is valid." % task["uuid"])
-        LOG.info("Benchmark Task %s on Deployment %s" % (task["uuid"],
-                                                         deployment["uuid"]))
+            LOG.info("Task %s config is valid." % task["uuid"])
+            LOG.info("Benchmark Task %s on Deployment %s" % (
+                task["uuid"], deployment["uuid"]))
 
-        benchmark_engine = engine.TaskEngine(
-            config, task, deployment,
-            abort_on_sla_failure=abort_on_sla_failure)
+            benchmark_engine = engine.TaskEngine(
+                config, task, deployment,
+                abort_on_sla_failure=abort_on_sla_failure, profile=profile)
 
-        try:
-            benchmark_engine.run()
-        except Exception:
-            deployment.update_status(consts.DeployStatus.DEPLOY_INCONSISTENT)
-            raise
+            try:
+                benchmark_engine.run()
+            except Exception:
+                deployment.update_status(
+                    consts.DeployStatus.DEPLOY_INCONSISTENT)
+                raise
 
         return task["uuid"], task.get_status(task["uuid"])
 
@@ -0,0 +1,157 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Rally command: bench"""
+
+from __future__ import print_function
+
+import json
+import os
+
+from rally.cli import cliutils
+from rally.cli import envutils
+from rally.common.i18n import _
+from rally import exceptions
+from rally import plugins
+from rally.task import bench
+
+
+class BenchCommands(object):
+    """Benchmark Rally's own overhead.
+
+    Dummy scenarios are run with different runners, concurrency, numbers
+    of iterations and sizes of atomic actions and output, so changes of
+    the task engine, the database layer and reports can be measured
+    without any cloud.
+    """
+
+    @staticmethod
+    def _load_results(path):
+        with open(os.path.expanduser(path)) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _print_results(results):
+        cols = ["Case"] + [m.replace("_", " ").capitalize()
+                           for m in bench.METRICS]
+        rows = []
+        for name, case in results["cases"].items():
+            row = {"Case": name}
+            for col, metric in zip(cols[1:], bench.METRICS):
+                row[col] = case["metrics"][metric]
+            rows.append(row)
+        cliutils.print_list(rows, fields=cols,
+                            table_label="Rally %s overhead"
+                                        % results["rally_version"],
+                            sortby_index=None)
+
+    @staticmethod
+    def _print_comparison(comparison):
+        """Print the comparison and return the number of regressions."""
+        cols = ["Case", "Metric", "Baseline", "Current", "Change (%)",
+                "Regression"]
+        rows = [{"Case": c["case"], "Metric": c["metric"],
+                 "Baseline": c["baseline"], "Current": c["current"],
+                 "Change (%)": "n/a" if c["change"] is None else c["change"],
+                 "Regression": "YES" if c["regression"] else ""}
+                for c in comparison]
+        cliutils.print_list(rows, fields=cols,
+                            table_label="Comparison with the baseline",
+                            sortby_index=None)
+        return len([c for c in comparison if c["regression"]])
+
+    def _compare(self, current, baseline, tolerance):
+        comparison = bench.compare(current, baseline, tolerance=tolerance)
+        if not comparison:
+            print(_("There are no common cases with the baseline."))
+            return 1
+        regressions = self._print_comparison(comparison)
+        if regressions:
+            print(_("%(count)d metric(s) got worse by more than "
+                    "%(tolerance)s%%.") % {"count": regressions,
+                                           "tolerance": tolerance})
+            return 1
+
+    @cliutils.args("--deployment", dest="deployment", type=str,
+                   metavar="<uuid>", required=False,
+                   help="UUID or name of a deployment to run tasks on.")
+    @cliutils.args("--cases", dest="pattern", type=str, metavar="<pattern>",
+                   required=False,
+                   help="Run only cases with names containing the pattern, "
+                        "e.g. 'atomics-50/constant'.")
+    @cliutils.args("--out", dest="out", type=str, metavar="<path>",
+                   required=False,
+                   help="Path to the file to save results to, they can be "
+                        "used as a baseline of next runs.")
+    @cliutils.args("--baseline", dest="baseline", type=str, metavar="<path>",
+                   required=False,
+                   help="Path to results of a previous run to compare "
+                        "with.")
+    @cliutils.args("--tolerance", dest="tolerance", type=float,
+                   metavar="<percent>", default=20.0, required=False,
+                   help="Percent a metric may get worse by before it is "
+                        "reported as a regression.")
+    @envutils.with_default_deployment(cli_arg_name="deployment")
+    @plugins.ensure_plugins_are_loaded
+    def run(self, api, deployment=None, pattern=None, out=None,
+            baseline=None, tolerance=20.0):
+        """Run the benchmark matrix and measure Rally's overhead.
+
+        :param deployment: UUID or name of a deployment
+        :param pattern: run only cases with names containing the pattern
+        :param out: path to the file to save results to
+        :param baseline: path to results of a previous run to compare with
+        :param tolerance: percent a metric may get worse by before it is
+                          reported as a regression
+        """
+        cases = bench.make_cases(pattern)
+        if not cases:
+            print(_("There are no cases matching '%s'.") % pattern)
+            return 1
+        if baseline:
+            baseline = self._load_results(baseline)
+
+        try:
+            results = bench.run(api, deployment, cases)
+        except exceptions.DeploymentNotFinishedStatus as e:
+            print(_("Cannot run the benchmark on unfinished deployment: "
+                    "%s") % e)
+            return 1
+
+        self._print_results(results)
+        if out:
+            with open(os.path.expanduser(out), "w") as f:
+                json.dump(results, f, indent=2)
+        if baseline:
+            return self._compare(results, baseline, tolerance)
+
+    @cliutils.args("--baseline", dest="baseline", type=str, metavar="<path>",
+                   help="Path to results of the previous run.")
+    @cliutils.args("--current", dest="current", type=str, metavar="<path>",
+                   help="Path to results of the current run.")
+    @cliutils.args("--tolerance", dest="tolerance", type=float,
+                   metavar="<percent>", default=20.0, required=False,
+                   help="Percent a metric may get worse by before it is "
+                        "reported as a regression.")
+    def compare(self, api, baseline, current, tolerance=20.0):
+        """Compare saved results of two benchmark runs.
+
+        :param baseline: path to results of the previous run
+        :param current: path to results of the current run
+        :param tolerance: percent a metric may get worse by before it is
+                          reported as a regression
+        """
+        return self._compare(self._load_results(current),
+                             self._load_results(baseline), tolerance)
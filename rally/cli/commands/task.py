@@ -42,6 +42,7 @@ from rally import plugins
 from rally.task import exporter
 from rally.task.processing import plot
 from rally.task.processing import utils as putils
+from rally.task import profiler
 from rally.task import utils as tutils
 
 
@@ -200,11 +201,14 @@ class TaskCommands(object):
                    dest="abort_on_sla_failure",
                    help="Abort the execution of a benchmark scenario when"
                         "any SLA check for it fails.")
+    @cliutils.args("--profile", action="store_true", dest="profile",
+                   help="Profile Rally itself while running the task. "
+                        "Hotspots are shown by 'rally task detailed'.")
     @envutils.with_default_deployment(cli_arg_name="deployment")
     @plugins.ensure_plugins_are_loaded
     def start(self, api, task_file, deployment=None, task_args=None,
               task_args_file=None, tag=None, do_use=False,
-              abort_on_sla_failure=False):
+              abort_on_sla_failure=False, profile=False):
         """Start benchmark task.
 
         If both task_args and task_args_file are specified, they will
@@ -226,6 +230,8 @@ class TaskCommands(object):
         :param abort_on_sla_failure: if True, the execution of a benchmark
                                      scenario will stop when any SLA check
                                      for it fails
+        :param profile: if True, Rally itself is profiled while running
+                        the task
         """
 
         input_task = self._load_and_validate_task(api, task_file,
@@ -248,7 +254,8 @@ class TaskCommands(object):
                 self.use(api, task_instance["uuid"])
 
             api.task.start(deployment, input_task, task=task_instance["uuid"],
-                           abort_on_sla_failure=abort_on_sla_failure)
+                           abort_on_sla_failure=abort_on_sla_failure,
+                           profile=profile)
 
         except exceptions.DeploymentNotFinishedStatus as e:
             print(_("Cannot start a task on unfinished deployment: %s") % e)
@@ -297,12 +304,19 @@ class TaskCommands(object):
     @cliutils.args("--iterations-data", dest="iterations_data",
                    action="store_true",
                    help="Print detailed results for each iteration.")
+    @cliutils.args("--profile-out", dest="profile_out", metavar="<path>",
+                   help="Save the profile of a task started with --profile "
+                        "to the file in the folded stacks format, which can "
+                        "be rendered by flamegraph.pl.")
     @envutils.with_default_task_id
-    def detailed(self, api, task_id=None, iterations_data=False):
+    def detailed(self, api, task_id=None, iterations_data=False,
+                 profile_out=None):
         """Print detailed information about given task.
 
         :param task_id: str, task uuid
         :param iterations_data: bool, include results for each iteration
+        :param profile_out: str, path of the file to save folded stacks of
+                            the task profile in
         """
         task = api.task.get_detailed(task_id, extended_results=True)
 
@@ -442,6 +456,11 @@ class TaskCommands(object):
             print(_("Full duration: %s") %
                   rutils.format_float_to_str(result["info"]["full_duration"]))
 
+            if result.get("profiling_data"):
+                print()
+                self._print_profile_hotspots(
+                    profiler.Profile.from_dict(result["profiling_data"]))
+
             print("\nHINTS:")
             print(_("* To plot HTML graphics with this data, run:"))
             print("\trally task report %s --out output.html\n" % task["uuid"])
@@ -451,6 +470,37 @@ class TaskCommands(object):
             print(_("* To get raw JSON output of task results, run:"))
             print("\trally task results %s\n" % task["uuid"])
 
+        if profile_out:
+            folded = []
+            for result in task["results"]:
+                if result.get("profiling_data"):
+                    profile = profiler.Profile.from_dict(
+                        result["profiling_data"])
+                    folded.extend(profile.to_folded(
+                        prefix="%s[%s]" % (result["key"]["name"],
+                                           result["key"]["pos"])))
+            if not folded:
+                print(_("The task %s was not profiled.") % task_id)
+                return 1
+            with open(os.path.expanduser(profile_out), "w+") as f:
+                f.write("\n".join(folded) + "\n")
+            print(_("Profile is saved to %s") % profile_out)
+
+    @staticmethod
+    def _print_profile_hotspots(profile, limit=10):
+        cols = ["Function", "Self (sec)", "Cumulative (sec)"]
+        rows = [{"Function": f["function"],
+                 "Self (sec)": f["self"],
+                 "Cumulative (sec)": f["cumulative"]}
+                for f in profile.top(limit)]
+        formatters = dict((col, cliutils.pretty_float_formatter(col, 3))
+                          for col in cols[1:])
+        cliutils.print_list(rows, fields=cols, formatters=formatters,
+                            table_label="Profile hotspots",
+                            sortby_index=None)
+        print(_("Idle (threads waiting on locks and sockets): %s sec") %
+              rutils.format_float_to_str(profile.idle()))
+
     @cliutils.args("--uuid", type=str, dest="task_id", help="UUID of task.")
     @envutils.with_default_task_id
     @cliutils.suppress_warnings
@@ -661,15 +711,9 @@ class TaskCommands(object):
                 tasks_results = self._load_task_results_file(
                     api, task_file_or_uuid)
             elif uuidutils.is_uuid_like(task_file_or_uuid):
-                tasks_results = map(
-                    lambda x: {"key": x["key"],
-                               "sla": x["data"]["sla"],
-                               "hooks": x["data"].get("hooks", []),
-                               "result": x["data"]["raw"],
-                               "load_duration": x["data"]["load_duration"],
-                               "full_duration": x["data"]["full_duration"],
-                               "created_at": x["created_at"]},
-                    api.task.get_detailed(task_file_or_uuid)["results"])
+                tasks_results = plot.make_report_results(
+                    api.task.get_detailed(task_file_or_uuid,
+                                          lazy_results=True)["results"])
             else:
                 print(_("ERROR: Invalid UUID or file name passed: %s"
                         ) % task_file_or_uuid,
@@ -687,7 +731,8 @@ class TaskCommands(object):
 
         if out_format.startswith("html"):
             result = plot.plot(results,
-                               include_libs=(out_format == "html_static"))
+                               include_libs=(out_format == "html_static"),
+                               stream=bool(out))
         elif out_format == "junit":
             test_suite = junit.JUnit("Rally test suite")
             for result in results:
@@ -709,7 +754,10 @@ class TaskCommands(object):
             output_file = os.path.expanduser(out)
 
             with open(output_file, "w+") as f:
-                f.write(result)
+                if isinstance(result, six.string_types):
+                    f.write(result)
+                else:
+                    f.writelines(result)
             if open_it:
                 webbrowser.open_new_tab("file://" + os.path.realpath(out))
         else:
@@ -14,7 +14,11 @@
 #    under the License.
 
 import collections
+import os
 import threading
+import time
+
+import six
 
 from rally.common.i18n import _LW
 from rally.common import logging
@@ -22,36 +26,206 @@ from rally.common import logging
 
 LOG = logging.getLogger(__name__)
 
+# Publishers are blocked when the queue holds this many jobs per consumer, so
+# the output of huge publishers doesn't have to be kept in memory at once.
+QUEUE_SIZE_PER_CONSUMER = 4
+
+# Time (in seconds) an idle worker of the pool waits for a new job before it
+# exits.
+WORKER_IDLE_TIMEOUT = 60
+
+
+class JobQueue(object):
+    """Bounded blocking queue of jobs with a deque-like interface.
+
+    append() blocks while the queue is full, popleft() blocks while it is
+    empty and raises IndexError once the queue is closed and drained, so
+    publishers and consumers may work at the same time.
+    """
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._items = collections.deque()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def append(self, item):
+        with self._not_full:
+            while self.maxsize and len(self._items) >= self.maxsize:
+                self._not_full.wait()
+            self._items.append(item)
+            self._not_empty.notify()
+
+    def popleft(self):
+        with self._not_empty:
+            while not self._items:
+                if self._closed:
+                    raise IndexError("pop from a closed empty queue")
+                self._not_empty.wait()
+            item = self._items.popleft()
+            self._not_full.notify()
+            return item
+
+    def close(self):
+        """Mark that no more jobs are going to be appended."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+
+
+class BrokerStats(object):
+    """Latency and throughput of jobs processed by one broker run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.finished_at = None
+        self.jobs = 0
+        self.failed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def add(self, latency, success=True):
+        with self._lock:
+            self.jobs += 1
+            if not success:
+                self.failed += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def finish(self):
+        self.finished_at = time.time()
+
+    @property
+    def duration(self):
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def avg_latency(self):
+        return self.total_latency / self.jobs if self.jobs else 0.0
+
+    @property
+    def throughput(self):
+        duration = self.duration
+        return self.jobs / duration if duration else 0.0
+
+    def to_dict(self):
+        return {"jobs": self.jobs, "failed": self.failed,
+                "duration": self.duration, "throughput": self.throughput,
+                "avg_latency": self.avg_latency,
+                "max_latency": self.max_latency}
+
+
+class WorkerPool(object):
+    """Pool of reusable daemon threads.
 
-def _consumer(consume, queue):
+    A job is handed over to an idle worker when there is one, otherwise a new
+    worker is started. Workers that stay idle for ``idle_timeout`` seconds
+    exit, so the pool shrinks back when the load is gone.
+    """
+
+    def __init__(self, idle_timeout=WORKER_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._jobs = six.moves.queue.Queue()
+        self._idle = 0
+        self.workers_started = 0
+
+    def submit(self, func, *args):
+        """Run func(*args) in a worker.
+
+        :returns: threading.Event that is set once the job is finished
+        """
+        done = threading.Event()
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+            else:
+                worker = threading.Thread(target=self._worker)
+                worker.daemon = True
+                worker.start()
+                self.workers_started += 1
+            self._jobs.put((func, args, done))
+        return done
+
+    def _worker(self):
+        while True:
+            try:
+                func, args, done = self._jobs.get(timeout=self.idle_timeout)
+            except six.moves.queue.Empty:
+                with self._lock:
+                    if self._jobs.empty():
+                        self._idle -= 1
+                        return
+                continue
+            try:
+                func(*args)
+            except Exception as e:
+                LOG.warning(_LW("Broker worker failed: %s") % e)
+                if logging.is_debug():
+                    LOG.exception(e)
+            finally:
+                done.set()
+            with self._lock:
+                self._idle += 1
+
+
+_POOL = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_pool():
+    """Return the worker pool shared by all broker runs of the process.
+
+    The pool is recreated in forked processes, since its workers are not
+    copied by fork().
+    """
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.pid != os.getpid():
+            _POOL = WorkerPool()
+        return _POOL
+
+
+def _consumer(consume, queue, stats=None):
     """Infinity worker that consumes tasks from queue.
 
     :param consume: method that consumes an object removed from the queue
-    :param queue: deque object to popleft() objects from
+    :param queue: JobQueue (or deque) object to popleft() objects from
+    :param stats: BrokerStats object to account processed objects in
     """
     cache = {}
     while True:
-        if not queue:
+        try:
+            args = queue.popleft()
+        except IndexError:
+            # queue is drained
             break
-        else:
-            try:
-                args = queue.popleft()
-            except IndexError:
-                # consumed by other thread
-                continue
+        started_at = time.time()
+        success = True
         try:
             consume(cache, args)
         except Exception as e:
+            success = False
             LOG.warning(_LW("Failed to consume a task from the queue: %s") % e)
             if logging.is_debug():
                 LOG.exception(e)
+        if stats is not None:
+            stats.add(time.time() - started_at, success)
 
 
 def _publisher(publish, queue):
     """Calls a publish method that fills queue with jobs.
 
     :param publish: method that fills the queue
-    :param queue: deque object to be filled by the publish() method
+    :param queue: JobQueue object to be filled by the publish() method
     """
     try:
         publish(queue)
@@ -61,26 +235,45 @@ def _publisher(publish, queue):
             LOG.exception(e)
 
 
-def run(publish, consume, consumers_count=1):
+def run(publish, consume, consumers_count=1, queue_size=None):
     """Run broker.
 
     publish() put to queue, consume() process one element from queue.
 
-    When publish() is finished and elements from queue are processed process
-    is finished all consumers threads are cleaned.
+    Consumers are taken from the shared worker pool and process elements
+    while publish() is still filling the bounded queue. When publish() is
+    finished and elements from queue are processed, the consumers are
+    returned to the pool.
 
     :param publish: Function that puts values to the queue
     :param consume: Function that processes a single value from the queue
     :param consumers_count: Number of consumers
+    :param queue_size: Max number of elements in the queue, defaults to
+                       QUEUE_SIZE_PER_CONSUMER elements per consumer
+    :returns: BrokerStats of the run
     """
-    queue = collections.deque()
-    _publisher(publish, queue)
+    if queue_size is None:
+        queue_size = consumers_count * QUEUE_SIZE_PER_CONSUMER
+    queue = JobQueue(queue_size)
+    stats = BrokerStats()
+    pool = get_pool()
 
-    consumers = []
-    for i in range(consumers_count):
-        consumer = threading.Thread(target=_consumer, args=(consume, queue))
-        consumer.start()
-        consumers.append(consumer)
+    consumers = [pool.submit(_consumer, consume, queue, stats)
+                 for i in range(consumers_count)]
+    try:
+        _publisher(publish, queue)
+    finally:
+        queue.close()
 
     for consumer in consumers:
-        consumer.join()
+        consumer.wait()
+    stats.finish()
+
+    LOG.debug("Broker processed %(jobs)d jobs (%(failed)d failed) in "
+              "%(duration).3f sec: %(throughput).2f jobs/sec, latency "
+              "avg %(avg).3f sec, max %(max).3f sec" % {
+                  "jobs": stats.jobs, "failed": stats.failed,
+                  "duration": stats.duration,
+                  "throughput": stats.throughput,
+                  "avg": stats.avg_latency, "max": stats.max_latency})
+    return stats
@@ -154,13 +154,15 @@ def task_get_detailed_last():
     return get_impl().task_get_detailed_last()
 
 
-def task_get_detailed(uuid):
+def task_get_detailed(uuid, lazy_results=False):
     """Returns task with results by uuid.
 
     :param uuid: UUID of the task.
+    :param lazy_results: whether to load iterations data of workloads
+                         chunk by chunk on demand instead of at once.
     :returns: task dict with data on the task and its results.
     """
-    return get_impl().task_get_detailed(uuid)
+    return get_impl().task_get_detailed(uuid, lazy_results=lazy_results)
 
 
 def task_create(values):
@@ -280,6 +282,28 @@ def workload_data_create(task_uuid, workload_uuid, chunk_order, data):
                                            chunk_order, data)
 
 
+def workload_data_create_many(task_uuid, workload_uuid, chunks):
+    """Create several workload data records in one transaction.
+
+    :param task_uuid: string with UUID of Task instance.
+    :param workload_uuid: string with UUID of Workload instance.
+    :param chunks: list of (chunk_order, data) pairs, where data is a dict
+                   with record values on the workload data.
+    """
+    return get_impl().workload_data_create_many(task_uuid, workload_uuid,
+                                                chunks)
+
+
+def workload_data_get_size(task_uuid):
+    """Get the size of workload data of a task.
+
+    :param task_uuid: string with UUID of Task instance.
+    :returns: a dict with total "chunk_size" and "compressed_chunk_size"
+              of the workload data records in bytes.
+    """
+    return get_impl().workload_data_get_size(task_uuid)
+
+
 def workload_set_results(workload_uuid, data):
     """Set workload results.
 
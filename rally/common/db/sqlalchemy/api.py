@@ -16,11 +16,13 @@
 SQLAlchemy implementation for DB.API
 """
 
+import base64
 import copy
 import datetime as dt
 import json
 import os
 import time
+import zlib
 
 import alembic
 from alembic import config as alembic_config
@@ -30,6 +32,8 @@ from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_db.sqlalchemy import session as db_session
 from oslo_utils import timeutils
+from sqlalchemy import event as sa_event
+from sqlalchemy import func as sa_func
 from sqlalchemy import or_
 from sqlalchemy.orm.exc import NoResultFound
 from sqlalchemy.orm import load_only as sa_loadonly
@@ -48,11 +52,25 @@ _FACADE = None
 INITIAL_REVISION_UUID = "ca3626f62937"
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    # with write-ahead log writers do not block readers and commits need
+    # much less fsync() calls, which matters while workload data is written
+    # during a task run. In-memory databases silently keep their journal
+    # mode.
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
+
+
 def _create_facade_lazily():
     global _FACADE
 
     if _FACADE is None:
         _FACADE = db_session.EngineFacade.from_config(CONF)
+        engine = _FACADE.get_engine()
+        if engine.dialect.name == "sqlite":
+            sa_event.listen(engine, "connect", _set_sqlite_pragmas)
 
     return _FACADE
 
@@ -78,6 +96,179 @@ def _alembic_config():
     return config
 
 
+_CHUNK_FIELDS = frozenset(("duration", "timestamp", "idle_duration",
+                           "error", "output", "atomic_actions"))
+_ATOMIC_ACTION_FIELDS = frozenset(("name", "started_at", "finished_at",
+                                   "children"))
+
+
+def _pack_atomic_actions(actions, names):
+    packed = []
+    for action in actions:
+        if (not isinstance(action, dict)
+                or set(action) != _ATOMIC_ACTION_FIELDS):
+            return None
+        children = _pack_atomic_actions(action["children"], names)
+        if children is None:
+            return None
+        packed.append([names.setdefault(action["name"], len(names)),
+                       action["started_at"], action["finished_at"],
+                       children])
+    return packed
+
+
+def _unpack_atomic_actions(packed, names):
+    return [{"name": names[name], "started_at": started_at,
+             "finished_at": finished_at,
+             "children": _unpack_atomic_actions(children, names)}
+            for name, started_at, finished_at, children in packed]
+
+
+def _pack_chunk(raw_data):
+    """Encode iteration results of a chunk for the storage.
+
+    Results are stored column by column: numeric fields, errors and outputs
+    go to separate lists, atomic action names are replaced by indexes in
+    a dictionary of names. The columns are compressed with zlib.
+
+    Results which do not fit the columnar layout (e.g. old formats of
+    atomic actions) are stored as is, i.e. as {"raw": [...]}.
+
+    :param raw_data: list of iteration results
+    :returns: tuple of the chunk data, size of the uncompressed chunk and
+              size of its payload as stored, i.e. of the base64 encoded
+              columns or of the JSON encoded raw results
+    """
+    names = {}
+    columns = {"timestamp": [], "duration": [], "idle_duration": [],
+               "error": [], "output": [], "atomic_actions": []}
+    for result in raw_data:
+        if not isinstance(result, dict) or set(result) != _CHUNK_FIELDS:
+            break
+        actions = _pack_atomic_actions(result["atomic_actions"], names)
+        if actions is None:
+            break
+        columns["atomic_actions"].append(actions)
+        for key in ("timestamp", "duration", "idle_duration", "error",
+                    "output"):
+            columns[key].append(result[key])
+    else:
+        if raw_data:
+            columns["atomic_names"] = sorted(names, key=names.get)
+            data = json.dumps(columns, separators=(",", ":")).encode("utf-8")
+            encoded = base64.b64encode(zlib.compress(data)).decode("ascii")
+            return ({"format": "columnar", "codec": "zlib", "data": encoded},
+                    len(data), len(encoded))
+
+    data = json.dumps(raw_data).encode("utf-8")
+    return {"raw": raw_data}, len(data), len(data)
+
+
+def _unpack_chunk(chunk_data):
+    """Decode iteration results of a chunk stored by _pack_chunk.
+
+    :param chunk_data: WorkloadData.chunk_data of any supported format
+    :returns: list of iteration results
+    """
+    if "raw" in chunk_data:
+        return chunk_data["raw"]
+    columns = json.loads(zlib.decompress(
+        base64.b64decode(chunk_data["data"])).decode("utf-8"))
+    names = columns["atomic_names"]
+    return [{"timestamp": timestamp,
+             "duration": duration,
+             "idle_duration": idle_duration,
+             "error": error,
+             "output": output,
+             "atomic_actions": _unpack_atomic_actions(actions, names)}
+            for timestamp, duration, idle_duration, error, output, actions
+            in zip(columns["timestamp"], columns["duration"],
+                   columns["idle_duration"], columns["error"],
+                   columns["output"], columns["atomic_actions"])]
+
+
+def _iter_raw_data(workload_data_list):
+    """Decode chunks one by one while iterating over the results."""
+    for workload_data in workload_data_list:
+        for data in _unpack_chunk(workload_data.chunk_data):
+            yield data
+
+
+def _convert_old_atomic_actions(raw_data):
+    """Convert atomic actions of iterations from the old dict format.
+
+    :param raw_data: list of iteration results, modified in place
+    """
+    for itr in raw_data:
+        if not isinstance(itr["atomic_actions"], dict):
+            continue
+        new_atomic_actions = []
+        started_at = itr["timestamp"]
+        for name, d in itr["atomic_actions"].items():
+            finished_at = started_at + d
+            new_atomic_actions.append(
+                {"name": name, "children": [],
+                 "started_at": started_at,
+                 "finished_at": finished_at})
+            started_at = finished_at
+        itr["atomic_actions"] = new_atomic_actions
+
+
+class _LazyRawData(object):
+    """Iteration results of a workload which are loaded on demand.
+
+    Only one chunk of results is fetched from the database and decoded
+    at a time, so the full workload results never reside in memory.
+    The object can be iterated over several times; each pass loads the
+    chunks again in its own session, which is closed when the pass is
+    over.
+
+    Iterations are yielded in chunk order: they are sorted by timestamp
+    within a chunk, but an iteration may start earlier than the last
+    iteration of the previous chunk, since chunks are saved while
+    the results of concurrent iterations are still coming. Sorting them
+    as a whole would require loading all chunks at once.
+    """
+
+    def __init__(self, workload_uuid):
+        self.workload_uuid = workload_uuid
+        self._count = None
+
+    def _query(self, session, *entities):
+        return (session.query(*entities).
+                filter_by(workload_uuid=self.workload_uuid))
+
+    def __len__(self):
+        if self._count is None:
+            session = get_session()
+            try:
+                self._count = sum(
+                    count for count, in self._query(
+                        session, models.WorkloadData.iteration_count))
+            finally:
+                session.close()
+        return self._count
+
+    def __iter__(self):
+        session = get_session()
+        try:
+            chunk_ids = [chunk_id for chunk_id, in self._query(
+                session, models.WorkloadData.id).order_by(
+                    models.WorkloadData.chunk_order.asc())]
+            for chunk_id in chunk_ids:
+                chunk_data, = (
+                    self._query(session, models.WorkloadData.chunk_data).
+                    filter_by(id=chunk_id).one())
+                raw_data = _unpack_chunk(chunk_data)
+                # old format of atomic actions is converted in memory, the
+                # stored chunks are left untouched.
+                _convert_old_atomic_actions(raw_data)
+                for itr in raw_data:
+                    yield itr
+        finally:
+            session.close()
+
+
 class Connection(object):
 
     def engine_reset(self):
@@ -219,11 +410,12 @@ class Connection(object):
             "verification_log": json.dumps(task.validation_result)
         }
 
-    def _make_old_task_result(self, workload, workload_data_list):
-        raw_data = [data
-                    for workload_data in workload_data_list
-                    for data in workload_data.chunk_data["raw"]]
-        return {
+    def _make_old_task_result(self, workload, workload_data_list=None):
+        if workload_data_list is None:
+            raw_data = _LazyRawData(workload.uuid)
+        else:
+            raw_data = list(_iter_raw_data(workload_data_list))
+        result = {
             "id": workload.id,
             "task_uuid": workload.task_uuid,
             "created_at": workload.created_at,
@@ -248,6 +440,13 @@ class Connection(object):
                 "hooks": workload.hooks
             }
         }
+        if workload._profiling_data:
+            result["data"]["profiling_data"] = json.loads(
+                workload._profiling_data)
+        if (workload.statistics or {}).get("load_generator"):
+            result["data"]["load_generator"] = (
+                workload.statistics["load_generator"])
+        return result
 
     def _task_workload_data_get_all(self, workload_uuid):
         session = get_session()
@@ -255,26 +454,20 @@ class Connection(object):
             results = (self.model_query(models.WorkloadData, session=session).
                        filter_by(workload_uuid=workload_uuid).
                        order_by(models.WorkloadData.chunk_order.asc()))
-            if results.first() and results[0].chunk_data["raw"] and isinstance(
-                    results[0].chunk_data["raw"][0]["atomic_actions"], dict):
+            if (results.first() and results[0].chunk_data.get("raw")
+                    and isinstance(
+                        results[0].chunk_data["raw"][0]["atomic_actions"],
+                        dict)):
                 # NOTE(andreykurilin): It is an old format of atomic actions.
                 #   We do not have migration yet, since it can take too much
                 #   time on the big databases. Let's lazy-migrate results which
                 #   user greps and force a migration after several releases.
 
                 for workload_data in results:
+                    if "raw" not in workload_data.chunk_data:
+                        continue
                     chunk_data = copy.deepcopy(workload_data.chunk_data)
-                    for chunk in chunk_data["raw"]:
-                        new_atomic_actions = []
-                        started_at = chunk["timestamp"]
-                        for name, d in chunk["atomic_actions"].items():
-                            finished_at = started_at + d
-                            new_atomic_actions.append(
-                                {"name": name, "children": [],
-                                 "started_at": started_at,
-                                 "finished_at": finished_at})
-                            started_at = finished_at
-                        chunk["atomic_actions"] = new_atomic_actions
+                    _convert_old_atomic_actions(chunk_data["raw"])
                     workload_data.update({"chunk_data": chunk_data})
 
         return results
@@ -285,9 +478,10 @@ class Connection(object):
         return self._make_old_task(task)
 
     # @db_api.serialize
-    def task_get_detailed(self, uuid):
+    def task_get_detailed(self, uuid, lazy_results=False):
         task = self.task_get(uuid)
-        task["results"] = self._task_result_get_all_by_uuid(uuid)
+        task["results"] = self._task_result_get_all_by_uuid(
+            uuid, lazy_results=lazy_results)
         return task
 
     @db_api.serialize
@@ -411,13 +605,16 @@ class Connection(object):
                                                            actual=task.status)
                 raise exceptions.TaskNotFound(uuid=uuid)
 
-    def _task_result_get_all_by_uuid(self, uuid):
+    def _task_result_get_all_by_uuid(self, uuid, lazy_results=False):
         results = []
 
         workloads = (self.model_query(models.Workload).
                      filter_by(task_uuid=uuid).all())
 
         for workload in workloads:
+            if lazy_results:
+                results.append(self._make_old_task_result(workload))
+                continue
             workload_data_list = self._task_workload_data_get_all(
                 workload.uuid)
 
@@ -468,12 +665,8 @@ class Connection(object):
         workload.save()
         return workload
 
-    @db_api.serialize
-    def workload_data_create(self, task_uuid, workload_uuid, chunk_order,
-                             data):
-        workload_data = models.WorkloadData(task_uuid=task_uuid,
-                                            workload_uuid=workload_uuid)
-
+    @staticmethod
+    def _workload_data_values(task_uuid, workload_uuid, chunk_order, data):
         raw_data = data.get("raw", [])
         iter_count = len(raw_data)
 
@@ -501,51 +694,90 @@ class Connection(object):
         if finished_at == 0:
             finished_at = now
 
-        workload_data.update({
+        chunk_data, chunk_size, compressed_chunk_size = _pack_chunk(raw_data)
+
+        return {
             "task_uuid": task_uuid,
             "workload_uuid": workload_uuid,
             "chunk_order": chunk_order,
             "iteration_count": iter_count,
             "failed_iteration_count": failed_iter_count,
-            "chunk_data": {"raw": raw_data},
-            # TODO(ikhudoshyn)
-            "chunk_size": 0,
-            "compressed_chunk_size": 0,
+            "chunk_data": chunk_data,
+            "chunk_size": chunk_size,
+            "compressed_chunk_size": compressed_chunk_size,
             "started_at": dt.datetime.fromtimestamp(started_at),
             "finished_at": dt.datetime.fromtimestamp(finished_at)
-        })
+        }
+
+    @db_api.serialize
+    def workload_data_create(self, task_uuid, workload_uuid, chunk_order,
+                             data):
+        workload_data = models.WorkloadData(task_uuid=task_uuid,
+                                            workload_uuid=workload_uuid)
+        workload_data.update(self._workload_data_values(
+            task_uuid, workload_uuid, chunk_order, data))
         workload_data.save()
         return workload_data
 
+    def workload_data_create_many(self, task_uuid, workload_uuid, chunks):
+        if not chunks:
+            return
+        values = [self._workload_data_values(task_uuid, workload_uuid,
+                                             chunk_order, data)
+                  for chunk_order, data in chunks]
+        session = get_session()
+        with session.begin():
+            # core insert with a list of values is executed as a single
+            # executemany() in one transaction.
+            session.execute(models.WorkloadData.__table__.insert(), values)
+
+    def workload_data_get_size(self, task_uuid):
+        session = get_session()
+        with session.begin():
+            chunk_size, compressed_chunk_size = (
+                session.query(
+                    sa_func.sum(models.WorkloadData.chunk_size),
+                    sa_func.sum(models.WorkloadData.compressed_chunk_size)).
+                filter(models.WorkloadData.task_uuid == task_uuid).one())
+        return {"chunk_size": int(chunk_size or 0),
+                "compressed_chunk_size": int(compressed_chunk_size or 0)}
+
     @db_api.serialize
     def workload_set_results(self, workload_uuid, data):
         workload = self.model_query(models.Workload).filter_by(
             uuid=workload_uuid).first()
 
-        workload_data_list = self._task_workload_data_get_all(workload.uuid)
-
-        raw_data = [raw
-                    for workload_data in workload_data_list
-                    for raw in workload_data.chunk_data["raw"]]
-        iter_count = len(raw_data)
+        if "total_iteration_count" in data:
+            # the aggregates are collected by the result consumer while the
+            # chunks are saved, so there is no need to read them again.
+            iter_count = data["total_iteration_count"]
+            failed_iter_count = data.get("failed_iteration_count", 0)
+            min_duration = data.get("min_duration", 0)
+            max_duration = data.get("max_duration", 0)
+        else:
+            iter_count = 0
+            failed_iter_count = 0
+            min_duration = None
+            max_duration = 0
 
-        failed_iter_count = 0
-        max_duration = 0
-        min_duration = 0
+            workload_data_list = self._task_workload_data_get_all(
+                workload.uuid)
+            for d in _iter_raw_data(workload_data_list):
+                iter_count += 1
+                if d.get("error"):
+                    failed_iter_count += 1
 
-        success = True
+                duration = d.get("duration", 0)
 
-        for d in raw_data:
-            if d.get("error"):
-                failed_iter_count += 1
+                if duration > max_duration:
+                    max_duration = duration
 
-            duration = d.get("duration", 0)
+                if min_duration is None or min_duration > duration:
+                    min_duration = duration
 
-            if duration > max_duration:
-                max_duration = duration
+            min_duration = min_duration or 0
 
-            if min_duration and min_duration > duration:
-                min_duration = duration
+        success = True
 
         sla = data.get("sla", [])
         # TODO(ikhudoshyn): if no SLA was specified and there are
@@ -563,7 +795,7 @@ class Connection(object):
             "task_uuid": workload.task_uuid,
             "subtask_uuid": workload.subtask_uuid,
             "sla_results": {"sla": sla},
-            "context_execution": {},
+            "context_execution": data.get("context_execution", {}),
             "hooks": data.get("hooks", []),
             "load_duration": data.get("load_duration", 0),
             "full_duration": data.get("full_duration", 0),
@@ -573,8 +805,10 @@ class Connection(object):
             "failed_iteration_count": failed_iter_count,
             # TODO(ikhudoshyn)
             "start_time": start,
-            "statistics": {},
-            "pass_sla": success
+            "statistics": data.get("statistics", {}),
+            "pass_sla": success,
+            "_profiling_data": (json.dumps(data["profiling_data"])
+                                if data.get("profiling_data") else "")
         })
 
         # TODO(ikhudoshyn): if pass_sla is False,
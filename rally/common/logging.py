@@ -14,10 +14,14 @@
 #    under the License.
 
 import functools
+import multiprocessing.util
+import os
+import threading
 
 from oslo_config import cfg
 from oslo_log import handlers
 from oslo_log import log as oslogging
+from six.moves import queue
 
 from rally.common.i18n import _
 
@@ -29,6 +33,20 @@ DEBUG_OPTS = [cfg.BoolOpt(
     help="Print debugging output only for Rally. "
          "Off-site components stay quiet.")]
 
+LOGGING_OPTS = [
+    cfg.BoolOpt("async_logging",
+                default=False,
+                help="Write log records in a separate thread of each process "
+                     "instead of the thread which logs them, so threads "
+                     "running iterations do not wait for log handlers."),
+    cfg.IntOpt("async_logging_queue_size",
+               default=10000,
+               min=1,
+               help="Max number of log records waiting to be written if "
+                    "async_logging is enabled. When the queue is full, "
+                    "records below WARNING level are dropped.")
+]
+
 CONF = cfg.CONF
 CONF.register_cli_opts(DEBUG_OPTS)
 oslogging.register_options(CONF)
@@ -47,16 +65,163 @@ WARN = log.WARN
 WARNING = log.WARNING
 
 
+class QueueHandler(log.Handler):
+    """Passes log records to other handlers through a bounded queue.
+
+    Records are written by a writer thread, which is started in every
+    process emitting them. The logging threads only merge the arguments
+    into the messages of records; the formatters and locks of the target
+    handlers are used by the writer thread. When the queue is full,
+    records below WARNING level are dropped and counted, the others wait
+    for a free slot.
+    """
+
+    def __init__(self, targets, max_size=10000):
+        """QueueHandler constructor.
+
+        :param targets: handlers to write records with
+        :param max_size: max number of records waiting to be written
+        """
+        log.Handler.__init__(self)
+        self.targets = list(targets)
+        self.max_size = max_size
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._closed = False
+
+    def _ensure_writer(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._start_lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                # locks of the target handlers could be held by other
+                # threads of the parent process at the moment of fork, they
+                # would never be released in the forked one
+                for target in self.targets:
+                    target.createLock()
+                self._dropped_lock = threading.Lock()
+            # the writer thread of the parent process does not exist in
+            # a forked one
+            self._queue = queue.Queue(self.max_size)
+            self._thread = threading.Thread(target=self._write)
+            self._thread.daemon = True
+            self._thread.start()
+            # runner worker processes exit without calling atexit
+            # functions, only multiprocessing finalizers
+            multiprocessing.util.Finalize(None, self.flush, exitpriority=100)
+            self._pid = pid
+
+    def _handle(self, record):
+        for target in self.targets:
+            if record.levelno >= target.level:
+                target.handle(record)
+
+    def _report_dropped(self):
+        dropped = self.dropped - self._reported_dropped
+        if dropped:
+            self._reported_dropped += dropped
+            self._handle(log.LogRecord(
+                __name__, log.WARNING, __file__, 0,
+                "%d log records were dropped since the logging queue was "
+                "full", (dropped,), None))
+
+    def _write(self):
+        records = self._queue
+        while True:
+            record = records.get()
+            try:
+                if record is None:
+                    return
+                self._report_dropped()
+                self._handle(record)
+            except Exception:
+                self.handleError(record)
+            finally:
+                records.task_done()
+
+    def prepare(self, record):
+        """Merge arguments into the message of the record.
+
+        Arguments may be changed by the logging thread before the record is
+        written, so they are merged in place, like logging.handlers does.
+        """
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def emit(self, record):
+        try:
+            if self._closed:
+                self._handle(record)
+                return
+            self._ensure_writer()
+            record = self.prepare(record)
+            if record.levelno >= log.WARNING:
+                self._queue.put(record)
+                return
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += 1
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Wait until all queued records are written."""
+        if self._closed:
+            return
+        if self._pid == os.getpid() and self._thread.is_alive():
+            self._queue.join()
+        for target in self.targets:
+            target.flush()
+
+    def close(self):
+        if (not self._closed and self._pid == os.getpid()
+                and self._thread.is_alive()):
+            self._queue.put(None)
+            self._thread.join()
+        self._closed = True
+        log.Handler.close(self)
+
+
+def _setup_queue_handler(logger, max_size):
+    """Route records of the logger's handlers through a QueueHandler."""
+    handler = QueueHandler(logger.handlers, max_size)
+    for target in handler.targets:
+        logger.removeHandler(target)
+    logger.addHandler(handler)
+    return handler
+
+
 def setup(product_name, version="unknown"):
     dbg_color = handlers.ColorHandler.LEVEL_COLORS[log.DEBUG]
     handlers.ColorHandler.LEVEL_COLORS[log.RDEBUG] = dbg_color
 
+    root = log.getLogger()
+    for handler in root.handlers:
+        if isinstance(handler, QueueHandler):
+            # oslo.log replaces handlers of the root logger
+            handler.flush()
+            handler.close()
+
     oslogging.setup(CONF, product_name, version)
 
     if CONF.rally_debug:
         oslogging.getLogger(
             project=product_name).logger.setLevel(log.RDEBUG)
 
+    if CONF.async_logging:
+        _setup_queue_handler(root, CONF.async_logging_queue_size)
+
 
 class RallyContextAdapter(oslogging.KeywordArgumentAdapter):
 
@@ -192,10 +357,10 @@ def _log_wrapper(obj, log_function, msg, **kw):
         def wrapper(self, *args, **kwargs):
             params = {"msg": msg % kw, "obj_name": obj.title(),
                       "uuid": getattr(self, obj)["uuid"]}
-            log_function(_("%(obj_name)s %(uuid)s | Starting:  %(msg)s") %
+            log_function(_("%(obj_name)s %(uuid)s | Starting:  %(msg)s"),
                          params)
             result = f(self, *args, **kwargs)
-            log_function(_("%(obj_name)s %(uuid)s | Completed: %(msg)s") %
+            log_function(_("%(obj_name)s %(uuid)s | Completed: %(msg)s"),
                          params)
             return result
         return wrapper
@@ -319,6 +319,38 @@ TASK_EXTENDED_RESULT_SCHEMA = {
 }
 
 
+def _normalize_output(itr):
+    """Make sure that iteration results have an output."""
+    if "output" not in itr:
+        itr["output"] = {"additive": [], "complete": []}
+
+        # NOTE(amaretskiy): Deprecated "scenario_output"
+        #     is supported for backward compatibility
+        if ("scenario_output" in itr
+                and itr["scenario_output"]["data"]):
+            itr["output"]["additive"].append(
+                {"items": itr["scenario_output"]["data"].items(),
+                 "title": "Scenario output",
+                 "description": "",
+                 "chart": "OutputStackedAreaChart"})
+            del itr["scenario_output"]
+    return itr
+
+
+class _LazyIterations(object):
+    """Re-iterable view of lazily loaded iterations with output."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def __len__(self):
+        return len(self._raw)
+
+    def __iter__(self):
+        for itr in self._raw:
+            yield _normalize_output(itr)
+
+
 class Task(object):
     """Represents a task object.
 
@@ -385,8 +417,9 @@ class Task(object):
         return db_task
 
     @staticmethod
-    def get_detailed(task_id):
-        task_detail = db.api.task_get_detailed(task_id)
+    def get_detailed(task_id, lazy_results=False):
+        task_detail = db.api.task_get_detailed(task_id,
+                                               lazy_results=lazy_results)
         results = []
         for result in task_detail["results"]:
             result["created_at"] = result.get("created_at", "").strftime(
@@ -475,6 +508,13 @@ class Task(object):
                       tstamp_start - float timestamp of the first iteration
                       full_duration - float full scenario duration
                       load_duration - float load scenario duration
+                  profiling_data - dict, profiler.Profile of Rally while
+                                   the workload was running, present only
+                                   if the task was profiled
+                  load_generator - dict, samples of resource usage of
+                                   Rally processes taken by
+                                   monitor.LoadGeneratorMonitor, present
+                                   only if they were taken
         """
 
         def _merge_atomic(atomic_actions):
@@ -516,19 +556,7 @@ class Task(object):
                 if not tstamp_start or itr["timestamp"] < tstamp_start:
                     tstamp_start = itr["timestamp"]
 
-                if "output" not in itr:
-                    itr["output"] = {"additive": [], "complete": []}
-
-                    # NOTE(amaretskiy): Deprecated "scenario_output"
-                    #     is supported for backward compatibility
-                    if ("scenario_output" in itr
-                            and itr["scenario_output"]["data"]):
-                        itr["output"]["additive"].append(
-                            {"items": itr["scenario_output"]["data"].items(),
-                             "title": "Scenario output",
-                             "description": "",
-                             "chart": "OutputStackedAreaChart"})
-                        del itr["scenario_output"]
+                _normalize_output(itr)
 
                 if itr["error"]:
                     iterations_failed += 1
@@ -560,14 +588,27 @@ class Task(object):
                 "tstamp_start": tstamp_start,
                 "full_duration": scenario["data"]["full_duration"],
                 "load_duration": scenario["data"]["load_duration"]}
-            iterations = sorted(scenario["data"]["raw"],
-                                key=lambda itr: itr["timestamp"])
+            if isinstance(scenario["data"]["raw"], list):
+                iterations = sorted(scenario["data"]["raw"],
+                                    key=lambda itr: itr["timestamp"])
+            else:
+                # results loaded lazily are not kept in memory, so they are
+                # neither sorted as a whole nor changed in place. They come
+                # in chunk order, which is only approximately the order of
+                # timestamps (see _LazyRawData in the DB layer).
+                iterations = _LazyIterations(scenario["data"]["raw"])
             if serializable:
-                scenario["iterations"] = list(iterations)
+                scenario["iterations"] = iterations
             else:
                 scenario["iterations"] = iter(iterations)
             scenario["sla"] = scenario["data"]["sla"]
             scenario["hooks"] = scenario["data"].get("hooks", [])
+            if "profiling_data" in scenario["data"]:
+                scenario["profiling_data"] = scenario["data"][
+                    "profiling_data"]
+            if "load_generator" in scenario["data"]:
+                scenario["load_generator"] = scenario["data"][
+                    "load_generator"]
             del scenario["data"]
             del scenario["task_uuid"]
             del scenario["id"]
@@ -634,5 +675,9 @@ class Workload(object):
                                 self.workload["uuid"], chunk_order,
                                 workload_data)
 
+    def add_workload_data_chunks(self, chunks):
+        db.workload_data_create_many(self.workload["task_uuid"],
+                                     self.workload["uuid"], chunks)
+
     def set_results(self, data):
         db.workload_set_results(self.workload["uuid"], data)
@@ -31,6 +31,7 @@ def list_opts():
         merged_opts.setdefault(category, [])
         merged_opts[category].extend(options)
     merged_opts["DEFAULT"] = itertools.chain(logging.DEBUG_OPTS,
+                                             logging.LOGGING_OPTS,
                                              osclients.OSCLIENTS_OPTS,
                                              engine.TASK_ENGINE_OPTS)
     return merged_opts.items()
@@ -38,7 +39,9 @@ def list_opts():
 
 def register():
     for category, options in list_opts():
-        group = cfg.OptGroup(name=category, title="%s options" % category)
+        group = None
         if category != "DEFAULT":
+            group = cfg.OptGroup(name=category,
+                                 title="%s options" % category)
             CONF.register_group(group)
         CONF.register_opts(options, group=group)
@@ -14,6 +14,7 @@
 #    under the License.
 
 import imp
+import json
 import os
 import pkg_resources
 import pkgutil
@@ -25,13 +26,23 @@ import six
 import rally
 from rally.common.i18n import _
 from rally.common import logging
+from rally.common import version
 
 LOG = logging.getLogger(__name__)
 
+PLUGIN_INDEX_PATH = os.path.expanduser("~/.rally/plugin_index.json")
+
+# plugin name -> [(base of plugin, module), ...] of the plugin index, which
+# modules are not imported yet
+_NOT_IMPORTED = {}
+
 
 def itersubclasses(cls, seen=None):
     """Generator over all subclasses of a given class in depth first order."""
 
+    if seen is None:
+        # subclasses may be defined by modules which are not imported yet
+        import_indexed_modules()
     seen = seen or set()
     try:
         subs = cls.__subclasses__()
@@ -45,13 +56,17 @@ def itersubclasses(cls, seen=None):
                 yield sub
 
 
+def _get_package_path(package):
+    path = [os.path.dirname(rally.__file__), ".."] + package.split(".")
+    return os.path.join(*path)
+
+
 def import_modules_from_package(package):
     """Import modules from package and append into sys.modules
 
     :param package: Full package name. For example: rally.deployment.engines
     """
-    path = [os.path.dirname(rally.__file__), ".."] + package.split(".")
-    path = os.path.join(*path)
+    path = _get_package_path(package)
     for root, dirs, files in os.walk(path):
         for filename in files:
             if filename.startswith("__") or not filename.endswith(".py"):
@@ -132,3 +147,114 @@ def load_plugins(dir_or_file):
                 % {"path": plugin_file, "e": e})
             if logging.is_debug():
                 LOG.exception(e)
+
+
+def get_packages_signature(packages):
+    """Return signature of the modules of packages.
+
+    It changes when the version of Rally changes or when any module of
+    packages is added, removed or modified.
+
+    :param packages: list of full package names
+    """
+    signature = {"version": version.version_string(), "packages": {}}
+    for package in packages:
+        count = 0
+        mtime = 0
+        for root, dirs, files in os.walk(_get_package_path(package)):
+            # mtime of a directory changes when its files are added or
+            # removed
+            mtime = max(mtime, os.path.getmtime(root))
+            for filename in files:
+                if filename.endswith(".py"):
+                    count += 1
+                    mtime = max(mtime, os.path.getmtime(
+                        os.path.join(root, filename)))
+        signature["packages"][package] = [count, mtime]
+    return signature
+
+
+def load_plugin_index(packages, path=PLUGIN_INDEX_PATH):
+    """Return the saved plugin index if modules of packages are not changed.
+
+    :param packages: list of full package names the index was saved for
+    :param path: path to the file with the index
+    :returns: list of dicts with "name", "namespace", "base", "module" and
+        "hidden" of plugins or None if the index is missing or outdated
+    """
+    try:
+        with open(path) as f:
+            index = json.load(f)
+    except (IOError, OSError, ValueError) as e:
+        LOG.debug("Failed to read the plugin index %(path)s: %(e)s",
+                  {"path": path, "e": e})
+        return None
+    if index.get("signature") != get_packages_signature(packages):
+        return None
+    return index["plugins"]
+
+
+def save_plugin_index(packages, plugins, path=PLUGIN_INDEX_PATH):
+    """Save the plugin index for modules of packages.
+
+    Failures are logged only, since without the index plugins are imported
+    eagerly.
+
+    :param packages: list of full package names the index is made of
+    :param plugins: list of dicts with "name", "namespace", "base",
+        "module" and "hidden" of plugins defined by modules of packages
+    :param path: path to the file to save the index to
+    """
+    index = {"signature": get_packages_signature(packages),
+             "plugins": plugins}
+    tmp_path = "%s.%d" % (path, os.getpid())
+    try:
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        # other processes must not read the partially written index
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as e:
+        LOG.debug("Failed to save the plugin index %(path)s: %(e)s",
+                  {"path": path, "e": e})
+
+
+def set_plugin_index(plugins):
+    """Import modules from the plugin index on the first lookup of plugins.
+
+    :param plugins: plugin index returned by load_plugin_index()
+    """
+    for p in plugins:
+        if p["module"] not in sys.modules:
+            _NOT_IMPORTED.setdefault(p["name"], []).append(
+                (p["base"], p["module"]))
+
+
+def import_modules_by_plugin_name(name, base=None):
+    """Import not imported modules of the plugin index defining the plugin.
+
+    :param name: name of plugin
+    :param base: full name of the plugin base, e.g.
+        rally.task.context.Context. If specified, only modules defining
+        plugins of this base are imported.
+    """
+    not_imported = _NOT_IMPORTED.get(name, [])
+    for plugin_base, module_name in list(not_imported):
+        if base and base != plugin_base:
+            continue
+        if (plugin_base, module_name) not in not_imported:
+            # it is imported by a nested lookup of the plugin
+            continue
+        not_imported.remove((plugin_base, module_name))
+        if module_name not in sys.modules:
+            importutils.import_module(module_name)
+
+
+def import_indexed_modules():
+    """Import all not imported modules of the plugin index."""
+    while _NOT_IMPORTED:
+        name, not_imported = _NOT_IMPORTED.popitem()
+        for plugin_base, module_name in not_imported:
+            if module_name not in sys.modules:
+                importutils.import_module(module_name)
@@ -13,7 +13,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import sys
+import weakref
 
 from rally.common.i18n import _LE
 from rally.common.plugin import discover
@@ -21,6 +23,10 @@ from rally.common.plugin import info
 from rally.common.plugin import meta
 from rally import exceptions
 
+# name of plugin -> weak references to configured plugins with this name,
+# so plugins are found by name without iterating over all subclasses
+_PLUGINS_BY_NAME = collections.defaultdict(list)
+
 
 def deprecated(reason, rally_version):
     """Mark plugin as deprecated.
@@ -169,6 +175,9 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
     @classmethod
     def unregister(cls):
         """Removes all plugin meta information and makes it undiscoverable."""
+        if cls._meta_is_inited(raise_exc=False):
+            refs = _PLUGINS_BY_NAME.get(cls.get_name(), [])
+            refs[:] = [ref for ref in refs if ref() not in (cls, None)]
         cls._meta_clear()
 
     @classmethod
@@ -177,16 +186,19 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
 
     @classmethod
     def _set_name_and_namespace(cls, name, namespace):
-        try:
-            existing_plugin = cls._get_base().get(name=name,
-                                                  namespace=namespace,
-                                                  allow_hidden=True,
-                                                  fallback_to_default=False)
-
-        except exceptions.PluginNotFound:
+        # modules of the plugin index defining plugins with such name are
+        # imported as well, so duplicates from them are detected
+        existing_plugins = cls._get_base().get_all(name=name,
+                                                   namespace=namespace,
+                                                   allow_hidden=True)
+        if not existing_plugins:
             cls._meta_set("name", name)
             cls._meta_set("namespace", namespace)
+            refs = _PLUGINS_BY_NAME[name]
+            refs[:] = [ref for ref in refs if ref() is not None]
+            refs.append(weakref.ref(cls))
         else:
+            existing_plugin = existing_plugins[0]
             raise exceptions.PluginWithSuchNameExists(
                 name=name, namespace=existing_plugin.get_namespace(),
                 existing_path=(
@@ -213,8 +225,8 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
             fallback_to_default=True):
         """Return plugin by its name from specified namespace.
 
-        This method iterates over all subclasses of cls and returns plugin
-        by name from specified namespace.
+        This method looks up plugins of cls by name and returns plugin from
+        specified namespace.
 
         If namespace is not specified, it will return first found plugin from
         any of namespaces.
@@ -264,9 +276,30 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
         :param name: return only plugins with specified name.
         :param allow_hidden: if False return only non hidden plugins
         """
+        if name:
+            base = cls._get_base()
+            if base is Plugin:
+                discover.import_modules_by_plugin_name(name)
+            else:
+                discover.import_modules_by_plugin_name(
+                    name, base="%s.%s" % (base.__module__, base.__name__))
+        return cls._get_all(namespace=namespace, allow_hidden=allow_hidden,
+                            name=name)
+
+    @classmethod
+    def _get_all(cls, namespace=None, allow_hidden=False, name=None):
+        """Return plugins of imported modules, see get_all()."""
         plugins = []
 
-        for p in discover.itersubclasses(cls):
+        if name:
+            candidates = [ref() for ref in _PLUGINS_BY_NAME.get(name, [])]
+            candidates = [p for p in candidates
+                          if p is not None and p is not cls and
+                          issubclass(p, cls)]
+        else:
+            candidates = discover.itersubclasses(cls)
+
+        for p in candidates:
             if not issubclass(p, Plugin):
                 continue
             if not p._meta_is_inited(raise_exc=False):
@@ -16,12 +16,12 @@
 from __future__ import division
 
 import abc
+import bisect
+import collections
 import math
 
 import six
 
-from rally.task.processing import utils
-
 
 @six.add_metaclass(abc.ABCMeta)
 class StreamingAlgorithm(object):
@@ -154,42 +154,117 @@ class MaxComputation(StreamingAlgorithm):
 
 
 class PercentileComputation(StreamingAlgorithm):
-    """Compute percentile value from a stream of numbers."""
+    """Compute percentile value from a stream of numbers.
+
+    While there are not more than `max_exact` values, they are kept sorted
+    and the result is exact. After that the values are moved to buckets of
+    exponentially growing width (as in DDSketch), so the memory depends on
+    the range of values instead of their number and the result has
+    a relative error not bigger than `accuracy`. Instances with the same
+    accuracy can be merged.
+    """
 
-    def __init__(self, percent, length):
+    def __init__(self, percent, length=None, accuracy=0.01, max_exact=10000):
         """Init streaming computation.
 
         :param percent: numeric percent (from 0.00..1 to 0.999..)
-        :param length: count of the measurements
+        :param length: count of the measurements. It is not required anymore
+                       and is kept for backward compatibility
+        :param accuracy: relative error of the result when the values do
+                         not fit into `max_exact`
+        :param max_exact: number of values to keep as is
         """
         if not 0 < percent < 1:
             raise ValueError("Unexpected percent: %s" % percent)
+        if not 0 < accuracy < 1:
+            raise ValueError("Unexpected accuracy: %s" % accuracy)
         self._percent = percent
+        self._accuracy = accuracy
+        self._gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._max_exact = max_exact
 
-        self._graph_zipper = utils.GraphZipper(length, 10000)
+        self._count = 0
+        self._values = []
+        self._zeros = 0
+        self._positive = collections.Counter()
+        self._negative = collections.Counter()
+
+    def _to_buckets(self):
+        for value in self._values:
+            self._add_to_buckets(value)
+        self._values = None
+
+    def _add_to_buckets(self, value, count=1):
+        if value > 0:
+            self._positive[self._bucket(value)] += count
+        elif value < 0:
+            self._negative[self._bucket(-value)] += count
+        else:
+            self._zeros += count
+
+    def _bucket(self, value):
+        return int(math.ceil(math.log(value) / self._log_gamma))
+
+    def _bucket_value(self, bucket):
+        return 2 * self._gamma ** bucket / (self._gamma + 1)
 
     def add(self, value):
-        self._graph_zipper.add_point(value)
+        if not isinstance(value, (int, float)):
+            value = 0
+        self._count += 1
+        if self._values is not None:
+            bisect.insort(self._values, value)
+            if len(self._values) > self._max_exact:
+                self._to_buckets()
+        else:
+            self._add_to_buckets(value)
 
     def merge(self, other):
-        # TODO(ikhudoshyn): Implement me
-        raise NotImplementedError()
+        if self._accuracy != other._accuracy:
+            raise ValueError("Can not merge percentiles computed with "
+                             "different accuracy: %s and %s"
+                             % (self._accuracy, other._accuracy))
+        self._count += other._count
+        if self._values is not None and other._values is not None:
+            if len(self._values) + len(other._values) <= self._max_exact:
+                self._values = sorted(self._values + other._values)
+                return
+        if self._values is not None:
+            self._to_buckets()
+        if other._values is not None:
+            for value in other._values:
+                self._add_to_buckets(value)
+        else:
+            self._zeros += other._zeros
+            self._positive.update(other._positive)
+            self._negative.update(other._negative)
+
+    def _value_at(self, rank):
+        if self._values is not None:
+            return self._values[rank]
+        buckets = [(-self._bucket_value(b), self._negative[b])
+                   for b in sorted(self._negative, reverse=True)]
+        buckets.append((0.0, self._zeros))
+        buckets.extend((self._bucket_value(b), self._positive[b])
+                       for b in sorted(self._positive))
+        for value, count in buckets:
+            if rank < count:
+                return value
+            rank -= count
 
     def result(self):
-        results = list(
-            map(lambda x: x[1], self._graph_zipper.get_zipped_graph()))
-        if results:
-            # NOTE(amaretskiy): Calculate percentile of a list of values
-            results.sort()
-            k = (len(results) - 1) * self._percent
-            f = math.floor(k)
-            c = math.ceil(k)
-            if f == c:
-                return results[int(k)]
-            d0 = results[int(f)] * (c - k)
-            d1 = results[int(c)] * (k - f)
-            return (d0 + d1)
-        return None
+        if not self._count:
+            return None
+        # NOTE(amaretskiy): Calculate percentile of a list of values
+        k = (self._count - 1) * self._percent
+        f = math.floor(k)
+        c = math.ceil(k)
+        if f == c:
+            return self._value_at(int(k))
+        d0 = self._value_at(int(f)) * (c - k)
+        d1 = self._value_at(int(c)) * (k - f)
+        return (d0 + d1)
 
 
 class IncrementComputation(StreamingAlgorithm):
@@ -548,6 +548,18 @@ def terminate_thread(thread_ident, exc_type=exceptions.ThreadTimeoutException):
         ctypes.c_long(thread_ident), ctypes.py_object(exc_type))
 
 
+def cancel_thread_termination(thread_ident):
+    """Cancel the exception which is delivered by terminate_thread.
+
+    It has no effect if the exception is already raised in the thread.
+
+    :param thread_ident: threading.Thread.ident value
+    """
+
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_long(thread_ident), None)
+
+
 def timeout_thread(queue):
     """Terminate threads by timeout.
 
@@ -558,7 +570,9 @@ def timeout_thread(queue):
     where `thread_ident` is Thread.ident value of thread to watch, and
     `deadline` is timestamp when thread should be terminated. Also tuple
     (None, None) should be put when all threads are exited and no more
-    threads to watch.
+    threads to watch. Instead of a thread, an object with `ident`,
+    `isAlive()` and `terminate()` can be put, then it is terminated by
+    its own `terminate()`.
 
     :param queue: Queue object to communicate with parent thread.
     """
@@ -578,7 +592,10 @@ def timeout_thread(queue):
             # ValueError means that timeout lower than 0.
             if thread.isAlive():
                 LOG.info("Thread %s is timed out. Terminating." % thread.ident)
-                terminate_thread(thread.ident)
+                if hasattr(thread, "terminate"):
+                    thread.terminate()
+                else:
+                    terminate_thread(thread.ident)
             all_threads.popleft()
 
         if next_thread == (None, None,):
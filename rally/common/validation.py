@@ -14,6 +14,10 @@
 #    under the License.
 
 import abc
+import collections
+import json
+import threading
+import time
 import traceback
 
 import six
@@ -166,6 +170,100 @@ class ValidationResult(object):
         return self.msg
 
 
+class ValidationCache(object):
+    """Memoises validator results within one validation pass.
+
+    Calls of the same validator with the same arguments, configuration and
+    credentials are done only once, even if they are made concurrently.
+    Time spent in each validator is collected as well.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._results = {}
+        self.stats = collections.defaultdict(
+            lambda: {"calls": 0, "cached": 0, "duration": 0.0})
+
+    @staticmethod
+    def _credential_key(credential):
+        if isinstance(credential, dict):
+            # users of the users contexts hold their credentials
+            credential = credential["credential"]
+        return (credential.auth_url, credential.username,
+                credential.tenant_name)
+
+    @classmethod
+    def _credentials_key(cls, credentials):
+        if not credentials:
+            return None
+        key = []
+        for platform, creds in sorted(credentials.items()):
+            admin = creds.get("admin")
+            key.append((platform,
+                        admin and cls._credential_key(admin),
+                        tuple(cls._credential_key(user)
+                              for user in creds.get("users") or [])))
+        return tuple(key)
+
+    def make_key(self, validator_cls, args, kwargs, plugin, credentials,
+                 config, plugin_cfg):
+        """Return hashable key of a validator call or None."""
+        try:
+            return (validator_cls, plugin,
+                    json.dumps([args, kwargs, config, plugin_cfg],
+                               sort_keys=True),
+                    self._credentials_key(credentials))
+        except (TypeError, ValueError, AttributeError, KeyError):
+            # unknown kind of arguments or credentials, do not memoise
+            return None
+
+    def call(self, validator_cls, key, func):
+        """Return the result of func(), memoised by the key.
+
+        :param validator_cls: validator class, used for timings
+        :param key: key made by make_key() or None to skip memoising
+        :param func: callable which runs the validator
+        """
+        name = validator_cls.get_name()
+        if key is None:
+            return self._timed(name, func)
+
+        with self._lock:
+            entry = self._results.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._results[key] = [threading.Event(), None]
+            else:
+                self.stats[name]["cached"] += 1
+        if owner:
+            try:
+                entry[1] = self._timed(name, func)
+            finally:
+                entry[0].set()
+        else:
+            entry[0].wait()
+        return entry[1]
+
+    def _timed(self, name, func):
+        started_at = time.time()
+        try:
+            return func()
+        finally:
+            with self._lock:
+                self.stats[name]["calls"] += 1
+                self.stats[name]["duration"] += time.time() - started_at
+
+    def report(self):
+        """Return a human-readable summary of validator timings."""
+        lines = ["%-40s %8s %8s %10s" % ("validator", "calls", "cached",
+                                         "duration")]
+        for name, stats in sorted(self.stats.items(),
+                                  key=lambda x: -x[1]["duration"]):
+            lines.append("%-40s %8d %8d %10.3f" % (
+                name, stats["calls"], stats["cached"], stats["duration"]))
+        return "\n".join(lines)
+
+
 class ValidatablePluginMixin(object):
 
     @staticmethod
@@ -174,9 +272,30 @@ class ValidatablePluginMixin(object):
         return [(Validator.get(name), args, kwargs)
                 for name, args, kwargs in validators]
 
+    @staticmethod
+    def _get_validator_runner(validator_cls, args, kwargs, credentials,
+                              config, plugin, plugin_cfg):
+        def run():
+            try:
+                validator = validator_cls(*args, **kwargs)
+
+                # NOTE(amaretskiy): validator is successful by default
+                return (validator.validate(credentials=credentials,
+                                           config=config,
+                                           plugin_cls=plugin,
+                                           plugin_cfg=plugin_cfg)
+                        or ValidationResult(True))
+            except Exception as exc:
+                return ValidationResult(
+                    is_valid=False,
+                    msg=str(exc),
+                    etype=type(exc).__name__,
+                    etraceback=traceback.format_exc())
+        return run
+
     @classmethod
     def validate(cls, name, credentials, config, plugin_cfg,
-                 namespace=None, allow_hidden=False, vtype=None):
+                 namespace=None, allow_hidden=False, vtype=None, cache=None):
         """Execute all validators stored in meta of plugin.
 
         Iterate during all validators stored in the meta of Validator
@@ -192,6 +311,7 @@ class ValidatablePluginMixin(object):
         :param vtype: Type of validation. Allowed types: syntax, platform,
             semantic. HINT: To specify several types use tuple or list with
             types
+        :param cache: ValidationCache to memoise results of validators in
         :returns: list of ValidationResult(is_valid=False) instances
         """
         try:
@@ -242,21 +362,17 @@ class ValidatablePluginMixin(object):
         for validators in (syntax_validators, platform_validators,
                            regular_validators):
             for validator_cls, args, kwargs in validators:
-                try:
-                    validator = validator_cls(*args, **kwargs)
-
-                    # NOTE(amaretskiy): validator is successful by default
-                    result = (validator.validate(credentials=credentials,
-                                                 config=config,
-                                                 plugin_cls=plugin,
-                                                 plugin_cfg=plugin_cfg)
-                              or ValidationResult(True))
-                except Exception as exc:
-                    result = ValidationResult(
-                        is_valid=False,
-                        msg=str(exc),
-                        etype=type(exc).__name__,
-                        etraceback=traceback.format_exc())
+                run = cls._get_validator_runner(
+                    validator_cls, args, kwargs, credentials, config,
+                    plugin, plugin_cfg)
+                if cache is None:
+                    result = run()
+                else:
+                    result = cache.call(
+                        validator_cls,
+                        cache.make_key(validator_cls, args, kwargs, plugin,
+                                       credentials, config, plugin_cfg),
+                        run)
                 if not result.is_valid:
                     LOG.debug("Result of validator '%s' is not successful for "
                               "plugin %s.", validator_cls.get_name(), name)
@@ -14,7 +14,9 @@
 #    under the License.
 
 import abc
+import collections
 import os
+import threading
 
 from oslo_config import cfg
 from six.moves.urllib import parse
@@ -33,13 +35,121 @@ CONF = cfg.CONF
 
 OSCLIENTS_OPTS = [
     cfg.FloatOpt("openstack_client_http_timeout", default=180.0,
-                 help="HTTP timeout for any of OpenStack service in seconds")
+                 help="HTTP timeout for any of OpenStack service in seconds"),
+    cfg.IntOpt("openstack_client_session_cache_size", default=1000,
+               help="Max number of keystone sessions shared by all threads "
+                    "of a process (0 disables sharing)")
 ]
 CONF.register_opts(OSCLIENTS_OPTS)
 
 _NAMESPACE = "openstack"
 
 
+class SessionCache(object):
+    """Thread-safe LRU cache of keystone sessions with hit/miss counters."""
+
+    def __init__(self, size):
+        self.size = size
+        self.pid = os.getpid()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+        # key -> lock held while the value of the key is created
+        self._key_locks = {}
+
+    def __len__(self):
+        return len(self._items)
+
+    def _get(self, key):
+        try:
+            value = self._items.pop(key)
+        except KeyError:
+            return None
+        self._items[key] = value
+        self.hits += 1
+        return value
+
+    def get(self, key):
+        """Return a cached value (marking it as recently used) or None."""
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self.misses += 1
+            return value
+
+    def get_or_create(self, key, create):
+        """Return a cached value or cache the value returned by create().
+
+        Threads which miss the same key at once wait for the first one to
+        create the value instead of creating their own ones.
+
+        :param key: key of the value
+        :param create: function without arguments which returns the value
+        """
+        if self.size <= 0:
+            with self._lock:
+                self.misses += 1
+            return create()
+        with self._lock:
+            value = self._get(key)
+            if value is not None:
+                return value
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                value = self._get(key)
+                if value is not None:
+                    return value
+                self.misses += 1
+            return self.set(key, create())
+
+    def set(self, key, value):
+        """Cache a value, evicting the least recently used ones if needed.
+
+        :returns: the value
+        """
+        if self.size <= 0:
+            return value
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = value
+            while len(self._items) > self.size:
+                evicted_key, _ = self._items.popitem(last=False)
+                self._key_locks.pop(evicted_key, None)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._key_locks.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._items), "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+_SESSION_CACHE = None
+_SESSION_CACHE_LOCK = threading.Lock()
+
+
+def get_session_cache():
+    """Return the keystone session cache of the current process.
+
+    The cache is recreated in forked processes, so HTTP connections are
+    never shared between processes.
+    """
+    global _SESSION_CACHE
+    with _SESSION_CACHE_LOCK:
+        if _SESSION_CACHE is None or _SESSION_CACHE.pid != os.getpid():
+            _SESSION_CACHE = SessionCache(
+                CONF.openstack_client_session_cache_size)
+        return _SESSION_CACHE
+
+
 def configure(name, default_version=None, default_service_type=None,
               supported_versions=None):
     """OpenStack client class wrapper.
@@ -220,6 +330,9 @@ class OSClient(plugin.Plugin):
 class Keystone(OSClient):
     """Wrapper for KeystoneClient which hides OpenStack auth details."""
 
+    # Seconds before the token expiration when it is considered stale.
+    TOKEN_STALE_DURATION = 120
+
     @property
     def keystone(self):
         raise exceptions.RallyException(_("Method 'keystone' is restricted "
@@ -231,57 +344,80 @@ class Keystone(OSClient):
 
     @property
     def auth_ref(self):
-        if "keystone_auth_ref" not in self.cache:
+        auth_ref = self.cache.get("keystone_auth_ref")
+        if auth_ref is None or auth_ref.will_expire_soon(
+                self.TOKEN_STALE_DURATION):
+            # the identity plugin of the session keeps its own access info
+            # and re-authenticates only when the token is expiring
             sess, plugin = self.get_session()
-            self.cache["keystone_auth_ref"] = plugin.get_access(sess)
-        return self.cache["keystone_auth_ref"]
+            auth_ref = plugin.get_access(sess)
+            self.cache["keystone_auth_ref"] = auth_ref
+        return auth_ref
+
+    def _get_session_cache_key(self, version):
+        cred = self.credential
+        return (cred.auth_url, cred.username, cred.password,
+                cred.tenant_name, cred.domain_name, cred.user_domain_name,
+                cred.project_domain_name, cred.https_insecure,
+                cred.https_cacert, self.choose_version(version))
 
     def get_session(self, version=None):
+        """Return keystone session and identity plugin.
+
+        Sessions are shared by all Keystone objects of the process which use
+        the same credential, so tokens and HTTP connection pools are reused
+        across users' iterations.
+        """
         key = "keystone_session_and_plugin_%s" % version
         if key not in self.cache:
-            from keystoneauth1 import discover
-            from keystoneauth1 import identity
-            from keystoneauth1 import session
-
-            version = self.choose_version(version)
-            auth_url = self.credential.auth_url
-            if version is not None:
-                auth_url = self._remove_url_version()
-
-            password_args = {
-                "auth_url": auth_url,
-                "username": self.credential.username,
-                "password": self.credential.password,
-                "tenant_name": self.credential.tenant_name
-            }
-
-            if version is None:
-                # NOTE(rvasilets): If version not specified than we discover
-                # available version with the smallest number. To be able to
-                # discover versions we need session
-                temp_session = session.Session(
-                    verify=(self.credential.https_cacert or
-                            not self.credential.https_insecure),
-                    timeout=CONF.openstack_client_http_timeout)
-                version = str(discover.Discover(
-                    temp_session,
-                    password_args["auth_url"]).version_data()[0]["version"][0])
-
-            if "v2.0" not in password_args["auth_url"] and (
-                    version != "2"):
-                password_args.update({
-                    "user_domain_name": self.credential.user_domain_name,
-                    "domain_name": self.credential.domain_name,
-                    "project_domain_name": self.credential.project_domain_name,
-                })
-            identity_plugin = identity.Password(**password_args)
-            sess = session.Session(
-                auth=identity_plugin,
+            self.cache[key] = get_session_cache().get_or_create(
+                self._get_session_cache_key(version),
+                lambda: self._create_session(version))
+        return self.cache[key]
+
+    def _create_session(self, version=None):
+        from keystoneauth1 import discover
+        from keystoneauth1 import identity
+        from keystoneauth1 import session
+
+        version = self.choose_version(version)
+        auth_url = self.credential.auth_url
+        if version is not None:
+            auth_url = self._remove_url_version()
+
+        password_args = {
+            "auth_url": auth_url,
+            "username": self.credential.username,
+            "password": self.credential.password,
+            "tenant_name": self.credential.tenant_name
+        }
+
+        if version is None:
+            # NOTE(rvasilets): If version not specified than we discover
+            # available version with the smallest number. To be able to
+            # discover versions we need session
+            temp_session = session.Session(
                 verify=(self.credential.https_cacert or
                         not self.credential.https_insecure),
                 timeout=CONF.openstack_client_http_timeout)
-            self.cache[key] = (sess, identity_plugin)
-        return self.cache[key]
+            version = str(discover.Discover(
+                temp_session,
+                password_args["auth_url"]).version_data()[0]["version"][0])
+
+        if "v2.0" not in password_args["auth_url"] and (
+                version != "2"):
+            password_args.update({
+                "user_domain_name": self.credential.user_domain_name,
+                "domain_name": self.credential.domain_name,
+                "project_domain_name": self.credential.project_domain_name,
+            })
+        identity_plugin = identity.Password(**password_args)
+        sess = session.Session(
+            auth=identity_plugin,
+            verify=(self.credential.https_cacert or
+                    not self.credential.https_insecure),
+            timeout=CONF.openstack_client_http_timeout)
+        return sess, identity_plugin
 
     def _remove_url_version(self):
         """Remove any version from the auth_url.
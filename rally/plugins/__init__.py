@@ -18,28 +18,65 @@ import os
 import decorator
 
 from rally.common.plugin import discover
+from rally.common.plugin import plugin
 
 
 PLUGINS_LOADED = False
 
+# packages of Rally with plugins, which are covered by the plugin index
+PACKAGES = ("rally.deployment.engines",
+            "rally.deployment.serverprovider",
+            "rally.plugins")
 
-def load():
+
+def _make_plugin_index():
+    index = []
+    for p in plugin.Plugin.get_all(allow_hidden=True):
+        module = p.__module__
+        if not any(module == package or module.startswith(package + ".")
+                   for package in PACKAGES):
+            continue
+        base = p._get_base()
+        index.append({"name": p.get_name(),
+                      "namespace": p.get_namespace(),
+                      "base": "%s.%s" % (base.__module__, base.__name__),
+                      "module": module,
+                      "hidden": p.is_hidden()})
+    return index
+
+
+def load(lazy=False):
+    """Import modules with plugins.
+
+    :param lazy: if True and the plugin index saved by the previous lazy
+        load is up to date, modules of Rally packages are imported only once
+        their plugins are looked up by name (or all of them once plugins are
+        listed). Otherwise, they are imported and the index is saved.
+        Plugins of entry points and plugin directories are always imported.
+    """
     global PLUGINS_LOADED
 
     if not PLUGINS_LOADED:
-        discover.import_modules_from_package("rally.deployment.engines")
-        discover.import_modules_from_package("rally.deployment.serverprovider")
-        discover.import_modules_from_package("rally.plugins")
+        index = discover.load_plugin_index(PACKAGES) if lazy else None
+        if index:
+            discover.set_plugin_index(index)
+        else:
+            for package in PACKAGES:
+                discover.import_modules_from_package(package)
+            if lazy:
+                discover.save_plugin_index(PACKAGES, _make_plugin_index())
 
         discover.import_modules_by_entry_point()
 
         discover.load_plugins("/opt/rally/plugins/")
         discover.load_plugins(os.path.expanduser("~/.rally/plugins/"))
+    elif not lazy:
+        discover.import_indexed_modules()
 
     PLUGINS_LOADED = True
 
 
 @decorator.decorator
 def ensure_plugins_are_loaded(f, *args, **kwargs):
-    load()
+    load(lazy=True)
     return f(*args, **kwargs)
@@ -14,29 +14,91 @@
 #    under the License.
 
 import collections
+import itertools
 import multiprocessing
 import threading
 import time
 
 from six.moves import queue as Queue
 
-from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally import consts
 from rally.task import runner
 
-LOG = logging.getLogger(__name__)
+
+def _get_launch_offsets(rps_cfg):
+    """Generate launch times of iterations, relative to the load start.
+
+    This is an open-loop schedule: iterations are launched at these times
+    regardless of how long previous iterations are running.
+
+    :param rps_cfg: rps section from task config. It is either a number of
+                    runs per second or a dict describing the "staircase"
+                    load profile: the load starts from "start" rps and is
+                    increased by "step" rps each "duration" seconds until
+                    it reaches "end" rps.
+    :returns: generator of offsets in seconds
+    """
+    if not isinstance(rps_cfg, dict):
+        interval = 1.0 / rps_cfg
+        for i in itertools.count():
+            yield i * interval
+
+    duration = rps_cfg.get("duration", 1)
+    for stage in itertools.count():
+        rps = min(rps_cfg["start"] + rps_cfg["step"] * stage, rps_cfg["end"])
+        stage_start = stage * duration
+        # each launch is computed from the stage start, so rounding errors
+        # are not accumulated and do not add or shift launches
+        launches = rps * duration
+        i = 0
+        while i < launches:
+            yield stage_start + float(i) / rps
+            i += 1
+
+
+def _worker_thread(queue, scheduled_at, cls, method_name, context_obj,
+                   scenario_kwargs, event_queue, slots):
+    """Run the scenario once and report the lag of its start.
+
+    :param queue: queue object to append results
+    :param scheduled_at: timestamp when the iteration should have started
+    :param cls: scenario class
+    :param method_name: scenario method name
+    :param context_obj: scenario context object
+    :param scenario_kwargs: scenario args
+    :param event_queue: queue object to append events
+    :param slots: threading.Semaphore of free concurrency slots, which is
+                  released when the iteration is finished
+    """
+    try:
+        result = runner._run_scenario_once(cls, method_name, context_obj,
+                                           scenario_kwargs, event_queue)
+        lag = max(result["timestamp"] - scheduled_at, 0.0)
+        result["output"]["additive"].append(
+            {"title": "Iteration start lag",
+             "description": "Time between the scheduled and the actual "
+                            "start of the iteration. Growing lag means "
+                            "that the requested rps was not achieved.",
+             "chart_plugin": "StackedArea",
+             "data": [["start lag", lag]],
+             "label": "Lag, sec"})
+        queue.put(result)
+    finally:
+        slots.release()
 
 
 def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
                     context, cls, method_name, args, event_queue, aborted,
-                    runs_per_second, rps_cfg, processes_to_start, info):
+                    rps_cfg, start_at, info):
     """Start scenario within threads.
 
-    Spawn N threads per second. Each thread runs the scenario once, and appends
-    result to queue. A maximum of max_concurrent threads will be ran
-    concurrently.
+    Launch iterations in separate threads according to the precomputed
+    schedule. The schedule of the whole load is shared between processes,
+    each process takes every `processes_to_start`-th launch. A maximum of
+    max_concurrent threads will be ran concurrently, iterations which are
+    delayed by this limit are started as soon as a slot is freed.
 
     :param queue: queue object to append results
     :param iteration_gen: next iteration number generator
@@ -47,29 +109,23 @@ def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
     :param cls: scenario class
     :param method_name: scenario method name
     :param args: scenario args
+    :param event_queue: queue object to append events
     :param aborted: multiprocessing.Event that aborts load generation if
                     the flag is set
-    :param runs_per_second: function that should return desired rps value
     :param rps_cfg: rps section from task config
-    :param processes_to_start: int, number of started processes for scenario
-                               execution
+    :param start_at: timestamp of the load start, common for all processes
     :param info: info about all processes count and counter of runned process
     """
 
     pool = collections.deque()
-    if isinstance(rps_cfg, dict):
-        rps = rps_cfg["start"]
-    else:
-        rps = rps_cfg
-    sleep = 1.0 / rps
+    slots = threading.Semaphore(max_concurrent)
+    launches = itertools.islice(_get_launch_offsets(rps_cfg),
+                                info["processes_counter"], None,
+                                info["processes_to_start"])
 
-    runner._log_worker_info(times=times, rps=rps, timeout=timeout,
+    runner._log_worker_info(times=times, rps=rps_cfg, timeout=timeout,
                             cls=cls, method_name=method_name, args=args)
 
-    time.sleep(
-        (sleep * info["processes_counter"]) / info["processes_to_start"])
-
-    start = time.time()
     timeout_queue = Queue.Queue()
 
     if timeout:
@@ -79,39 +135,32 @@ def _worker_process(queue, iteration_gen, timeout, times, max_concurrent,
         )
         collector_thr_by_timeout.start()
 
-    i = 0
-    while i < times and not aborted.is_set():
+    for i in range(times):
+        scheduled_at = start_at + next(launches)
+        delay = scheduled_at - time.time()
+        if delay > 0:
+            time.sleep(delay)
+        slots.acquire()
+        if aborted.is_set():
+            slots.release()
+            break
+
         scenario_context = runner._get_scenario_context(next(iteration_gen),
                                                         context)
-        worker_args = (
-            queue, cls, method_name, scenario_context, args, event_queue)
-        thread = threading.Thread(target=runner._worker_thread,
-                                  args=worker_args)
+        worker_args = (queue, scheduled_at, cls, method_name,
+                       scenario_context, args, event_queue, slots)
+        thread = threading.Thread(target=_worker_thread, args=worker_args)
 
-        i += 1
         thread.start()
         if timeout:
             timeout_queue.put((thread, time.time() + timeout))
         pool.append(thread)
 
-        time_gap = time.time() - start
-        real_rps = i / time_gap if time_gap else "Infinity"
-
-        LOG.debug("Worker: %s rps: %s (requested rps: %s)" %
-                  (i, real_rps, runs_per_second(
-                      rps_cfg, start, processes_to_start)))
-
-        # try to join latest thread(s) until it finished, or until time to
-        # start new thread (if we have concurrent slots available)
-        while i / (time.time() - start) > runs_per_second(
-                rps_cfg, start, processes_to_start) or (
-                    len(pool) >= max_concurrent):
-            if pool:
-                pool[0].join(0.001)
-                if not pool[0].isAlive():
-                    pool.popleft()
-            else:
-                time.sleep(0.001)
+        # NOTE(boris-42): cleanup pool array. This is required because
+        #                 in other case array length will be equal to times
+        #                 which is unlimited big
+        while pool and not pool[0].isAlive():
+            pool.popleft().join()
 
     while pool:
         pool.popleft().join()
@@ -234,18 +283,6 @@ class RPSScenarioRunner(runner.ScenarioRunner):
         max_cpu_used = min(cpu_count,
                            self.config.get("max_cpu_count", cpu_count))
 
-        def runs_per_second(rps_cfg, start_timer, number_of_processes):
-            """At the given second return desired rps."""
-
-            if not isinstance(rps_cfg, dict):
-                return float(rps_cfg) / number_of_processes
-            stage_order = (time.time() - start_timer) / rps_cfg.get(
-                "duration", 1) - 1
-            rps = (float(rps_cfg["start"] + rps_cfg["step"] * stage_order) /
-                   number_of_processes)
-
-            return min(rps, float(rps_cfg["end"]))
-
         processes_to_start = min(max_cpu_used, times,
                                  self.config.get("max_concurrency", times))
         times_per_worker, times_overhead = divmod(times, processes_to_start)
@@ -284,14 +321,14 @@ class RPSScenarioRunner(runner.ScenarioRunner):
                     times_per_worker + (times_overhead and 1),
                     concurrency_per_worker + (concurrency_overhead and 1),
                     context, cls, method_name, args, event_queue,
-                    self.aborted, runs_per_second, self.config["rps"],
-                    processes_to_start
+                    self.aborted, self.config["rps"], start_at
                 )
                 if times_overhead:
                     times_overhead -= 1
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
+        start_at = time.time()
         process_pool = self._create_process_pool(
             processes_to_start, _worker_process,
             worker_args_gen(times_overhead, concurrency_overhead))
@@ -0,0 +1,83 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+SLA (Service-level agreement) is set of details for determining compliance
+with contracted values such as maximum error rate or minimum response time.
+"""
+
+from rally.common.i18n import _
+from rally import consts
+from rally.task import sla
+
+
+@sla.configure(name="max_load_generator_saturation")
+class MaxLoadGeneratorSaturation(sla.SLA):
+    """Maximum percent of time Rally itself was the bottleneck.
+
+    The load generator is saturated when the Rally process or one of the
+    runner worker processes uses more than max_cpu_percent of a CPU core.
+    Durations measured at such moments include time spent waiting for
+    Rally, not only for the cloud.
+    """
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "max_cpu_percent": {"type": "number", "minimum": 0.0,
+                                "maximum": 100.0},
+            "max_saturated_percent": {"type": "number", "minimum": 0.0,
+                                      "maximum": 100.0}
+        },
+        "additionalProperties": False,
+    }
+
+    def __init__(self, criterion_value):
+        super(MaxLoadGeneratorSaturation, self).__init__(criterion_value)
+        self.max_cpu_percent = self.criterion_value.get("max_cpu_percent",
+                                                        90.0)
+        self.max_saturated_percent = self.criterion_value.get(
+            "max_saturated_percent", 10.0)
+        self.saturated = 0
+        self.total = 0
+        self.saturated_percent = 0.0
+
+    def add_iteration(self, iteration):
+        return self.success
+
+    def add_load_generator_sample(self, sample):
+        self.total += 1
+        if any(p["cpu"] > self.max_cpu_percent
+               for p in sample["processes"]):
+            self.saturated += 1
+        return self._check()
+
+    def _check(self):
+        if self.total:
+            self.saturated_percent = self.saturated * 100.0 / self.total
+        self.success = self.saturated_percent <= self.max_saturated_percent
+        return self.success
+
+    def merge(self, other):
+        self.total += other.total
+        self.saturated += other.saturated
+        return self._check()
+
+    def details(self):
+        return (_("Load generator was saturated (CPU > %.2f%%) %.2f%% of "
+                  "time <= %.2f%% - %s") %
+                (self.max_cpu_percent, self.saturated_percent,
+                 self.max_saturated_percent, self.status()))
@@ -0,0 +1,82 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+SLA (Service-level agreement) is set of details for determining compliance
+with contracted values such as maximum error rate or minimum response time.
+"""
+
+from rally.common.i18n import _
+from rally.common import streaming_algorithms
+from rally.common import utils
+from rally import consts
+from rally.task import sla
+
+
+@sla.configure(name="max_percentile_duration")
+class MaxPercentileDuration(sla.SLA):
+    """Maximum duration of the given percentile of iterations in seconds.
+
+    For example, {"percentile": 95, "max": 2.5} means that 95% of
+    successful iterations should take not more than 2.5 seconds. The 100th
+    percentile is the maximum duration.
+    """
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "percentile": {"type": "number", "minimum": 0.0,
+                           "maximum": 100.0, "exclusiveMinimum": True},
+            "max": {"type": "number", "minimum": 0.0,
+                    "exclusiveMinimum": True}
+        },
+        "required": ["percentile", "max"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, criterion_value):
+        super(MaxPercentileDuration, self).__init__(criterion_value)
+        self.percentile = self.criterion_value["percentile"]
+        self.max_duration = self.criterion_value["max"]
+        if self.percentile == 100:
+            self.percentile_comp = streaming_algorithms.MaxComputation()
+        else:
+            self.percentile_comp = (
+                streaming_algorithms.PercentileComputation(
+                    self.percentile / 100.0))
+
+    def _check(self):
+        self.success = ((self.percentile_comp.result() or 0.0)
+                        <= self.max_duration)
+        return self.success
+
+    def add_iteration(self, iteration):
+        if not iteration.get("error"):
+            self.percentile_comp.add(iteration["duration"])
+        return self._check()
+
+    def merge(self, other):
+        self.percentile_comp.merge(other.percentile_comp)
+        return self._check()
+
+    def details(self):
+        return (_("%(percentile)s%%ile duration of one iteration "
+                  "%(duration)ss <= %(max)ss - %(status)s") %
+                {"percentile": utils.format_float_to_str(self.percentile),
+                 "duration": utils.format_float_to_str(
+                     self.percentile_comp.result() or 0.0),
+                 "max": utils.format_float_to_str(self.max_duration),
+                 "status": self.status()})
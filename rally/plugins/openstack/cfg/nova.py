@@ -254,5 +254,12 @@ OPTS = {"benchmark": [
                  help="Nova volume detach timeout"),
     cfg.FloatOpt("nova_detach_volume_poll_interval",
                  default=float(2),
-                 help="Nova volume detach poll interval")
+                 help="Nova volume detach poll interval"),
+    cfg.BoolOpt("nova_server_batch_poll",
+                default=False,
+                help="Poll statuses of booted and deleted servers with one "
+                     "shared list request per poll interval and tenant in "
+                     "each process instead of a request per server (the "
+                     "servers context lists servers of all tenants by "
+                     "admin)")
 ]}
@@ -46,7 +46,8 @@ class NoName(object):
 def resource(service, resource, order=0, admin_required=False,
              perform_for_admin_only=False, tenant_resource=False,
              max_attempts=3, timeout=CONF.cleanup.resource_deletion_timeout,
-             interval=1, threads=CONF.cleanup.cleanup_threads):
+             interval=1, threads=CONF.cleanup.cleanup_threads,
+             independent=False):
     """Decorator that overrides resource specification.
 
     Just put it on top of your resource class and specify arguments that you
@@ -66,6 +67,9 @@ def resource(service, resource, order=0, admin_required=False,
     :param interval: Resource status pooling interval
     :param threads: Amount of threads (workers) that are deleting resources
                     simultaneously
+    :param independent: Resources neither depend on resources of other
+                        services nor are used by them, so they can be
+                        cleaned up concurrently with other services
     """
 
     def inner(cls):
@@ -80,6 +84,7 @@ def resource(service, resource, order=0, admin_required=False,
         cls._interval = interval
         cls._threads = threads
         cls._tenant_resource = tenant_resource
+        cls._independent = independent
 
         return cls
 
@@ -136,3 +141,16 @@ class ResourceManager(object):
     def list(self):
         """List all resources specific for admin or user."""
         return self._manager().list()
+
+    def list_all_tenants(self):
+        """List resources of all tenants at once with admin client.
+
+        Resource managers which are able to do it should return an iterable
+        over resources, which may fetch them page by page. None means that
+        resources have to be listed for each user or tenant separately.
+        """
+        return None
+
+    def tenant_id(self):
+        """Returns id of the tenant the resource belongs to."""
+        return self.raw_resource.tenant_id
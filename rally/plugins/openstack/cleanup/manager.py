@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
 import time
 
 from rally.common import broker
@@ -22,6 +23,7 @@ from rally.common.plugin import discover
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.plugins.openstack.cleanup import base
+from rally.task import utils as task_utils
 
 
 LOG = logging.getLogger(__name__)
@@ -51,6 +53,17 @@ class SeekAndDestroy(object):
         self.resource_classes = resource_classes or [
             rutils.RandomNameGeneratorMixin]
         self.task_id = task_id
+        # NOTE: resources which are checked for deletion in the common way
+        #   are checked by listing them at once instead of one by one
+        is_deleted = getattr(manager_cls, "is_deleted", None)
+        self._confirm_by_list = (
+            getattr(is_deleted, "__func__", is_deleted)
+            is getattr(base.ResourceManager.is_deleted, "__func__",
+                       base.ResourceManager.is_deleted))
+        self._pending = {}
+        self._pending_lock = threading.Lock()
+        self._deleted = []
+        self._failed = []
 
     def _get_cached_client(self, user):
         """Simplifies initialization and caching OpenStack clients."""
@@ -59,16 +72,12 @@ class SeekAndDestroy(object):
         # NOTE(astudenov): Credential now supports caching by default
         return user["credential"].clients(api_info=self.api_versions)
 
-    def _delete_single_resource(self, resource):
-        """Safe resource deletion with retries and timeouts.
-
-        Send request to delete resource, in case of failures repeat it few
-        times. After that pull status of resource until it's deleted.
-
-        Writes in LOG warning with UUID of resource that wasn't deleted
+    def _request_deletion(self, resource):
+        """Send request to delete resource with retries.
 
         :param resource: instance of resource manager initiated with resource
                          that should be deleted.
+        :returns: bool, whether the request was sent successfully
         """
 
         msg_kw = {
@@ -92,12 +101,35 @@ class SeekAndDestroy(object):
                 % msg_kw)
             if logging.is_debug():
                 LOG.exception(e)
-        else:
+            self._failed.append(resource.id())
+            return False
+        return True
+
+    def _delete_single_resource(self, resource):
+        """Safe resource deletion with retries and timeouts.
+
+        Send request to delete resource, in case of failures repeat it few
+        times. After that pull status of resource until it's deleted.
+
+        Writes in LOG warning with UUID of resource that wasn't deleted
+
+        :param resource: instance of resource manager initiated with resource
+                         that should be deleted.
+        """
+
+        msg_kw = {
+            "uuid": resource.id(),
+            "service": resource._service,
+            "resource": resource._resource
+        }
+
+        if self._request_deletion(resource):
             started = time.time()
             failures_count = 0
             while time.time() - started < resource._timeout:
                 try:
                     if resource.is_deleted():
+                        self._deleted.append(resource.id())
                         return
                 except Exception as e:
                     LOG.warning(
@@ -118,6 +150,56 @@ class SeekAndDestroy(object):
             LOG.warning(_("Resource deletion failed, timeout occurred for "
                           "%(service)s.%(resource)s: %(uuid)s.")
                         % msg_kw)
+            self._failed.append(resource.id())
+
+    def _confirm_deletion(self):
+        """Wait until deleted resources disappear from resources lists.
+
+        Resources are listed once per status polling interval for each
+        user (or tenant) instead of fetching every resource separately.
+        """
+        started = time.time()
+        while self._pending:
+            for key in list(self._pending):
+                admin, user, pending = self._pending[key]
+                manager = self.manager_cls(
+                    admin=self._get_cached_client(admin),
+                    user=self._get_cached_client(user),
+                    tenant_uuid=user and user["tenant_id"])
+                try:
+                    existing = set(
+                        self.manager_cls(resource=raw_resource).id()
+                        for raw_resource in manager.list()
+                        if task_utils.get_status(raw_resource) not in (
+                            "DELETED", "DELETE_COMPLETE"))
+                except Exception as e:
+                    LOG.warning(
+                        _("Failed to list %(service)s.%(resource)s to check "
+                          "deletion of resources: %(reason)s")
+                        % {"service": self.manager_cls._service,
+                           "resource": self.manager_cls._resource,
+                           "reason": e})
+                    continue
+                self._deleted.extend(pending - existing)
+                pending &= existing
+                if not pending:
+                    del self._pending[key]
+
+            if not self._pending:
+                break
+            if time.time() - started >= self.manager_cls._timeout:
+                for admin, user, pending in self._pending.values():
+                    for uuid in pending:
+                        LOG.warning(
+                            _("Resource deletion failed, timeout occurred "
+                              "for %(service)s.%(resource)s: %(uuid)s.")
+                            % {"service": self.manager_cls._service,
+                               "resource": self.manager_cls._resource,
+                               "uuid": uuid})
+                        self._failed.append(uuid)
+                self._pending.clear()
+                break
+            rutils.interruptable_sleep(self.manager_cls._interval)
 
     def _publisher(self, queue):
         """Publisher for deletion jobs.
@@ -131,9 +213,15 @@ class SeekAndDestroy(object):
         In case of tenant based resource, uuids are fetched only from one user
         per tenant.
         """
+        # ids of resources published by the listing of all tenants
+        published = set()
+
         def _publish(admin, user, manager):
             try:
                 for raw_resource in rutils.retry(3, manager.list):
+                    if (published and self.manager_cls(
+                            resource=raw_resource).id() in published):
+                        continue
                     queue.append((admin, user, raw_resource))
             except Exception as e:
                 LOG.warning(
@@ -149,8 +237,14 @@ class SeekAndDestroy(object):
             _publish(self.admin, None, manager)
 
         else:
-            visited_tenants = set()
             admin_client = self._get_cached_client(self.admin)
+            if (admin_client is not None
+                    and self.manager_cls._tenant_resource
+                    and self._publish_all_tenants(admin_client, queue,
+                                                  published)):
+                return
+
+            visited_tenants = set()
             for user in self.users:
                 if (self.manager_cls._tenant_resource
                    and user["tenant_id"] in visited_tenants):
@@ -163,6 +257,46 @@ class SeekAndDestroy(object):
                     tenant_uuid=user["tenant_id"])
                 _publish(self.admin, user, manager)
 
+    def _publish_all_tenants(self, admin_client, queue, published):
+        """Publish deletion jobs for resources of all tenants at once.
+
+        Resources of all tenants are listed by admin (usually page by page)
+        and only resources of tenants of the passed users are published,
+        so there is no list call for each tenant. Jobs are published as soon
+        as their page is listed, so deletion starts while the next pages are
+        being listed.
+
+        :param published: set to add ids of the published resources to, so
+                          listing resources for each tenant after a failure
+                          skips them
+        :returns: False if resources can not be listed in such way and
+                  should be listed for each tenant separately
+        """
+        manager = self.manager_cls(admin=admin_client)
+        resources = manager.list_all_tenants()
+        if resources is None:
+            return False
+
+        users = {}
+        for user in self.users:
+            users.setdefault(user["tenant_id"], user)
+        try:
+            for raw_resource in resources:
+                resource = self.manager_cls(resource=raw_resource)
+                tenant_id = resource.tenant_id()
+                if tenant_id in users:
+                    published.add(resource.id())
+                    queue.append((self.admin, users[tenant_id], raw_resource))
+        except Exception as e:
+            LOG.warning(
+                _("Failed to list resources of all tenants with %s.%s, "
+                  "falling back to listing them for each tenant: %s")
+                % (manager.__module__, type(manager).__name__, e))
+            if logging.is_debug():
+                LOG.exception(e)
+            return False
+        return True
+
     def _consumer(self, cache, args):
         """Method that consumes single deletion job."""
         admin, user, raw_resource = args
@@ -177,13 +311,31 @@ class SeekAndDestroy(object):
                 rutils.name_matches_object(
                     manager.name(), *self.resource_classes,
                     task_id=self.task_id, exact=False)):
-            self._delete_single_resource(manager)
+            if not self._confirm_by_list:
+                self._delete_single_resource(manager)
+            elif self._request_deletion(manager):
+                # NOTE: the same user objects are passed to all consumers,
+                #   so resources are grouped by identity of their owners
+                key = (id(admin), id(user))
+                with self._pending_lock:
+                    if key not in self._pending:
+                        self._pending[key] = (admin, user, set())
+                    self._pending[key][2].add(manager.id())
 
     def exterminate(self):
         """Delete all resources for passed users, admin and resource_mgr."""
 
+        started_at = time.time()
         broker.run(self._publisher, self._consumer,
                    consumers_count=self.manager_cls._threads)
+        self._confirm_deletion()
+        LOG.info(_("Cleanup of %(service)s.%(resource)s took %(duration).2f "
+                   "sec: %(deleted)d resources deleted, %(failed)d failed.")
+                 % {"service": self.manager_cls._service,
+                    "resource": self.manager_cls._resource,
+                    "duration": time.time() - started_at,
+                    "deleted": len(self._deleted),
+                    "failed": len(self._failed)})
 
 
 def list_resource_names(admin_required=None):
@@ -243,6 +395,36 @@ def find_resource_managers(names=None, admin_required=None):
     return resource_managers
 
 
+def make_cleanup_plan(resource_managers):
+    """Group resource managers and find dependencies between the groups.
+
+    Resource managers of one service which go one after another in the
+    cleanup order form a group; they are cleaned up sequentially. Each group
+    depends on all previous groups, except independent groups which neither
+    depend on other groups nor have dependants.
+
+    :param resource_managers: resource managers sorted by cleanup order
+    :returns: list of (managers, indexes of groups to wait for) tuples
+    """
+    groups = []
+    for mgr in resource_managers:
+        if groups and groups[-1][-1]._service == mgr._service:
+            groups[-1].append(mgr)
+        else:
+            groups.append([mgr])
+
+    plan = []
+    independent = []
+    for i, group in enumerate(groups):
+        independent.append(all(mgr._independent for mgr in group))
+        if independent[i]:
+            depends_on = []
+        else:
+            depends_on = [j for j in range(i) if not independent[j]]
+        plan.append((group, depends_on))
+    return plan
+
+
 def cleanup(names=None, admin_required=None, admin=None, users=None,
             api_versions=None, superclass=plugin.Plugin, task_id=None):
     """Generic cleaner.
@@ -251,7 +433,8 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     with _service from services or _resource from resources.
 
     Then goes through all passed users and using cleaners cleans all related
-    resources.
+    resources. Groups of resource managers which do not depend on each
+    other are processed concurrently (see make_cleanup_plan()).
 
     :param names: Use only resource managers that have names in this list.
                   There are in as _service or
@@ -279,11 +462,33 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
     if not resource_classes and issubclass(superclass,
                                            rutils.RandomNameGeneratorMixin):
         resource_classes.append(superclass)
-    for manager in find_resource_managers(names, admin_required):
-        LOG.debug("Cleaning up %(service)s %(resource)s objects" %
-                  {"service": manager._service,
-                   "resource": manager._resource})
-        SeekAndDestroy(manager, admin, users,
-                       api_versions=api_versions,
-                       resource_classes=resource_classes,
-                       task_id=task_id).exterminate()
+    plan = make_cleanup_plan(find_resource_managers(names, admin_required))
+    finished = [threading.Event() for i in range(len(plan))]
+    errors = []
+
+    def _cleanup_group(idx):
+        managers, depends_on = plan[idx]
+        try:
+            for dependency in depends_on:
+                finished[dependency].wait()
+            for manager in managers:
+                LOG.debug("Cleaning up %(service)s %(resource)s objects" %
+                          {"service": manager._service,
+                           "resource": manager._resource})
+                SeekAndDestroy(manager, admin, users,
+                               api_versions=api_versions,
+                               resource_classes=resource_classes,
+                               task_id=task_id).exterminate()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            finished[idx].set()
+
+    threads = [threading.Thread(target=_cleanup_group, args=(i,))
+               for i in range(len(plan))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
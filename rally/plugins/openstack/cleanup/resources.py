@@ -41,6 +41,22 @@ def get_order(start):
     return iter(range(start, start + 99))
 
 
+def _walk_pages(func, page_size=1000, **kwargs):
+    """Generator over resources which are fetched page by page.
+
+    The service may return less than `page_size` items per page (e.g. if it
+    has a lower limit configured), so pages are fetched until an empty one.
+    """
+    marker = None
+    while True:
+        items = func(marker=marker, limit=page_size, **kwargs)
+        if not items:
+            break
+        for item in items:
+            yield item
+        marker = items[-1].id
+
+
 class SynchronizedDeletion(object):
 
     def is_deleted(self):
@@ -155,6 +171,12 @@ class NovaServer(base.ResourceManager):
         """List all servers."""
         return self._manager().list(limit=-1)
 
+    def list_all_tenants(self):
+        if not self.admin:
+            return None
+        return _walk_pages(self.admin.nova().servers.list,
+                           search_opts={"all_tenants": True})
+
     def delete(self):
         if getattr(self.raw_resource, "OS-EXT-STS:locked", False):
             self.raw_resource.unlock()
@@ -265,6 +287,9 @@ class NeutronMixin(SynchronizedDeletion, base.ResourceManager):
     def name(self):
         return self.raw_resource["name"]
 
+    def tenant_id(self):
+        return self.raw_resource["tenant_id"]
+
     def delete(self):
         delete_method = getattr(self._manager(), "delete_%s" % self._resource)
         delete_method(self.id())
@@ -420,6 +445,27 @@ class NeutronPort(NeutronMixin):
                     port["parent_name"] = parent_name
         return ports
 
+    def list_all_tenants(self):
+        if not self.admin:
+            return None
+        # ports are not admin_required, so _manager() would use the user
+        return self._list_ports_of_all_tenants(self.admin.neutron())
+
+    def _list_ports_of_all_tenants(self, neutron):
+        routers = None
+        for page in neutron.list_ports(retrieve_all=False):
+            for port in page["ports"]:
+                if (not port.get("name") and (
+                        port["device_owner"] in self.ROUTER_INTERFACE_OWNERS
+                        or port["device_owner"] == self.ROUTER_GATEWAY_OWNER)):
+                    if routers is None:
+                        routers = dict(
+                            (r["id"], r["name"])
+                            for r in neutron.list_routers()["routers"])
+                    if routers.get(port["device_id"]):
+                        port["parent_name"] = routers[port["device_id"]]
+                yield port
+
     def name(self):
         name = self.raw_resource.get("parent_name",
                                      self.raw_resource.get("name", ""))
@@ -514,7 +560,15 @@ class CinderVolumeTransfer(base.ResourceManager):
 @base.resource("cinder", "volumes", order=next(_cinder_order),
                tenant_resource=True)
 class CinderVolume(base.ResourceManager):
-    pass
+
+    def list_all_tenants(self):
+        if not self.admin:
+            return None
+        return _walk_pages(self.admin.cinder().volumes.list,
+                           search_opts={"all_tenants": True})
+
+    def tenant_id(self):
+        return getattr(self.raw_resource, "os-vol-tenant-attr:tenant_id")
 
 
 @base.resource("cinder", "image_volumes_cache", order=next(_cinder_order),
@@ -680,7 +734,7 @@ class CeilometerAlarms(SynchronizedDeletion, base.ResourceManager):
 
 # ZAQAR
 
-@base.resource("zaqar", "queues", order=800)
+@base.resource("zaqar", "queues", order=800, independent=True)
 class ZaqarQueues(SynchronizedDeletion, base.ResourceManager):
 
     def list(self):
@@ -718,19 +772,21 @@ class DesignateResource(SynchronizedDeletion, base.ResourceManager):
             marker = items[-1]["id"]
 
 
-@base.resource("designate", "domains", order=next(_designate_order))
+@base.resource("designate", "domains", order=next(_designate_order),
+               independent=True)
 class DesignateDomain(DesignateResource):
     pass
 
 
 @base.resource("designate", "servers", order=next(_designate_order),
-               admin_required=True, perform_for_admin_only=True)
+               admin_required=True, perform_for_admin_only=True,
+               independent=True)
 class DesignateServer(DesignateResource):
     pass
 
 
 @base.resource("designate", "recordsets", order=next(_designate_order),
-               tenant_resource=True)
+               tenant_resource=True, independent=True)
 class DesignateRecordSets(DesignateResource):
     def _client(self):
         # Map resource names to api / client version
@@ -753,7 +809,7 @@ class DesignateRecordSets(DesignateResource):
 
 
 @base.resource("designate", "zones", order=next(_designate_order),
-               tenant_resource=True)
+               tenant_resource=True, independent=True)
 class DesignateZones(DesignateResource):
     def list(self):
         criterion = {"name": "s_rally_*"}
@@ -789,7 +845,7 @@ class SwiftMixin(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("swift", "object", order=next(_swift_order),
-               tenant_resource=True)
+               tenant_resource=True, independent=True)
 class SwiftObject(SwiftMixin):
 
     def list(self):
@@ -805,7 +861,7 @@ class SwiftObject(SwiftMixin):
 
 
 @base.resource("swift", "container", order=next(_swift_order),
-               tenant_resource=True)
+               tenant_resource=True, independent=True)
 class SwiftContainer(SwiftMixin):
 
     def list(self):
@@ -825,20 +881,20 @@ class MistralMixin(SynchronizedDeletion, base.ResourceManager):
 
 
 @base.resource("mistral", "workbooks", order=next(_mistral_order),
-               tenant_resource=True)
+               tenant_resource=True, independent=True)
 class MistralWorkbooks(MistralMixin):
     def delete(self):
         self._manager().delete(self.raw_resource["name"])
 
 
 @base.resource("mistral", "workflows", order=next(_mistral_order),
-               tenant_resource=True)
+               tenant_resource=True, independent=True)
 class MistralWorkflows(MistralMixin):
     pass
 
 
 @base.resource("mistral", "executions", order=next(_mistral_order),
-               tenant_resource=True)
+               tenant_resource=True, independent=True)
 class MistralExecutions(MistralMixin):
     pass
 
@@ -14,16 +14,21 @@
 
 from oslo_config import cfg
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import utils as rutils
 from rally.common import validation
 from rally import consts
+from rally import exceptions
 from rally import osclients
 from rally.plugins.openstack.cleanup import manager as resource_manager
 from rally.plugins.openstack.services.image import image
 from rally.task import context
 
+from rally.common import opts
+opts.register()
+
 CONF = cfg.CONF
 CONF.import_opt("glance_image_delete_timeout",
                 "rally.plugins.openstack.scenarios.glance.utils",
@@ -103,6 +108,12 @@ class ImageGenerator(context.Context):
                 "enum": ["qcow2", "raw", "vhd", "vmdk", "vdi", "iso", "aki",
                          "ari", "ami"],
             },
+            "resource_management_workers": {
+                "description": "The number of images to create "
+                               "concurrently.",
+                "type": "integer",
+                "minimum": 1
+            },
         },
         "oneOf": [{"description": "It is been used since Rally 0.10.0",
                    "required": ["image_url", "disk_format",
@@ -119,7 +130,11 @@ class ImageGenerator(context.Context):
         "additionalProperties": False
     }
 
-    DEFAULT_CONFIG = {"images_per_tenant": 1}
+    DEFAULT_CONFIG = {
+        "images_per_tenant": 1,
+        "resource_management_workers":
+            CONF.users_context.resource_management_workers
+    }
 
     @logging.log_task_wrapper(LOG.info, _("Enter context: `Images`"))
     def setup(self):
@@ -168,27 +183,38 @@ class ImageGenerator(context.Context):
         if "image_name" in self.config and images_per_tenant == 1:
             image_name = self.config["image_name"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
-            current_images = []
-            clients = osclients.Clients(
-                user["credential"],
-                api_info=self.context["config"].get("api_versions"))
-            image_service = image.Image(
-                clients, name_generator=self.generate_random_name)
-
-            for i in range(images_per_tenant):
-                image_obj = image_service.create_image(
-                    image_name=image_name,
-                    container_format=container_format,
-                    image_location=image_url,
-                    disk_format=disk_format,
-                    visibility=visibility,
-                    min_disk=min_disk,
-                    min_ram=min_ram)
-                current_images.append(image_obj.id)
-
-            self.context["tenants"][tenant_id]["images"] = current_images
+        def publish(queue):
+            for user, tenant_id in rutils.iterate_per_tenants(
+                    self.context["users"]):
+                self.context["tenants"][tenant_id]["images"] = []
+                for i in range(images_per_tenant):
+                    queue.append((user, tenant_id))
+
+        def consume(cache, args):
+            user, tenant_id = args
+            if tenant_id not in cache:
+                clients = osclients.Clients(
+                    user["credential"],
+                    api_info=self.context["config"].get("api_versions"))
+                cache[tenant_id] = image.Image(
+                    clients, name_generator=self.generate_random_name)
+            image_obj = cache[tenant_id].create_image(
+                image_name=image_name,
+                container_format=container_format,
+                image_location=image_url,
+                disk_format=disk_format,
+                visibility=visibility,
+                min_disk=min_disk,
+                min_ram=min_ram)
+            self.context["tenants"][tenant_id]["images"].append(image_obj.id)
+
+        stats = broker.run(publish, consume,
+                           self.config["resource_management_workers"])
+        self.execution_stats["images"] = stats.to_dict()
+        if stats.failed:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg=_("Failed to create %d image(s).") % stats.failed)
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Images`"))
     def cleanup(self):
@@ -14,6 +14,7 @@
 #    under the License.
 
 import collections
+import time
 import uuid
 
 from oslo_config import cfg
@@ -118,8 +119,12 @@ class UserGenerator(context.Context):
             LOG.debug("Security group context is disabled: %s" % msg)
             return
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
+        def publish(queue):
+            for user, tenant_id in rutils.iterate_per_tenants(
+                    self.context["users"]):
+                queue.append(user)
+
+        def consume(cache, user):
             with logging.ExceptionLogger(
                     LOG, _("Unable to delete default security group")):
                 uclients = osclients.Clients(user["credential"])
@@ -129,81 +134,123 @@ class UserGenerator(context.Context):
                 if default:
                     clients.neutron().delete_security_group(default[0]["id"])
 
-    def _create_tenants(self):
-        threads = self.config["resource_management_workers"]
+        broker.run(publish, consume,
+                   self.config["resource_management_workers"])
 
-        tenants = collections.deque()
+    def _create_tenant(self, cache, args):
+        domain, task_id, i = args
+        if "client" not in cache:
+            clients = osclients.Clients(self.credential)
+            cache["client"] = identity.Identity(
+                clients, name_generator=self.generate_random_name)
+        tenant = cache["client"].create_project(domain_name=domain)
+        return {"id": tenant.id, "name": tenant.name, "users": []}
 
+    def _get_tenants_publisher(self):
         def publish(queue):
             for i in range(self.config["tenants"]):
                 args = (self.config["project_domain"], self.task["uuid"], i)
                 queue.append(args)
-
-        def consume(cache, args):
-            domain, task_id, i = args
-            if "client" not in cache:
-                clients = osclients.Clients(self.credential)
-                cache["client"] = identity.Identity(
-                    clients, name_generator=self.generate_random_name)
-            tenant = cache["client"].create_project(domain_name=domain)
-            tenant_dict = {"id": tenant.id, "name": tenant.name, "users": []}
-            tenants.append(tenant_dict)
-
-        # NOTE(msdubov): consume() will fill the tenants list in the closure.
-        broker.run(publish, consume, threads)
-        tenants_dict = {}
-        for t in tenants:
-            tenants_dict[t["id"]] = t
-
-        return tenants_dict
-
-    def _create_users(self):
-        # NOTE(msdubov): This should be called after _create_tenants().
+        return publish
+
+    def _create_user(self, cache, args):
+        username, password, project_dom, user_dom, tenant_id, tenant_name = (
+            args)
+        if "client" not in cache:
+            clients = osclients.Clients(self.credential)
+            cache["client"] = identity.Identity(
+                clients, name_generator=self.generate_random_name)
+        client = cache["client"]
+        # the default role is assigned by the same worker right after the
+        # user is created
+        user = client.create_user(
+            username, password=password, project_id=tenant_id,
+            domain_name=user_dom,
+            default_role=cfg.CONF.users_context.keystone_default_role)
+        user_credential = credential.OpenStackCredential(
+            auth_url=self.credential.auth_url,
+            username=user.name,
+            password=password,
+            tenant_name=tenant_name,
+            permission=consts.EndpointPermission.USER,
+            project_domain_name=project_dom,
+            user_domain_name=user_dom,
+            endpoint_type=self.credential.endpoint_type,
+            https_insecure=self.credential.https_insecure,
+            https_cacert=self.credential.https_cacert,
+            region_name=self.credential.region_name)
+        return {"id": user.id,
+                "credential": user_credential,
+                "tenant_id": tenant_id}
+
+    def _publish_tenant_users(self, queue, tenant_id, tenant_name):
+        for user_id in range(self.config["users_per_tenant"]):
+            username = self.generate_random_name()
+            password = str(uuid.uuid4())
+            args = (username, password, self.config["project_domain"],
+                    self.config["user_domain"], tenant_id, tenant_name)
+            queue.append(args)
+
+    def _create_tenants_and_users(self):
+        """Create tenants and users in a pipeline.
+
+        Users of a tenant start to be created as soon as the tenant exists,
+        without waiting for the rest of tenants.
+
+        Both stages share resource_management_workers threads, so keystone
+        never gets more concurrent requests than configured. The users stage
+        gets a share proportional to the number of users per tenant. A single
+        worker creates all tenants first and then the users.
+
+        :returns: tuple of tenants dict and users list
+        """
         threads = self.config["resource_management_workers"]
-        users_per_tenant = self.config["users_per_tenant"]
-        default_role = cfg.CONF.users_context.keystone_default_role
+        tenant_threads = max(
+            1, threads // (1 + self.config["users_per_tenant"]))
+        user_threads = threads - tenant_threads
 
+        tenants = collections.deque()
         users = collections.deque()
+        created_tenants = broker.JobQueue()
+
+        def consume_tenant(cache, args):
+            tenant = self._create_tenant(cache, args)
+            tenants.append(tenant)
+            created_tenants.append(tenant)
+
+        def create_tenants():
+            try:
+                self.execution_stats["tenants"] = broker.run(
+                    self._get_tenants_publisher(), consume_tenant,
+                    tenant_threads).to_dict()
+            finally:
+                created_tenants.close()
+
+        def publish_users(queue):
+            while True:
+                try:
+                    tenant = created_tenants.popleft()
+                except IndexError:
+                    break
+                self._publish_tenant_users(queue, tenant["id"],
+                                           tenant["name"])
+
+        def consume_user(cache, args):
+            users.append(self._create_user(cache, args))
+
+        if user_threads:
+            tenants_created = broker.get_pool().submit(create_tenants)
+            stats = broker.run(publish_users, consume_user, user_threads)
+            tenants_created.wait()
+        else:
+            create_tenants()
+            stats = broker.run(publish_users, consume_user, 1)
+        self.execution_stats["users"] = stats.to_dict()
 
-        def publish(queue):
-            for tenant_id in self.context["tenants"]:
-                for user_id in range(users_per_tenant):
-                    username = self.generate_random_name()
-                    password = str(uuid.uuid4())
-                    args = (username, password, self.config["project_domain"],
-                            self.config["user_domain"], tenant_id)
-                    queue.append(args)
-
-        def consume(cache, args):
-            username, password, project_dom, user_dom, tenant_id = args
-            if "client" not in cache:
-                clients = osclients.Clients(self.credential)
-                cache["client"] = identity.Identity(
-                    clients, name_generator=self.generate_random_name)
-            client = cache["client"]
-            user = client.create_user(username, password=password,
-                                      project_id=tenant_id,
-                                      domain_name=user_dom,
-                                      default_role=default_role)
-            user_credential = credential.OpenStackCredential(
-                auth_url=self.credential.auth_url,
-                username=user.name,
-                password=password,
-                tenant_name=self.context["tenants"][tenant_id]["name"],
-                permission=consts.EndpointPermission.USER,
-                project_domain_name=project_dom,
-                user_domain_name=user_dom,
-                endpoint_type=self.credential.endpoint_type,
-                https_insecure=self.credential.https_insecure,
-                https_cacert=self.credential.https_cacert,
-                region_name=self.credential.region_name)
-            users.append({"id": user.id,
-                          "credential": user_credential,
-                          "tenant_id": tenant_id})
-
-        # NOTE(msdubov): consume() will fill the users list in the closure.
-        broker.run(publish, consume, threads)
-        return list(users)
+        tenants_dict = {}
+        for t in tenants:
+            tenants_dict[t["id"]] = t
+        return tenants_dict, list(users)
 
     def _get_consumer_for_deletion(self, func_name):
         def consume(cache, resource_id):
@@ -244,23 +291,25 @@ class UserGenerator(context.Context):
         self.context["user_choice_method"] = self.config["user_choice_method"]
 
         threads = self.config["resource_management_workers"]
+        users_num = self.config["users_per_tenant"] * self.config["tenants"]
 
-        LOG.debug("Creating %(tenants)d tenants using %(threads)s threads" %
-                  {"tenants": self.config["tenants"], "threads": threads})
-        self.context["tenants"] = self._create_tenants()
+        LOG.debug("Creating %(tenants)d tenants and %(users)d users using "
+                  "%(threads)s threads" % {"tenants": self.config["tenants"],
+                                           "users": users_num,
+                                           "threads": threads})
+        tenants, users = self._create_tenants_and_users()
+        self.context["tenants"] = tenants
+        self.context["users"] = users
+        for user in self.context["users"]:
+            self.context["tenants"][user["tenant_id"]]["users"].append(user)
+        LOG.debug("Created %(tenants)d tenants and %(users)d users" %
+                  {"tenants": len(tenants), "users": len(users)})
 
         if len(self.context["tenants"]) < self.config["tenants"]:
             raise exceptions.ContextSetupFailure(
                 ctx_name=self.get_name(),
                 msg=_("Failed to create the requested number of tenants."))
 
-        users_num = self.config["users_per_tenant"] * self.config["tenants"]
-        LOG.debug("Creating %(users)d users using %(threads)s threads" %
-                  {"users": users_num, "threads": threads})
-        self.context["users"] = self._create_users()
-        for user in self.context["users"]:
-            self.context["tenants"][user["tenant_id"]]["users"].append(user)
-
         if len(self.context["users"]) < users_num:
             raise exceptions.ContextSetupFailure(
                 ctx_name=self.get_name(),
@@ -269,6 +318,9 @@ class UserGenerator(context.Context):
     @logging.log_task_wrapper(LOG.info, _("Exit context: `users`"))
     def cleanup(self):
         """Delete tenants and users, using the broker pattern."""
+        started_at = time.time()
         self._remove_default_security_group()
+        self.execution_stats["security_groups_cleanup_duration"] = (
+            time.time() - started_at)
         self._delete_users()
         self._delete_tenants()
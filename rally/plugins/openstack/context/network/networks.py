@@ -13,18 +13,27 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_config import cfg
+
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally import consts
+from rally import exceptions
 from rally import osclients
 from rally.plugins.openstack.wrappers import network as network_wrapper
 from rally.task import context
 
+from rally.common import opts
+opts.register()
+
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
 
 # NOTE(andreykurilin): admin is used only by cleanup
 @validation.add("required_platform", platform="openstack", admin=True,
@@ -60,6 +69,10 @@ class Network(context.Context):
                 "type": "array",
                 "items": {"type": "string"},
                 "uniqueItems": True
+            },
+            "resource_management_workers": {
+                "type": "integer",
+                "minimum": 1
             }
         },
         "additionalProperties": False
@@ -70,7 +83,9 @@ class Network(context.Context):
         "networks_per_tenant": 1,
         "subnets_per_network": 1,
         "network_create_args": {},
-        "dns_nameservers": None
+        "dns_nameservers": None,
+        "resource_management_workers":
+            CONF.users_context.resource_management_workers
     }
 
     @logging.log_task_wrapper(LOG.info, _("Enter context: `network`"))
@@ -79,26 +94,41 @@ class Network(context.Context):
         #               multithreading/multiprocessing, it is likely the
         #               sockets are left open. This problem is eliminated by
         #               creating a connection in setup and cleanup separately.
-        net_wrapper = network_wrapper.wrap(
-            osclients.Clients(self.context["admin"]["credential"]),
-            self, config=self.config)
+        #               Each worker of the setup uses its own connection.
         kwargs = {}
         if self.config["dns_nameservers"] is not None:
             kwargs["dns_nameservers"] = self.config["dns_nameservers"]
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
-            self.context["tenants"][tenant_id]["networks"] = []
-            for i in range(self.config["networks_per_tenant"]):
-                # NOTE(amaretskiy): add_router and subnets_num take effect
-                #                   for Neutron only.
-                network_create_args = self.config["network_create_args"].copy()
-                network = net_wrapper.create_network(
-                    tenant_id,
-                    add_router=True,
-                    subnets_num=self.config["subnets_per_network"],
-                    network_create_args=network_create_args,
-                    **kwargs)
-                self.context["tenants"][tenant_id]["networks"].append(network)
+
+        def publish(queue):
+            for user, tenant_id in (utils.iterate_per_tenants(
+                    self.context.get("users", []))):
+                self.context["tenants"][tenant_id]["networks"] = []
+                for i in range(self.config["networks_per_tenant"]):
+                    queue.append(tenant_id)
+
+        def consume(cache, tenant_id):
+            if "net_wrapper" not in cache:
+                cache["net_wrapper"] = network_wrapper.wrap(
+                    osclients.Clients(self.context["admin"]["credential"]),
+                    self, config=self.config)
+            # NOTE(amaretskiy): add_router and subnets_num take effect
+            #                   for Neutron only.
+            network_create_args = self.config["network_create_args"].copy()
+            network = cache["net_wrapper"].create_network(
+                tenant_id,
+                add_router=True,
+                subnets_num=self.config["subnets_per_network"],
+                network_create_args=network_create_args,
+                **kwargs)
+            self.context["tenants"][tenant_id]["networks"].append(network)
+
+        stats = broker.run(publish, consume,
+                           self.config["resource_management_workers"])
+        self.execution_stats["networks"] = stats.to_dict()
+        if stats.failed:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg=_("Failed to create %d network(s).") % stats.failed)
 
     @logging.log_task_wrapper(LOG.info, _("Exit context: `network`"))
     def cleanup(self):
@@ -12,19 +12,29 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+from oslo_config import cfg
+
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import utils as rutils
 from rally.common import validation
+from rally import exceptions
 from rally import osclients
 from rally.plugins.openstack.cleanup import manager as resource_manager
 from rally.plugins.openstack.scenarios.nova import utils as nova_utils
 from rally.plugins.openstack import types
 from rally.task import context
+from rally.task import utils as task_utils
+
+from rally.common import opts
+opts.register()
 
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
 
 @validation.add("required_platform", platform="openstack", users=True)
 @context.configure(name="servers", order=430)
@@ -70,6 +80,12 @@ class ServerGenerator(context.Context):
                                     " expects to see."},
                     {"type": "string", "description": "Network ID."}]},
                 "minItems": 1
+            },
+            "resource_management_workers": {
+                "description": "The number of tenants to boot servers in "
+                               "concurrently.",
+                "type": "integer",
+                "minimum": 1
             }
         },
         "required": ["image", "flavor"],
@@ -78,9 +94,31 @@ class ServerGenerator(context.Context):
 
     DEFAULT_CONFIG = {
         "servers_per_tenant": 5,
-        "auto_assign_nic": False
+        "auto_assign_nic": False,
+        "resource_management_workers":
+            CONF.users_context.resource_management_workers
     }
 
+    def _get_servers_poller(self):
+        """Return poller of servers of all tenants or None.
+
+        Servers of the whole cloud are listed by admin, so the poller is
+        used only if batch polling is enabled and admin is available,
+        otherwise each server is polled separately.
+        """
+        if (not CONF.benchmark.nova_server_batch_poll
+                or not self.context.get("admin")):
+            return None
+        credential = self.context["admin"]["credential"]
+        interval = CONF.benchmark.nova_server_boot_poll_interval
+        nova = osclients.Clients(credential).nova()
+        return task_utils.BatchStatusPoller.get_poller(
+            ("nova.servers.all_tenants", credential.auth_url,
+             credential.username, interval),
+            lambda: nova.servers.list(search_opts={"all_tenants": True},
+                                      limit=-1),
+            interval=interval)
+
     @logging.log_task_wrapper(LOG.info, _("Enter context: `Servers`"))
     def setup(self):
         image = self.config["image"]
@@ -102,8 +140,15 @@ class ServerGenerator(context.Context):
         flavor_id = types.Flavor.transform(clients=clients,
                                            resource_config=flavor)
 
-        for iter_, (user, tenant_id) in enumerate(rutils.iterate_per_tenants(
-                self.context["users"])):
+        servers_poller = self._get_servers_poller()
+
+        def publish(queue):
+            for iter_, (user, tenant_id) in enumerate(
+                    rutils.iterate_per_tenants(self.context["users"])):
+                queue.append((iter_, user, tenant_id))
+
+        def consume(cache, args):
+            iter_, user, tenant_id = args
             LOG.debug("Booting servers for user tenant %s "
                       % (user["tenant_id"]))
             tmp_context = {"user": user,
@@ -112,6 +157,7 @@ class ServerGenerator(context.Context):
                            "owner_id": self.context["owner_id"],
                            "iteration": iter_}
             nova_scenario = nova_utils.NovaScenario(tmp_context)
+            nova_scenario.servers_poller = servers_poller
 
             LOG.debug("Calling _boot_servers with image_id=%(image_id)s "
                       "flavor_id=%(flavor_id)s "
@@ -133,6 +179,15 @@ class ServerGenerator(context.Context):
             self.context["tenants"][tenant_id][
                 "servers"] = current_servers
 
+        stats = broker.run(publish, consume,
+                           self.config["resource_management_workers"])
+        self.execution_stats["tenants"] = stats.to_dict()
+        if stats.failed:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg=_("Failed to boot servers for %d tenant(s).")
+                % stats.failed)
+
     @logging.log_task_wrapper(LOG.info, _("Exit context: `Servers`"))
     def cleanup(self):
         resource_manager.cleanup(names=["nova.servers"],
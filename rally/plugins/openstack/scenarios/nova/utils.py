@@ -37,6 +37,25 @@ class NovaScenario(scenario.OpenStackScenario):
         """Returns user servers list."""
         return self.clients("nova").servers.list(detailed)
 
+    # BatchStatusPoller shared by several tenants (e.g. listing servers of
+    # all tenants by admin) to wait for servers with, instead of a poller
+    # of servers of the current tenant
+    servers_poller = None
+
+    def _get_server_updater(self, check_interval):
+        """Returns update_resource function for waiting for servers."""
+        if self.servers_poller is not None:
+            return utils.get_from_poller(self.servers_poller)
+        if not CONF.benchmark.nova_server_batch_poll:
+            return utils.get_from_manager()
+        credential = self._clients.credential
+        nova = self.clients("nova")
+        poller = utils.BatchStatusPoller.get_poller(
+            ("nova.servers", credential.auth_url, credential.tenant_name,
+             check_interval),
+            lambda: nova.servers.list(limit=-1), interval=check_interval)
+        return utils.get_from_poller(poller)
+
     def _pick_random_nic(self):
         """Choose one network from existing ones."""
         ctxt = self.context
@@ -83,7 +102,8 @@ class NovaScenario(scenario.OpenStackScenario):
         server = utils.wait_for_status(
             server,
             ready_statuses=["ACTIVE"],
-            update_resource=utils.get_from_manager(),
+            update_resource=self._get_server_updater(
+                CONF.benchmark.nova_server_boot_poll_interval),
             timeout=CONF.benchmark.nova_server_boot_timeout,
             check_interval=CONF.benchmark.nova_server_boot_poll_interval
         )
@@ -368,7 +388,8 @@ class NovaScenario(scenario.OpenStackScenario):
                 server,
                 ready_statuses=["deleted"],
                 check_deletion=True,
-                update_resource=utils.get_from_manager(),
+                update_resource=self._get_server_updater(
+                    CONF.benchmark.nova_server_delete_poll_interval),
                 timeout=CONF.benchmark.nova_server_delete_timeout,
                 check_interval=CONF.benchmark.nova_server_delete_poll_interval
             )
@@ -387,12 +408,14 @@ class NovaScenario(scenario.OpenStackScenario):
                 else:
                     server.delete()
 
+            update_resource = self._get_server_updater(
+                CONF.benchmark.nova_server_delete_poll_interval)
             for server in servers:
                 utils.wait_for_status(
                     server,
                     ready_statuses=["deleted"],
                     check_deletion=True,
-                    update_resource=utils.get_from_manager(),
+                    update_resource=update_resource,
                     timeout=CONF.benchmark.nova_server_delete_timeout,
                     check_interval=CONF.
                     benchmark.nova_server_delete_poll_interval
@@ -566,11 +589,12 @@ class NovaScenario(scenario.OpenStackScenario):
         servers = [s for s in self.clients("nova").servers.list()
                    if s.name.startswith(name_prefix)]
         self.sleep_between(CONF.benchmark.nova_server_boot_prepoll_delay)
+        update_resource = self._get_server_updater(
+            CONF.benchmark.nova_server_boot_poll_interval)
         servers = [utils.wait_for_status(
             server,
             ready_statuses=["ACTIVE"],
-            update_resource=utils.
-            get_from_manager(),
+            update_resource=update_resource,
             timeout=CONF.benchmark.nova_server_boot_timeout,
             check_interval=CONF.benchmark.nova_server_boot_poll_interval
         ) for server in servers]
@@ -23,6 +23,7 @@ from rally.task import types
 class Flavor(types.ResourceType):
 
     @classmethod
+    @types.cache_transform
     def transform(cls, clients, resource_config):
         """Transform the resource config to id.
 
@@ -71,6 +72,7 @@ class EC2Flavor(types.ResourceType):
 class GlanceImage(types.ResourceType):
 
     @classmethod
+    @types.cache_transform
     def transform(cls, clients, resource_config):
         """Transform the resource config to id.
 
@@ -82,9 +84,16 @@ class GlanceImage(types.ResourceType):
         resource_id = resource_config.get("id")
         if not resource_id:
             glanceclient = clients.glance()
+            resources = []
+            if "name" in resource_config:
+                # look for the exact name on server side first
+                resources = list(glanceclient.images.list(
+                    filters={"name": resource_config["name"]}))
+            if not resources:
+                resources = list(glanceclient.images.list())
             resource_id = types._id_from_name(
                 resource_config=resource_config,
-                resources=list(glanceclient.images.list()),
+                resources=resources,
                 typename="image")
         return resource_id
 
@@ -149,6 +158,7 @@ class EC2Image(types.ResourceType):
 class VolumeType(types.ResourceType):
 
     @classmethod
+    @types.cache_transform
     def transform(cls, clients, resource_config):
         """Transform the resource config to id.
 
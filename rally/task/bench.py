@@ -0,0 +1,205 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmarks of Rally's own overhead.
+
+Dummy scenarios do not touch any cloud, so running them with different
+runners, concurrency, number of iterations and size of atomic actions and
+output measures the task engine, the database layer and the report
+builder only.
+"""
+
+import collections
+import datetime as dt
+import resource
+
+from rally.common import db
+from rally.common import utils
+from rally.common import version
+from rally.task.processing import plot
+
+# name of workload -> (scenario, scenario args)
+WORKLOADS = collections.OrderedDict([
+    ("dummy", ("Dummy.dummy", {"sleep": 0})),
+    ("output", ("Dummy.dummy_output", {"random_range": 25})),
+    ("atomics-5", ("Dummy.dummy_random_action",
+                   {"actions_num": 5, "sleep_min": 0, "sleep_max": 0})),
+    ("atomics-50", ("Dummy.dummy_random_action",
+                    {"actions_num": 50, "sleep_min": 0, "sleep_max": 0}))
+])
+RUNNERS = ("constant", "serial", "rps")
+CONCURRENCY = (1, 10)
+TIMES = (100, 1000)
+# rate of the rps runner, it is high enough to not be reached by Dummy
+# scenarios, so the achieved rate is limited by Rally only
+RPS = 1000
+
+# name of metric -> whether a bigger value is better
+METRICS = collections.OrderedDict([
+    ("iterations_per_second", True),
+    ("overhead_per_iteration", False),
+    ("parent_cpu_time", False),
+    ("db_bytes", False),
+    ("report_build_time", False)
+])
+
+
+def make_cases(pattern=None):
+    """Return the cases of the benchmark matrix.
+
+    The serial runner does not run iterations concurrently, so it is
+    benchmarked with the concurrency of 1 only.
+
+    :param pattern: if given, only cases which names contain it are
+        returned
+    :returns: list of dicts with "name", "workload", "scenario", "args",
+        "runner", "concurrency" and "times"
+    """
+    cases = []
+    for workload, (scenario_name, args) in WORKLOADS.items():
+        for runner_type in RUNNERS:
+            for concurrency in CONCURRENCY:
+                if runner_type == "serial" and concurrency != 1:
+                    continue
+                for times in TIMES:
+                    name = "%s/%s/c%d/n%d" % (workload, runner_type,
+                                              concurrency, times)
+                    if pattern and pattern not in name:
+                        continue
+                    cases.append({"name": name,
+                                  "workload": workload,
+                                  "scenario": scenario_name,
+                                  "args": args,
+                                  "runner": runner_type,
+                                  "concurrency": concurrency,
+                                  "times": times})
+    return cases
+
+
+def make_task_config(case):
+    """Return the config of the task running the case."""
+    runner_cfg = {"type": case["runner"], "times": case["times"]}
+    if case["runner"] == "constant":
+        runner_cfg["concurrency"] = case["concurrency"]
+    elif case["runner"] == "rps":
+        runner_cfg["rps"] = RPS
+        runner_cfg["max_concurrency"] = case["concurrency"]
+    return {case["scenario"]: [{"args": case["args"],
+                                "runner": runner_cfg}]}
+
+
+def _get_cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_case(api, deployment, case):
+    """Run the case and measure Rally's overhead.
+
+    The task created for the case is deleted once it is measured.
+
+    :param api: rally.api.API instance
+    :param deployment: UUID or name of the deployment to run the task on
+    :param case: one of the cases returned by make_cases()
+    :returns: dict of metrics: achieved "iterations_per_second",
+        "overhead_per_iteration" (seconds each iteration slot spent outside
+        the scenario, for the rps runner it includes pacing of the runner),
+        "parent_cpu_time" (seconds of CPU used by the Rally process, runner
+        worker processes are not counted), "db_bytes" (size of the
+        iterations data as it is stored in the database) and
+        "report_build_time" (seconds to build the HTML report)
+    """
+    task = api.task.create(deployment, tag="rally-bench")
+    try:
+        cpu_time = _get_cpu_time()
+        api.task.start(deployment, make_task_config(case), task=task["uuid"])
+        parent_cpu_time = _get_cpu_time() - cpu_time
+
+        results = api.task.get_detailed(task["uuid"])["results"]
+        with utils.Timer() as timer:
+            plot.plot(plot.make_report_results(results))
+        db_size = db.workload_data_get_size(task["uuid"])
+    finally:
+        api.task.delete(task["uuid"], force=True)
+
+    data = results[0]["data"]
+    raw = list(data["raw"])
+    iterations = len(raw)
+    load_duration = data["load_duration"]
+    scenario_duration = sum(r["duration"] for r in raw)
+    metrics = {"iterations_per_second": 0, "overhead_per_iteration": 0,
+               "parent_cpu_time": round(parent_cpu_time, 3),
+               "db_bytes": db_size["compressed_chunk_size"],
+               "report_build_time": round(timer.duration(), 3)}
+    if iterations and load_duration:
+        metrics["iterations_per_second"] = round(
+            iterations / load_duration, 2)
+        metrics["overhead_per_iteration"] = round(max(
+            load_duration * case["concurrency"] - scenario_duration,
+            0) / iterations, 6)
+    return metrics
+
+
+def run(api, deployment, cases):
+    """Run the cases one by one.
+
+    :param api: rally.api.API instance
+    :param deployment: UUID or name of the deployment to run tasks on
+    :param cases: list of cases returned by make_cases()
+    :returns: dict with "rally_version", "created_at" and "cases", which
+        maps names of cases to dicts with "config" and "metrics"; it is
+        the format of baselines
+    """
+    results = collections.OrderedDict()
+    for case in cases:
+        results[case["name"]] = {"config": case,
+                                 "metrics": run_case(api, deployment, case)}
+    return {"rally_version": version.version_string(),
+            "created_at": dt.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S"),
+            "cases": results}
+
+
+def compare(current, baseline, tolerance=20.0):
+    """Compare results of the benchmark with the baseline.
+
+    :param current: results returned by run()
+    :param baseline: results returned by a previous run()
+    :param tolerance: percent a metric may get worse by before it is
+        reported as a regression
+    :returns: list of dicts with "case", "metric", "baseline", "current",
+        "change" (percent, None if the baseline value is 0) and
+        "regression" for all metrics of the cases present in both results
+    """
+    comparison = []
+    for name, case in current["cases"].items():
+        if name not in baseline["cases"]:
+            continue
+        for metric, bigger_is_better in METRICS.items():
+            old = baseline["cases"][name]["metrics"].get(metric)
+            new = case["metrics"].get(metric)
+            if old is None or new is None:
+                continue
+            change = None
+            regression = False
+            if old:
+                change = round((new - old) * 100.0 / old, 2)
+                if bigger_is_better:
+                    regression = change < -tolerance
+                else:
+                    regression = change > tolerance
+            comparison.append({"case": name, "metric": metric,
+                               "baseline": old, "current": new,
+                               "change": change, "regression": regression})
+    return comparison
@@ -14,6 +14,7 @@
 #    under the License.
 
 import abc
+import time
 
 import six
 
@@ -88,6 +89,10 @@ class BaseContext(plugin.Plugin, functional.FunctionalMixin,
             #                   however we handle this
             self.config = config
         self.context = ctx
+        # JSON-serializable information about setup/cleanup of the context
+        # (progress, throughput, etc.) to be saved in the workload's
+        # context_execution
+        self.execution_stats = {}
 
     def __lt__(self, other):
         return self.get_order() < other.get_order()
@@ -153,13 +158,32 @@ class Context(BaseContext, validation.ValidatablePluginMixin):
 class ContextManager(object):
     """Create context environment and run method inside it."""
 
-    def __init__(self, context_obj):
+    def __init__(self, context_obj, shared=None):
+        """ContextManager constructor.
+
+        :param context_obj: dict with the context config and data
+        :param shared: names of contexts from the config which are already
+            set up by an outer ContextManager and must be neither set up nor
+            cleaned up by this one
+        """
         self._visited = []
         self.context_obj = context_obj
+        self.shared = set(shared or [])
+        self.execution = {}
+
+    def _save_execution(self, ctx, stage, started_at):
+        info = self.execution.setdefault(ctx.get_name(), {})
+        info[stage] = {"started_at": started_at,
+                       "duration": time.time() - started_at}
+        stats = getattr(ctx, "execution_stats", None)
+        if isinstance(stats, dict):
+            info.update(stats)
 
     def _get_sorted_context_lst(self):
         context_list = []
         for ctx_name in self.context_obj["config"].keys():
+            if ctx_name in self.shared:
+                continue
             # TODO(andreykurilin): move this logic to some "find" method
             if "@" in ctx_name:
                 ctx_name, ctx_namespace = ctx_name.split("@", 1)
@@ -195,9 +219,12 @@ class ContextManager(object):
         """Creates benchmark environment from config."""
 
         self._visited = []
+        self.execution.clear()
         for ctx in self._get_sorted_context_lst():
             self._visited.append(ctx)
+            started_at = time.time()
             ctx.setup()
+            self._save_execution(ctx, "setup", started_at)
 
         return self.context_obj
 
@@ -206,8 +233,10 @@ class ContextManager(object):
 
         ctxlst = self._visited or self._get_sorted_context_lst()
         for ctx in ctxlst[::-1]:
+            started_at = time.time()
             try:
                 ctx.cleanup()
+                self._save_execution(ctx, "cleanup", started_at)
             except Exception as e:
                 LOG.error("Context %s failed during cleanup." % ctx.get_name())
                 LOG.exception(e)
@@ -22,15 +22,21 @@ import traceback
 
 import jsonschema
 from oslo_config import cfg
+from six.moves import queue as Queue
 
+from rally.common import broker
 from rally.common.i18n import _
 from rally.common import logging
 from rally.common import objects
+from rally.common import streaming_algorithms as streaming
 from rally.common import utils
+from rally.common import validation
 from rally import consts
 from rally import exceptions
 from rally.task import context
 from rally.task import hook
+from rally.task import monitor
+from rally.task import profiler
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
@@ -44,10 +50,154 @@ CONF = cfg.CONF
 TASK_ENGINE_OPTS = [
     cfg.IntOpt("raw_result_chunk_size", default=1000, min=1,
                help="Size of raw result chunk in iterations"),
+    cfg.IntOpt("semantic_validation_workers", default=10, min=1,
+               help="The number of workloads to validate semantic of "
+                    "concurrently"),
+    cfg.FloatOpt("profiler_sampling_interval", default=0.01, min=0.001,
+                 help="Interval in seconds between stack samples taken "
+                      "while profiling a task"),
+    cfg.FloatOpt("load_generator_monitor_interval", default=1.0, min=0,
+                 help="Interval in seconds between samples of resource usage "
+                      "of Rally and runner processes taken while a workload "
+                      "runs, 0 disables the monitor"),
 ]
 CONF.register_opts(TASK_ENGINE_OPTS)
 
 
+class WorkloadStatistics(object):
+    """Running aggregates of iteration results of a workload.
+
+    Results are processed one by one as they are consumed, so computing
+    the workload summary does not require reading the stored results.
+    """
+
+    def __init__(self):
+        self.iteration_count = 0
+        self.failed_iteration_count = 0
+        self.duration = self._make_computations()
+        self.atomics = collections.OrderedDict()
+
+    @staticmethod
+    def _make_computations():
+        return {"min": streaming.MinComputation(),
+                "median": streaming.PercentileComputation(0.5),
+                "90%ile": streaming.PercentileComputation(0.9),
+                "95%ile": streaming.PercentileComputation(0.95),
+                "max": streaming.MaxComputation(),
+                "avg": streaming.MeanComputation()}
+
+    @staticmethod
+    def _add(computations, value):
+        for computation in computations.values():
+            computation.add(value)
+
+    @staticmethod
+    def _result(computations):
+        result = dict((k, v.result()) for k, v in computations.items())
+        result["count"] = computations["avg"].count
+        return result
+
+    def add(self, result):
+        self.iteration_count += 1
+        if result.get("error"):
+            self.failed_iteration_count += 1
+        self._add(self.duration, result["duration"])
+        for action in result.get("atomic_actions", []):
+            if action["name"] not in self.atomics:
+                self.atomics[action["name"]] = self._make_computations()
+            self._add(self.atomics[action["name"]],
+                      action["finished_at"] - action["started_at"])
+
+    def result(self):
+        """Return values to be stored with the workload results."""
+        atomics = []
+        for name, computations in self.atomics.items():
+            atomic = self._result(computations)
+            atomic["name"] = name
+            atomics.append(atomic)
+        return {
+            "total_iteration_count": self.iteration_count,
+            "failed_iteration_count": self.failed_iteration_count,
+            "min_duration": self.duration["min"].result() or 0,
+            "max_duration": self.duration["max"].result() or 0,
+            "statistics": {"durations": {
+                "total": self._result(self.duration),
+                "atomics": atomics}}
+        }
+
+
+class WorkloadDataWriter(object):
+    """Saves chunks of workload data to the database in a separate thread.
+
+    Chunks are put to a bounded queue, so a slow database slows down the
+    result consumer instead of accumulating unsaved results in memory.
+    All chunks queued while the previous write was in progress are saved
+    in one transaction. If a write fails, the writer goes on with the next
+    chunks and close() raises the first error.
+    """
+
+    def __init__(self, workload, max_queued_chunks=16):
+        self.workload = workload
+        self.queue = Queue.Queue(max_queued_chunks)
+        self.write_duration = {"max": streaming.MaxComputation(),
+                               "avg": streaming.MeanComputation()}
+        self.thread = threading.Thread(target=self._write_chunks)
+        self.error = None
+
+    def start(self):
+        self.thread.start()
+
+    def put(self, chunk_order, data):
+        self.queue.put((chunk_order, data))
+
+    def close(self):
+        """Wait until all queued chunks are saved.
+
+        :raises Exception: the first error of saving chunks, if any
+        """
+        self.queue.put(None)
+        self.thread.join()
+        if self.write_duration["avg"].count:
+            LOG.info("Workload data is saved in %(count)s transactions, "
+                     "write latency avg: %(avg)s, max: %(max)s" % {
+                         "count": self.write_duration["avg"].count,
+                         "avg": utils.format_float_to_str(
+                             self.write_duration["avg"].result()),
+                         "max": utils.format_float_to_str(
+                             self.write_duration["max"].result())})
+        if self.error is not None:
+            raise self.error
+
+    def _write_chunks(self):
+        finished = False
+        while not finished:
+            chunks = [self.queue.get()]
+            while True:
+                try:
+                    chunks.append(self.queue.get_nowait())
+                except Queue.Empty:
+                    break
+            if None in chunks:
+                chunks = chunks[:chunks.index(None)]
+                finished = True
+            if not chunks:
+                continue
+
+            started_at = time.time()
+            try:
+                self.workload.add_workload_data_chunks(chunks)
+            except Exception as e:
+                LOG.error("Failed to save %(count)s chunks of workload data: "
+                          "%(error)s" % {"count": len(chunks), "error": e})
+                if logging.is_debug():
+                    LOG.exception(e)
+                if self.error is None:
+                    self.error = e
+                continue
+            for computation in self.write_duration.values():
+                computation.add(time.time() - started_at)
+
+
 class ResultConsumer(object):
     """ResultConsumer class stores results from ScenarioRunner, checks SLA.
 
@@ -56,7 +206,8 @@ class ResultConsumer(object):
     """
 
     def __init__(self, key, task, subtask, workload, runner,
-                 abort_on_sla_failure):
+                 abort_on_sla_failure, context_execution=None, profile=None,
+                 monitor=None):
         """ResultConsumer constructor.
 
         :param key: Scenario identifier
@@ -67,6 +218,13 @@ class ResultConsumer(object):
                        consumed
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param context_execution: dict filled by ContextManager with
+                                  information about contexts execution
+        :param profile: profiler.Profile filled while the workload runs,
+                        it is saved with the results if given
+        :param monitor: monitor.LoadGeneratorMonitor of the runner, its
+                        samples are checked by SLA and saved with the
+                        results if given
         """
 
         self.key = key
@@ -81,26 +239,63 @@ class ResultConsumer(object):
         self.sla_checker = sla.SLAChecker(key["kw"])
         self.hook_executor = hook.HookExecutor(key["kw"], self.task)
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.context_execution = (context_execution
+                                  if context_execution is not None else {})
+        self.profile = profile
+        self.monitor = monitor
         self.is_done = threading.Event()
+        self.aborted_on_sla = False
+        self._abort_lock = threading.Lock()
         self.unexpected_failure = {}
-        self.results = []
+        self.results = collections.deque()
+        self.statistics = WorkloadStatistics()
+        self.writer = WorkloadDataWriter(workload)
         self.thread = threading.Thread(target=self._consume_results)
         self.aborting_checker = threading.Thread(target=self.wait_and_abort)
         if "hooks" in self.key["kw"]:
             self.event_thread = threading.Thread(target=self._consume_events)
 
     def __enter__(self):
+        self.writer.start()
         self.thread.start()
         self.aborting_checker.start()
         if "hooks" in self.key["kw"]:
             self.event_thread.start()
+        if self.monitor is not None:
+            self.monitor.start(callback=self._add_load_generator_sample)
         self.start = time.time()
         return self
 
+    def _wait_for_data(self, queue):
+        """Block until queue gets new data or the consumer is done.
+
+        :param queue: runner's result_queue or event_queue
+        :returns: True if there is data in the queue
+        """
+        with self.runner.data_available:
+            while not queue and not self.is_done.isSet():
+                self.runner.data_available.wait()
+        return bool(queue)
+
+    def _abort_on_sla_failure(self):
+        # iterations and load generator samples are checked in different
+        # threads, the runner is aborted once
+        with self._abort_lock:
+            if self.aborted_on_sla:
+                return
+            self.aborted_on_sla = True
+        self.sla_checker.set_aborted_on_sla()
+        self.runner.abort()
+        self.task.update_status(consts.TaskStatus.SOFT_ABORTING)
+
+    def _add_load_generator_sample(self, sample):
+        success = self.sla_checker.add_load_generator_sample(sample)
+        if self.abort_on_sla_failure and not success:
+            self._abort_on_sla_failure()
+
     def _consume_results(self):
-        task_aborted = False
         while True:
-            if self.runner.result_queue:
+            if self._wait_for_data(self.runner.result_queue):
                 results = self.runner.result_queue.popleft()
                 self.results.extend(results)
                 for r in results:
@@ -108,49 +303,53 @@ class ResultConsumer(object):
                                                self.load_started_at)
                     self.load_finished_at = max(r["duration"] + r["timestamp"],
                                                 self.load_finished_at)
+                    self.statistics.add(r)
                     success = self.sla_checker.add_iteration(r)
-                    if (self.abort_on_sla_failure and
-                            not success and
-                            not task_aborted):
-                        self.sla_checker.set_aborted_on_sla()
-                        self.runner.abort()
-                        self.task.update_status(
-                            consts.TaskStatus.SOFT_ABORTING)
-                        task_aborted = True
+                    if self.abort_on_sla_failure and not success:
+                        self._abort_on_sla_failure()
 
                 # save results chunks
                 chunk_size = CONF.raw_result_chunk_size
                 while len(self.results) >= chunk_size:
-                    results_chunk = self.results[:chunk_size]
-                    self.results = self.results[chunk_size:]
+                    results_chunk = [self.results.popleft()
+                                     for i in range(chunk_size)]
                     results_chunk.sort(key=lambda x: x["timestamp"])
-                    self.workload.add_workload_data(self.workload_data_count,
-                                                    {"raw": results_chunk})
+                    self.writer.put(self.workload_data_count,
+                                    {"raw": results_chunk})
                     self.workload_data_count += 1
-
-            elif self.is_done.isSet():
-                break
             else:
-                time.sleep(0.1)
+                break
 
     def _consume_events(self):
-        while not self.is_done.isSet() or self.runner.event_queue:
-            if self.runner.event_queue:
-                event = self.runner.event_queue.popleft()
-                self.hook_executor.on_event(
-                    event_type=event["type"], value=event["value"])
-            else:
-                time.sleep(0.01)
+        while self._wait_for_data(self.runner.event_queue):
+            event = self.runner.event_queue.popleft()
+            self.hook_executor.on_event(
+                event_type=event["type"], value=event["value"])
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.finish = time.time()
+        if self.monitor is not None:
+            self.monitor.stop()
         self.is_done.set()
+        with self.runner.data_available:
+            self.runner.data_available.notify_all()
         self.aborting_checker.join()
         self.thread.join()
 
         if exc_type:
             self.sla_checker.set_unexpected_failure(exc_value)
 
+        # NOTE(boris-42): Sort in order of starting
+        #                 instead of order of ending
+        self.results = sorted(self.results, key=lambda x: x["timestamp"])
+        if self.results:
+            self.writer.put(self.workload_data_count, {"raw": self.results})
+        try:
+            self.writer.close()
+        except Exception as e:
+            # the workload results are incomplete, so the workload fails
+            self.sla_checker.set_unexpected_failure(e)
+
         if objects.Task.get_status(
                 self.task["uuid"]) == consts.TaskStatus.ABORTED:
             self.sla_checker.set_aborted_manually()
@@ -168,18 +367,17 @@ class ResultConsumer(object):
             "load_duration": load_duration,
             "full_duration": self.finish - self.start,
             "sla": self.sla_checker.results(),
+            "context_execution": self.context_execution,
         }
+        results.update(self.statistics.result())
+        if self.monitor is not None:
+            results["statistics"]["load_generator"] = self.monitor.result()
+        if self.profile is not None:
+            results["profiling_data"] = self.profile.to_dict()
         if "hooks" in self.key["kw"]:
             self.event_thread.join()
             results["hooks"] = self.hook_executor.results()
 
-        if self.results:
-            # NOTE(boris-42): Sort in order of starting
-            #                 instead of order of ending
-            self.results.sort(key=lambda x: x["timestamp"])
-            self.workload.add_workload_data(self.workload_data_count,
-                                            {"raw": self.results})
-
         self.workload.set_results(results)
 
     @staticmethod
@@ -209,7 +407,7 @@ class ResultConsumer(object):
                 self.runner.abort()
                 self.task.update_status(consts.TaskStatus.ABORTED)
                 break
-            time.sleep(2.0)
+            self.is_done.wait(2.0)
 
 
 class TaskAborted(Exception):
@@ -237,7 +435,7 @@ class TaskEngine(object):
     """
 
     def __init__(self, config, task, deployment,
-                 abort_on_sla_failure=False):
+                 abort_on_sla_failure=False, profile=False):
         """TaskEngine constructor.
 
         :param config: Dict with configuration of specified benchmark scenarios
@@ -246,6 +444,8 @@ class TaskEngine(object):
         :param deployment: Instance of Deployment,
         :param abort_on_sla_failure: True if the execution should be stopped
                                      when some SLA check fails
+        :param profile: True if Rally itself should be profiled while
+                        running workloads
         """
         try:
             self.config = TaskConfig(config)
@@ -260,20 +460,29 @@ class TaskEngine(object):
         self.task = task
         self.deployment = deployment
         self.abort_on_sla_failure = abort_on_sla_failure
+        self.profile = profile
 
-    def _validate_workload(self, workload, credentials=None, vtype=None):
+    def _validate_workload(self, workload, credentials=None, vtype=None,
+                           cache=None, shared_context=None):
         scenario_cls = scenario.Scenario.get(workload.name)
         namespace = scenario_cls.get_namespace()
         scenario_context = copy.deepcopy(scenario_cls.get_default_context())
 
+        # contexts shared by the subtask are set up for the workload as well
+        workload_context = dict(shared_context or {})
+        workload_context.update(workload.context)
+        workload_config = workload.to_dict()
+        if workload_context:
+            workload_config["context"] = workload_context
+
         results = []
 
         results.extend(scenario.Scenario.validate(
             name=workload.name,
             credentials=credentials,
-            config=workload.to_dict(),
+            config=workload_config,
             plugin_cfg=None,
-            vtype=vtype))
+            vtype=vtype, cache=cache))
 
         if workload.runner:
             results.extend(runner.ScenarioRunner.validate(
@@ -282,16 +491,16 @@ class TaskEngine(object):
                 config=None,
                 plugin_cfg=workload.runner,
                 namespace=namespace,
-                vtype=vtype))
+                vtype=vtype, cache=cache))
 
-        for context_name, context_conf in workload.context.items():
+        for context_name, context_conf in workload_context.items():
             results.extend(context.Context.validate(
                 name=context_name,
                 credentials=credentials,
                 config=None,
                 plugin_cfg=context_conf,
                 namespace=namespace,
-                vtype=vtype))
+                vtype=vtype, cache=cache))
 
         for context_name, context_conf in scenario_context.items():
             results.extend(context.Context.validate(
@@ -301,7 +510,7 @@ class TaskEngine(object):
                 plugin_cfg=context_conf,
                 namespace=namespace,
                 allow_hidden=True,
-                vtype=vtype))
+                vtype=vtype, cache=cache))
 
         for sla_name, sla_conf in workload.sla.items():
             results.extend(sla.SLA.validate(
@@ -309,7 +518,7 @@ class TaskEngine(object):
                 credentials=credentials,
                 config=None,
                 plugin_cfg=sla_conf,
-                vtype=vtype))
+                vtype=vtype, cache=cache))
 
         for hook_conf in workload.hooks:
             results.extend(hook.Hook.validate(
@@ -317,7 +526,7 @@ class TaskEngine(object):
                 credentials=credentials,
                 config=None,
                 plugin_cfg=hook_conf["args"],
-                vtype=vtype))
+                vtype=vtype, cache=cache))
 
             trigger_conf = hook_conf["trigger"]
             results.extend(trigger.Trigger.validate(
@@ -325,18 +534,56 @@ class TaskEngine(object):
                 credentials=credentials,
                 config=None,
                 plugin_cfg=trigger_conf["args"],
-                vtype=vtype))
+                vtype=vtype, cache=cache))
 
         if results:
             msg = "\n ".join([str(r) for r in results])
             kw = workload.make_exception_args(msg)
             raise exceptions.InvalidTaskConfig(**kw)
 
+    def _get_subtask_namespace(self, subtask):
+        namespaces = set(scenario.Scenario.get(w.name).get_namespace()
+                         for w in subtask.workloads)
+        if len(namespaces) != 1:
+            raise exceptions.InvalidTaskException(
+                "Subtask '%s' has shared context, so all its workloads "
+                "should belong to one platform, but they belong to: %s"
+                % (subtask.title, ", ".join(sorted(namespaces))))
+        return namespaces.pop()
+
+    def _validate_subtask_context(self, subtask, vtype=None):
+        namespace = self._get_subtask_namespace(subtask)
+        results = []
+        for context_name, context_conf in subtask.context.items():
+            results.extend(context.Context.validate(
+                name=context_name,
+                credentials=None,
+                config=None,
+                plugin_cfg=context_conf,
+                namespace=namespace,
+                vtype=vtype))
+        if results:
+            raise exceptions.InvalidTaskException(
+                "Subtask '%s' has wrong context %s:\n %s"
+                % (subtask.title, json.dumps(subtask.context),
+                   "\n ".join([str(r) for r in results])))
+
+        for workload in subtask.workloads:
+            for context_name, context_conf in workload.context.items():
+                if (context_name in subtask.context and
+                        subtask.context[context_name] != context_conf):
+                    kw = workload.make_exception_args(
+                        "Context '%s' is shared by the subtask and can not "
+                        "be redefined by the workload" % context_name)
+                    raise exceptions.InvalidTaskConfig(**kw)
+
     @logging.log_task_wrapper(LOG.info, _("Task validation of syntax."))
     def _validate_config_syntax(self, config):
         for subtask in config.subtasks:
             for workload in subtask.workloads:
                 self._validate_workload(workload, vtype="syntax")
+            if subtask.context:
+                self._validate_subtask_context(subtask, vtype="syntax")
 
     @logging.log_task_wrapper(LOG.info, _("Task validation of required "
                                           "platforms."))
@@ -346,20 +593,45 @@ class TaskEngine(object):
         for subtask in config.subtasks:
             for workload in subtask.workloads:
                 self._validate_workload(workload, vtype="platform",
-                                        credentials=credentials)
+                                        credentials=credentials,
+                                        shared_context=subtask.context)
 
     def _validate_config_semantic_helper(self, admin, user_context,
-                                         workloads, platform):
+                                         workloads, platform, cache=None):
         with user_context as ctx:
             ctx.setup()
             users = ctx.context["users"]
-            for workload in workloads:
-                credentials = {platform: {"admin": admin, "users": users}}
-                self._validate_workload(workload, credentials=credentials,
-                                        vtype="semantic")
+            credentials = {platform: {"admin": admin, "users": users}}
+            errors = {}
+
+            def publish(queue):
+                for pos, (workload, shared_context) in enumerate(workloads):
+                    queue.append((pos, workload, shared_context))
+
+            def consume(cache_, args):
+                pos, workload, shared_context = args
+                try:
+                    self._validate_workload(workload, credentials=credentials,
+                                            vtype="semantic", cache=cache,
+                                            shared_context=shared_context)
+                except Exception as e:
+                    errors[pos] = e
+
+            broker.run(publish, consume,
+                       CONF.semantic_validation_workers)
+            if errors:
+                # report the first invalid workload of the task
+                raise errors[min(errors)]
 
     @logging.log_task_wrapper(LOG.info, _("Task validation of semantic."))
     def _validate_config_semantic(self, config):
+        cache = validation.ValidationCache()
+        try:
+            self._validate_config_semantic_platforms(config, cache)
+        finally:
+            LOG.info("Semantic validators:\n%s" % cache.report())
+
+    def _validate_config_semantic_platforms(self, config, cache):
         # map workloads to platforms
         platforms = collections.defaultdict(list)
         for subtask in config.subtasks:
@@ -369,7 +641,7 @@ class TaskEngine(object):
                 # requires (regular users or admin)
                 scenario_cls = scenario.Scenario.get(workload.name)
                 namespace = scenario_cls.get_namespace()
-                platforms[namespace].append(workload)
+                platforms[namespace].append((workload, subtask.context))
 
         for platform, workloads in platforms.items():
             creds = self.deployment.get_credentials_for(platform)
@@ -381,11 +653,13 @@ class TaskEngine(object):
             workloads_with_users = []
             workloads_with_existing_users = []
 
-            for workload in workloads:
-                if creds["users"] and "users" not in workload.context:
-                    workloads_with_existing_users.append(workload)
+            for workload, shared_context in workloads:
+                if (creds["users"] and "users" not in workload.context and
+                        "users" not in shared_context):
+                    workloads_with_existing_users.append(
+                        (workload, shared_context))
                 else:
-                    workloads_with_users.append(workload)
+                    workloads_with_users.append((workload, shared_context))
 
             if workloads_with_users:
                 ctx_conf = {"task": self.task,
@@ -395,7 +669,8 @@ class TaskEngine(object):
                     allow_hidden=True)(ctx_conf)
 
                 self._validate_config_semantic_helper(
-                    admin, user_context, workloads_with_users, platform)
+                    admin, user_context, workloads_with_users, platform,
+                    cache=cache)
 
             if workloads_with_existing_users:
                 ctx_conf = {"task": self.task,
@@ -408,7 +683,7 @@ class TaskEngine(object):
 
                 self._validate_config_semantic_helper(
                     admin, user_context, workloads_with_existing_users,
-                    platform)
+                    platform, cache=cache)
 
     @logging.log_task_wrapper(LOG.info, _("Task validation."))
     def validate(self, only_syntax=False):
@@ -437,17 +712,21 @@ class TaskEngine(object):
         config = config or {"type": "serial"}
         return runner.ScenarioRunner.get(config["type"])(self.task, config)
 
-    def _prepare_context(self, ctx, name, owner_id):
+    def _prepare_context(self, ctx, name, owner_id, shared_context=None):
         scenario_cls = scenario.Scenario.get(name)
         namespace = scenario_cls.get_namespace()
 
         creds = self.deployment.get_credentials_for(namespace)
         existing_users = creds["users"]
 
+        shared_config = shared_context["config"] if shared_context else {}
+        has_users = ("users" in ctx or "users" in shared_config or
+                     "existing_users" in shared_config)
+
         scenario_context = copy.deepcopy(scenario_cls.get_default_context())
-        if existing_users and "users" not in ctx:
+        if existing_users and not has_users:
             scenario_context.setdefault("existing_users", existing_users)
-        elif "users" not in ctx:
+        elif not has_users:
             scenario_context.setdefault("users", {})
 
         scenario_context.update(ctx)
@@ -460,8 +739,45 @@ class TaskEngine(object):
             "config": scenario_context
         }
 
+        if shared_context:
+            # workload contexts are layered on top of the shared ones which
+            # are already set up, so they see the same users and tenants
+            for key, value in shared_context.items():
+                if key in ("owner_id", "scenario_name", "scenario_namespace",
+                           "config"):
+                    continue
+                elif key == "users":
+                    value = [dict(user) for user in value]
+                elif key == "tenants":
+                    value = dict((tenant_id, dict(tenant))
+                                 for tenant_id, tenant in value.items())
+                context_obj[key] = value
+            for ctx_name, ctx_conf in shared_config.items():
+                scenario_context[ctx_name] = ctx_conf
+
         return context_obj
 
+    def _prepare_subtask_context(self, subtask, owner_id):
+        namespace = self._get_subtask_namespace(subtask)
+
+        creds = self.deployment.get_credentials_for(namespace)
+        existing_users = creds["users"]
+
+        subtask_context = copy.deepcopy(subtask.context)
+        if existing_users and "users" not in subtask_context:
+            subtask_context.setdefault("existing_users", existing_users)
+        elif "users" not in subtask_context:
+            subtask_context.setdefault("users", {})
+
+        return {
+            "task": self.task,
+            "owner_id": owner_id,
+            "admin": {"credential": creds["admin"]},
+            "scenario_name": subtask.workloads[0].name,
+            "scenario_namespace": namespace,
+            "config": subtask_context
+        }
+
     @logging.log_task_wrapper(LOG.info, _("Benchmarking."))
     def run(self):
         """Run the benchmark according to the test configuration.
@@ -488,9 +804,18 @@ class TaskEngine(object):
         subtask_obj = self.task.add_subtask(**subtask.to_dict())
 
         try:
-            # TODO(astudenov): add subtask context here
-            for workload in subtask.workloads:
-                self._run_workload(subtask_obj, workload)
+            if subtask.context:
+                # contexts of the subtask are set up once and shared by
+                # all its workloads
+                shared_context = self._prepare_subtask_context(
+                    subtask, subtask_obj["uuid"])
+                with context.ContextManager(shared_context):
+                    for workload in subtask.workloads:
+                        self._run_workload(subtask_obj, workload,
+                                           shared_context=shared_context)
+            else:
+                for workload in subtask.workloads:
+                    self._run_workload(subtask_obj, workload)
         except TaskAborted:
             subtask_obj.update_status(consts.SubtaskStatus.ABORTED)
             raise
@@ -506,7 +831,7 @@ class TaskEngine(object):
         else:
             subtask_obj.update_status(consts.SubtaskStatus.FINISHED)
 
-    def _run_workload(self, subtask_obj, workload):
+    def _run_workload(self, subtask_obj, workload, shared_context=None):
         if ResultConsumer.is_task_in_aborting_status(self.task["uuid"]):
             raise TaskAborted()
 
@@ -515,14 +840,29 @@ class TaskEngine(object):
         LOG.info("Running benchmark with key: \n%s"
                  % json.dumps(key, indent=2))
         runner_obj = self._get_runner(workload.runner)
+        profile = None
+        if self.profile:
+            profile = profiler.Profile(CONF.profiler_sampling_interval)
+            runner_obj.profile = profile
+        load_monitor = None
+        if CONF.load_generator_monitor_interval and monitor.is_supported():
+            load_monitor = monitor.LoadGeneratorMonitor(
+                runner_obj, CONF.load_generator_monitor_interval)
         context_obj = self._prepare_context(
-            workload.context, workload.name, workload_obj["uuid"])
+            workload.context, workload.name, workload_obj["uuid"],
+            shared_context=shared_context)
+        ctx_manager = context.ContextManager(
+            context_obj,
+            shared=shared_context["config"] if shared_context else None)
         try:
             with ResultConsumer(key, self.task, subtask_obj, workload_obj,
-                                runner_obj, self.abort_on_sla_failure):
-                with context.ContextManager(context_obj):
-                    runner_obj.run(workload.name, context_obj,
-                                   workload.args)
+                                runner_obj, self.abort_on_sla_failure,
+                                context_execution=ctx_manager.execution,
+                                profile=profile, monitor=load_monitor):
+                with profiler.sampling(profile):
+                    with ctx_manager:
+                        runner_obj.run(workload.name, context_obj,
+                                       workload.args)
         except Exception as e:
             LOG.debug(traceback.format_exc())
             LOG.exception(e)
@@ -612,6 +952,7 @@ class TaskConfig(object):
                         },
 
                         "run_in_parallel": {"type": "boolean"},
+                        "context": {"type": "object"},
                         "workloads": {
                             "type": "array",
                             "minItems": 1,
@@ -0,0 +1,208 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Health monitor of the host generating the load.
+
+If Rally itself is the bottleneck (CPU-bound result processing, GIL
+contention in the worker processes, etc.), iteration durations grow and
+the cloud gets blamed. The monitor samples resource usage of the Rally
+process and of the runner worker processes from /proc, so such runs can
+be told apart.
+"""
+
+import os
+import threading
+import time
+
+from rally.common import logging
+
+LOG = logging.getLogger(__name__)
+
+PROC_DIR = "/proc"
+
+try:
+    _CLK_TCK = float(os.sysconf("SC_CLK_TCK"))
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _CLK_TCK = 100.0
+    _PAGE_SIZE = 4096
+
+
+def is_supported():
+    """Whether resource usage of processes can be read on this host."""
+    return os.path.isdir(os.path.join(PROC_DIR, "self", "task"))
+
+
+def _read_process(pid):
+    """Read resource usage of the process.
+
+    :param pid: id of the process
+    :returns: dict with cumulative "cpu_time" (seconds) and "ctx_switches"
+        and current "rss" (bytes) and "threads", or None if the process
+        is gone
+    """
+    proc_dir = os.path.join(PROC_DIR, str(pid))
+    try:
+        with open(os.path.join(proc_dir, "stat")) as f:
+            stat = f.read()
+        # the name of the process may contain spaces, so the fields are
+        # counted from its closing parenthesis; field 3 (state) is the first
+        fields = stat[stat.rindex(")") + 2:].split()
+        ctx_switches = 0
+        threads = os.listdir(os.path.join(proc_dir, "task"))
+        for tid in threads:
+            try:
+                with open(os.path.join(proc_dir, "task", tid,
+                                       "status")) as f:
+                    for line in f:
+                        # voluntary_ctxt_switches and
+                        # nonvoluntary_ctxt_switches
+                        if line.split(":", 1)[0].endswith("ctxt_switches"):
+                            ctx_switches += int(line.split()[1])
+            except (IOError, OSError):
+                # the thread has just finished
+                continue
+    except (IOError, OSError, ValueError):
+        return None
+    return {"cpu_time": (int(fields[11]) + int(fields[12])) / _CLK_TCK,
+            "rss": int(fields[21]) * _PAGE_SIZE,
+            "threads": len(threads),
+            "ctx_switches": ctx_switches}
+
+
+class LoadGeneratorMonitor(object):
+    """Samples resource usage of the processes running a workload.
+
+    Each sample is a dict with the "timestamp", the "queue_depth" (number
+    of result batches the runner has not handed to the consumer yet) and
+    "processes": a list of dicts with "pid", "role" ("rally" or "worker"),
+    "cpu" (percent of one core), "rss" (bytes), "threads" and
+    "ctx_switches" (per second).
+    """
+
+    def __init__(self, runner, interval=1.0, max_samples=300):
+        """LoadGeneratorMonitor constructor.
+
+        :param runner: ScenarioRunner instance running the workload
+        :param interval: seconds between two samples
+        :param max_samples: if there are more samples, every second one is
+            dropped and the interval is doubled
+        """
+        self.runner = runner
+        self.interval = interval
+        self.max_samples = max_samples
+        self.samples = []
+        self._callback = None
+        self._previous = {}
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+
+    def _get_processes(self):
+        processes = [(os.getpid(), "rally")]
+        processes.extend((pid, "worker")
+                         for pid in list(self.runner.worker_pids))
+        return processes
+
+    def sample(self):
+        """Take a sample of all the processes.
+
+        The first reading of a process is used as a baseline only, since
+        CPU usage and context switches are rates.
+        """
+        now = time.time()
+        processes = []
+        for pid, role in self._get_processes():
+            usage = _read_process(pid)
+            if usage is None:
+                self._previous.pop(pid, None)
+                continue
+            previous = self._previous.get(pid)
+            self._previous[pid] = (now, usage)
+            if previous is None or now <= previous[0]:
+                continue
+            duration = now - previous[0]
+            processes.append({
+                "pid": pid,
+                "role": role,
+                "cpu": round(100.0 * (usage["cpu_time"] -
+                                      previous[1]["cpu_time"]) / duration, 1),
+                "rss": usage["rss"],
+                "threads": usage["threads"],
+                "ctx_switches": round((usage["ctx_switches"] -
+                                       previous[1]["ctx_switches"]) /
+                                      duration, 1)})
+        if not processes:
+            return None
+
+        sample = {"timestamp": now,
+                  "queue_depth": len(self.runner.result_queue),
+                  "processes": processes}
+        self.samples.append(sample)
+        if len(self.samples) > self.max_samples:
+            self.samples = self.samples[::2]
+            self.interval *= 2
+        return sample
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            sample = self.sample()
+            if sample is not None and self._callback is not None:
+                try:
+                    self._callback(sample)
+                except Exception as e:
+                    LOG.warning("Failed to process load generator sample: "
+                                "%s" % e)
+
+    def start(self, callback=None):
+        """Start sampling in a background thread.
+
+        :param callback: function to call with every new sample
+        """
+        self._callback = callback
+        self.sample()
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def result(self):
+        """Return the samples and their summary.
+
+        :returns: dict with "interval", "samples" and "summary" which has
+            max/avg CPU usage of the Rally process, max CPU usage of the
+            busiest worker, max RSS of all processes and max queue depth
+        """
+        rally_cpu = []
+        workers_cpu = []
+        rss = []
+        for sample in self.samples:
+            rally_cpu.extend(p["cpu"] for p in sample["processes"]
+                             if p["role"] == "rally")
+            workers_cpu.append(max([p["cpu"] for p in sample["processes"]
+                                    if p["role"] == "worker"] or [0]))
+            rss.append(sum(p["rss"] for p in sample["processes"]))
+        summary = {
+            "rally_cpu_max": max(rally_cpu or [0]),
+            "rally_cpu_avg": (round(sum(rally_cpu) / len(rally_cpu), 1)
+                              if rally_cpu else 0),
+            "workers_cpu_max": max(workers_cpu or [0]),
+            "rss_max": max(rss or [0]),
+            "queue_depth_max": max([s["queue_depth"]
+                                    for s in self.samples] or [0])}
+        return {"interval": self.interval,
+                "samples": self.samples,
+                "summary": summary}
@@ -372,13 +372,12 @@ class MainStatsTable(Table):
 
     def __init__(self, *args, **kwargs):
         super(MainStatsTable, self).__init__(*args, **kwargs)
-        iters_num = self._workload_info["iterations_count"]
         for name in (self._get_atomic_names() + ["total"]):
             self._data[name] = [
                 [streaming.MinComputation(), None],
-                [streaming.PercentileComputation(0.5, iters_num), None],
-                [streaming.PercentileComputation(0.9, iters_num), None],
-                [streaming.PercentileComputation(0.95, iters_num), None],
+                [streaming.PercentileComputation(0.5), None],
+                [streaming.PercentileComputation(0.9), None],
+                [streaming.PercentileComputation(0.95), None],
                 [streaming.MaxComputation(), None],
                 [streaming.MeanComputation(), None],
                 [streaming.MeanComputation(),
@@ -574,12 +573,11 @@ class OutputStatsTable(OutputTable):
     def add_iteration(self, iteration):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
-                iters_num = self._workload_info["iterations_count"]
                 self._data[name] = [
                     [streaming.MinComputation(), None],
-                    [streaming.PercentileComputation(0.5, iters_num), None],
-                    [streaming.PercentileComputation(0.9, iters_num), None],
-                    [streaming.PercentileComputation(0.95, iters_num), None],
+                    [streaming.PercentileComputation(0.5), None],
+                    [streaming.PercentileComputation(0.9), None],
+                    [streaming.PercentileComputation(0.95), None],
                     [streaming.MaxComputation(), None],
                     [streaming.MeanComputation(), None],
                     [streaming.IncrementComputation(),
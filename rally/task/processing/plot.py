@@ -82,6 +82,27 @@ def _process_hooks(hooks):
     return hooks_ctx
 
 
+def _process_load_generator(load_generator):
+    """Prepare load generator health chart data for report."""
+    samples = (load_generator or {}).get("samples", [])
+    if not samples:
+        return []
+    started_at = samples[0]["timestamp"]
+    rally_cpu = []
+    workers_cpu = []
+    queue_depth = []
+    for sample in samples:
+        x = round(sample["timestamp"] - started_at, 2)
+        rally_cpu.append((x, max([p["cpu"] for p in sample["processes"]
+                                  if p["role"] == "rally"] or [0])))
+        workers_cpu.append((x, max([p["cpu"] for p in sample["processes"]
+                                    if p["role"] == "worker"] or [0])))
+        queue_depth.append((x, sample["queue_depth"]))
+    return [("Rally process CPU %", rally_cpu),
+            ("Busiest worker CPU %", workers_cpu),
+            ("Result queue depth", queue_depth)]
+
+
 def _process_scenario(data, pos):
     main_area = charts.MainStackedAreaChart(data["info"])
     main_hist = charts.MainHistogramChart(data["info"])
@@ -148,6 +169,8 @@ def _process_scenario(data, pos):
                     ("errors", len(errors))],
             "histogram": main_hist.render()},
         "load_profile": load_profile.render(),
+        "load_generator": _process_load_generator(
+            data.get("load_generator")),
         "atomic": {"histogram": atomic_hist.render(),
                    "iter": atomic_area.render(),
                    "pie": atomic_pie.render()},
@@ -204,19 +227,54 @@ def _extend_results(results):
                             "load_duration": result["load_duration"]},
                    "created_at": result.get("created_at"),
                    "updated_at": result.get("updated_at")}
+        if result.get("load_generator"):
+            generic["data"]["load_generator"] = result["load_generator"]
         extended_results.extend(
             objects.Task.extend_results([generic], True))
     return extended_results
 
 
-def plot(tasks_results, include_libs=False):
+def make_report_results(results):
+    """Transform results of a detailed task into the format of plot().
+
+    :param results: "results" of a task returned by TaskAPI.get_detailed()
+    :returns: tasks results list in old format
+    """
+    return [{"key": result["key"],
+             "sla": result["data"]["sla"],
+             "hooks": result["data"].get("hooks", []),
+             "result": result["data"]["raw"],
+             "load_duration": result["data"]["load_duration"],
+             "full_duration": result["data"]["full_duration"],
+             "load_generator": result["data"].get("load_generator"),
+             "created_at": result["created_at"]}
+            for result in results]
+
+
+def plot(tasks_results, include_libs=False, stream=False):
+    """Make HTML report for tasks results.
+
+    :param tasks_results: tasks results list in old format
+    :param include_libs: whether to embed JS and CSS into the report
+    :param stream: whether to return an iterator over parts of the report
+                   instead of the whole report, so it can be written
+                   part by part. The JSON of the processed workloads is
+                   encoded part by part as well.
+    :returns: str or iterator over str parts of the report
+    """
     extended_results = _extend_results(tasks_results)
     template = ui_utils.get_template("task/report.html")
     source, data = _process_tasks(extended_results)
-    return template.render(version=version.version_string(),
-                           source=json.dumps(source),
-                           data=json.dumps(data),
-                           include_libs=include_libs)
+    if stream:
+        render = template.generate
+        data_parts = json.JSONEncoder().iterencode(data)
+    else:
+        render = template.render
+        data_parts = [json.dumps(data)]
+    return render(version=version.version_string(),
+                  source=json.dumps(source),
+                  data=data_parts,
+                  include_libs=include_libs)
 
 
 def trends(tasks_results):
@@ -0,0 +1,179 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Sampling profiler of Rally itself.
+
+Stacks of all threads of a process are sampled periodically, so the same
+mechanism works in the main Rally process and in the runner worker
+processes, whose profiles are merged into one per workload.
+"""
+
+import collections
+import contextlib
+import sys
+import threading
+
+MAX_STACK_DEPTH = 128
+
+# innermost frames of threads blocked on locks, queues and sockets; they get
+# most of wall-clock samples, so they are reported apart from the hotspots
+IDLE_FUNCTIONS = frozenset(["threading:wait",
+                            "threading:_wait_for_tstate_lock",
+                            "selectors:select",
+                            "selectors:poll"])
+
+
+def _fold_stack(frame):
+    stack = []
+    while frame is not None and len(stack) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        stack.append("%s:%s" % (frame.f_globals.get("__name__", "?"),
+                                code.co_name))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class Profile(object):
+    """Aggregated stack samples.
+
+    Each stack is a tuple of "module:function" frames starting from the
+    outermost one and is mapped to the number of times it was sampled.
+    Samples are wall-clock, so threads waiting for the cloud are counted
+    as well as the ones busy in Rally code.
+    """
+
+    def __init__(self, interval, stacks=None):
+        """Profile constructor.
+
+        :param interval: seconds between two samples
+        :param stacks: dict of stacks to their sample counts
+        """
+        self.interval = interval
+        self.stacks = collections.Counter(stacks or {})
+
+    def add(self, stack):
+        self.stacks[stack] += 1
+
+    def merge(self, other):
+        self.stacks.update(other.stacks)
+
+    def functions(self):
+        """Return self and cumulative time of every sampled function.
+
+        :returns: dict of function names to dicts with "self" and
+            "cumulative" durations in seconds
+        """
+        result = collections.defaultdict(lambda: {"self": 0.0,
+                                                  "cumulative": 0.0})
+        for stack, count in self.stacks.items():
+            duration = count * self.interval
+            # recursive functions are counted once per sample
+            for function in set(stack):
+                result[function]["cumulative"] += duration
+            if stack:
+                result[stack[-1]]["self"] += duration
+        return dict(result)
+
+    def idle(self):
+        """Return time of samples of threads blocked in IDLE_FUNCTIONS."""
+        return sum(count for stack, count in self.stacks.items()
+                   if stack and stack[-1] in IDLE_FUNCTIONS) * self.interval
+
+    def top(self, limit=10):
+        """Return the functions with the biggest self time.
+
+        Waiting in IDLE_FUNCTIONS is not a hotspot, see idle() instead.
+
+        :param limit: max number of functions to return
+        :returns: list of dicts with "function", "self" and "cumulative"
+        """
+        functions = [dict(times, function=function)
+                     for function, times in self.functions().items()
+                     if function not in IDLE_FUNCTIONS]
+        functions.sort(key=lambda f: (-f["self"], -f["cumulative"],
+                                      f["function"]))
+        return functions[:limit]
+
+    def to_folded(self, prefix=None):
+        """Return samples in the folded stacks format of flamegraph.pl.
+
+        :param prefix: optional name of the root frame of all stacks
+        :returns: list of "frame;frame;frame count" lines
+        """
+        lines = []
+        for stack, count in sorted(self.stacks.items()):
+            if prefix:
+                stack = (prefix,) + stack
+            lines.append("%s %d" % (";".join(stack), count))
+        return lines
+
+    def to_dict(self):
+        return {"interval": self.interval,
+                "stacks": dict((";".join(stack), count)
+                               for stack, count in self.stacks.items())}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["interval"],
+                   dict((tuple(stack.split(";")), count)
+                        for stack, count in data["stacks"].items()))
+
+
+class StackSampler(object):
+    """Samples stacks of all other threads of the current process."""
+
+    def __init__(self, interval):
+        """StackSampler constructor.
+
+        :param interval: seconds between two samples
+        """
+        self.profile = Profile(interval)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._sample)
+        self._thread.daemon = True
+
+    def _sample(self):
+        own_id = threading.current_thread().ident
+        while not self._stop_event.wait(self.profile.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self.profile.add(_fold_stack(frame))
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+
+@contextlib.contextmanager
+def sampling(profile):
+    """Sample stacks of the current process into the profile.
+
+    :param profile: Profile to merge the samples in, nothing is sampled
+        if it is None
+    """
+    if profile is None:
+        yield
+        return
+    sampler = StackSampler(profile.interval)
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        profile.merge(sampler.profile)
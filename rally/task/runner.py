@@ -17,6 +17,9 @@ import abc
 import collections
 import copy
 import multiprocessing
+import multiprocessing.connection
+import select
+import threading
 import time
 
 import six
@@ -25,7 +28,9 @@ from rally.common import logging
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.common import validation
+from rally import osclients
 from rally.task.processing import charts
+from rally.task import profiler
 from rally.task import scenario
 from rally.task import types
 from rally.task import utils
@@ -62,7 +67,7 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
     # provide arguments isolation between iterations
     scenario_kwargs = copy.deepcopy(scenario_kwargs)
 
-    LOG.info("Task %(task)s | ITER: %(iteration)s START" %
+    LOG.info("Task %(task)s | ITER: %(iteration)s START",
              {"task": context_obj["task"]["uuid"], "iteration": iteration})
 
     scenario_inst = cls(context_obj)
@@ -75,10 +80,11 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
         if logging.is_debug():
             LOG.exception(e)
     finally:
-        status = "Error %s: %s" % tuple(error[0:2]) if error else "OK"
-        LOG.info("Task %(task)s | ITER: %(iteration)s END: %(status)s" %
-                 {"task": context_obj["task"]["uuid"], "iteration": iteration,
-                  "status": status})
+        if LOG.isEnabledFor(logging.INFO):
+            status = "Error %s: %s" % tuple(error[0:2]) if error else "OK"
+            LOG.info("Task %(task)s | ITER: %(iteration)s END: %(status)s",
+                     {"task": context_obj["task"]["uuid"],
+                      "iteration": iteration, "status": status})
 
         return {"duration": timer.duration() - scenario_inst.idle_duration(),
                 "timestamp": timer.timestamp(),
@@ -94,6 +100,179 @@ def _worker_thread(queue, cls, method_name, context_obj, scenario_kwargs,
                                  scenario_kwargs, event_queue))
 
 
+_RESULT_FIELDS = frozenset(("duration", "timestamp", "idle_duration",
+                            "error", "output", "atomic_actions"))
+_ATOMIC_ACTION_FIELDS = frozenset(("name", "started_at", "finished_at",
+                                   "children"))
+
+
+def _pack_atomic_actions(actions, names):
+    for a in actions:
+        if set(a) != _ATOMIC_ACTION_FIELDS:
+            raise ValueError("Unexpected atomic action keys: %s" % sorted(a))
+    return tuple((names.setdefault(a["name"], len(names)),
+                  a["started_at"], a["finished_at"],
+                  _pack_atomic_actions(a["children"], names))
+                 for a in actions)
+
+
+def _unpack_atomic_actions(packed, names):
+    return [{"name": names[name], "started_at": started_at,
+             "finished_at": finished_at,
+             "children": _unpack_atomic_actions(children, names)}
+            for name, started_at, finished_at, children in packed]
+
+
+def _pack_result(result, names):
+    """Encode an iteration result into a compact record.
+
+    The record is a tuple of primitives: numeric fields go first, names of
+    atomic actions are replaced by indexes in the `names` table shared by
+    the batch and empty output is omitted.
+
+    :param result: iteration result dict
+    :param names: dict that maps atomic action names to their indexes
+    :returns: the record or the result itself if it has unexpected format,
+              so it can be reported by the schema validation later
+    """
+    if type(result) is not dict or set(result) != _RESULT_FIELDS:
+        return result
+    output = result["output"]
+    if output == {"additive": [], "complete": []}:
+        output = None
+    try:
+        actions = _pack_atomic_actions(result["atomic_actions"], names)
+    except (KeyError, TypeError, ValueError):
+        return result
+    return (result["duration"], result["timestamp"], result["idle_duration"],
+            result["error"], actions, output)
+
+
+def _unpack_results(data):
+    """Decode results received from a worker process.
+
+    :param data: batch of records produced by _ResultBatcher or a single
+                 result dict put to the queue directly
+    :returns: list of iteration result dicts
+    """
+    if not isinstance(data, tuple):
+        return [data]
+    names, records = data
+    results = []
+    for record in records:
+        if isinstance(record, dict):
+            results.append(record)
+            continue
+        duration, timestamp, idle_duration, error, actions, output = record
+        results.append({
+            "duration": duration,
+            "timestamp": timestamp,
+            "idle_duration": idle_duration,
+            "error": error,
+            "output": (output if output is not None
+                       else {"additive": [], "complete": []}),
+            "atomic_actions": _unpack_atomic_actions(actions, names)})
+    return results
+
+
+class _ResultBatcher(object):
+    """Queue-like object which sends iteration results in batches.
+
+    Worker threads put results here instead of the result queue, so the
+    parent process unpickles one compact batch instead of a dict per
+    iteration. A batch is sent when it is full or when the previous one
+    was sent more than `max_delay` seconds ago; a background thread checks
+    the latter, so results of slow iterations are not held back until the
+    next put(). Call close() when all results are put.
+    """
+
+    def __init__(self, queue, max_size=100, max_delay=0.1):
+        self.queue = queue
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self._lock = threading.Lock()
+        self._names = {}
+        self._records = []
+        self._sent_at = time.time()
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_delayed)
+        self._flusher.daemon = True
+        self._flusher.start()
+
+    def _flush_delayed(self):
+        while not self._closed.wait(self.max_delay):
+            with self._lock:
+                if (self._records
+                        and time.time() - self._sent_at >= self.max_delay):
+                    self._send()
+
+    def put(self, result):
+        with self._lock:
+            self._records.append(_pack_result(result, self._names))
+            if (len(self._records) >= self.max_size
+                    or time.time() - self._sent_at >= self.max_delay):
+                self._send()
+
+    def flush(self):
+        with self._lock:
+            if self._records:
+                self._send()
+
+    def close(self):
+        """Stop the background thread and send the rest of results."""
+        self._closed.set()
+        self._flusher.join()
+        self.flush()
+
+    def _send(self):
+        names = sorted(self._names, key=self._names.get)
+        self.queue.put((tuple(names), tuple(self._records)))
+        self._names = {}
+        self._records = []
+        self._sent_at = time.time()
+
+
+def _batched_worker_process(worker_process, queue, *args, **kwargs):
+    """Run the worker process with results sent in batches.
+
+    If the `profile_interval` keyword argument is given, stacks of the
+    process are sampled with this interval and the resulting
+    profiler.Profile is put to the queue after the results.
+
+    :param worker_process: target function of the process, its first
+                           argument is the result queue
+    :param queue: multiprocessing.Queue for the results
+    """
+    profile_interval = kwargs.pop("profile_interval", None)
+    profile = profiler.Profile(profile_interval) if profile_interval else None
+    batcher = _ResultBatcher(queue)
+    try:
+        with profiler.sampling(profile):
+            worker_process(batcher, *args, **kwargs)
+    finally:
+        batcher.close()
+        if profile is not None:
+            queue.put(profile)
+        LOG.debug("Keystone session cache of the worker process: %s"
+                  % osclients.get_session_cache().stats())
+
+
+def _wait_for_ready(objects, timeout=None):
+    """Block until at least one of objects is ready.
+
+    :param objects: readable connections (e.g. ``queue._reader``) and/or
+                    process sentinels
+    :param timeout: maximum time to block in seconds, None means forever
+    :returns: list of ready objects
+    """
+    wait = getattr(multiprocessing.connection, "wait", None)
+    if wait is not None:
+        return wait(objects, timeout)
+    # Python 2.7 has neither multiprocessing.connection.wait nor process
+    # sentinels, but the queue readers are still selectable.
+    return select.select(objects, [], [], timeout)[0]
+
+
 def _log_worker_info(**info):
     """Log worker parameters for debugging.
 
@@ -139,10 +318,19 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         self.config = config
         self.result_queue = collections.deque()
         self.event_queue = collections.deque()
+        # Consumers wait on this condition instead of polling result_queue and
+        # event_queue.
+        self.data_available = threading.Condition()
         self.aborted = multiprocessing.Event()
         self.run_duration = 0
         self.batch_size = batch_size
         self.result_batch = []
+        # profiler.Profile to merge stack samples of the worker processes
+        # in, they are not profiled if it is None
+        self.profile = None
+        # ids of the started worker processes, read by the load generator
+        # monitor
+        self.worker_pids = []
 
     @abc.abstractmethod
     def _run_scenario(self, cls, method_name, context, args):
@@ -179,25 +367,30 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         """Abort the execution of further benchmark scenario iterations."""
         self.aborted.set()
 
-    @staticmethod
-    def _create_process_pool(processes_to_start, worker_process,
+    def _create_process_pool(self, processes_to_start, worker_process,
                              worker_args_gen):
         """Create a pool of processes with some defined target function.
 
         :param processes_to_start: number of processes to create in the pool
         :param worker_process: target function for all processes in the pool
-        :param worker_args_gen: generator of arguments for the target function
+        :param worker_args_gen: generator of arguments for the target function,
+                                the first argument is the result queue
         :returns: the process pool as a deque
         """
         process_pool = collections.deque()
+        process_kwargs = {}
+        if self.profile is not None:
+            process_kwargs["profile_interval"] = self.profile.interval
 
         for i in range(processes_to_start):
             kwrgs = {"processes_to_start": processes_to_start,
                      "processes_counter": i}
-            process = multiprocessing.Process(target=worker_process,
-                                              args=next(worker_args_gen),
-                                              kwargs={"info": kwrgs})
+            args = (worker_process, ) + tuple(next(worker_args_gen))
+            process = multiprocessing.Process(
+                target=_batched_worker_process, args=args,
+                kwargs=dict(process_kwargs, info=kwrgs))
             process.start()
+            self.worker_pids.append(process.pid)
             process_pool.append(process)
 
         return process_pool
@@ -205,33 +398,65 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
     def _join_processes(self, process_pool, result_queue, event_queue):
         """Join the processes in the pool and send their results to the queue.
 
+        Instead of polling, the method blocks until either one of the queues
+        has data to read or one of the processes has finished.
+
         :param process_pool: pool of processes to join
         :param result_queue: multiprocessing.Queue that receives the results
         :param event_queue: multiprocessing.Queue that receives the events
         """
-        while process_pool:
-            while process_pool and not process_pool[0].is_alive():
-                process_pool.popleft().join()
-
-            if result_queue.empty() and event_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.01)
-
-            while not event_queue.empty():
-                self.send_event(**event_queue.get())
-
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+        readers = [result_queue._reader, event_queue._reader]
+        has_sentinels = hasattr(multiprocessing.Process, "sentinel")
 
+        while process_pool:
+            for process in list(process_pool):
+                if not process.is_alive():
+                    process.join()
+                    process_pool.remove(process)
+            if not process_pool:
+                break
+
+            if has_sentinels:
+                _wait_for_ready(
+                    readers + [p.sentinel for p in process_pool])
+            else:
+                # there is no way to wait for process termination without
+                # sentinels, so wake up from time to time to check whether
+                # processes are still alive.
+                _wait_for_ready(readers, timeout=0.1)
+
+            self._drain_queues(result_queue, event_queue)
+
+        # finished processes have already flushed all their data to the pipes,
+        # so read the rest of it.
+        self._drain_queues(result_queue, event_queue)
         self._flush_results()
         result_queue.close()
         event_queue.close()
 
+    def _drain_queues(self, result_queue, event_queue):
+        while not event_queue.empty():
+            self.send_event(**event_queue.get())
+
+        while not result_queue.empty():
+            data = result_queue.get()
+            if isinstance(data, profiler.Profile):
+                if self.profile is not None:
+                    self.profile.merge(data)
+                continue
+            for result in _unpack_results(data):
+                self._send_result(result)
+
+    def _notify_consumers(self):
+        with self.data_available:
+            self.data_available.notify_all()
+
     def _flush_results(self):
         if self.result_batch:
             sorted_batch = sorted(self.result_batch)
             self.result_queue.append(sorted_batch)
             del self.result_batch[:]
+            self._notify_consumers()
 
     _RESULT_SCHEMA = {
         "fields": [("duration", float), ("timestamp", float),
@@ -259,7 +484,8 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
                        "proper_type": proper_type.__name__})
                 return False
 
-        actions_list = copy.deepcopy(result["atomic_actions"])
+        # walk the tree without copying it, results are stored as is.
+        actions_list = list(result["atomic_actions"])
         for action in actions_list:
             for key in ("name", "started_at", "finished_at", "children"):
                 if key not in action:
@@ -336,6 +562,7 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
                                   key=lambda r: result["timestamp"])
             self.result_queue.append(sorted_batch)
             del self.result_batch[:]
+            self._notify_consumers()
 
     def send_event(self, type, value=None):
         """Store event to send it to consumer later.
@@ -345,6 +572,7 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         """
         self.event_queue.append({"type": type,
                                  "value": value})
+        self._notify_consumers()
 
     def _log_debug_info(self, **info):
         """Log runner parameters for debugging.
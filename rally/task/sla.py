@@ -65,6 +65,15 @@ class SLAChecker(object):
                 atomic_actions)
         return all([sla.add_iteration(iteration) for sla in self.sla_criteria])
 
+    def add_load_generator_sample(self, sample):
+        """Process a resource usage sample of the load generator.
+
+        :param sample: sample taken by monitor.LoadGeneratorMonitor
+        :returns: True if all the SLA checks passed, False otherwise
+        """
+        return all([sla.add_load_generator_sample(sample)
+                    for sla in self.sla_criteria])
+
     def merge(self, other):
         self._validate_config(other)
         self._validate_sla_types(other)
@@ -141,6 +150,17 @@ class SLA(plugin.Plugin, validation.ValidatablePluginMixin):
         :returns: True if the SLA check passed, False otherwise
         """
 
+    def add_load_generator_sample(self, sample):
+        """Process a resource usage sample of the load generator.
+
+        Most of SLAs check iterations only, so samples are ignored by
+        default.
+
+        :param sample: sample taken by monitor.LoadGeneratorMonitor
+        :returns: True if the SLA check passed, False otherwise
+        """
+        return self.success
+
     def result(self):
         """Returns the SLA result dict corresponding to the current state."""
         return _format_result(self.get_name(), self.success, self.details())
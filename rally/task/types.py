@@ -14,18 +14,112 @@
 #    under the License.
 
 import abc
+import contextlib
 import copy
+import functools
+import json
 import operator
 import re
+import threading
 
 import six
 
+from rally.common import logging
 from rally.common.plugin import plugin
 from rally import exceptions
 from rally import osclients
 from rally.task import scenario
 
 
+LOG = logging.getLogger(__name__)
+
+
+class ResolutionCache(object):
+    """Thread-safe cache of transformed resources.
+
+    It is shared by validation, contexts and preprocessing of scenario
+    arguments, so the same resource is looked up once per task run.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value or None if it is missing."""
+        with self._lock:
+            return self._items.get(key)
+
+    def set(self, key, value):
+        with self._lock:
+            self._items[key] = value
+        return value
+
+
+_RESOLUTION_CACHE = None
+
+
+def get_resolution_cache():
+    """Return the cache of the current task run or None."""
+    return _RESOLUTION_CACHE
+
+
+@contextlib.contextmanager
+def resolution_cache():
+    """Cache transformed resources while the block is executed.
+
+    It is meant to wrap a whole task run (validation and benchmarking), so
+    nothing is reused between tasks and resources changed in the cloud
+    meanwhile are looked up again by the next task.
+    """
+    global _RESOLUTION_CACHE
+
+    previous = _RESOLUTION_CACHE
+    _RESOLUTION_CACHE = ResolutionCache()
+    try:
+        yield _RESOLUTION_CACHE
+    finally:
+        _RESOLUTION_CACHE = previous
+
+
+def cache_transform(transform):
+    """Cache results of ResourceType.transform within a task run.
+
+    Results are cached by the resource type, the cloud, user and project of
+    the clients and the resource config, since visibility of resources
+    (private images, flavors, etc.) depends on the user. Failures are not
+    cached, nothing is cached outside of `resolution_cache()`:
+
+        @classmethod
+        @types.cache_transform
+        def transform(cls, clients, resource_config):
+            ...
+    """
+    @functools.wraps(transform)
+    def wrapper(cls, clients, resource_config):
+        cache = _RESOLUTION_CACHE
+        if cache is None:
+            return transform(cls, clients, resource_config)
+        try:
+            credential = clients.credential
+            key = (cls.get_name(), credential.auth_url,
+                   credential.region_name, credential.username,
+                   credential.tenant_name,
+                   json.dumps(resource_config, sort_keys=True))
+        except (AttributeError, TypeError):
+            # clients or config of unknown kind, do not cache them
+            return transform(cls, clients, resource_config)
+
+        value = cache.get(key)
+        if value is None:
+            value = cache.set(key, transform(cls, clients, resource_config))
+        else:
+            LOG.debug("Resolved %(type)s %(config)s from cache" %
+                      {"type": cls.get_name(), "config": resource_config})
+        return value
+    return wrapper
+
+
 def _get_preprocessor_loader(plugin_name):
     """Get a class that loads a preprocessor class.
 
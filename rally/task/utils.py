@@ -15,8 +15,10 @@
 
 import collections
 import itertools
+import threading
 import time
 import traceback
+import weakref
 
 import jsonschema
 from novaclient import exceptions as nova_exc
@@ -67,9 +69,23 @@ class resource_is(object):
         return str(self.desired_status)
 
 
+def _check_resource_status(res, error_statuses):
+    # catch abnormal status, such as "no valid host" for servers
+    status = get_status(res)
+
+    if status in ("DELETED", "DELETE_COMPLETE"):
+        raise exceptions.GetResourceNotFound(resource=res)
+    if status in error_statuses:
+        raise exceptions.GetResourceErrorStatus(
+            resource=res, status=status,
+            fault=getattr(res, "fault", "n/a"))
+
+    return res
+
+
 def get_from_manager(error_statuses=None):
     error_statuses = error_statuses or ["ERROR"]
-    error_statuses = map(lambda str: str.upper(), error_statuses)
+    error_statuses = [s.upper() for s in error_statuses]
 
     def _get_from_manager(resource, id_attr="id"):
         # catch client side errors
@@ -80,19 +96,165 @@ def get_from_manager(error_statuses=None):
                 raise exceptions.GetResourceNotFound(resource=resource)
             raise exceptions.GetResourceFailure(resource=resource, err=e)
 
-        # catch abnormal status, such as "no valid host" for servers
-        status = get_status(res)
+        return _check_resource_status(res, error_statuses)
 
-        if status in ("DELETED", "DELETE_COMPLETE"):
-            raise exceptions.GetResourceNotFound(resource=res)
-        if status in error_statuses:
-            raise exceptions.GetResourceErrorStatus(
-                resource=res, status=status,
-                fault=getattr(res, "fault", "n/a"))
+    return _get_from_manager
 
-        return res
 
-    return _get_from_manager
+class _PendingGet(object):
+    """Result of a resource get which is going to be done by a poller."""
+
+    def __init__(self):
+        self._done = threading.Event()
+        self.resource = None
+        self.error = None
+
+    def set(self, resource=None, error=None):
+        self.resource = resource
+        self.error = error
+        self._done.set()
+
+    def wait(self):
+        self._done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.resource
+
+
+class BatchStatusPoller(object):
+    """Shared poller of resources statuses.
+
+    Instead of a separate GET request for each resource that some thread
+    is waiting for, all pending gets are satisfied by a single list
+    request done at most once per interval, so the polling load does not
+    depend on the number of concurrent waiters.
+
+    The polling thread runs only while there are pending gets. A list
+    made less than `interval` seconds ago is reused without new requests.
+    """
+
+    _pollers = weakref.WeakValueDictionary()
+    _pollers_lock = threading.Lock()
+
+    def __init__(self, list_resources, interval=1, id_attr="id"):
+        """Init poller.
+
+        :param list_resources: callable without arguments that returns
+            all resources which can be waited for, e.g. ``manager.list``.
+            A resource which is absent in the list is considered deleted
+        :param interval: minimal interval in seconds between list calls
+        :param id_attr: name of resources identifier attribute
+        """
+        self.list_resources = list_resources
+        self.interval = interval
+        self.id_attr = id_attr
+        self._lock = threading.Lock()
+        self._pending = collections.defaultdict(list)
+        self._resources = {}
+        self._listed_at = None
+        self._thread = None
+
+    @classmethod
+    def get_poller(cls, key, list_resources, interval=1, id_attr="id"):
+        """Return the poller for the key, creating it if necessary.
+
+        Pollers are shared by all threads of the current process while
+        they are in use; a poller is dropped once nobody refers to it, so
+        pollers of finished tasks do not pile up.
+
+        :param key: hashable identifier of resources kind and scope,
+            e.g. ("nova.servers", tenant_id)
+        """
+        with cls._pollers_lock:
+            poller = cls._pollers.get(key)
+            if poller is None:
+                poller = cls(list_resources, interval=interval,
+                             id_attr=id_attr)
+                cls._pollers[key] = poller
+            return poller
+
+    def get(self, resource_id):
+        """Get the resource from the latest list of resources.
+
+        Blocks until the next list call if the latest one is outdated.
+
+        :raises GetResourceNotFound: if the resource is not listed
+        :raises GetResourceFailure: if the list call failed
+        """
+        with self._lock:
+            # NOTE: a resource which is absent in the recent list may be
+            #   created after it, so only found resources are reused
+            if (resource_id in self._resources
+                    and time.time() - self._listed_at < self.interval):
+                return self._resources[resource_id]
+            pending = _PendingGet()
+            self._pending[resource_id].append(pending)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._poll)
+                self._thread.daemon = True
+                self._thread.start()
+        return pending.wait()
+
+    def _poll(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    return
+                delay = 0
+                if self._listed_at is not None:
+                    delay = self._listed_at + self.interval - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            # NOTE: gets added while listing is in progress are left for
+            #   the next list call, since it is not known whether their
+            #   resources are listed by the current one
+            with self._lock:
+                pending, self._pending = (self._pending,
+                                          collections.defaultdict(list))
+            started_at = time.time()
+            try:
+                resources = dict((getattr(r, self.id_attr), r)
+                                 for r in self.list_resources())
+                error = None
+            except Exception as e:
+                resources = {}
+                error = e
+
+            with self._lock:
+                if error is None:
+                    self._resources = resources
+                    self._listed_at = started_at
+            for resource_id, gets in pending.items():
+                if error is not None:
+                    exc = exceptions.GetResourceFailure(resource=resource_id,
+                                                        err=error)
+                elif resource_id not in resources:
+                    exc = exceptions.GetResourceNotFound(resource=resource_id)
+                else:
+                    exc = None
+                for pending_get in gets:
+                    pending_get.set(resources.get(resource_id), exc)
+
+
+def get_from_poller(poller, error_statuses=None):
+    """Return update_resource function which uses the shared poller.
+
+    It is an alternative to get_from_manager() for wait_for_status() which
+    makes no requests for single resources.
+
+    :param poller: BatchStatusPoller instance
+    :param error_statuses: list of statuses which mean a failure
+    """
+    error_statuses = error_statuses or ["ERROR"]
+    error_statuses = [s.upper() for s in error_statuses]
+
+    def _get_from_poller(resource, id_attr="id"):
+        res = poller.get(getattr(resource, id_attr))
+        return _check_resource_status(res, error_statuses)
+
+    return _get_from_poller
 
 
 def manager_list_size(sizes):
@@ -227,7 +389,7 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
             delta = current_time - latest_status_update
             LOG.debug(
                 "Waiting for resource %(resource)s. Status changed: "
-                "%(latest)s => %(current)s in %(delta)s" %
+                "%(latest)s => %(current)s in %(delta)s",
                 {"resource": resource_repr, "latest": latest_status,
                  "current": status, "delta": delta})
 
@@ -0,0 +1,116 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import mock
+
+from rally.cli.commands import bench as bench_cmd
+from rally import exceptions
+from tests.unit import fakes
+from tests.unit import test
+
+BENCH = "rally.cli.commands.bench."
+
+
+class BenchCommandsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(BenchCommandsTestCase, self).setUp()
+        self.bench = bench_cmd.BenchCommands()
+        self.fake_api = fakes.FakeAPI()
+        metrics = {"iterations_per_second": 100.0,
+                   "overhead_per_iteration": 0.01,
+                   "parent_cpu_time": 1.5,
+                   "db_bytes": 1024,
+                   "report_build_time": 0.5}
+        self.results = {"rally_version": "0.9.1",
+                        "created_at": "2017-01-01T00:00:00",
+                        "cases": {"dummy/serial/c1/n100": {
+                            "config": {}, "metrics": metrics}}}
+
+    def _make_worse_results(self):
+        results = json.loads(json.dumps(self.results))
+        results["cases"]["dummy/serial/c1/n100"]["metrics"][
+            "iterations_per_second"] = 50.0
+        return results
+
+    @mock.patch(BENCH + "bench.run")
+    def test_run(self, mock_run):
+        mock_run.return_value = self.results
+
+        self.assertIsNone(self.bench.run(self.fake_api, "deployment",
+                                         pattern="dummy/serial"))
+
+        cases = mock_run.call_args[0][2]
+        self.assertEqual(["dummy/serial/c1/n100", "dummy/serial/c1/n1000"],
+                         [c["name"] for c in cases])
+        mock_run.assert_called_once_with(self.fake_api, "deployment", cases)
+
+    @mock.patch(BENCH + "bench.run")
+    @mock.patch(BENCH + "open", create=True)
+    def test_run_with_out_and_baseline(self, mock_open, mock_run):
+        mock_open.side_effect = [
+            mock.mock_open(read_data=json.dumps(self.results)).return_value,
+            mock.mock_open().return_value]
+        mock_run.return_value = self._make_worse_results()
+
+        self.assertEqual(1, self.bench.run(self.fake_api, "deployment",
+                                           pattern="dummy/serial/c1/n100",
+                                           out="out.json",
+                                           baseline="baseline.json"))
+
+        mock_open.assert_has_calls([mock.call("baseline.json"),
+                                    mock.call("out.json", "w")])
+
+    def test_run_without_cases(self):
+        self.assertEqual(1, self.bench.run(self.fake_api, "deployment",
+                                           pattern="unknown"))
+
+    @mock.patch(BENCH + "bench.run")
+    def test_run_on_unfinished_deployment(self, mock_run):
+        mock_run.side_effect = exceptions.DeploymentNotFinishedStatus(
+            name="foo", uuid="uuid", status="status")
+
+        self.assertEqual(1, self.bench.run(self.fake_api, "deployment"))
+
+    @mock.patch(BENCH + "BenchCommands._load_results")
+    def test_compare(self, mock__load_results):
+        mock__load_results.side_effect = [self.results, self.results]
+
+        self.assertIsNone(self.bench.compare(self.fake_api, "baseline.json",
+                                             "current.json"))
+
+        mock__load_results.assert_has_calls([mock.call("current.json"),
+                                             mock.call("baseline.json")])
+
+    @mock.patch(BENCH + "BenchCommands._load_results")
+    def test_compare_with_regression(self, mock__load_results):
+        mock__load_results.side_effect = [self._make_worse_results(),
+                                          self.results]
+        self.assertEqual(1, self.bench.compare(
+            self.fake_api, "baseline.json", "current.json", tolerance=20))
+
+        mock__load_results.side_effect = [self._make_worse_results(),
+                                          self.results]
+        self.assertIsNone(self.bench.compare(
+            self.fake_api, "baseline.json", "current.json", tolerance=60))
+
+    @mock.patch(BENCH + "BenchCommands._load_results")
+    def test_compare_without_common_cases(self, mock__load_results):
+        mock__load_results.side_effect = [self.results, {"cases": {}}]
+
+        self.assertEqual(1, self.bench.compare(
+            self.fake_api, "baseline.json", "current.json"))
@@ -26,6 +26,7 @@ from rally.cli.commands import task
 from rally.common import yamlutils as yaml
 from rally import consts
 from rally import exceptions
+from rally.task.processing import plot
 from rally.task import utils as tutils
 from tests.unit import fakes
 from tests.unit import test
@@ -213,7 +214,7 @@ class TaskCommandsTestCase(test.TestCase):
         self.fake_api.task.start.assert_called_once_with(
             deployment_id, mock__load_and_validate_task.return_value,
             task=fake_task["uuid"],
-            abort_on_sla_failure=False)
+            abort_on_sla_failure=False, profile=False)
         mock__load_and_validate_task.assert_called_once_with(
             self.fake_api, task_path, args_file=None, raw_args=None)
         mock_use.assert_called_once_with(self.fake_api, "some_new_uuid")
@@ -265,7 +266,7 @@ class TaskCommandsTestCase(test.TestCase):
         self.fake_api.task.start.assert_called_once_with(
             "any", mock__load_and_validate_task.return_value,
             task=fake_task["uuid"],
-            abort_on_sla_failure=False)
+            abort_on_sla_failure=False, profile=False)
         mock_detailed.assert_called_once_with(
             self.fake_api,
             task_id=fake_task["uuid"])
@@ -308,7 +309,7 @@ class TaskCommandsTestCase(test.TestCase):
         self.fake_api.task.start.assert_called_once_with(
             "deployment", task_cfg,
             task=task_obj["uuid"],
-            abort_on_sla_failure=False)
+            abort_on_sla_failure=False, profile=False)
 
         self.assertFalse(mock_detailed.called)
 
@@ -416,6 +417,41 @@ class TaskCommandsTestCase(test.TestCase):
         self.fake_api.task.get_detailed.assert_called_once_with(
             test_uuid, extended_results=True)
 
+    @mock.patch("rally.cli.commands.task.open", create=True)
+    @mock.patch("rally.cli.commands.task.cliutils.print_list")
+    def test_detailed_with_profile(self, mock_print_list, mock_open):
+        mock_open.side_effect = mock.mock_open()
+        profiling_data = {"interval": 0.5,
+                          "stacks": {"a:main;b:run": 3, "a:main": 1,
+                                     "a:main;threading:wait": 2}}
+        self.fake_api.task.get_detailed.return_value = {
+            "id": "task",
+            "uuid": "task_uuid",
+            "status": "finished",
+            "results": [{
+                "key": {"name": "fake_name", "pos": 0, "kw": "fake_kw"},
+                "info": {"stat": {"cols": ["col"] * 9, "rows": []},
+                         "load_duration": 3.2,
+                         "full_duration": 3.5,
+                         "iterations_count": 0,
+                         "atomic": {}},
+                "iterations": [],
+                "profiling_data": profiling_data}]}
+
+        self.task.detailed(self.fake_api, "task_uuid",
+                           profile_out="/tmp/profile.folded")
+
+        rows = mock_print_list.call_args_list[-1][0][0]
+        self.assertEqual(
+            [{"Function": "b:run", "Self (sec)": 1.5,
+              "Cumulative (sec)": 1.5},
+             {"Function": "a:main", "Self (sec)": 0.5,
+              "Cumulative (sec)": 3.0}], rows)
+        mock_open.assert_called_once_with("/tmp/profile.folded", "w+")
+        mock_open.side_effect.return_value.write.assert_called_once_with(
+            "fake_name[0];a:main 1\nfake_name[0];a:main;b:run 3\n"
+            "fake_name[0];a:main;threading:wait 2\n")
+
     @mock.patch("rally.cli.commands.task.sys.stdout")
     @mock.patch("rally.cli.commands.task.logging")
     @ddt.data({"debug": True},
@@ -635,7 +671,8 @@ class TaskCommandsTestCase(test.TestCase):
              "data": {"raw": "foo_raw", "sla": "foo_sla",
                       "hooks": "foo_hooks",
                       "load_duration": 0.1,
-                      "full_duration": 1.2},
+                      "full_duration": 1.2,
+                      "load_generator": "foo_load_generator"},
              "created_at": "2017-06-02 07:33:04"},
             {"key": {"name": "class.test", "pos": 0},
              "data": {"raw": "bar_raw", "sla": "bar_sla",
@@ -650,10 +687,12 @@ class TaskCommandsTestCase(test.TestCase):
                     "hooks": x["data"]["hooks"],
                     "load_duration": x["data"]["load_duration"],
                     "full_duration": x["data"]["full_duration"],
+                    "load_generator": x["data"].get("load_generator"),
                     "created_at": x["created_at"]}
                    for x in data]
         self.fake_api.task.get_detailed.return_value = {"results": data}
-        mock_plot.plot.return_value = "html_report"
+        mock_plot.make_report_results.side_effect = plot.make_report_results
+        mock_plot.plot.return_value = ["html_", "report"]
 
         def reset_mocks():
             for m in (self.fake_api.task.get_detailed, mock_webbrowser,
@@ -662,10 +701,13 @@ class TaskCommandsTestCase(test.TestCase):
         self.task.report(self.fake_api, tasks=task_id,
                          out="/tmp/%s.html" % task_id)
         mock_open.assert_called_once_with("/tmp/%s.html" % task_id, "w+")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot.assert_called_once_with(
+            results, include_libs=False, stream=True)
 
-        mock_open.side_effect().write.assert_called_once_with("html_report")
-        self.fake_api.task.get_detailed.assert_called_once_with(task_id)
+        mock_open.side_effect().writelines.assert_called_once_with(
+            ["html_", "report"])
+        self.fake_api.task.get_detailed.assert_called_once_with(
+            task_id, lazy_results=True)
 
         # JUnit
         reset_mocks()
@@ -680,14 +722,16 @@ class TaskCommandsTestCase(test.TestCase):
                          open_it=True, out_format="html")
         mock_webbrowser.open_new_tab.assert_called_once_with(
             "file://realpath_output.html")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot.assert_called_once_with(
+            results, include_libs=False, stream=True)
 
         # HTML with embedded JS/CSS
         reset_mocks()
         self.task.report(self.fake_api, task_id, open_it=False,
                          out="output.html", out_format="html_static")
         self.assertFalse(mock_webbrowser.open_new_tab.called)
-        mock_plot.plot.assert_called_once_with(results, include_libs=True)
+        mock_plot.plot.assert_called_once_with(
+            results, include_libs=True, stream=True)
 
     @mock.patch("rally.cli.commands.task.os.path.realpath",
                 side_effect=lambda p: "realpath_%s" % p)
@@ -722,10 +766,12 @@ class TaskCommandsTestCase(test.TestCase):
                                "hooks": x["data"]["hooks"],
                                "load_duration": x["data"]["load_duration"],
                                "full_duration": x["data"]["full_duration"],
+                               "load_generator": None,
                                "created_at": x["created_at"]},
                     data))
 
         self.fake_api.task.get_detailed.return_value = {"results": data}
+        mock_plot.make_report_results.side_effect = plot.make_report_results
         mock_plot.plot.return_value = "html_report"
 
         def reset_mocks():
@@ -734,10 +780,12 @@ class TaskCommandsTestCase(test.TestCase):
                 m.reset_mock()
         self.task.report(self.fake_api, tasks=tasks, out="/tmp/1_test.html")
         mock_open.assert_called_once_with("/tmp/1_test.html", "w+")
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot.assert_called_once_with(
+            results, include_libs=False, stream=True)
 
         mock_open.side_effect().write.assert_called_once_with("html_report")
-        expected_get_calls = [mock.call(task) for task in tasks]
+        expected_get_calls = [mock.call(task, lazy_results=True)
+                              for task in tasks]
         self.fake_api.task.get_detailed.assert_has_calls(
             expected_get_calls, any_order=True)
 
@@ -785,7 +833,8 @@ class TaskCommandsTestCase(test.TestCase):
             self.real_api, task_file)
         expected_open_calls = [mock.call("/tmp/1_test.html", "w+")]
         mock_open.assert_has_calls(expected_open_calls, any_order=True)
-        mock_plot.plot.assert_called_once_with(results, include_libs=False)
+        mock_plot.plot.assert_called_once_with(
+            results, include_libs=False, stream=True)
         mock_open.side_effect().write.assert_called_once_with("html_report")
 
     @mock.patch("rally.cli.commands.task.os.path.exists", return_value=False)
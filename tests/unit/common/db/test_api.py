@@ -26,6 +26,7 @@ from six import moves
 
 from rally.common import db
 from rally.common.db import api as db_api
+from rally.common.db.sqlalchemy import api as sa_api
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -700,7 +701,8 @@ class WorkloadTestCase(test.DBTestCase):
                 {"a": "A", "success": True}
             ],
             "load_duration": 13,
-            "full_duration": 42
+            "full_duration": 42,
+            "context_execution": {"users": {"setup": {"duration": 1}}}
         }
 
         workload = db.workload_create(self.task_uuid, self.subtask_uuid, key)
@@ -723,9 +725,73 @@ class WorkloadTestCase(test.DBTestCase):
         self.assertTrue(workload["pass_sla"])
         self.assertEqual([], workload["hooks"])
         self.assertEqual(data["sla"], workload["sla_results"]["sla"])
+        self.assertEqual(data["context_execution"],
+                         workload["context_execution"])
         self.assertEqual(self.task_uuid, workload["task_uuid"])
         self.assertEqual(self.subtask_uuid, workload["subtask_uuid"])
 
+    def _create_workload(self):
+        key = {"name": "atata", "description": "tatata", "pos": 0,
+               "kw": {"runner": {"r": "R", "type": "T"}}}
+        return db.workload_create(self.task_uuid, self.subtask_uuid,
+                                  key)["uuid"]
+
+    def test_workload_set_results_with_profiling_data(self):
+        workload_uuid = self._create_workload()
+        profiling_data = {"interval": 0.01, "stacks": {"a:main;b:run": 3}}
+        workload = db.workload_set_results(workload_uuid, {
+            "sla": [], "profiling_data": profiling_data})
+
+        self.assertEqual(profiling_data,
+                         json.loads(workload["_profiling_data"]))
+        results = db.task_get_detailed(self.task_uuid)["results"]
+        self.assertEqual(profiling_data,
+                         results[0]["data"]["profiling_data"])
+
+    def test_workload_set_results_with_load_generator(self):
+        workload_uuid = self._create_workload()
+        load_generator = {"interval": 1.0, "samples": [], "summary": {}}
+        db.workload_set_results(workload_uuid, {
+            "sla": [], "statistics": {"load_generator": load_generator}})
+
+        results = db.task_get_detailed(self.task_uuid)["results"]
+        self.assertEqual(load_generator,
+                         results[0]["data"]["load_generator"])
+
+    def test_workload_set_results_min_duration(self):
+        workload_uuid = self._create_workload()
+        raw_data = {"raw": [
+            {"duration": 3, "timestamp": 1, "atomic_actions": []},
+            {"duration": 1, "timestamp": 2, "atomic_actions": []},
+            {"duration": 2, "timestamp": 3, "atomic_actions": []}]}
+        db.workload_data_create(self.task_uuid, workload_uuid, 0, raw_data)
+        workload = db.workload_set_results(workload_uuid, {"sla": []})
+        self.assertEqual(1, workload["min_duration"])
+        self.assertEqual(3, workload["max_duration"])
+        self.assertEqual(3, workload["total_iteration_count"])
+
+    @mock.patch("rally.common.db.sqlalchemy.api.Connection."
+                "_task_workload_data_get_all")
+    def test_workload_set_results_with_aggregates(
+            self, mock__task_workload_data_get_all):
+        workload_uuid = self._create_workload()
+        statistics = {"durations": {"total": {"count": 5}, "atomics": []}}
+        workload = db.workload_set_results(workload_uuid, {
+            "sla": [{"success": True}],
+            "total_iteration_count": 5,
+            "failed_iteration_count": 2,
+            "min_duration": 1.5,
+            "max_duration": 4.5,
+            "statistics": statistics})
+
+        self.assertFalse(mock__task_workload_data_get_all.called)
+        self.assertEqual(5, workload["total_iteration_count"])
+        self.assertEqual(2, workload["failed_iteration_count"])
+        self.assertEqual(1.5, workload["min_duration"])
+        self.assertEqual(4.5, workload["max_duration"])
+        self.assertEqual(statistics, workload["statistics"])
+        self.assertTrue(workload["pass_sla"])
+
     def test_workload_set_results_empty_raw_data(self):
         key = {
             "name": "atata",
@@ -805,6 +871,70 @@ class WorkloadDataTestCase(test.DBTestCase):
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
+    def test_workload_data_create_columnar(self):
+        raw = [
+            {"duration": 1.0, "timestamp": float(i), "idle_duration": 0.0,
+             "error": ["Error", "msg", "trace"] if i % 2 else [],
+             "output": {"additive": [], "complete": []},
+             "atomic_actions": [
+                 {"name": "foo", "started_at": float(i),
+                  "finished_at": i + 0.5,
+                  "children": [{"name": "bar", "started_at": float(i),
+                                "finished_at": i + 0.1, "children": []}]}]}
+            for i in range(10)]
+        workload_data = db.workload_data_create(
+            self.task_uuid, self.workload_uuid, 0, {"raw": raw})
+        self.assertEqual(10, workload_data["iteration_count"])
+        self.assertEqual(5, workload_data["failed_iteration_count"])
+        self.assertEqual("columnar", workload_data["chunk_data"]["format"])
+        self.assertGreater(workload_data["chunk_size"],
+                           workload_data["compressed_chunk_size"])
+        self.assertEqual(len(workload_data["chunk_data"]["data"]),
+                         workload_data["compressed_chunk_size"])
+
+        db.workload_set_results(self.workload_uuid,
+                                {"sla": [{"success": True}]})
+        results = db.task_result_get_all_by_uuid(self.task_uuid)
+        self.assertEqual(raw, results[0]["data"]["raw"])
+
+    def test_task_get_detailed_lazy_results(self):
+        raw = [
+            {"duration": 1.0, "timestamp": float(i), "idle_duration": 0.0,
+             "error": [], "output": {"additive": [], "complete": []},
+             "atomic_actions": [{"name": "foo", "started_at": float(i),
+                                 "finished_at": i + 0.5, "children": []}]}
+            for i in range(6)]
+        db.workload_data_create(
+            self.task_uuid, self.workload_uuid, 1, {"raw": raw[3:]})
+        db.workload_data_create(
+            self.task_uuid, self.workload_uuid, 0, {"raw": raw[:3]})
+        db.workload_set_results(self.workload_uuid,
+                                {"sla": [{"success": True}]})
+
+        task = db.task_get_detailed(self.task_uuid, lazy_results=True)
+        lazy_raw = task["results"][0]["data"]["raw"]
+        self.assertNotIsInstance(lazy_raw, list)
+        self.assertEqual(6, len(lazy_raw))
+        self.assertEqual(raw, list(lazy_raw))
+        # the results can be iterated over several times
+        self.assertEqual(raw, list(lazy_raw))
+
+    @mock.patch("rally.common.db.sqlalchemy.api.get_session")
+    def test_task_get_detailed_lazy_results_closes_sessions(
+            self, mock_get_session):
+        session = mock_get_session.return_value
+        query = session.query.return_value.filter_by.return_value
+        query.__iter__.return_value = iter([(2, ), (3, )])
+        lazy_raw = sa_api._LazyRawData("uuid")
+
+        self.assertEqual(5, len(lazy_raw))
+        session.close.assert_called_once_with()
+
+        session.reset_mock()
+        query.order_by.return_value = iter([])
+        self.assertEqual([], list(lazy_raw))
+        session.close.assert_called_once_with()
+
     @mock.patch("time.time")
     def test_workload_data_create_empty(self, mock_time):
         mock_time.return_value = 10
@@ -821,6 +951,46 @@ class WorkloadDataTestCase(test.DBTestCase):
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
+    def test_workload_data_create_many(self):
+        chunks = [
+            (0, {"raw": [{"duration": 1, "timestamp": 1,
+                          "atomic_actions": []},
+                         {"duration": 2, "timestamp": 2,
+                          "atomic_actions": []}]}),
+            (1, {"raw": [{"error": "anError", "duration": 3,
+                          "timestamp": 3, "atomic_actions": []}]})
+        ]
+        db.workload_data_create_many(self.task_uuid, self.workload_uuid,
+                                     chunks)
+
+        workload = db.workload_set_results(self.workload_uuid,
+                                           {"sla": [{"success": True}]})
+        self.assertEqual(3, workload["total_iteration_count"])
+        self.assertEqual(1, workload["failed_iteration_count"])
+        results = db.task_result_get_all_by_uuid(self.task_uuid)
+        self.assertEqual([1, 2, 3],
+                         [r["duration"] for r in results[0]["data"]["raw"]])
+
+    def test_workload_data_create_many_empty(self):
+        db.workload_data_create_many(self.task_uuid, self.workload_uuid, [])
+        workload = db.workload_set_results(self.workload_uuid, {"sla": []})
+        self.assertEqual(0, workload["total_iteration_count"])
+
+    def test_workload_data_get_size(self):
+        chunks = [
+            (i, {"raw": [{"duration": i, "timestamp": i,
+                          "atomic_actions": []}]}) for i in range(2)]
+        db.workload_data_create_many(self.task_uuid, self.workload_uuid,
+                                     chunks)
+
+        # the raw results are stored as they are
+        size = sum(len(json.dumps(data["raw"])) for i, data in chunks)
+        self.assertEqual(
+            {"chunk_size": size, "compressed_chunk_size": size},
+            db.workload_data_get_size(self.task_uuid))
+        self.assertEqual({"chunk_size": 0, "compressed_chunk_size": 0},
+                         db.workload_data_get_size("another_task"))
+
 
 class DeploymentTestCase(test.DBTestCase):
     def test_deployment_create(self):
@@ -15,6 +15,7 @@
 
 """Tests for db.task layer."""
 
+import copy
 import datetime as dt
 
 import ddt
@@ -27,6 +28,20 @@ from rally import exceptions
 from tests.unit import test
 
 
+class LazyRaw(object):
+    """Re-iterable results which are loaded on each pass."""
+
+    def __init__(self, iterations):
+        self.iterations = iterations
+
+    def __len__(self):
+        return len(self.iterations)
+
+    def __iter__(self):
+        # every pass yields new objects, like a lazy DB loader does
+        return iter(copy.deepcopy(self.iterations))
+
+
 @ddt.ddt
 class TaskTestCase(test.TestCase):
     def setUp(self):
@@ -232,6 +247,27 @@ class TaskTestCase(test.TestCase):
         results[0]["iterations"] = "foo_iterations"
         self.assertEqual(results, expected)
 
+    def test_extend_results_lazy_raw(self):
+        iterations = [
+            {"timestamp": i, "duration": 1, "error": [], "idle_duration": 0,
+             "atomic_actions": []} for i in (3, 1, 2)]
+        obsolete = [
+            {"task_uuid": "foo_uuid", "created_at": None, "updated_at": None,
+             "id": 11, "key": {"kw": {"foo": 42},
+                               "name": "Foo.bar", "pos": 0},
+             "data": {"raw": LazyRaw(iterations), "sla": [], "hooks": [],
+                      "full_duration": 40, "load_duration": 32}}]
+
+        results = objects.Task.extend_results(obsolete, serializable=True)
+        self.assertEqual(3, results[0]["info"]["iterations_count"])
+        self.assertEqual(1, results[0]["info"]["tstamp_start"])
+        self.assertEqual(3, len(results[0]["iterations"]))
+        # iterations keep the order of the lazy source and get an output
+        expected = [dict(itr, output={"additive": [], "complete": []})
+                    for itr in iterations]
+        self.assertEqual(expected, list(results[0]["iterations"]))
+        self.assertEqual(expected, list(results[0]["iterations"]))
+
     @mock.patch("rally.common.objects.task.db.deployment_get")
     @mock.patch("rally.common.objects.task.Task.get_results")
     def test_to_dict(self, mock_get_results, mock_deployment_get):
@@ -262,7 +298,8 @@ class TaskTestCase(test.TestCase):
             "updated_at": dt.datetime.now()}]}
 
         task_detailed = task.get_detailed(task_id="task_id")
-        mock_task_get_detailed.assert_called_once_with("task_id")
+        mock_task_get_detailed.assert_called_once_with("task_id",
+                                                       lazy_results=False)
         self.assertEqual(mock_task_get_detailed.return_value, task_detailed)
 
     @mock.patch("rally.common.objects.task.db.task_result_get_all_by_uuid",
@@ -417,6 +454,18 @@ class WorkloadTestCase(test.TestCase):
             self.workload["task_uuid"], self.workload["uuid"],
             0, {"data": "foo"})
 
+    @mock.patch("rally.common.objects.task.db.workload_data_create_many")
+    @mock.patch("rally.common.objects.task.db.workload_create")
+    def test_add_workload_data_chunks(self, mock_workload_create,
+                                      mock_workload_data_create_many):
+        mock_workload_create.return_value = self.workload
+        workload = objects.Workload("uuid1", "uuid2", {"bar": "baz"})
+
+        workload.add_workload_data_chunks([(0, {"data": "foo"})])
+        mock_workload_data_create_many.assert_called_once_with(
+            self.workload["task_uuid"], self.workload["uuid"],
+            [(0, {"data": "foo"})])
+
     @mock.patch("rally.common.objects.task.db.workload_set_results")
     @mock.patch("rally.common.objects.task.db.workload_create")
     def test_set_results(self, mock_workload_create,
@@ -13,6 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+import os
+import shutil
+import tempfile
 import uuid
 
 import mock
@@ -41,6 +45,15 @@ class IterSubclassesTestCase(test.TestCase):
 
         self.assertEqual([B, C, D], list(discover.itersubclasses(A)))
 
+    @mock.patch("%s.import_indexed_modules" % DISCOVER)
+    def test_itersubclasses_imports_indexed_modules(
+            self, mock_import_indexed_modules):
+        class A(object):
+            pass
+
+        self.assertEqual([], list(discover.itersubclasses(A)))
+        mock_import_indexed_modules.assert_called_once_with()
+
 
 class LoadExtraModulesTestCase(test.TestCase):
 
@@ -169,3 +182,116 @@ class LoadExtraModulesTestCase(test.TestCase):
         self.assertEqual(
             [mock.call(n) for n in names],
             loader.find_module.return_value.load_module.call_args_list)
+
+
+class PluginIndexTestCase(test.TestCase):
+
+    def setUp(self):
+        super(PluginIndexTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "rally", "plugin_index.json")
+        self.plugins = [{"name": "foo", "namespace": "default",
+                         "base": "rally.task.context.Context",
+                         "module": "rally.plugins.foo", "hidden": False}]
+
+    @mock.patch("%s.version.version_string" % DISCOVER, return_value="1.0")
+    @mock.patch("%s.os.path.getmtime" % DISCOVER)
+    @mock.patch("%s.os.walk" % DISCOVER)
+    def test_get_packages_signature(self, mock_walk, mock_getmtime,
+                                    mock_version_string):
+        mtimes = {"/a": 1, "/a/__init__.py": 2, "/a/x.py": 5, "/a/b": 7,
+                  "/a/b/y.py": 3}
+        mock_getmtime.side_effect = lambda path: mtimes[path]
+        mock_walk.side_effect = [
+            [("/a", ["b"], ["__init__.py", "x.py", "x.pyc"]),
+             ("/a/b", [], ["y.py"])],
+            []]
+
+        self.assertEqual({"version": "1.0",
+                          "packages": {"rally.a": [3, 7],
+                                       "rally.c": [0, 0]}},
+                         discover.get_packages_signature(["rally.a",
+                                                          "rally.c"]))
+
+    @mock.patch("%s.get_packages_signature" % DISCOVER)
+    def test_save_and_load_plugin_index(self, mock_get_packages_signature):
+        mock_get_packages_signature.return_value = {"version": "1.0"}
+
+        discover.save_plugin_index(["rally.a"], self.plugins, path=self.path)
+
+        self.assertEqual(self.plugins, discover.load_plugin_index(
+            ["rally.a"], path=self.path))
+        with open(self.path) as f:
+            self.assertEqual({"signature": {"version": "1.0"},
+                              "plugins": self.plugins}, json.load(f))
+        self.assertEqual(["plugin_index.json"],
+                         os.listdir(os.path.dirname(self.path)))
+        mock_get_packages_signature.assert_called_with(["rally.a"])
+
+    @mock.patch("%s.get_packages_signature" % DISCOVER)
+    def test_load_outdated_plugin_index(self, mock_get_packages_signature):
+        mock_get_packages_signature.return_value = {"version": "1.0"}
+        discover.save_plugin_index(["rally.a"], self.plugins, path=self.path)
+
+        mock_get_packages_signature.return_value = {"version": "1.1"}
+        self.assertIsNone(discover.load_plugin_index(["rally.a"],
+                                                     path=self.path))
+
+    def test_load_missing_plugin_index(self):
+        self.assertIsNone(discover.load_plugin_index(["rally.a"],
+                                                     path=self.path))
+
+    @mock.patch("%s.get_packages_signature" % DISCOVER)
+    @mock.patch("%s.open" % DISCOVER, create=True)
+    def test_save_plugin_index_fails(self, mock_open,
+                                     mock_get_packages_signature):
+        mock_open.side_effect = IOError
+
+        discover.save_plugin_index(["rally.a"], self.plugins, path=self.path)
+
+        self.assertFalse(os.path.exists(self.path))
+
+    @mock.patch("%s._NOT_IMPORTED" % DISCOVER, new_callable=dict)
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    def test_import_modules_by_plugin_name(self, mock_import_module,
+                                           mock__not_imported):
+        # use random uuid to not have conflicts in sys.modules
+        modules = [str(uuid.uuid4()) for i in range(3)]
+        discover.set_plugin_index([
+            {"name": "foo", "base": "a.A", "module": modules[0]},
+            {"name": "foo", "base": "b.B", "module": modules[1]},
+            {"name": "bar", "base": "a.A", "module": modules[2]},
+            {"name": "spam", "base": "a.A", "module": __name__}])
+
+        discover.import_modules_by_plugin_name("foo", base="b.B")
+        mock_import_module.assert_called_once_with(modules[1])
+
+        mock_import_module.reset_mock()
+        discover.import_modules_by_plugin_name("foo")
+        discover.import_modules_by_plugin_name("foo")
+        discover.import_modules_by_plugin_name("spam")
+        mock_import_module.assert_called_once_with(modules[0])
+
+        mock_import_module.reset_mock()
+        discover.import_indexed_modules()
+        mock_import_module.assert_called_once_with(modules[2])
+        self.assertEqual({}, mock__not_imported)
+
+    @mock.patch("%s._NOT_IMPORTED" % DISCOVER, new_callable=dict)
+    @mock.patch("%s.importutils.import_module" % DISCOVER)
+    def test_import_modules_by_plugin_name_nested(self, mock_import_module,
+                                                  mock__not_imported):
+        modules = [str(uuid.uuid4()) for i in range(2)]
+        discover.set_plugin_index([
+            {"name": "foo", "base": "a.A", "module": modules[0]},
+            {"name": "foo", "base": "a.A", "module": modules[1]}])
+        # configuring of a plugin looks up plugins with the same name
+        mock_import_module.side_effect = (
+            lambda module: discover.import_modules_by_plugin_name("foo"))
+
+        discover.import_modules_by_plugin_name("foo")
+
+        self.assertEqual([mock.call(modules[0]), mock.call(modules[1])],
+                         mock_import_module.call_args_list)
+        self.assertEqual({"foo": []}, mock__not_imported)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from rally.common.plugin import plugin
 from rally import exceptions
 from tests.unit import test
@@ -235,6 +237,31 @@ class PluginTestCase(test.TestCase):
 
         A.unregister()
 
+    @mock.patch("rally.common.plugin.discover."
+                "import_modules_by_plugin_name")
+    def test_configure_with_same_name_in_plugin_index(
+            self, mock_import_modules_by_plugin_name):
+
+        class A(plugin.Plugin):
+            pass
+
+        def import_modules(name):
+            # the module of the plugin index defines the plugin
+            mock_import_modules_by_plugin_name.side_effect = None
+            plugin.configure(name)(A)
+
+        mock_import_modules_by_plugin_name.side_effect = import_modules
+
+        class B(plugin.Plugin):
+            pass
+
+        self.assertRaises(exceptions.PluginWithSuchNameExists,
+                          plugin.configure("test_indexed_plugin"), B)
+        mock_import_modules_by_plugin_name.assert_called_with(
+            "test_indexed_plugin")
+
+        A.unregister()
+
     def test_get_name(self):
         self.assertEqual("test_some_plugin", SomePlugin.get_name())
 
@@ -253,6 +280,33 @@ class PluginTestCase(test.TestCase):
                               MyPluginInDefault, MyPluginInFoo]),
                          set(BasePlugin.get_all(allow_hidden=True)))
 
+    @mock.patch("rally.common.plugin.discover.itersubclasses")
+    def test_get_does_not_iterate_over_subclasses(self,
+                                                  mock_itersubclasses):
+        self.assertEqual(SomePlugin, BasePlugin.get("test_some_plugin"))
+        self.assertEqual([MyPluginInFoo],
+                         BasePlugin.get_all(name="test_my_plugin",
+                                            namespace="foo"))
+        self.assertEqual([], SomePlugin.get_all(name="test_my_plugin"))
+        self.assertFalse(mock_itersubclasses.called)
+
+    @mock.patch("rally.common.plugin.discover."
+                "import_modules_by_plugin_name")
+    def test_get_imports_modules_by_plugin_name(
+            self, mock_import_modules_by_plugin_name):
+        self.assertEqual(SomePlugin, BasePlugin.get("test_some_plugin"))
+        mock_import_modules_by_plugin_name.assert_called_once_with(
+            "test_some_plugin")
+
+        @plugin.base()
+        class SomeBase(plugin.Plugin):
+            pass
+
+        mock_import_modules_by_plugin_name.reset_mock()
+        SomeBase.get_all(name="test_some_plugin")
+        mock_import_modules_by_plugin_name.assert_called_once_with(
+            "test_some_plugin", base="%s.SomeBase" % __name__)
+
     def test_is_deprecated(self):
         self.assertFalse(SomePlugin.is_deprecated())
         self.assertEqual(DeprecatedPlugin.is_deprecated(),
@@ -14,6 +14,7 @@
 #    under the License.
 
 import collections
+import threading
 
 import mock
 
@@ -84,3 +85,131 @@ class BrokerTestCase(test.TestCase):
         consumer_count = 2
         broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+
+    def test_run_publisher_and_consumers_concurrently(self):
+        consumed = threading.Event()
+
+        def publish(queue):
+            queue.append(1)
+            # consumers must not wait for publish() to be finished
+            self.assertTrue(consumed.wait(5))
+
+        def consume(cache, item):
+            consumed.set()
+
+        stats = broker.run(publish, consume, 1)
+        self.assertEqual(1, stats.jobs)
+
+    def test_run_stats(self):
+
+        def publish(queue):
+            for i in range(10):
+                queue.append(i)
+
+        def consume(cache, item):
+            if item % 2:
+                raise Exception()
+
+        stats = broker.run(publish, consume, 3, queue_size=2)
+        self.assertEqual(10, stats.jobs)
+        self.assertEqual(5, stats.failed)
+        self.assertIsNotNone(stats.finished_at)
+        self.assertGreaterEqual(stats.max_latency, stats.avg_latency)
+        self.assertEqual(
+            {"jobs": 10, "failed": 5, "duration": stats.duration,
+             "throughput": stats.throughput, "avg_latency": stats.avg_latency,
+             "max_latency": stats.max_latency},
+            stats.to_dict())
+
+    def test_run_reuses_workers(self):
+        pool = broker.WorkerPool()
+        consume = mock.Mock()
+
+        def publish(queue):
+            queue.append(1)
+
+        with mock.patch("rally.common.broker.get_pool", return_value=pool):
+            broker.run(publish, consume, 2)
+            broker.run(publish, consume, 2)
+
+        self.assertEqual(2, pool.workers_started)
+        self.assertEqual(2, consume.call_count)
+
+
+class JobQueueTestCase(test.TestCase):
+
+    def test_popleft(self):
+        queue = broker.JobQueue()
+        queue.append(1)
+        queue.append(2)
+        self.assertEqual(2, len(queue))
+        self.assertEqual(1, queue.popleft())
+        queue.close()
+        self.assertEqual(2, queue.popleft())
+        self.assertRaises(IndexError, queue.popleft)
+
+    def test_popleft_waits_for_items(self):
+        queue = broker.JobQueue()
+        items = []
+
+        def consumer():
+            items.append(queue.popleft())
+
+        thread = threading.Thread(target=consumer)
+        thread.start()
+        queue.append(1)
+        thread.join(5)
+        self.assertEqual([1], items)
+
+    def test_append_blocks_when_full(self):
+        queue = broker.JobQueue(maxsize=1)
+        queue.append(1)
+        appended = threading.Event()
+
+        def publisher():
+            queue.append(2)
+            appended.set()
+
+        thread = threading.Thread(target=publisher)
+        thread.start()
+        self.assertFalse(appended.wait(0.1))
+        self.assertEqual(1, queue.popleft())
+        self.assertTrue(appended.wait(5))
+        thread.join()
+        self.assertEqual(1, len(queue))
+
+
+class WorkerPoolTestCase(test.TestCase):
+
+    def test_submit(self):
+        pool = broker.WorkerPool()
+        func = mock.Mock()
+        self.assertTrue(pool.submit(func, 1, 2).wait(5))
+        func.assert_called_once_with(1, 2)
+        # the idle worker is reused for the next job
+        self.assertTrue(pool.submit(func, 3).wait(5))
+        self.assertEqual(1, pool.workers_started)
+
+    def test_submit_fails(self):
+        pool = broker.WorkerPool()
+        self.assertTrue(pool.submit(mock.Mock(side_effect=Exception)).wait(5))
+
+    def test_idle_workers_exit(self):
+        pool = broker.WorkerPool(idle_timeout=0.01)
+        pool.submit(mock.Mock()).wait(5)
+        for i in range(500):
+            if not pool._idle:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(0, pool._idle)
+        self.assertTrue(pool.submit(mock.Mock()).wait(5))
+        self.assertEqual(2, pool.workers_started)
+
+    @mock.patch("rally.common.broker.os.getpid")
+    def test_get_pool(self, mock_getpid):
+        mock_getpid.return_value = 1
+        pool = broker.get_pool()
+        self.assertIs(pool, broker.get_pool())
+        # forked process
+        mock_getpid.return_value = 2
+        self.assertIsNot(pool, broker.get_pool())
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import mock
 
 from rally.common.i18n import _
@@ -38,10 +40,13 @@ class LogTestCase(test.TestCase):
         t = TaskLog()
         self.assertEqual(t.some_method.__name__, "some_method")
         self.assertEqual(t.some_method(2, 2), 4)
-        params = {"msg": msg % {"a": 10, "b": 20}, "uuid": t.task["uuid"]}
+        params = {"msg": msg % {"a": 10, "b": 20}, "uuid": t.task["uuid"],
+                  "obj_name": "Task"}
         expected = [
-            mock.call(_("Task %(uuid)s | Starting:  %(msg)s") % params),
-            mock.call(_("Task %(uuid)s | Completed: %(msg)s") % params)
+            mock.call(_("%(obj_name)s %(uuid)s | Starting:  %(msg)s"),
+                      params),
+            mock.call(_("%(obj_name)s %(uuid)s | Completed: %(msg)s"),
+                      params)
         ]
         self.assertEqual(mock_log.mock_calls, expected)
 
@@ -85,3 +90,173 @@ class LogTestCase(test.TestCase):
         self.assertEqual(some_method(2, 2, z=3), 7)
         mock_log.assert_called_once_with(
             "Deprecated test (args `z' deprecated in Rally v0.0.1)")
+
+
+class ListHandler(logging.log.Handler):
+
+    def __init__(self):
+        logging.log.Handler.__init__(self)
+        self.buffer = []
+
+    def emit(self, record):
+        self.buffer.append(record)
+
+
+class QueueHandlerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(QueueHandlerTestCase, self).setUp()
+        self.target = ListHandler()
+        self.handler = logging.QueueHandler([self.target], max_size=2)
+        self.addCleanup(self.handler.close)
+        self.root_handlers = list(logging.log.getLogger().handlers)
+
+    def tearDown(self):
+        # setup() replaces handlers of the real root logger, they should
+        # not leak to other tests
+        root = logging.log.getLogger()
+        for handler in list(root.handlers):
+            if handler not in self.root_handlers:
+                root.removeHandler(handler)
+                handler.close()
+        for handler in self.root_handlers:
+            if handler not in root.handlers:
+                root.addHandler(handler)
+        super(QueueHandlerTestCase, self).tearDown()
+
+    def _make_record(self, msg, args=None, level=logging.INFO):
+        return logging.log.LogRecord("test", level, __file__, 0, msg, args,
+                                     None)
+
+    def test_emit(self):
+        threads = []
+        handle = self.target.handle
+
+        def handle_and_save_thread(record):
+            threads.append(threading.current_thread())
+            return handle(record)
+
+        self.target.handle = handle_and_save_thread
+        args = {"foo": "bar"}
+        self.handler.emit(self._make_record("value: %(foo)s", (args,)))
+        args["foo"] = "changed"
+
+        self.handler.flush()
+
+        self.assertEqual(["value: bar"],
+                         [r.msg for r in self.target.buffer])
+        self.assertEqual([self.handler._thread], threads)
+
+    def test_emit_target_level(self):
+        self.target.setLevel(logging.WARNING)
+
+        self.handler.emit(self._make_record("info"))
+        self.handler.emit(self._make_record("warning",
+                                            level=logging.WARNING))
+        self.handler.flush()
+
+        self.assertEqual(["warning"], [r.msg for r in self.target.buffer])
+
+    def test_emit_queue_is_full(self):
+        written = threading.Event()
+        release = threading.Event()
+
+        def handle(record):
+            written.set()
+            release.wait()
+            self.target.buffer.append(record)
+
+        self.target.handle = handle
+        self.handler.emit(self._make_record("first"))
+        written.wait()
+        for i in range(5):
+            self.handler.emit(self._make_record("info %d" % i))
+        release.set()
+        self.handler.flush()
+
+        self.assertEqual(3, self.handler.dropped)
+        self.assertEqual(
+            ["first",
+             "3 log records were dropped since the logging queue was full",
+             "info 0", "info 1"],
+            [r.getMessage() for r in self.target.buffer])
+
+        self.handler.emit(self._make_record("last"))
+        self.handler.flush()
+
+        self.assertEqual("last", self.target.buffer[-1].msg)
+        self.assertEqual(5, len(self.target.buffer))
+
+    def test_emit_in_forked_process(self):
+        self.handler.emit(self._make_record("parent"))
+        self.handler.flush()
+        parent_thread = self.handler._thread
+        parent_lock = self.target.lock
+
+        with mock.patch("rally.common.logging.os.getpid",
+                        return_value=-1):
+            self.handler.emit(self._make_record("child"))
+            self.handler.flush()
+            child_thread = self.handler._thread
+            self.handler.close()
+
+        self.assertNotEqual(parent_thread, child_thread)
+        self.assertIsNot(parent_lock, self.target.lock)
+        self.assertFalse(child_thread.is_alive())
+        self.assertEqual(["parent", "child"],
+                         [r.msg for r in self.target.buffer])
+
+    def test_close(self):
+        self.handler.emit(self._make_record("before"))
+        self.handler.close()
+
+        self.assertFalse(self.handler._thread.is_alive())
+        self.handler.emit(self._make_record("after"))
+        self.assertEqual(["before", "after"],
+                         [r.msg for r in self.target.buffer])
+
+    def test__setup_queue_handler(self):
+        logger = logging.log.getLogger("rally.test_queue_handler")
+        logger.addHandler(self.target)
+        self.addCleanup(logger.removeHandler, self.target)
+
+        handler = logging._setup_queue_handler(logger, 10)
+        self.addCleanup(logger.removeHandler, handler)
+        self.addCleanup(handler.close)
+
+        self.assertEqual([handler], logger.handlers)
+        self.assertEqual([self.target], handler.targets)
+        self.assertEqual(10, handler.max_size)
+
+    @mock.patch("rally.common.logging._setup_queue_handler")
+    @mock.patch("rally.common.logging.oslogging.setup")
+    @mock.patch("rally.common.logging.CONF")
+    def test_setup_async(self, mock_conf, mock_setup,
+                         mock__setup_queue_handler):
+        mock_conf.rally_debug = False
+        mock_conf.async_logging = True
+        mock_conf.async_logging_queue_size = 42
+
+        logging.setup("rally")
+
+        mock_setup.assert_called_once_with(mock_conf, "rally", "unknown")
+        mock__setup_queue_handler.assert_called_once_with(
+            logging.log.getLogger(), 42)
+
+    @mock.patch("rally.common.logging._setup_queue_handler")
+    @mock.patch("rally.common.logging.oslogging.setup")
+    @mock.patch("rally.common.logging.CONF")
+    def test_setup_closes_previous_queue_handler(
+            self, mock_conf, mock_setup, mock__setup_queue_handler):
+        mock_conf.rally_debug = False
+        mock_conf.async_logging = False
+        root = logging.log.getLogger()
+        root.addHandler(self.handler)
+        self.addCleanup(root.removeHandler, self.handler)
+        self.handler.emit(self._make_record("message"))
+
+        logging.setup("rally")
+
+        self.assertFalse(self.handler._thread.is_alive())
+        self.assertEqual(["message"], [r.msg for r in self.target.buffer])
+        self.assertFalse(mock__setup_queue_handler.called)
@@ -221,11 +221,6 @@ class PercentileComputationTestCase(test.TestCase):
         {"stream": "mixed50", "percent": 0.50, "expected": 51.89},
         {"stream": "mixed50", "percent": 0.90, "expected":
             82.81300000000002},
-        {"stream": "mixed5000", "percent": 0.25, "expected":
-            35.54600000000001},
-        {"stream": "mixed5000", "percent": 0.50, "expected": 48.351},
-        {"stream": "mixed5000", "percent": 0.90, "expected":
-            66.05880000000437},
         {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
         {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
         {"stream": "range5000", "percent": 0.90, "expected": 4499.1})
@@ -236,10 +231,60 @@ class PercentileComputationTestCase(test.TestCase):
         [comp.add(i) for i in getattr(self, stream)]
         self.assertEqual(expected, comp.result())
 
+    @ddt.data({"percent": 0.25, "expected": 25.03},
+              {"percent": 0.50, "expected": 51.89},
+              {"percent": 0.90, "expected": 82.813})
+    @ddt.unpack
+    def test_add_and_result_approximated(self, percent, expected):
+        # 50000 values do not fit into max_exact, so they are bucketed
+        comp = algo.PercentileComputation(percent=percent)
+        [comp.add(i) for i in self.mixed5000]
+        self.assertIsNone(comp._values)
+        self.assertLessEqual(abs(comp.result() - expected), expected * 0.01)
+
     def test_add_raises(self):
         comp = algo.PercentileComputation(0.50, 100)
         self.assertRaises(TypeError, comp.add)
 
+    @ddt.data(0.25, 0.5, 0.9, 0.95, 0.99)
+    def test_result_is_approximated(self, percent):
+        comp = algo.PercentileComputation(percent, accuracy=0.01,
+                                          max_exact=100)
+        stream = [(i % 97) * 1.5 + (i % 13) * 0.01 + 0.1
+                  for i in range(5000)]
+        for value in stream:
+            comp.add(value)
+
+        stream.sort()
+        k = (len(stream) - 1) * percent
+        expected = stream[int(k)]
+        self.assertIsNone(comp._values)
+        self.assertLessEqual(abs(comp.result() - expected),
+                             expected * 0.01 + 1.5)
+
+    @ddt.data({"max_exact": 10000}, {"max_exact": 30})
+    @ddt.unpack
+    def test_merge(self, max_exact):
+        stream = [float(i % 17) - 3 for i in range(100)]
+        single_comp = algo.PercentileComputation(0.9, max_exact=max_exact)
+        for value in stream:
+            single_comp.add(value)
+
+        comps = [algo.PercentileComputation(0.9, max_exact=max_exact)
+                 for i in range(4)]
+        for idx, value in enumerate(stream):
+            comps[idx % 4].add(value)
+        merged_comp = comps[0]
+        for comp in comps[1:]:
+            merged_comp.merge(comp)
+
+        self.assertEqual(single_comp.result(), merged_comp.result())
+
+    def test_merge_different_accuracy(self):
+        comp = algo.PercentileComputation(0.5, accuracy=0.01)
+        self.assertRaises(ValueError, comp.merge,
+                          algo.PercentileComputation(0.5, accuracy=0.02))
+
     def test_result_empty(self):
         self.assertRaises(TypeError, algo.PercentileComputation)
         comp = algo.PercentileComputation(0.50, 100)
@@ -494,6 +494,41 @@ class TimeoutThreadTestCase(test.TestCase):
         self.assertLess(time_elapsed, 11,
                         "Thread killed too late (%s seconds)" % time_elapsed)
 
+    @mock.patch("rally.common.utils.terminate_thread")
+    def test_timeout_thread_terminate(self, mock_terminate_thread):
+        queue = Queue.Queue()
+        handle = mock.Mock()
+        handle.isAlive.return_value = True
+        queue.put((handle, time.time()))
+        queue.put((None, None))
+
+        utils.timeout_thread(queue)
+
+        handle.terminate.assert_called_once_with()
+        self.assertFalse(mock_terminate_thread.called)
+
+    def test_cancel_thread_termination(self):
+        def target():
+            try:
+                event.wait()
+                for i in range(1000):
+                    pass
+            except exceptions.ThreadTimeoutException:
+                result.append("terminated")
+            else:
+                result.append("finished")
+
+        event = threading.Event()
+        result = []
+        thread = threading.Thread(target=target)
+        thread.start()
+        # the exception is raised once the thread returns from event.wait()
+        utils.terminate_thread(thread.ident)
+        utils.cancel_thread_termination(thread.ident)
+        event.set()
+        thread.join()
+        self.assertEqual(["finished"], result)
+
 
 class LockedDictTestCase(test.TestCase):
 
@@ -14,6 +14,7 @@
 #    under the License.
 
 import ddt
+import mock
 
 from rally.common.plugin import plugin
 from rally.common import validation
@@ -108,6 +109,98 @@ class ValidatorTestCase(test.TestCase):
                       "with name: 'dummy_plugin'", result[0].msg)
 
 
+class ValidationCacheTestCase(test.TestCase):
+
+    def test_call(self):
+        cache = validation.ValidationCache()
+        func = mock.Mock(return_value="result")
+        creds = {"foo": {"admin": self._get_credential("admin"),
+                         "users": [{"credential":
+                                    self._get_credential("user")}]}}
+        key = cache.make_key(DummyValidator, (), {"foo": "bar"}, "plugin",
+                             creds, {"a": 1}, None)
+
+        self.assertEqual("result", cache.call(DummyValidator, key, func))
+        self.assertEqual("result", cache.call(DummyValidator, key, func))
+        func.assert_called_once_with()
+        self.assertEqual(1, cache.stats["dummy_validator"]["calls"])
+        self.assertEqual(1, cache.stats["dummy_validator"]["cached"])
+
+        other_key = cache.make_key(DummyValidator, (), {"foo": "bar"},
+                                   "plugin", creds, {"a": 2}, None)
+        self.assertNotEqual(key, other_key)
+        cache.call(DummyValidator, other_key, func)
+        self.assertEqual(2, func.call_count)
+
+    def _get_credential(self, username, tenant_name="tenant"):
+        return mock.Mock(auth_url="http://example.com", username=username,
+                         tenant_name=tenant_name)
+
+    def test_make_key_by_credentials(self):
+        cache = validation.ValidationCache()
+
+        def make_key(admin, user):
+            creds = {"foo": {"admin": admin,
+                             "users": [{"credential": user}]}}
+            return cache.make_key(DummyValidator, (), {}, "plugin", creds,
+                                  {}, None)
+
+        key = make_key(self._get_credential("admin"),
+                       self._get_credential("user"))
+        self.assertIsNotNone(key)
+        # equal credentials which are different objects
+        self.assertEqual(key, make_key(self._get_credential("admin"),
+                                       self._get_credential("user")))
+        self.assertNotEqual(key, make_key(self._get_credential("admin"),
+                                          self._get_credential("user2")))
+        self.assertNotEqual(key, make_key(
+            self._get_credential("admin"),
+            self._get_credential("user", tenant_name="tenant2")))
+        self.assertNotEqual(key, make_key(None,
+                                          self._get_credential("user")))
+        # unknown kind of credentials
+        self.assertIsNone(make_key("admin", "user"))
+
+    def test_call_without_key(self):
+        cache = validation.ValidationCache()
+        func = mock.Mock(return_value="result")
+        self.assertIsNone(cache.make_key(DummyValidator, (object(),), {},
+                                         "plugin", None, None, None))
+
+        cache.call(DummyValidator, None, func)
+        cache.call(DummyValidator, None, func)
+        self.assertEqual(2, func.call_count)
+        self.assertEqual(0, cache.stats["dummy_validator"]["cached"])
+
+    def test_validate_with_cache(self):
+        @plugin.base()
+        class DummyPluginBase(plugin.Plugin,
+                              validation.ValidatablePluginMixin):
+            pass
+
+        @validation.add(name="dummy_validator", foo="bar")
+        @plugin.configure(name="dummy_plugin")
+        class DummyPlugin(DummyPluginBase):
+            pass
+
+        cache = validation.ValidationCache()
+        # DummyValidator requires the admin of "foo" platform
+        creds = {"foo": {"admin": self._get_credential("admin")}}
+        with mock.patch.object(DummyValidator, "validate") as mock_validate:
+            mock_validate.return_value = None
+            for i in range(3):
+                result = DummyPluginBase.validate(
+                    name="dummy_plugin", credentials=creds,
+                    config={"bar": 1}, plugin_cfg={}, cache=cache)
+                self.assertEqual([], result)
+        mock_validate.assert_called_once_with(
+            credentials=creds, config={"bar": 1}, plugin_cls=DummyPlugin,
+            plugin_cfg={})
+        self.assertIn("dummy_validator", cache.report())
+
+        DummyPlugin.unregister()
+
+
 @ddt.ddt
 class RequiredPlatformValidatorTestCase(test.TestCase):
 
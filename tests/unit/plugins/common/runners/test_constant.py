@@ -16,6 +16,7 @@
 import ddt
 import mock
 
+from rally import exceptions
 from rally.plugins.common.runners import constant
 from rally.task import runner
 from tests.unit import fakes
@@ -26,6 +27,32 @@ RUNNERS_BASE = "rally.task.runner."
 RUNNERS = "rally.plugins.common.runners."
 
 
+class IterationHandleTestCase(test.TestCase):
+
+    @mock.patch(RUNNERS + "constant.utils")
+    def test_terminate(self, mock_utils):
+        handle = constant._IterationHandle()
+
+        self.assertTrue(handle.isAlive())
+        handle.terminate()
+        mock_utils.terminate_thread.assert_called_once_with(handle.ident)
+
+        handle.finish()
+        self.assertFalse(handle.isAlive())
+        mock_utils.cancel_thread_termination.assert_called_once_with(
+            handle.ident)
+
+    @mock.patch(RUNNERS + "constant.utils")
+    def test_terminate_finished(self, mock_utils):
+        handle = constant._IterationHandle()
+
+        handle.finish()
+        handle.terminate()
+
+        self.assertFalse(mock_utils.terminate_thread.called)
+        self.assertFalse(mock_utils.cancel_thread_termination.called)
+
+
 @ddt.ddt
 class ConstantScenarioRunnerTestCase(test.TestCase):
 
@@ -54,24 +81,11 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         else:
             self.assertGreater(len(results), 0)
 
-    @mock.patch(RUNNERS + "constant.runner")
-    def test__run_scenario_once_with_unpack_args(self, mock_runner):
-        result = constant._run_scenario_once_with_unpack_args(
-            ("FOO", ("BAR", "QUUZ")))
-
-        self.assertEqual(mock_runner._run_scenario_once.return_value, result)
-        mock_runner._run_scenario_once.assert_called_once_with(
-            "FOO", ("BAR", "QUUZ"))
-
-    @mock.patch(RUNNERS + "constant.time")
     @mock.patch(RUNNERS + "constant.threading.Thread")
     @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
     @mock.patch(RUNNERS + "constant.runner")
-    def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time):
-
-        mock_thread_instance = mock.MagicMock(
-            isAlive=mock.MagicMock(return_value=False))
+    def test__worker_process(self, mock_runner, mock_queue, mock_thread):
+        mock_thread_instance = mock.MagicMock()
         mock_thread.return_value = mock_thread_instance
 
         mock_event = mock.MagicMock(
@@ -80,6 +94,7 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
         mock_event_queue = mock.MagicMock()
 
         times = 4
+        concurrency = 2
 
         fake_ram_int = iter(range(10))
 
@@ -87,26 +102,122 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                               "id": "uuid1"}]}
         info = {"processes_to_start": 1, "processes_counter": 1}
 
-        constant._worker_process(mock_queue, fake_ram_int, 1, 2, times,
-                                 context, "Dummy", "dummy", (),
+        constant._worker_process(mock_queue, fake_ram_int, 1, concurrency,
+                                 times, None, context, "Dummy", "dummy", (),
                                  mock_event_queue, mock_event, info)
 
-        self.assertEqual(times + 1, mock_thread.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.start.call_count)
-        self.assertEqual(times + 1, mock_thread_instance.join.call_count)
-        # NOTE(rvasilets): `times` + 1 here because `times` the number of
-        # scenario repetition and one more need on "initialization" stage
-        # of the thread stuff.
-        self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
-            scenario_context = mock_runner._get_scenario_context(i, context)
-            call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
-                      mock_event_queue),
-                target=mock_runner._worker_thread,
-            )
-            self.assertIn(call, mock_thread.mock_calls)
+        # `concurrency` worker threads + one thread which watches timeouts.
+        self.assertEqual(concurrency + 1, mock_thread.call_count)
+        self.assertEqual(concurrency + 1,
+                         mock_thread_instance.start.call_count)
+        self.assertEqual(concurrency + 1,
+                         mock_thread_instance.join.call_count)
+        worker_calls = [c for c in mock_thread.call_args_list
+                        if c[1]["target"] == constant._worker_thread]
+        self.assertEqual(concurrency, len(worker_calls))
+        self.assertEqual(
+            (mock_queue, fake_ram_int, 1, times, None, context, "Dummy",
+             "dummy", (), mock_event_queue, mock_event),
+            worker_calls[0][1]["args"][:-1])
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_thread_runs_iterations(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event_queue = mock.MagicMock()
+        mock_timeout_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        times = 3
+
+        constant._worker_thread(mock_queue, iter(range(10)), 1, times,
+                                None, "context", "Dummy", "dummy", {},
+                                mock_event_queue, mock_event,
+                                mock_timeout_queue)
+
+        self.assertEqual(
+            [mock.call(i, "context") for i in range(times)],
+            mock_runner._get_scenario_context.call_args_list)
+        self.assertEqual(times, mock_runner._run_scenario_once.call_count)
+        mock_runner._run_scenario_once.assert_called_with(
+            "Dummy", "dummy", mock_runner._get_scenario_context.return_value,
+            {}, mock_event_queue)
+        self.assertEqual(
+            [mock.call(mock_runner._run_scenario_once.return_value)] * times,
+            mock_queue.put.call_args_list)
+        self.assertEqual(times, mock_timeout_queue.put.call_count)
+        for call in mock_timeout_queue.put.call_args_list:
+            handle, deadline = call[0][0]
+            self.assertFalse(handle.isAlive())
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_thread_timeout_outside_of_scenario(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+        error = exceptions.ThreadTimeoutException()
+        mock_runner._run_scenario_once.side_effect = [error, "result"]
+
+        constant._worker_thread(mock_queue, iter(range(10)), 1, 2, None,
+                                "context", "Dummy", "dummy", {},
+                                mock.MagicMock(), mock_event,
+                                mock.MagicMock())
+
+        mock_runner.format_result_on_timeout.assert_called_once_with(error, 1)
+        self.assertEqual(
+            [mock.call(mock_runner.format_result_on_timeout.return_value),
+             mock.call("result")],
+            mock_queue.put.call_args_list)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_thread_aborted(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=True))
+
+        constant._worker_thread(mock_queue, iter(range(10)), 0, 3, None,
+                                "context", "Dummy", "dummy", {},
+                                mock.MagicMock(), mock_event,
+                                mock.MagicMock())
+
+        self.assertFalse(mock_runner._run_scenario_once.called)
+        self.assertFalse(mock_queue.put.called)
+
+    @mock.patch(RUNNERS + "constant.time")
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_thread_stops_at_deadline(self, mock_runner, mock_time):
+        mock_time.time.side_effect = [10, 11, 12, 13, 14]
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+
+        constant._worker_thread(mock_queue, iter(range(10)), 0, None, 13,
+                                "context", "Dummy", "dummy", {},
+                                mock.MagicMock(), mock_event,
+                                mock.MagicMock())
+
+        # the first iteration is started without checking the deadline.
+        self.assertEqual(
+            [mock.call(i, "context") for i in range(4)],
+            mock_runner._get_scenario_context.call_args_list)
+        self.assertEqual(4, mock_queue.put.call_count)
+
+    @mock.patch(RUNNERS + "constant.time")
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_thread_runs_first_iteration_only(self, mock_runner,
+                                                      mock_time):
+        mock_time.time.return_value = 100
+        mock_queue = mock.MagicMock()
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=False))
+
+        constant._worker_thread(mock_queue, iter(range(10)), 0, None, 10,
+                                "context", "Dummy", "dummy", {},
+                                mock.MagicMock(), mock_event,
+                                mock.MagicMock())
+
+        mock_runner._get_scenario_context.assert_called_once_with(
+            0, "context")
+        self.assertEqual(1, mock_queue.put.call_count)
 
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
@@ -266,6 +377,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
         self.context = fakes.FakeContext({"task": {"uuid": "uuid"}}).context
         self.context["iteration"] = 14
         self.args = {"a": 1}
+        self.task = mock.MagicMock()
 
     @ddt.data(({"duration": 0, "concurrency": 2,
                 "timeout": 2, "type": "constant_for_duration"}, True),
@@ -281,7 +393,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
 
     def test_run_scenario_constantly_for_duration(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(
-            None, self.config)
+            self.task, self.config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "do_it",
                                  self.context, self.args)
@@ -294,7 +406,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
 
     def test_run_scenario_constantly_for_duration_exception(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(
-            None, self.config)
+            self.task, self.config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "something_went_wrong",
                                  self.context, self.args)
@@ -308,7 +420,7 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
 
     def test_run_scenario_constantly_for_duration_timeout(self):
         runner_obj = constant.ConstantForDurationScenarioRunner(
-            None, self.config)
+            self.task, self.config)
 
         runner_obj._run_scenario(fakes.FakeScenario, "raise_timeout",
                                  self.context, self.args)
@@ -321,17 +433,52 @@ class ConstantForDurationScenarioRunnerTestCase(test.TestCase):
         self.assertIn("error", runner_obj.result_queue[0][0])
 
     def test__run_scenario_constantly_aborted(self):
-        runner_obj = constant.ConstantForDurationScenarioRunner(None,
-                                                                self.config)
+        runner_obj = constant.ConstantForDurationScenarioRunner(
+            self.task, self.config)
 
         runner_obj.abort()
         runner_obj._run_scenario(fakes.FakeScenario, "do_it",
                                  self.context, self.args)
         self.assertEqual(len(runner_obj.result_queue), 0)
 
+    @mock.patch(RUNNERS + "constant.time")
+    @mock.patch(RUNNERS + "constant.multiprocessing.Queue")
+    @mock.patch(RUNNERS + "constant.multiprocessing.cpu_count")
+    @mock.patch(RUNNERS + "constant.ConstantForDurationScenarioRunner"
+                "._create_process_pool")
+    @mock.patch(RUNNERS + "constant.ConstantForDurationScenarioRunner"
+                "._join_processes")
+    def test__run_scenario_uses_worker_processes(
+            self, mock__join_processes, mock__create_process_pool,
+            mock_cpu_count, mock_queue, mock_time):
+        mock_cpu_count.return_value = 4
+        mock_time.time.return_value = 100
+        config = {"duration": 10, "concurrency": 10, "max_cpu_count": 3,
+                  "type": "constant_for_duration"}
+        runner_obj = constant.ConstantForDurationScenarioRunner(
+            self.task, config)
+
+        runner_obj._run_scenario(fakes.FakeScenario, "do_it", self.context,
+                                 self.args)
+
+        processes_to_start, worker_process, worker_args_gen = (
+            mock__create_process_pool.call_args[0])
+        self.assertEqual(3, processes_to_start)
+        self.assertEqual(constant._worker_process, worker_process)
+        worker_args = [next(worker_args_gen) for i in range(3)]
+        self.assertEqual([4, 3, 3], [a[3] for a in worker_args])
+        for args in worker_args:
+            # iterations are not limited by number, all processes share the
+            # same deadline.
+            self.assertEqual((None, 110), args[4:6])
+            self.assertEqual(runner_obj.aborted, args[-1])
+        mock__join_processes.assert_called_once_with(
+            mock__create_process_pool.return_value,
+            mock_queue.return_value, mock_queue.return_value)
+
     def test_abort(self):
-        runner_obj = constant.ConstantForDurationScenarioRunner(None,
-                                                                self.config)
+        runner_obj = constant.ConstantForDurationScenarioRunner(
+            self.task, self.config)
         self.assertFalse(runner_obj.aborted.is_set())
         runner_obj.abort()
         self.assertTrue(runner_obj.aborted.is_set())
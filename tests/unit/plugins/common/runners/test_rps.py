@@ -17,6 +17,7 @@ import ddt
 import mock
 
 from rally.plugins.common.runners import rps
+from rally.task.processing import charts
 from rally.task import runner
 from tests.unit import fakes
 from tests.unit import test
@@ -146,22 +147,29 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         else:
             self.assertGreater(len(results), 0)
 
-    @mock.patch(RUNNERS + "rps.LOG")
+    @ddt.data(
+        {"rps_cfg": 4, "expected": [0, 0.25, 0.5, 0.75, 1.0, 1.25]},
+        {"rps_cfg": {"start": 2, "end": 4, "step": 1},
+         "expected": [0, 0.5, 1.0, 1.3333, 1.6667, 2.0, 2.25, 2.5, 2.75, 3.0]},
+        {"rps_cfg": {"start": 1, "end": 2, "step": 1, "duration": 2},
+         "expected": [0, 1.0, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5]},
+        {"rps_cfg": {"start": 3, "end": 3, "step": 1},
+         "expected": [i / 3.0 for i in range(30)]}
+    )
+    @ddt.unpack
+    def test__get_launch_offsets(self, rps_cfg, expected):
+        offsets = rps._get_launch_offsets(rps_cfg)
+        actual = [round(next(offsets), 4) for i in range(len(expected))]
+        self.assertEqual([round(e, 4) for e in expected], actual)
+
     @mock.patch(RUNNERS + "rps.time")
+    @mock.patch(RUNNERS + "rps.threading.Semaphore")
     @mock.patch(RUNNERS + "rps.threading.Thread")
     @mock.patch(RUNNERS + "rps.multiprocessing.Queue")
     @mock.patch(RUNNERS + "rps.runner")
     def test__worker_process(self, mock_runner, mock_queue, mock_thread,
-                             mock_time, mock_log):
-
-        def time_side():
-            time_side.last += 0.03
-            time_side.count += 1
-            return time_side.last
-        time_side.last = 0
-        time_side.count = 0
-
-        mock_time.time = time_side
+                             mock_semaphore, mock_time):
+        mock_time.time.return_value = 100
 
         mock_thread_instance = mock.MagicMock(
             isAlive=mock.MagicMock(return_value=False))
@@ -179,16 +187,13 @@ class RPSScenarioRunnerTestCase(test.TestCase):
 
         context = {"users": [{"tenant_id": "t1", "credential": "c1",
                               "id": "uuid1"}]}
-        info = {"processes_to_start": 1, "processes_counter": 1}
-        mock_runs_per_second = mock.MagicMock(return_value=10)
+        info = {"processes_to_start": 2, "processes_counter": 1}
 
         rps._worker_process(mock_queue, fake_ram_int, 1, times,
                             max_concurrent, context, "Dummy", "dummy",
-                            (), mock_event_queue, mock_event,
-                            mock_runs_per_second, 10, 1,
+                            (), mock_event_queue, mock_event, 10, 100,
                             info)
 
-        self.assertEqual(times, mock_log.debug.call_count)
         self.assertEqual(times + 1, mock_thread.call_count)
         self.assertEqual(times + 1, mock_thread_instance.start.call_count)
         self.assertEqual(times + 1, mock_thread_instance.join.call_count)
@@ -196,34 +201,81 @@ class RPSScenarioRunnerTestCase(test.TestCase):
         # scenario repetition and one more need on "initialization" stage
         # of the thread stuff.
 
-        self.assertEqual(1, mock_time.sleep.call_count)
-        self.assertEqual(2, mock_thread_instance.isAlive.call_count)
-        self.assertEqual(times * 4 - 1, mock_time.time.count)
+        # the second process takes odd launches of the schedule with 0.1 sec
+        # interval
+        self.assertEqual(
+            [mock.call(0.1), mock.call(0.3), mock.call(0.5), mock.call(0.7)],
+            [mock.call(round(c[0][0], 4))
+             for c in mock_time.sleep.call_args_list])
 
         self.assertEqual(times, mock_runner._get_scenario_context.call_count)
-
-        for i in range(times):
+        # worker threads are mocked, so slots are never released
+        mock_semaphore.assert_called_once_with(max_concurrent)
+        self.assertEqual(times, mock_semaphore.return_value.acquire.call_count)
+        self.assertFalse(mock_semaphore.return_value.release.called)
+
+        worker_calls = [c for c in mock_thread.call_args_list
+                        if c[1]["target"] == rps._worker_thread]
+        self.assertEqual(times, len(worker_calls))
+        for i, call in enumerate(worker_calls):
             scenario_context = mock_runner._get_scenario_context(i, context)
-            call = mock.call(
-                args=(mock_queue, "Dummy", "dummy", scenario_context, (),
-                      mock_event_queue),
-                target=mock_runner._worker_thread,
-            )
-            self.assertIn(call, mock_thread.mock_calls)
+            queue, scheduled_at, cls, method, ctx, args, event_queue = (
+                call[1]["args"][:-1])
+            self.assertEqual(round(100 + 0.1 + 0.2 * i, 4),
+                             round(scheduled_at, 4))
+            self.assertEqual(
+                (mock_queue, "Dummy", "dummy", scenario_context, (),
+                 mock_event_queue),
+                (queue, cls, method, ctx, args, event_queue))
+
+    @mock.patch(RUNNERS + "rps.time")
+    @mock.patch(RUNNERS + "rps.threading.Thread")
+    @mock.patch(RUNNERS + "rps.runner")
+    def test__worker_process_aborted(self, mock_runner, mock_thread,
+                                     mock_time):
+        mock_time.time.return_value = 100
+        mock_event = mock.MagicMock(
+            is_set=mock.MagicMock(return_value=True))
+        info = {"processes_to_start": 1, "processes_counter": 0}
+
+        rps._worker_process(mock.MagicMock(), iter(range(10)), 0, 4, 3,
+                            {}, "Dummy", "dummy", (), mock.MagicMock(),
+                            mock_event, 10, 100, info)
+
+        self.assertFalse(mock_thread.called)
+        self.assertFalse(mock_runner._get_scenario_context.called)
 
     @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
+        mock__run_scenario_once.return_value = {
+            "timestamp": 12.5, "output": {"additive": [], "complete": []}}
         mock_queue = mock.MagicMock()
         mock_event_queue = mock.MagicMock()
+        mock_slots = mock.MagicMock()
         args = ("fake_cls", "fake_method_name", "fake_context_obj", {},
                 mock_event_queue)
 
-        runner._worker_thread(mock_queue, *args)
+        rps._worker_thread(mock_queue, 10, *(args + (mock_slots, )))
 
-        self.assertEqual(1, mock_queue.put.call_count)
+        mock__run_scenario_once.assert_called_once_with(*args)
+        mock_queue.put.assert_called_once_with(
+            mock__run_scenario_once.return_value)
+        additive = mock__run_scenario_once.return_value["output"]["additive"]
+        self.assertEqual(1, len(additive))
+        self.assertEqual([["start lag", 2.5]], additive[0]["data"])
+        self.assertIsNone(charts.validate_output("additive", additive[0]))
+        mock_slots.release.assert_called_once_with()
 
-        expected_calls = [mock.call(*args)]
-        self.assertEqual(expected_calls, mock__run_scenario_once.mock_calls)
+    @mock.patch(RUNNERS + "rps.runner._run_scenario_once")
+    def test__worker_thread_releases_slot_on_failure(
+            self, mock__run_scenario_once):
+        mock__run_scenario_once.side_effect = KeyboardInterrupt
+        mock_slots = mock.MagicMock()
+
+        self.assertRaises(KeyboardInterrupt, rps._worker_thread,
+                          mock.MagicMock(), 10, "fake_cls", "fake_method",
+                          {}, {}, mock.MagicMock(), mock_slots)
+        mock_slots.release.assert_called_once_with()
 
     @ddt.data(
         {
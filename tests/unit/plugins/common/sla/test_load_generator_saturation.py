@@ -0,0 +1,82 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import ddt
+
+from rally.plugins.common.sla import load_generator_saturation as saturation
+from rally.task import sla
+from tests.unit import test
+
+
+def _sample(*cpu):
+    return {"timestamp": 1, "queue_depth": 0,
+            "processes": [{"pid": i, "cpu": c} for i, c in enumerate(cpu)]}
+
+
+@ddt.ddt
+class MaxLoadGeneratorSaturationTestCase(test.TestCase):
+
+    @ddt.data(({"max_cpu_percent": 80, "max_saturated_percent": 5}, True),
+              ({"max_cpu_percent": 80}, True),
+              ({}, True),
+              ({"max_cpu_percent": 101}, False),
+              ({"max_saturated_percent": -1}, False),
+              ({"foo": 10}, False))
+    @ddt.unpack
+    def test_validate(self, config, valid):
+        results = sla.SLA.validate("max_load_generator_saturation",
+                                   None, None, config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertEqual(1, len(results))
+
+    def test_add_load_generator_sample(self):
+        sla_inst = saturation.MaxLoadGeneratorSaturation(
+            {"max_cpu_percent": 90, "max_saturated_percent": 40})
+
+        self.assertTrue(sla_inst.add_load_generator_sample(_sample(10, 20)))
+        self.assertTrue(sla_inst.add_load_generator_sample(_sample(90, 20)))
+        self.assertTrue(sla_inst.add_load_generator_sample(_sample(10, 95)))
+        # 2 of 4 samples are saturated
+        self.assertFalse(sla_inst.add_load_generator_sample(_sample(99)))
+        self.assertEqual("Failed", sla_inst.status())
+        self.assertFalse(sla_inst.add_iteration({"error": []}))
+
+    def test_result_no_samples(self):
+        sla_inst = saturation.MaxLoadGeneratorSaturation({})
+        self.assertTrue(sla_inst.add_iteration({"error": []}))
+        self.assertTrue(sla_inst.result()["success"])
+
+    def test_merge(self):
+        samples = [[_sample(95), _sample(10)],
+                   [_sample(10), _sample(10, 10), _sample(10, 100)]]
+        single_sla = saturation.MaxLoadGeneratorSaturation({})
+        slas = []
+        for part in samples:
+            sla_inst = saturation.MaxLoadGeneratorSaturation({})
+            for sample in part:
+                single_sla.add_load_generator_sample(sample)
+                sla_inst.add_load_generator_sample(sample)
+            slas.append(sla_inst)
+
+        merged_sla = slas[0]
+        merged_sla.merge(slas[1])
+
+        self.assertEqual(single_sla.success, merged_sla.success)
+        self.assertEqual(single_sla.saturated, merged_sla.saturated)
+        self.assertEqual(single_sla.total, merged_sla.total)
+        self.assertEqual(single_sla.details(), merged_sla.details())
@@ -0,0 +1,90 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import ddt
+
+from rally.plugins.common.sla import max_percentile_duration
+from rally.task import sla
+from tests.unit import test
+
+
+@ddt.ddt
+class MaxPercentileDurationTestCase(test.TestCase):
+
+    @ddt.data(({"percentile": 95, "max": 1.5}, True),
+              ({"percentile": 100, "max": 1.5}, True),
+              ({"percentile": 101, "max": 1.5}, False),
+              ({"percentile": 0, "max": 1.5}, False),
+              ({"percentile": 95, "max": 0}, False),
+              ({"percentile": 95}, False))
+    @ddt.unpack
+    def test_validate(self, config, valid):
+        results = sla.SLA.validate("max_percentile_duration", None, None,
+                                   config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertEqual(1, len(results))
+
+    @ddt.data(([1.0, 2.0, 3.0, 4.0, 5.0], 4.9, True, "Passed"),
+              ([1.0, 2.0, 3.0, 4.0, 5.0], 4.5, False, "Failed"),
+              ([], 1.0, True, "Passed"))
+    @ddt.unpack
+    def test_result(self, durations, max_duration, success, status):
+        sla_inst = max_percentile_duration.MaxPercentileDuration(
+            {"percentile": 90, "max": max_duration})
+        for duration in durations:
+            sla_inst.add_iteration({"duration": duration})
+        # an error does not affect the percentile
+        sla_inst.add_iteration({"duration": 100.0, "error": ["error"]})
+
+        self.assertIs(success, sla_inst.result()["success"])
+        self.assertEqual(status, sla_inst.status())
+
+    @ddt.data((90, 4.5, False), (100, 5.0, True), (100, 4.9, False))
+    @ddt.unpack
+    def test_result_100th_percentile(self, percentile, max_duration,
+                                     success):
+        sla_inst = max_percentile_duration.MaxPercentileDuration(
+            {"percentile": percentile, "max": max_duration})
+        for duration in [1.0, 2.0, 3.0, 4.0, 5.0]:
+            sla_inst.add_iteration({"duration": duration})
+
+        self.assertIs(success, sla_inst.result()["success"])
+
+    @ddt.data([[1.0, 2.0, 1.5, 4.3],
+               [2.1, 3.4, 1.2, 6.3, 7.2, 7.0, 1.],
+               [1.1, 1.1, 2.2, 2.2, 3.3, 4.3]])
+    def test_merge(self, durations):
+        config = {"percentile": 50, "max": 2.2}
+        single_sla = max_percentile_duration.MaxPercentileDuration(config)
+        for dd in durations:
+            for d in dd:
+                single_sla.add_iteration({"duration": d})
+
+        slas = [max_percentile_duration.MaxPercentileDuration(config)
+                for _ in durations]
+        for idx, sla_inst in enumerate(slas):
+            for duration in durations[idx]:
+                sla_inst.add_iteration({"duration": duration})
+
+        merged_sla = slas[0]
+        for sla_inst in slas[1:]:
+            merged_sla.merge(sla_inst)
+
+        self.assertEqual(single_sla.success, merged_sla.success)
+        self.assertEqual(single_sla.percentile_comp.result(),
+                         merged_sla.percentile_comp.result())
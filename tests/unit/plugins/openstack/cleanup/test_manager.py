@@ -13,11 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import mock
 
 from rally.common import utils
 from rally.plugins.openstack.cleanup import base
 from rally.plugins.openstack.cleanup import manager
+from rally.plugins.openstack.cleanup import resources
 from tests.unit import test
 
 
@@ -98,6 +101,7 @@ class SeekAndDestroyTestCase(test.TestCase):
     def _manager(self, list_side_effect, **kw):
         mock_mgr = mock.MagicMock()
         mock_mgr().list.side_effect = list_side_effect
+        mock_mgr().list_all_tenants.return_value = None
         mock_mgr.reset_mock()
 
         for k, v in kw.items():
@@ -209,6 +213,66 @@ class SeekAndDestroyTestCase(test.TestCase):
         self.assertTrue(mock_log.warning.mock_called)
         self.assertTrue(mock_log.exception.mock_called)
 
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__publisher_all_tenants(self, mock__get_cached_client):
+        queue = []
+        published_before = []
+
+        @base.resource("foo", "bar", tenant_resource=True)
+        class FooManager(base.ResourceManager):
+            list = mock.Mock()
+
+            def list_all_tenants(self):
+                for t in "abcab":
+                    published_before.append(len(queue))
+                    yield mock.Mock(tenant_id=t)
+
+        admin = mock.MagicMock()
+        users = [{"tenant_id": "a", "id": 1}, {"tenant_id": "a", "id": 2},
+                 {"tenant_id": "b", "id": 3}]
+        publish = manager.SeekAndDestroy(FooManager, admin, users)._publisher
+
+        publish(queue)
+        self.assertEqual(
+            [(admin, users[0]), (admin, users[2]),
+             (admin, users[0]), (admin, users[2])],
+            [(a, u) for a, u, r in queue])
+        self.assertEqual(["a", "b", "a", "b"],
+                         [r.tenant_id for a, u, r in queue])
+        # jobs are published while the next resources are being listed
+        self.assertEqual([0, 1, 2, 2, 3], published_before)
+        self.assertFalse(FooManager.list.called)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__publisher_all_tenants_fails(self, mock__get_cached_client,
+                                          mock_log):
+        res_a1 = mock.Mock(id="a1", tenant_id="a")
+        res_a2 = mock.Mock(id="a2", tenant_id="a")
+        res_b = mock.Mock(id="b", tenant_id="b")
+
+        @base.resource("foo", "bar", tenant_resource=True)
+        class FooManager(base.ResourceManager):
+            def list(self):
+                return {"a": [res_a1, res_a2], "b": [res_b]}[self.tenant_uuid]
+
+            def list_all_tenants(self):
+                # the first page is listed, the second one fails
+                yield res_a1
+                raise RuntimeError()
+
+        admin = mock.MagicMock()
+        users = [{"tenant_id": "a", "id": 1}, {"tenant_id": "b", "id": 2}]
+        publish = manager.SeekAndDestroy(FooManager, admin, users)._publisher
+
+        queue = []
+        publish(queue)
+        # the already published resource is not published again
+        self.assertEqual([(admin, users[0], res_a1),
+                          (admin, users[0], res_a2),
+                          (admin, users[1], res_b)], queue)
+        self.assertTrue(mock_log.warning.called)
+
     @mock.patch("rally.common.utils.name_matches_object")
     @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
     @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
@@ -283,6 +347,73 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
+    @mock.patch("rally.common.utils.name_matches_object",
+                return_value=True)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    @mock.patch("%s.SeekAndDestroy._request_deletion" % BASE)
+    @mock.patch("%s.SeekAndDestroy._delete_single_resource" % BASE)
+    def test__consumer_confirm_by_list(self, mock__delete_single_resource,
+                                       mock__request_deletion,
+                                       mock__get_cached_client,
+                                       mock_name_matches_object):
+        @base.resource("foo", "bar")
+        class FooManager(base.ResourceManager):
+            pass
+
+        destroyer = manager.SeekAndDestroy(FooManager, None, None)
+        user = {"id": "a", "tenant_id": "uuid1"}
+        mock__request_deletion.side_effect = [True, True, False]
+        for res_id in ("id1", "id2", "id3"):
+            destroyer._consumer({}, (None, user, mock.Mock(id=res_id)))
+
+        self.assertFalse(mock__delete_single_resource.called)
+        self.assertEqual(3, mock__request_deletion.call_count)
+        self.assertEqual([(None, user, {"id1", "id2"})],
+                         list(destroyer._pending.values()))
+
+    @mock.patch("%s.rutils.interruptable_sleep" % BASE)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__confirm_deletion(self, mock__get_cached_client,
+                               mock_interruptable_sleep):
+        listed = [[mock.Mock(id="id1", status="ACTIVE"),
+                   mock.Mock(id="id2", status="DELETED"),
+                   mock.Mock(id="id3", status="ACTIVE")],
+                  [mock.Mock(id="id3", status="ACTIVE")],
+                  []]
+
+        @base.resource("foo", "bar", timeout=10)
+        class FooManager(base.ResourceManager):
+            def list(self):
+                return listed.pop(0)
+
+        user = {"id": "a", "tenant_id": "uuid1"}
+        destroyer = manager.SeekAndDestroy(FooManager, None, [user])
+        destroyer._pending[(id(None), id(user))] = (
+            None, user, {"id1", "id2", "id3"})
+        destroyer._confirm_deletion()
+
+        self.assertEqual({}, destroyer._pending)
+        self.assertEqual(["id1", "id2", "id3"], sorted(destroyer._deleted))
+        self.assertEqual([], destroyer._failed)
+        self.assertEqual(2, mock_interruptable_sleep.call_count)
+
+    @mock.patch("%s.LOG" % BASE)
+    @mock.patch("%s.SeekAndDestroy._get_cached_client" % BASE)
+    def test__confirm_deletion_timeout(self, mock__get_cached_client,
+                                       mock_log):
+        @base.resource("foo", "bar", timeout=0)
+        class FooManager(base.ResourceManager):
+            def list(self):
+                return [mock.Mock(id="id1", status="ACTIVE")]
+
+        destroyer = manager.SeekAndDestroy(FooManager, None, None)
+        destroyer._pending[(id(None), id(None))] = (None, None, {"id1"})
+        destroyer._confirm_deletion()
+
+        self.assertEqual({}, destroyer._pending)
+        self.assertEqual(["id1"], destroyer._failed)
+        self.assertEqual(1, mock_log.warning.call_count)
+
     @mock.patch("%s.broker.run" % BASE)
     def test_exterminate(self, mock_broker_run):
         manager_cls = mock.MagicMock(_threads=5)
@@ -294,6 +425,7 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock_broker_run.assert_called_once_with(cleaner._publisher,
                                                 cleaner._consumer,
                                                 consumers_count=5)
+        self.assertEqual({}, cleaner._pending)
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -361,10 +493,85 @@ class ResourceManagerTestCase(test.TestCase):
                          manager.find_resource_managers(names=["fake"],
                                                         admin_required=False))
 
+    def test_make_cleanup_plan(self):
+        def mgr(service, independent=False):
+            return mock.Mock(_service=service, _independent=independent)
+
+        managers = [mgr("heat"), mgr("nova"), mgr("nova"),
+                    mgr("glance", True), mgr("cinder"),
+                    mgr("swift", True), mgr("swift", True), mgr("keystone")]
+        self.assertEqual(
+            [(managers[0:1], []),
+             (managers[1:3], [0]),
+             (managers[3:4], []),
+             (managers[4:5], [0, 1]),
+             (managers[5:7], []),
+             (managers[7:8], [0, 1, 3])],
+            manager.make_cleanup_plan(managers))
+
+    def test_make_cleanup_plan_glance_after_cinder(self):
+        # image volumes cache of cinder is found by glance images
+        managers = manager.find_resource_managers(["cinder", "glance"])
+        plan = manager.make_cleanup_plan(managers)
+
+        self.assertEqual(2, len(plan))
+        cinder_managers, cinder_depends_on = plan[0]
+        glance_managers, glance_depends_on = plan[1]
+        self.assertIn(resources.CinderImageVolumeCache, cinder_managers)
+        self.assertEqual([resources.GlanceImage], glance_managers)
+        self.assertEqual([0], glance_depends_on)
+
+    @mock.patch("rally.common.plugin.discover.itersubclasses",
+                return_value=[])
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE)
+    def test_cleanup_independent(self, mock_find_resource_managers,
+                                 mock_seek_and_destroy, mock_itersubclasses):
+        started = threading.Event()
+
+        def exterminate():
+            # the dependent group can not start before the first one
+            # finishes, while the independent one runs concurrently
+            self.assertTrue(started.wait(5))
+
+        def seek_and_destroy(mgr, *args, **kwargs):
+            destroyer = mock.Mock()
+            if mgr is independent:
+                destroyer.exterminate.side_effect = started.set
+            elif mgr is first:
+                destroyer.exterminate.side_effect = exterminate
+            return destroyer
+
+        first = mock.Mock(_service="a", _independent=False)
+        independent = mock.Mock(_service="b", _independent=True)
+        last = mock.Mock(_service="c", _independent=False)
+        mock_find_resource_managers.return_value = [first, independent, last]
+        mock_seek_and_destroy.side_effect = seek_and_destroy
+
+        manager.cleanup(names=["a", "b", "c"], admin="admin")
+
+        self.assertEqual(3, mock_seek_and_destroy.call_count)
+        self.assertEqual(last, mock_seek_and_destroy.call_args[0][0])
+
+    @mock.patch("rally.common.plugin.discover.itersubclasses",
+                return_value=[])
+    @mock.patch("%s.SeekAndDestroy" % BASE)
+    @mock.patch("%s.find_resource_managers" % BASE,
+                return_value=[
+                    mock.MagicMock(_service="a", _independent=False),
+                    mock.MagicMock(_service="b", _independent=False)])
+    def test_cleanup_fails(self, mock_find_resource_managers,
+                           mock_seek_and_destroy, mock_itersubclasses):
+        mock_seek_and_destroy.return_value.exterminate.side_effect = (
+            RuntimeError)
+        self.assertRaises(RuntimeError, manager.cleanup, names=["a", "b"])
+
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[
+                    mock.MagicMock(_service="a", _independent=False),
+                    mock.MagicMock(_service="b", _independent=False)])
     def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy,
                      mock_itersubclasses):
         class A(utils.RandomNameGeneratorMixin):
@@ -396,7 +603,9 @@ class ResourceManagerTestCase(test.TestCase):
     @mock.patch("rally.common.plugin.discover.itersubclasses")
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
-                return_value=[mock.MagicMock(), mock.MagicMock()])
+                return_value=[
+                    mock.MagicMock(_service="a", _independent=False),
+                    mock.MagicMock(_service="b", _independent=False)])
     def test_cleanup_with_api_versions(self,
                                        mock_find_resource_managers,
                                        mock_seek_and_destroy,
@@ -84,6 +84,30 @@ class NovaServerTestCase(test.TestCase):
 
         server._manager.return_value.list.assert_called_once_with(limit=-1)
 
+    def test_list_all_tenants(self):
+        admin = mock.Mock()
+        servers = [mock.Mock(id=i) for i in range(1500)]
+        # the service may return pages shorter than requested
+        admin.nova.return_value.servers.list.side_effect = [
+            servers[:500], servers[500:], []]
+
+        server = resources.NovaServer(admin=admin)
+        self.assertEqual(servers, list(server.list_all_tenants()))
+        admin.nova.return_value.servers.list.assert_has_calls([
+            mock.call(marker=None, limit=1000,
+                      search_opts={"all_tenants": True}),
+            mock.call(marker=499, limit=1000,
+                      search_opts={"all_tenants": True}),
+            mock.call(marker=1499, limit=1000,
+                      search_opts={"all_tenants": True})])
+
+        self.assertIsNone(resources.NovaServer().list_all_tenants())
+
+    def test_tenant_id(self):
+        raw_res = mock.Mock(tenant_id="foo")
+        self.assertEqual(
+            "foo", resources.NovaServer(resource=raw_res).tenant_id())
+
     def test_delete(self):
         server = resources.NovaServer()
         server.raw_resource = mock.Mock()
@@ -430,6 +454,37 @@ class NeutronFloatingIPTestCase(test.TestCase):
 
 class NeutronPortTestCase(test.TestCase):
 
+    def test_list_all_tenants(self):
+        admin = mock.MagicMock()
+        neutron = admin.neutron.return_value
+        ports = [
+            {"id": "p1", "name": "foo", "tenant_id": "t1",
+             "device_owner": "compute:nova", "device_id": "s1"},
+            {"id": "p2", "name": "", "tenant_id": "t2",
+             "device_owner": "network:router_interface", "device_id": "r1"},
+            {"id": "p3", "name": "", "tenant_id": "t2",
+             "device_owner": "network:router_gateway", "device_id": "r2"}]
+        neutron.list_ports.return_value = iter([{"ports": ports[:1]},
+                                                {"ports": ports[1:]}])
+        neutron.list_routers.return_value = {
+            "routers": [{"id": "r1", "name": "router"}]}
+
+        user = mock.MagicMock()
+        port = resources.NeutronPort(admin=admin, user=user)
+        result = list(port.list_all_tenants())
+
+        self.assertEqual(ports, result)
+        self.assertEqual("router", result[1]["parent_name"])
+        self.assertNotIn("parent_name", result[2])
+        neutron.list_ports.assert_called_once_with(retrieve_all=False)
+        neutron.list_routers.assert_called_once_with()
+        self.assertEqual(
+            "t2", resources.NeutronPort(resource=result[1]).tenant_id())
+        self.assertFalse(user.neutron.called)
+
+        self.assertIsNone(
+            resources.NeutronPort(user=user).list_all_tenants())
+
     def test_delete(self):
         raw_res = {"device_owner": "abbabaab", "id": "some_id"}
         user = mock.MagicMock()
@@ -1045,6 +1100,30 @@ class WatcherActionPlanTestCase(test.TestCase):
         watcher._manager().list.assert_called_once_with(limit=0)
 
 
+class CinderVolumeTestCase(test.TestCase):
+
+    def test_list_all_tenants(self):
+        admin = mock.Mock()
+        volumes = [mock.Mock(id=i) for i in range(3)]
+        admin.cinder.return_value.volumes.list.side_effect = [volumes, []]
+
+        volume = resources.CinderVolume(admin=admin)
+        self.assertEqual(volumes, list(volume.list_all_tenants()))
+        admin.cinder.return_value.volumes.list.assert_has_calls([
+            mock.call(marker=None, limit=1000,
+                      search_opts={"all_tenants": True}),
+            mock.call(marker=2, limit=1000,
+                      search_opts={"all_tenants": True})])
+
+        self.assertIsNone(resources.CinderVolume().list_all_tenants())
+
+    def test_tenant_id(self):
+        raw_res = mock.Mock()
+        setattr(raw_res, "os-vol-tenant-attr:tenant_id", "foo")
+        self.assertEqual(
+            "foo", resources.CinderVolume(resource=raw_res).tenant_id())
+
+
 class CinderImageVolumeCacheTestCase(test.TestCase):
 
     class Resource(object):
@@ -13,8 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import ddt
 import mock
 
+from rally.common import broker
 from rally import consts
 from rally import exceptions
 from rally.plugins.openstack.context.keystone import users
@@ -24,6 +26,7 @@ from tests.unit import test
 CTX = "rally.plugins.openstack.context.keystone.users"
 
 
+@ddt.ddt
 class UserGeneratorTestCase(test.ScenarioTestCase):
 
     tenants_num = 1
@@ -130,30 +133,72 @@ class UserGeneratorTestCase(test.ScenarioTestCase):
         user_net = user2.neutron.return_value
         user_net.list_security_groups.assert_called_once_with()
         admin_neutron = admin_clients.neutron.return_value
-        self.assertEqual(
-            [mock.call("id-1"), mock.call("id-3")],
-            admin_neutron.delete_security_group.call_args_list)
+        admin_neutron.delete_security_group.assert_has_calls(
+            [mock.call("id-1"), mock.call("id-3")], any_order=True)
+        self.assertEqual(2, admin_neutron.delete_security_group.call_count)
 
     @mock.patch("%s.identity" % CTX)
-    def test__create_tenants(self, mock_identity):
-        self.context["config"]["users"]["tenants"] = 1
+    def test__create_tenants_and_users(self, mock_identity):
+        self.context["config"]["users"]["tenants"] = 3
+        self.context["config"]["users"]["users_per_tenant"] = 2
+        identity_service = mock_identity.Identity.return_value
+        identity_service.create_project.side_effect = [
+            mock.Mock(id="t%d" % i) for i in range(3)]
         user_generator = users.UserGenerator(self.context)
-        tenants = user_generator._create_tenants()
-        self.assertEqual(1, len(tenants))
-        id, tenant = tenants.popitem()
-        self.assertIn("name", tenant)
 
+        tenants, users_ = user_generator._create_tenants_and_users()
+
+        self.assertEqual(set(["t0", "t1", "t2"]), set(tenants))
+        self.assertEqual(6, len(users_))
+        self.assertEqual(["t0", "t0", "t1", "t1", "t2", "t2"],
+                         sorted(u["tenant_id"] for u in users_))
+        for user in users_:
+            self.assertEqual(tenants[user["tenant_id"]]["name"],
+                             user["credential"].tenant_name)
+        self.assertEqual(3,
+                         user_generator.execution_stats["tenants"]["jobs"])
+        self.assertEqual(6, user_generator.execution_stats["users"]["jobs"])
+
+    @ddt.data((1, 1, [1, 1]), (2, 1, [1, 1]), (10, 1, [5, 5]),
+              (10, 3, [2, 8]), (3, 5, [1, 2]))
+    @ddt.unpack
+    @mock.patch("%s.broker.run" % CTX, side_effect=broker.run)
     @mock.patch("%s.identity" % CTX)
-    def test__create_users(self, mock_identity):
-        self.context["config"]["users"]["users_per_tenant"] = 2
+    def test__create_tenants_and_users_workers(self, workers,
+                                               users_per_tenant,
+                                               expected_threads,
+                                               mock_identity,
+                                               mock_broker_run):
+        self.context["config"]["users"].update({
+            "tenants": 2, "users_per_tenant": users_per_tenant,
+            "resource_management_workers": workers})
+        identity_service = mock_identity.Identity.return_value
+        identity_service.create_project.side_effect = [
+            mock.Mock(id="t%d" % i) for i in range(2)]
         user_generator = users.UserGenerator(self.context)
-        user_generator.context["tenants"] = {"t1": {"id": "t1", "name": "t1"},
-                                             "t2": {"id": "t2", "name": "t2"}}
-        users_ = user_generator._create_users()
-        self.assertEqual(4, len(users_))
-        for user in users_:
-            self.assertIn("id", user)
-            self.assertIn("credential", user)
+
+        tenants, users_ = user_generator._create_tenants_and_users()
+
+        self.assertEqual(2 * users_per_tenant, len(users_))
+        # tenants and users stages share the workers
+        self.assertEqual(expected_threads,
+                         sorted(c[0][2]
+                                for c in mock_broker_run.call_args_list))
+
+    @mock.patch("%s.identity" % CTX)
+    def test__create_tenants_and_users_tenant_failure(self, mock_identity):
+        self.context["config"]["users"]["tenants"] = 2
+        identity_service = mock_identity.Identity.return_value
+        identity_service.create_project.side_effect = [
+            mock.Mock(id="t0"), Exception()]
+        user_generator = users.UserGenerator(self.context)
+
+        tenants, users_ = user_generator._create_tenants_and_users()
+
+        self.assertEqual(["t0"], list(tenants))
+        self.assertEqual(self.users_per_tenant, len(users_))
+        self.assertEqual(1,
+                         user_generator.execution_stats["tenants"]["failed"])
 
     @mock.patch("%s.identity" % CTX)
     def test__delete_tenants(self, mock_identity):
@@ -204,6 +249,10 @@ class UserGeneratorTestCase(test.ScenarioTestCase):
             self.assertEqual(len(ctx.context["tenants"]),
                              self.tenants_num)
             self.assertEqual("random", ctx.context["user_choice_method"])
+            self.assertEqual(
+                {"tenants": self.tenants_num, "users": self.users_num},
+                {k: ctx.execution_stats[k]["jobs"]
+                 for k in ("tenants", "users")})
 
         # Cleanup (called by content manager)
         self.assertEqual(len(ctx.context["users"]), 0)
@@ -293,7 +342,8 @@ class UserGeneratorTestCase(test.ScenarioTestCase):
         }
 
         user_generator = users.UserGenerator(config)
-        users_ = user_generator._create_users()
+        tenants, users_ = user_generator._create_tenants_and_users()
+        self.assertEqual(2, len(users_))
 
         for user in users_:
             self.assertEqual("internal", user["credential"].endpoint_type)
@@ -315,7 +365,9 @@ class UserGeneratorTestCase(test.ScenarioTestCase):
         }
 
         user_generator = users.UserGenerator(config)
-        users_ = user_generator._create_users()
+        tenants, users_ = user_generator._create_tenants_and_users()
+        self.assertEqual(2, len(users_))
 
         for user in users_:
-            self.assertEqual("public", user["credential"].endpoint_type)
+            # the endpoint type is left unset, so clients use the public one
+            self.assertIsNone(user["credential"].endpoint_type)
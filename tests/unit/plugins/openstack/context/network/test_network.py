@@ -17,6 +17,7 @@ import ddt
 import mock
 import netaddr
 
+from rally import exceptions
 from rally.plugins.openstack.context.network import networks as network_context
 from tests.unit import test
 
@@ -90,7 +91,7 @@ class NetworkTestCase(test.TestCase):
                       subnets_num=1, network_create_args={"fakearg": "fake"},
                       **dns_kwargs)
             for user, tenant in mock_utils.iterate_per_tenants.return_value]
-        mock_create.assert_has_calls(create_calls)
+        mock_create.assert_has_calls(create_calls, any_order=True)
 
         mock_utils.iterate_per_tenants.assert_called_once_with(
             net_context.context["users"])
@@ -102,6 +103,20 @@ class NetworkTestCase(test.TestCase):
         self.assertSequenceEqual(sorted(expected_networks),
                                  sorted(actual_networks))
 
+    @mock.patch(NET + "wrap")
+    @mock.patch("rally.plugins.openstack.context.network.networks.utils")
+    @mock.patch("rally.osclients.Clients")
+    def test_setup_fails(self, mock_clients, mock_utils, mock_wrap):
+        mock_utils.iterate_per_tenants.return_value = [
+            ("foo_user", "foo_tenant"),
+            ("bar_user", "bar_tenant")]
+        mock_wrap.return_value.create_network.side_effect = [
+            "foo_tenant-net", Exception()]
+        net_context = network_context.Network(self.get_context())
+
+        self.assertRaises(exceptions.ContextSetupFailure, net_context.setup)
+        self.assertEqual(1, net_context.execution_stats["networks"]["failed"])
+
     @mock.patch("rally.osclients.Clients")
     @mock.patch(NET + "wrap")
     def test_cleanup(self, mock_wrap, mock_clients):
@@ -17,6 +17,7 @@ import copy
 
 import mock
 
+from rally import exceptions
 from rally.plugins.openstack.context.nova import servers
 from rally.plugins.openstack.scenarios.nova import utils as nova_utils
 from tests.unit import fakes
@@ -47,8 +48,11 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
             "tenants": self._gen_tenants(tenants_count)})
 
         inst = servers.ServerGenerator(self.context)
-        self.assertEqual({"auto_assign_nic": False, "servers_per_tenant": 5},
-                         inst.config)
+        self.assertEqual(
+            {"auto_assign_nic": False, "servers_per_tenant": 5,
+             "resource_management_workers":
+                 servers.CONF.users_context.resource_management_workers},
+            inst.config)
 
     @mock.patch("%s.nova.utils.NovaScenario._boot_servers" % SCN,
                 return_value=[
@@ -104,6 +108,9 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
         })
 
         new_context = copy.deepcopy(self.context)
+        new_context["config"]["servers"]["resource_management_workers"] = (
+            servers.ServerGenerator.DEFAULT_CONFIG[
+                "resource_management_workers"])
         for id_ in new_context["tenants"]:
             new_context["tenants"][id_].setdefault("servers", [])
             for i in range(servers_per_tenant):
@@ -124,6 +131,67 @@ class ServerGeneratorTestCase(test.ScenarioTestCase):
                                 requests=expected_requests)
                       for i in range(called_times)]
         mock_nova_scenario__boot_servers.assert_has_calls(mock_calls)
+        self.assertEqual(
+            tenants_count, servers_ctx.execution_stats["tenants"]["jobs"])
+
+    @mock.patch("%s.nova.utils.NovaScenario._boot_servers" % SCN)
+    @mock.patch("%s.GlanceImage.transform" % TYP)
+    @mock.patch("%s.Flavor.transform" % TYP)
+    @mock.patch("%s.servers.osclients" % CTX)
+    def test_setup_fails(self, mock_osclients, mock_flavor_transform,
+                         mock_glance_image_transform,
+                         mock_nova_scenario__boot_servers):
+        mock_nova_scenario__boot_servers.side_effect = [
+            [fakes.FakeServer(id="uuid")], Exception()]
+        tenants = self._gen_tenants(2)
+        self.context.update({
+            "config": {
+                "servers": {
+                    "servers_per_tenant": 1,
+                    "image": {"name": "cirros-0.3.4-x86_64-uec"},
+                    "flavor": {"name": "m1.tiny"}
+                },
+            },
+            "users": [{"id": 1, "tenant_id": tenant_id,
+                       "credential": mock.MagicMock()}
+                      for tenant_id in tenants],
+            "tenants": tenants
+        })
+
+        servers_ctx = servers.ServerGenerator(self.context)
+        self.assertRaises(exceptions.ContextSetupFailure, servers_ctx.setup)
+        self.assertEqual(1, servers_ctx.execution_stats["tenants"]["failed"])
+
+    @mock.patch("%s.servers.task_utils.BatchStatusPoller.get_poller" % CTX)
+    @mock.patch("%s.servers.osclients" % CTX)
+    def test__get_servers_poller(self, mock_osclients,
+                                 mock_batch_status_poller_get_poller):
+        admin = mock.Mock(auth_url="url", username="admin")
+        self.context.update({
+            "config": {"servers": {"image": {}, "flavor": {}}},
+            "admin": {"credential": admin}})
+        servers_ctx = servers.ServerGenerator(self.context)
+        # batch polling is disabled by default
+        self.assertIsNone(servers_ctx._get_servers_poller())
+
+        servers.CONF.set_override("nova_server_batch_poll", True,
+                                  "benchmark")
+        self.addCleanup(servers.CONF.clear_override,
+                        "nova_server_batch_poll", "benchmark")
+        self.assertEqual(mock_batch_status_poller_get_poller.return_value,
+                         servers_ctx._get_servers_poller())
+        interval = servers.CONF.benchmark.nova_server_boot_poll_interval
+        mock_batch_status_poller_get_poller.assert_called_once_with(
+            ("nova.servers.all_tenants", "url", "admin", interval),
+            mock.ANY, interval=interval)
+        list_servers = mock_batch_status_poller_get_poller.call_args[0][1]
+        nova = mock_osclients.Clients.return_value.nova.return_value
+        self.assertEqual(nova.servers.list.return_value, list_servers())
+        nova.servers.list.assert_called_once_with(
+            search_opts={"all_tenants": True}, limit=-1)
+
+        self.context.pop("admin")
+        self.assertIsNone(servers_ctx._get_servers_poller())
 
     @mock.patch("%s.servers.osclients" % CTX)
     @mock.patch("%s.servers.resource_manager.cleanup" % CTX)
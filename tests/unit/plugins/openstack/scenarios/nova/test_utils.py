@@ -60,6 +60,39 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
         self._test_atomic_action_timer(nova_scenario.atomic_actions(),
                                        "nova.list_servers")
 
+    @mock.patch(NOVA_UTILS + ".utils.get_from_poller")
+    @mock.patch(NOVA_UTILS + ".utils.BatchStatusPoller")
+    def test__get_server_updater_batch_poll(self, mock_batch_status_poller,
+                                            mock_get_from_poller):
+        CONF.set_override("nova_server_batch_poll", True, "benchmark")
+        self.addCleanup(CONF.clear_override, "nova_server_batch_poll",
+                        "benchmark")
+        nova_scenario = utils.NovaScenario(self.context)
+        credential = nova_scenario._clients.credential
+
+        self.assertEqual(mock_get_from_poller.return_value,
+                         nova_scenario._get_server_updater(3))
+        mock_batch_status_poller.get_poller.assert_called_once_with(
+            ("nova.servers", credential.auth_url, credential.tenant_name, 3),
+            mock.ANY, interval=3)
+        list_servers = mock_batch_status_poller.get_poller.call_args[0][1]
+        self.assertEqual(self.clients("nova").servers.list.return_value,
+                         list_servers())
+        self.clients("nova").servers.list.assert_called_once_with(limit=-1)
+        mock_get_from_poller.assert_called_once_with(
+            mock_batch_status_poller.get_poller.return_value)
+        self.assertFalse(self.mock_get_from_manager.mock.called)
+
+    @mock.patch(NOVA_UTILS + ".utils.get_from_poller")
+    def test__get_server_updater_servers_poller(self, mock_get_from_poller):
+        nova_scenario = utils.NovaScenario(self.context)
+        nova_scenario.servers_poller = mock.Mock()
+
+        self.assertEqual(mock_get_from_poller.return_value,
+                         nova_scenario._get_server_updater(3))
+        mock_get_from_poller.assert_called_once_with(
+            nova_scenario.servers_poller)
+
     def test__pick_random_nic(self):
         context = {"tenant": {"networks": [{"id": "net_id_1"},
                                            {"id": "net_id_2"}]},
@@ -472,8 +505,8 @@ class NovaScenarioTestCase(test.ScenarioTestCase):
             for i in range(instances_amount)]
         self.mock_wait_for_status.mock.assert_has_calls(wait_for_status_calls)
 
-        self.mock_get_from_manager.mock.assert_has_calls(
-            [mock.call() for i in range(instances_amount)])
+        # one updater is used for all the servers
+        self.mock_get_from_manager.mock.assert_called_once_with()
         self._test_atomic_action_timer(scenario.atomic_actions(),
                                        "nova.boot_servers")
 
@@ -18,6 +18,7 @@ import mock
 
 from rally import exceptions
 from rally.plugins.openstack import types
+from rally.task import types as task_types
 from tests.unit import fakes
 from tests.unit import test
 
@@ -176,6 +177,33 @@ class GlanceImageTestCase(test.TestCase):
                           types.GlanceImage.transform, self.clients,
                           resource_config)
 
+    def test_transform_by_name_filtered_on_server(self):
+        clients = mock.Mock()
+        image = fakes.FakeResource(name="cirros", id="100")
+        clients.glance.return_value.images.list.return_value = [image]
+
+        image_id = types.GlanceImage.transform(
+            clients=clients, resource_config={"name": "cirros"})
+
+        self.assertEqual("100", image_id)
+        clients.glance.return_value.images.list.assert_called_once_with(
+            filters={"name": "cirros"})
+
+    def test_transform_by_name_cached(self):
+        clients = mock.Mock()
+        images = clients.glance.return_value.images
+        images.list.side_effect = [
+            [], [fakes.FakeResource(name="cirros-0.3.4", id="100")]]
+
+        with task_types.resolution_cache():
+            for i in range(2):
+                self.assertEqual("100", types.GlanceImage.transform(
+                    clients=clients, resource_config={"name": "cirros"}))
+
+        self.assertEqual([mock.call(filters={"name": "cirros"}),
+                          mock.call()],
+                         images.list.call_args_list)
+
 
 class GlanceImageArgsTestCase(test.TestCase):
 
@@ -74,6 +74,7 @@ class PlotTestCase(test.TestCase):
                             "pie": [("success", 10), ("errors", 0)]},
              "iterations_count": 10, "errors": [],
              "load_profile": "load_profile",
+             "load_generator": [],
              "additive_output": [],
              "complete_output": [[], [], [], [], [], [], [], [], [], []],
              "has_output": False,
@@ -81,6 +82,22 @@ class PlotTestCase(test.TestCase):
              "sla": [], "sla_success": True, "table": "main_stats"},
             result)
 
+    def test__process_load_generator(self):
+        samples = [
+            {"timestamp": 10.0, "queue_depth": 0,
+             "processes": [{"role": "rally", "cpu": 20.0},
+                           {"role": "worker", "cpu": 30.0},
+                           {"role": "worker", "cpu": 50.0}]},
+            {"timestamp": 11.5, "queue_depth": 3,
+             "processes": [{"role": "rally", "cpu": 99.0}]}]
+
+        self.assertEqual(
+            [("Rally process CPU %", [(0, 20.0), (1.5, 99.0)]),
+             ("Busiest worker CPU %", [(0, 50.0), (1.5, 0)]),
+             ("Result queue depth", [(0, 0), (1.5, 3)])],
+            plot._process_load_generator({"samples": samples}))
+        self.assertEqual([], plot._process_load_generator(None))
+
     @ddt.data(
         {"hooks": [], "expected": []},
         {"hooks": [
@@ -201,13 +218,90 @@ class PlotTestCase(test.TestCase):
         mock__process_tasks.assert_called_once_with(["extended_result"])
         if "include_libs" in ddt_kwargs:
             mock_get_template.return_value.render.assert_called_once_with(
-                version="42.0", data="json_scenarios", source="json_source",
+                version="42.0", data=["json_scenarios"], source="json_source",
                 include_libs=ddt_kwargs["include_libs"])
         else:
             mock_get_template.return_value.render.assert_called_once_with(
-                version="42.0", data="json_scenarios", source="json_source",
+                version="42.0", data=["json_scenarios"], source="json_source",
                 include_libs=False)
 
+    @mock.patch(PLOT + "_process_tasks")
+    @mock.patch(PLOT + "_extend_results")
+    @mock.patch(PLOT + "ui_utils.get_template")
+    @mock.patch(PLOT + "json.dumps", side_effect=lambda s: "json_" + s)
+    @mock.patch("rally.common.version.version_string", return_value="42.0")
+    def test_plot_stream(self, mock_version_string, mock_dumps,
+                         mock_get_template, mock__extend_results,
+                         mock__process_tasks):
+        mock__process_tasks.return_value = "source", [{"foo": [1, 2]}]
+        template = mock_get_template.return_value
+        template.generate.return_value = iter(["tasks_", "html"])
+        html = plot.plot("tasks_results", stream=True)
+        self.assertEqual(["tasks_", "html"], list(html))
+        self.assertFalse(template.render.called)
+        mock_dumps.assert_called_once_with("source")
+        kwargs = template.generate.call_args[1]
+        self.assertEqual("[{\"foo\": [1, 2]}]", "".join(kwargs.pop("data")))
+        self.assertEqual({"version": "42.0", "source": "json_source",
+                          "include_libs": False}, kwargs)
+
+    @mock.patch(PLOT + "_process_tasks")
+    @mock.patch(PLOT + "_extend_results")
+    def test_plot_stream_matches_render(self, mock__extend_results,
+                                        mock__process_tasks):
+        mock__process_tasks.return_value = (
+            "source", [{"cls": "Foo", "met": "bar", "data": [1.5, "<b>"]}])
+
+        html = plot.plot("tasks_results")
+        parts = list(plot.plot("tasks_results", stream=True))
+
+        self.assertGreater(len(parts), 1)
+        self.assertEqual(html, "".join(parts))
+        self.assertIn(json.dumps(mock__process_tasks.return_value[1]), html)
+
+    def test_make_report_results(self):
+        results = [
+            {"key": "foo_key", "created_at": "foo_time",
+             "data": {"raw": "foo_raw", "sla": "foo_sla",
+                      "load_duration": 1.0, "full_duration": 2.0}},
+            {"key": "bar_key", "created_at": "bar_time",
+             "data": {"raw": "bar_raw", "sla": "bar_sla",
+                      "hooks": "bar_hooks", "load_generator": "bar_lg",
+                      "load_duration": 3.0, "full_duration": 4.0}}]
+
+        self.assertEqual(
+            [{"key": "foo_key", "sla": "foo_sla", "hooks": [],
+              "result": "foo_raw", "load_duration": 1.0,
+              "full_duration": 2.0, "load_generator": None,
+              "created_at": "foo_time"},
+             {"key": "bar_key", "sla": "bar_sla", "hooks": "bar_hooks",
+              "result": "bar_raw", "load_duration": 3.0,
+              "full_duration": 4.0, "load_generator": "bar_lg",
+              "created_at": "bar_time"}],
+            plot.make_report_results(results))
+
+    @mock.patch(PLOT + "ui_utils.get_template")
+    def test_plot_with_load_generator(self, mock_get_template):
+        sample = {"timestamp": 10.0, "queue_depth": 2,
+                  "processes": [{"role": "rally", "cpu": 20.0}]}
+        tasks_results = [
+            {"key": {"name": "Foo.bar", "pos": 0,
+                     "kw": {"runner": {"type": "constant"}}},
+             "sla": [], "hooks": [], "result": [],
+             "load_duration": 1.0, "full_duration": 2.0,
+             "created_at": "2017-06-02 07:33:04",
+             "load_generator": {"interval": 1.0, "samples": [sample]}}]
+
+        plot.plot(tasks_results)
+
+        render = mock_get_template.return_value.render
+        scenarios = json.loads(render.call_args[1]["data"][0])
+        self.assertEqual(
+            [["Rally process CPU %", [[0, 20.0]]],
+             ["Busiest worker CPU %", [[0, 0]]],
+             ["Result queue depth", [[0, 2]]]],
+            scenarios[0]["load_generator"])
+
     @mock.patch(PLOT + "objects.Task.extend_results")
     def test__extend_results(self, mock_task_extend_results):
         mock_task_extend_results.side_effect = iter(
@@ -0,0 +1,201 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import ddt
+import mock
+
+from rally.common import db
+from rally.task import bench
+from tests.unit import fakes
+from tests.unit import test
+
+BENCH = "rally.task.bench."
+
+
+@ddt.ddt
+class BenchTestCase(test.TestCase):
+
+    def test_make_cases(self):
+        cases = bench.make_cases()
+
+        names = [c["name"] for c in cases]
+        self.assertEqual(len(names), len(set(names)))
+        self.assertIn("dummy/constant/c10/n1000", names)
+        self.assertIn("atomics-50/rps/c1/n100", names)
+        self.assertNotIn("dummy/serial/c10/n100", names)
+        # (constant + rps) * concurrency + serial
+        self.assertEqual(len(bench.WORKLOADS) * len(bench.TIMES) *
+                         (2 * len(bench.CONCURRENCY) + 1), len(cases))
+
+    def test_make_cases_with_pattern(self):
+        cases = bench.make_cases("output/serial")
+
+        self.assertEqual(["output/serial/c1/n100", "output/serial/c1/n1000"],
+                         [c["name"] for c in cases])
+        self.assertEqual("Dummy.dummy_output", cases[0]["scenario"])
+
+    @ddt.data(
+        ("constant", {"type": "constant", "times": 10, "concurrency": 5}),
+        ("serial", {"type": "serial", "times": 10}),
+        ("rps", {"type": "rps", "times": 10, "rps": bench.RPS,
+                 "max_concurrency": 5}))
+    @ddt.unpack
+    def test_make_task_config(self, runner_type, expected_runner):
+        case = {"scenario": "Dummy.dummy", "args": {"sleep": 0},
+                "runner": runner_type, "concurrency": 5, "times": 10}
+
+        self.assertEqual(
+            {"Dummy.dummy": [{"args": {"sleep": 0},
+                              "runner": expected_runner}]},
+            bench.make_task_config(case))
+
+    @mock.patch(BENCH + "db.workload_data_get_size")
+    @mock.patch(BENCH + "utils.Timer")
+    @mock.patch(BENCH + "plot.plot")
+    @mock.patch(BENCH + "_get_cpu_time")
+    def test_run_case(self, mock__get_cpu_time, mock_plot, mock_timer,
+                      mock_workload_data_get_size):
+        mock__get_cpu_time.side_effect = [1.0, 3.5]
+        mock_workload_data_get_size.return_value = {
+            "chunk_size": 1024, "compressed_chunk_size": 256}
+        mock_timer.return_value.__enter__.return_value.duration.return_value \
+            = 0.25
+        api = fakes.FakeAPI()
+        api.task.create.return_value = {"uuid": "task_uuid"}
+        raw = [{"duration": 0.5, "timestamp": 1},
+               {"duration": 1.5, "timestamp": 2}]
+        result = {"key": {"name": "Dummy.dummy", "pos": 0},
+                  "created_at": "xxx",
+                  "data": {"raw": raw, "sla": [], "load_duration": 2.0,
+                           "full_duration": 3.0}}
+        api.task.get_detailed.return_value = {"results": [result]}
+        case = {"scenario": "Dummy.dummy", "args": {}, "runner": "constant",
+                "concurrency": 2, "times": 2}
+
+        metrics = bench.run_case(api, "deployment", case)
+
+        self.assertEqual({"iterations_per_second": 1.0,
+                          "overhead_per_iteration": 1.0,
+                          "parent_cpu_time": 2.5,
+                          "db_bytes": 256,
+                          "report_build_time": 0.25},
+                         metrics)
+        api.task.create.assert_called_once_with("deployment",
+                                                tag="rally-bench")
+        api.task.start.assert_called_once_with(
+            "deployment", bench.make_task_config(case), task="task_uuid")
+        mock_plot.assert_called_once_with(
+            [{"key": result["key"], "sla": [], "hooks": [], "result": raw,
+              "load_duration": 2.0, "full_duration": 3.0,
+              "load_generator": None, "created_at": "xxx"}])
+        mock_workload_data_get_size.assert_called_once_with("task_uuid")
+        api.task.delete.assert_called_once_with("task_uuid", force=True)
+
+    def test_run_case_failed(self):
+        api = fakes.FakeAPI()
+        api.task.create.return_value = {"uuid": "task_uuid"}
+        api.task.start.side_effect = RuntimeError
+
+        self.assertRaises(RuntimeError, bench.run_case, api, "deployment",
+                          bench.make_cases()[0])
+        api.task.delete.assert_called_once_with("task_uuid", force=True)
+
+    @mock.patch(BENCH + "run_case")
+    def test_run(self, mock_run_case):
+        cases = bench.make_cases("dummy/serial")
+
+        results = bench.run("api", "deployment", cases)
+
+        self.assertEqual(
+            [mock.call("api", "deployment", case) for case in cases],
+            mock_run_case.call_args_list)
+        self.assertEqual(
+            {"dummy/serial/c1/n100": {
+                "config": cases[0], "metrics": mock_run_case.return_value},
+             "dummy/serial/c1/n1000": {
+                 "config": cases[1], "metrics": mock_run_case.return_value}},
+            results["cases"])
+        self.assertIn("rally_version", results)
+        self.assertIn("created_at", results)
+
+    def test_compare(self):
+        baseline = {"cases": {
+            "a": {"metrics": {"iterations_per_second": 100,
+                              "report_build_time": 1.0,
+                              "db_bytes": 0}},
+            "b": {"metrics": {"iterations_per_second": 100}}}}
+        current = {"cases": {
+            "a": {"metrics": {"iterations_per_second": 70,
+                              "report_build_time": 1.1,
+                              "db_bytes": 10}},
+            "c": {"metrics": {"iterations_per_second": 1}}}}
+
+        self.assertEqual(
+            [{"case": "a", "metric": "iterations_per_second",
+              "baseline": 100, "current": 70, "change": -30.0,
+              "regression": True},
+             {"case": "a", "metric": "db_bytes",
+              "baseline": 0, "current": 10, "change": None,
+              "regression": False},
+             {"case": "a", "metric": "report_build_time",
+              "baseline": 1.0, "current": 1.1, "change": 10.0,
+              "regression": False}],
+            bench.compare(current, baseline, tolerance=20))
+
+
+class RunCaseDBTestCase(test.DBTestCase):
+
+    @mock.patch(BENCH + "plot.plot")
+    def test_run_case_db_bytes(self, mock_plot):
+        deployment = db.deployment_create({})
+        task = db.task_create({"deployment_uuid": deployment["uuid"]})
+        subtask = db.subtask_create(task["uuid"], title="foo")
+        workload = db.workload_create(
+            task["uuid"], subtask["uuid"],
+            {"name": "Dummy.dummy", "description": "", "pos": 0,
+             "kw": {"runner": {"type": "constant"}}})
+        raw = [{"duration": 1.0, "timestamp": float(i), "idle_duration": 0.0,
+                "error": [], "output": {"additive": [], "complete": []},
+                "atomic_actions": []}
+               for i in range(10)]
+        stored = []
+
+        def start(*args, **kwargs):
+            stored.append(db.workload_data_create(
+                task["uuid"], workload["uuid"], 0, {"raw": raw[:5]}))
+            # chunk stored as is
+            stored.append(db.workload_data_create(
+                task["uuid"], workload["uuid"], 1,
+                {"raw": [{"duration": 1.0, "timestamp": 5.0}]}))
+
+        api = fakes.FakeAPI()
+        api.task.create.return_value = task
+        api.task.start.side_effect = start
+        api.task.get_detailed.return_value = {"results": [
+            {"key": {"name": "Dummy.dummy", "pos": 0},
+             "created_at": "xxx",
+             "data": {"raw": raw, "sla": [], "load_duration": 10.0,
+                      "full_duration": 11.0}}]}
+        case = {"scenario": "Dummy.dummy", "args": {}, "runner": "constant",
+                "concurrency": 1, "times": 10}
+
+        metrics = bench.run_case(api, deployment["uuid"], case)
+
+        columnar, as_is = [data["chunk_data"] for data in stored]
+        self.assertEqual("columnar", columnar["format"])
+        self.assertEqual(len(columnar["data"]) + len(json.dumps(as_is["raw"])),
+                         metrics["db_bytes"])
@@ -166,6 +166,25 @@ class ContextManagerTestCase(test.TestCase):
         foo_context.setup.assert_called_once_with()
         bar_context.setup.assert_called_once_with()
 
+    @mock.patch("rally.task.context.time.time")
+    @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
+    def test_setup_and_cleanup_execution(self, mock__get_sorted_context_lst,
+                                         mock_time):
+        mock_time.side_effect = [1, 3, 5, 6]
+        ctx = mock.MagicMock(execution_stats={"created": 10})
+        ctx.get_name.return_value = "foo"
+        mock__get_sorted_context_lst.return_value = [ctx]
+
+        manager = context.ContextManager({"config": {"foo": {}}})
+        manager.setup()
+        manager.cleanup()
+
+        self.assertEqual({"foo": {"setup": {"started_at": 1, "duration": 2},
+                                  "cleanup": {"started_at": 5,
+                                              "duration": 1},
+                                  "created": 10}},
+                         manager.execution)
+
     @mock.patch("rally.task.context.Context.get_all")
     @mock.patch("rally.task.context.Context.get")
     def test_get_sorted_context_lst(self, mock_context_get,
@@ -259,6 +278,19 @@ class ContextManagerTestCase(test.TestCase):
         mock_context.return_value.assert_has_calls(
             [mock.call.cleanup(), mock.call.cleanup()], any_order=True)
 
+    @mock.patch("rally.task.context.Context.get")
+    def test_cleanup_with_shared(self, mock_context_get):
+        mock_context = mock.MagicMock()
+        mock_context.return_value = mock.MagicMock(__lt__=lambda x, y: True)
+        mock_context_get.return_value = mock_context
+        ctx_object = {"config": {"a@foo": [], "b@foo": []}}
+
+        manager = context.ContextManager(ctx_object, shared=["a@foo"])
+        manager.cleanup()
+        mock_context_get.assert_called_once_with(
+            "b", namespace="foo", allow_hidden=True, fallback_to_default=False)
+        mock_context.return_value.cleanup.assert_called_once_with()
+
     @mock.patch("rally.task.context.Context.get")
     def test_cleanup_exception(self, mock_context_get):
         mock_context = mock.MagicMock()
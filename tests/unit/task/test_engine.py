@@ -26,6 +26,7 @@ from rally.common import validation
 from rally import consts
 from rally import exceptions
 from rally.task import engine
+from rally.task import profiler
 from tests.unit import fakes
 from tests.unit import test
 
@@ -156,30 +157,72 @@ class TaskEngineTestCase(test.TestCase):
 
         mock_scenario_runner_validate.assert_called_once_with(
             name=runner_type, credentials=None, config=None,
-            plugin_cfg={"type": runner_type}, namespace="default", vtype=None)
+            plugin_cfg={"type": runner_type}, namespace="default", vtype=None,
+            cache=None)
         self.assertEqual([mock.call(name="a",
                                     credentials=None,
                                     config=None,
                                     plugin_cfg="a_conf",
                                     namespace="default",
-                                    vtype=None),
+                                    vtype=None,
+                                    cache=None),
                           mock.call(name="foo",
                                     credentials=None,
                                     config=None,
                                     plugin_cfg="foo_conf",
                                     namespace="default",
                                     allow_hidden=True,
-                                    vtype=None)],
+                                    vtype=None,
+                                    cache=None)],
                          mock_context_validate.call_args_list)
         mock_sla_validate.assert_called_once_with(
             config=None, credentials=None,
-            name="foo_sla", plugin_cfg="sla_conf", vtype=None)
+            name="foo_sla", plugin_cfg="sla_conf", vtype=None, cache=None)
         mock_hook_validate.assert_called_once_with(
             config=None, credentials=None, name="c", plugin_cfg="c_args",
-            vtype=None)
+            vtype=None, cache=None)
         mock_trigger_validate.assert_called_once_with(
             config=None, credentials=None, name="d", plugin_cfg="d_args",
-            vtype=None)
+            vtype=None, cache=None)
+
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner.validate")
+    @mock.patch("rally.task.engine.scenario.Scenario.validate")
+    @mock.patch("rally.task.engine.context.Context.validate")
+    def test__validate_workload_with_shared_context(
+            self, mock_context_validate, mock_scenario_validate,
+            mock_scenario_runner_validate, mock_task_config,
+            mock_scenario_get):
+        mock_context_validate.return_value = []
+        mock_scenario_validate.return_value = []
+        mock_scenario_runner_validate.return_value = []
+        scenario_cls = mock_scenario_get.return_value
+        scenario_cls.get_namespace.return_value = "default"
+        scenario_cls.get_default_context.return_value = {}
+        workload = engine.Workload({"name": "Foo.bar",
+                                    "runner": {"type": "r"},
+                                    "context": {"a": "a_conf"}}, 0)
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                mock.Mock())
+
+        eng._validate_workload(workload, vtype="semantic", cache="cache",
+                               shared_context={"users": "users_conf"})
+
+        mock_scenario_validate.assert_called_once_with(
+            name="Foo.bar", credentials=None,
+            config={"runner": {"type": "r"},
+                    "context": {"a": "a_conf", "users": "users_conf"}},
+            plugin_cfg=None, vtype="semantic", cache="cache")
+        self.assertEqual(
+            [mock.call(name=name, credentials=None, config=None,
+                       plugin_cfg=conf, namespace="default",
+                       vtype="semantic", cache="cache")
+             for name, conf in (("a", "a_conf"), ("users", "users_conf"))],
+            sorted(mock_context_validate.call_args_list,
+                   key=lambda c: c[1]["name"]))
+        # the workload config is not changed
+        self.assertEqual({"a": "a_conf"}, workload.context)
 
     @mock.patch("rally.task.engine.json.dumps")
     @mock.patch("rally.task.engine.scenario.Scenario.get")
@@ -330,24 +373,104 @@ class TaskEngineTestCase(test.TestCase):
                          "Subtask configuration:\n<JSON>\n\n"
                          "Reason(s):\n trigger_error", e.format_message())
 
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.context.Context.validate")
+    def test__validate_subtask_context(
+            self, mock_context_validate, mock_task_config, mock_scenario_get):
+        mock_context_validate.return_value = []
+        mock_scenario_get.return_value.get_namespace.return_value = "foo"
+        subtask = engine.SubTask({
+            "title": "t",
+            "context": {"users": {"tenants": 2}},
+            "workloads": [{"name": "a", "runner": {"type": "r"},
+                           "context": {"users": {"tenants": 2}}},
+                          {"name": "b", "runner": {"type": "r"},
+                           "context": {"quotas": {}}}]})
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                mock.Mock())
+
+        eng._validate_subtask_context(subtask, vtype="syntax")
+
+        mock_context_validate.assert_called_once_with(
+            name="users", credentials=None, config=None,
+            plugin_cfg={"tenants": 2}, namespace="foo", vtype="syntax")
+
+        subtask.workloads[1].context["users"] = {"tenants": 3}
+        e = self.assertRaises(exceptions.InvalidTaskConfig,
+                              eng._validate_subtask_context, subtask)
+        self.assertIn("Context 'users' is shared by the subtask",
+                      e.format_message())
+
+        mock_context_validate.return_value = [
+            validation.ValidationResult(False, "context_error")]
+        e = self.assertRaises(exceptions.InvalidTaskException,
+                              eng._validate_subtask_context, subtask)
+        self.assertIn("context_error", e.format_message())
+
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__validate_subtask_context_different_platforms(
+            self, mock_task_config, mock_scenario_get):
+        mock_scenario_get.side_effect = lambda name: mock.MagicMock(
+            get_namespace=mock.Mock(return_value=name))
+        subtask = engine.SubTask({
+            "title": "t",
+            "context": {"users": {}},
+            "workloads": [{"name": "foo", "runner": {"type": "r"}},
+                          {"name": "bar", "runner": {"type": "r"}}]})
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                mock.Mock())
+
+        e = self.assertRaises(exceptions.InvalidTaskException,
+                              eng._validate_subtask_context, subtask)
+        self.assertIn("they belong to: bar, foo", e.format_message())
+
     @mock.patch("rally.task.engine.TaskConfig")
     def test__validate_config_semantic_helper(self, mock_task_config):
         eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
                                 mock.Mock())
         eng._validate_workload = mock.Mock()
-        workloads = [engine.Workload(
-            {"name": "name", "runner": "runner", "args": "args"}, 0)]
+        workload = engine.Workload(
+            {"name": "name", "runner": "runner", "args": "args"}, 0)
         users = [{"foo": "user1"}]
         user_context = mock.MagicMock()
         user_context.__enter__.return_value.context = {"users": users}
 
         eng._validate_config_semantic_helper(
-            "admin", user_context, workloads, "foo")
+            "admin", user_context, [(workload, {"ctx": {}})], "foo")
 
         eng._validate_workload.assert_called_once_with(
-            workloads[0], credentials={"foo": {"admin": "admin",
-                                               "users": users}},
-            vtype="semantic")
+            workload, credentials={"foo": {"admin": "admin",
+                                           "users": users}},
+            vtype="semantic", cache=None, shared_context={"ctx": {}})
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    def test__validate_config_semantic_helper_reports_first_error(
+            self, mock_task_config):
+        eng = engine.TaskEngine(mock.MagicMock(), mock.MagicMock(),
+                                mock.Mock())
+        workloads = [engine.Workload(
+            {"name": "name%d" % i, "runner": "runner", "args": "args"}, i)
+            for i in range(5)]
+        errors = {w.name: exceptions.InvalidTaskConfig(
+            name=w.name, pos=w.pos, config="", reason="fail")
+            for w in workloads[2:]}
+
+        def validate_workload(workload, **kwargs):
+            if workload.name in errors:
+                raise errors[workload.name]
+
+        eng._validate_workload = mock.Mock(side_effect=validate_workload)
+        user_context = mock.MagicMock()
+        user_context.__enter__.return_value.context = {"users": []}
+
+        e = self.assertRaises(exceptions.InvalidTaskConfig,
+                              eng._validate_config_semantic_helper,
+                              "admin", user_context,
+                              [(w, {}) for w in workloads], "foo")
+        self.assertIs(errors["name2"], e)
+        self.assertEqual(5, eng._validate_workload.call_count)
 
     @mock.patch("rally.task.engine.scenario.Scenario.get")
     @mock.patch("rally.task.engine.context.Context")
@@ -370,17 +493,22 @@ class TaskEngineTestCase(test.TestCase):
         scenario_cls.get_namespace.return_value = "openstack"
 
         mock_task_instance = mock.MagicMock()
-        mock_subtask1 = mock.MagicMock()
+        mock_subtask1 = mock.MagicMock(context={})
         wconf1 = engine.Workload({"name": "a", "runner": "ra",
                                   "context": {"users": {}}}, 0)
         wconf2 = engine.Workload({"name": "a", "runner": "rb"}, 1)
         mock_subtask1.workloads = [wconf1, wconf2]
 
-        mock_subtask2 = mock.MagicMock()
+        mock_subtask2 = mock.MagicMock(context={})
         wconf3 = engine.Workload({"name": "b", "runner": "ra"}, 0)
         mock_subtask2.workloads = [wconf3]
 
-        mock_task_instance.subtasks = [mock_subtask1, mock_subtask2]
+        mock_subtask3 = mock.MagicMock(context={"users": {"tenants": 2}})
+        wconf4 = engine.Workload({"name": "c", "runner": "ra"}, 0)
+        mock_subtask3.workloads = [wconf4]
+
+        mock_task_instance.subtasks = [mock_subtask1, mock_subtask2,
+                                       mock_subtask3]
         fake_task = mock.MagicMock()
         eng = engine.TaskEngine(mock_task_instance, fake_task, deployment)
 
@@ -389,8 +517,11 @@ class TaskEngineTestCase(test.TestCase):
         user_context = mock_context.get.return_value.return_value
 
         mock__validate_config_semantic_helper.assert_has_calls([
-            mock.call(admin, user_context, [wconf1], "openstack"),
-            mock.call(admin, user_context, [wconf2, wconf3], "openstack"),
+            mock.call(admin, user_context,
+                      [(wconf1, {}), (wconf4, mock_subtask3.context)],
+                      "openstack", cache=mock.ANY),
+            mock.call(admin, user_context, [(wconf2, {}), (wconf3, {})],
+                      "openstack", cache=mock.ANY),
         ], any_order=True)
 
     @mock.patch("rally.task.engine.TaskConfig")
@@ -410,16 +541,17 @@ class TaskEngineTestCase(test.TestCase):
 
         workload1 = "workload1"
         workload2 = "workload2"
-        subtasks = [mock.Mock(workloads=[workload1]),
-                    mock.Mock(workloads=[workload2])]
+        subtasks = [mock.Mock(workloads=[workload1], context={}),
+                    mock.Mock(workloads=[workload2], context={"ctx": {}})]
         config = mock.Mock(subtasks=subtasks)
         eng = engine.TaskEngine({}, mock.MagicMock(), deployment)
 
         eng._validate_config_platforms(config)
 
         self.assertEqual(
-            [mock.call(w, vtype="platform", credentials={"foo": foo_cred1})
-             for w in (workload1, workload2)],
+            [mock.call(w, vtype="platform", credentials={"foo": foo_cred1},
+                       shared_context=ctx)
+             for w, ctx in ((workload1, {}), (workload2, {"ctx": {}}))],
             mock__validate_workload.call_args_list)
         deployment.get_all_credentials.assert_called_once_with()
 
@@ -472,6 +604,7 @@ class TaskEngineTestCase(test.TestCase):
                 {"name": "b.task", "description": "foo",
                  "context": {"context_b": {"b": 2}}}, 1)
         ]
+        mock_subtask.context = {}
         mock_task_instance.subtasks = [mock_subtask]
 
         mock_task_config.return_value = mock_task_instance
@@ -647,6 +780,260 @@ class TaskEngineTestCase(test.TestCase):
         self.assertEqual(result, expected_result)
         mock_scenario_get.assert_called_once_with(name)
 
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
+    def test__prepare_context_with_shared_context(self, mock_scenario_get,
+                                                  mock_task_config):
+        mock_scenario = mock_scenario_get.return_value
+        mock_scenario.get_default_context.return_value = {"a": 1}
+        mock_scenario.get_namespace.return_value = "openstack"
+        task = mock.MagicMock()
+        admin = fakes.fake_credential(foo="admin")
+        deployment = fakes.FakeDeployment(
+            uuid="deployment_uuid", admin=admin)
+        eng = engine.TaskEngine({}, task, deployment)
+        users = [{"id": "u1", "tenant_id": "t1"}]
+        tenants = {"t1": {"id": "t1", "name": "t1_name"}}
+        shared_context = {
+            "task": task,
+            "owner_id": "subtask_uuid",
+            "admin": {"credential": admin},
+            "scenario_name": "b.task",
+            "scenario_namespace": "openstack",
+            "config": {"users": {"tenants": 1}, "a": 2},
+            "users": users,
+            "tenants": tenants
+        }
+
+        result = eng._prepare_context({"b": 3}, "a.task", "foo_uuid",
+                                      shared_context=shared_context)
+
+        self.assertEqual({
+            "task": task,
+            "owner_id": "foo_uuid",
+            "admin": {"credential": admin},
+            "scenario_name": "a.task",
+            "scenario_namespace": "openstack",
+            "config": {"users": {"tenants": 1}, "a": 2, "b": 3},
+            "users": users,
+            "tenants": tenants
+        }, result)
+        # workload contexts must not change the shared users and tenants
+        result["tenants"]["t1"]["networks"] = ["net"]
+        result["users"].append({"id": "u2"})
+        self.assertEqual({"id": "t1", "name": "t1_name"}, tenants["t1"])
+        self.assertEqual(1, len(users))
+
+    @mock.patch("rally.task.engine.TaskConfig")
+    @mock.patch("rally.task.engine.scenario.Scenario.get")
+    def test__prepare_subtask_context(self, mock_scenario_get,
+                                      mock_task_config):
+        mock_scenario_get.return_value.get_namespace.return_value = "openstack"
+        task = mock.MagicMock()
+        admin = fakes.fake_credential(foo="admin")
+        deployment = fakes.FakeDeployment(
+            uuid="deployment_uuid", admin=admin)
+        eng = engine.TaskEngine({}, task, deployment)
+        subtask = engine.SubTask({
+            "title": "t",
+            "context": {"quotas": {}},
+            "workloads": [{"name": "a.task", "runner": {"type": "r"}}]})
+
+        self.assertEqual({
+            "task": task,
+            "owner_id": "subtask_uuid",
+            "admin": {"credential": admin},
+            "scenario_name": "a.task",
+            "scenario_namespace": "openstack",
+            "config": {"quotas": {}, "users": {}}
+        }, eng._prepare_subtask_context(subtask, "subtask_uuid"))
+
+    @mock.patch("rally.task.engine.objects.task.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager")
+    @mock.patch("rally.task.engine.scenario.Scenario")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner")
+    def test_run_with_subtask_context(
+            self, mock_scenario_runner, mock_scenario, mock_context_manager,
+            mock_result_consumer, mock_task_get_status):
+        scenario_cls = mock_scenario.get.return_value
+        scenario_cls.get_namespace.return_value = "openstack"
+        scenario_cls.get_default_context.return_value = {}
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        task = mock.MagicMock()
+        subtask_obj = task.add_subtask.return_value
+        subtask_obj.__getitem__.return_value = "subtask_uuid"
+        config = {
+            "version": 2,
+            "title": "t",
+            "subtasks": [{
+                "title": "st",
+                "context": {"users": {"tenants": 2}},
+                "workloads": [
+                    {"name": "a.task", "description": "foo",
+                     "runner": {"type": "a"}},
+                    {"name": "b.task", "description": "bar",
+                     "runner": {"type": "a"}, "context": {"quotas": {}}}]}]}
+        deployment = fakes.FakeDeployment(
+            uuid="deployment_uuid", admin={"foo": "admin"})
+        eng = engine.TaskEngine(config, task, deployment)
+
+        eng.run()
+
+        # one shared manager for the subtask and one per workload
+        self.assertEqual(3, mock_context_manager.call_count)
+        shared_context = mock_context_manager.call_args_list[0][0][0]
+        self.assertEqual("subtask_uuid", shared_context["owner_id"])
+        self.assertEqual({"users": {"tenants": 2}}, shared_context["config"])
+        for call in mock_context_manager.call_args_list[1:]:
+            self.assertEqual({"users": {"tenants": 2}},
+                             call[1]["shared"])
+        self.assertEqual(
+            {"users": {"tenants": 2}, "quotas": {}},
+            mock_context_manager.call_args_list[2][0][0]["config"])
+        self.assertEqual(
+            3, mock_context_manager.return_value.__exit__.call_count)
+        self.assertEqual(2, mock_scenario_runner.get.return_value.return_value
+                         .run.call_count)
+
+    @mock.patch("rally.task.engine.objects.task.Task.get_status")
+    @mock.patch("rally.task.engine.profiler.sampling")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager.cleanup")
+    @mock.patch("rally.task.engine.context.ContextManager.setup")
+    @mock.patch("rally.task.engine.scenario.Scenario")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner")
+    def test_run_with_profile(
+            self, mock_scenario_runner, mock_scenario,
+            mock_context_manager_setup, mock_context_manager_cleanup,
+            mock_result_consumer, mock_sampling, mock_task_get_status):
+        scenario_cls = mock_scenario.get.return_value
+        scenario_cls.get_namespace.return_value = "openstack"
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        fake_runner = mock_scenario_runner.get.return_value.return_value
+        config = {"a.task": [{"runner": {"type": "a"},
+                              "description": "foo"}]}
+        deployment = fakes.FakeDeployment(
+            uuid="deployment_uuid", admin={"foo": "admin"})
+        eng = engine.TaskEngine(config, mock.MagicMock(), deployment,
+                                profile=True)
+
+        eng.run()
+
+        profile = fake_runner.profile
+        self.assertIsInstance(profile, profiler.Profile)
+        mock_sampling.assert_called_once_with(profile)
+        self.assertEqual(profile,
+                         mock_result_consumer.call_args[1]["profile"])
+
+    @mock.patch("rally.task.engine.objects.task.Task.get_status")
+    @mock.patch("rally.task.engine.monitor")
+    @mock.patch("rally.task.engine.ResultConsumer")
+    @mock.patch("rally.task.engine.context.ContextManager.cleanup")
+    @mock.patch("rally.task.engine.context.ContextManager.setup")
+    @mock.patch("rally.task.engine.scenario.Scenario")
+    @mock.patch("rally.task.engine.runner.ScenarioRunner")
+    def test_run_with_load_generator_monitor(
+            self, mock_scenario_runner, mock_scenario,
+            mock_context_manager_setup, mock_context_manager_cleanup,
+            mock_result_consumer, mock_monitor, mock_task_get_status):
+        scenario_cls = mock_scenario.get.return_value
+        scenario_cls.get_namespace.return_value = "openstack"
+        mock_result_consumer.is_task_in_aborting_status.return_value = False
+        mock_monitor.is_supported.return_value = True
+        fake_runner = mock_scenario_runner.get.return_value.return_value
+        config = {"a.task": [{"runner": {"type": "a"},
+                              "description": "foo"}]}
+        deployment = fakes.FakeDeployment(
+            uuid="deployment_uuid", admin={"foo": "admin"})
+        eng = engine.TaskEngine(config, mock.MagicMock(), deployment)
+
+        eng.run()
+
+        mock_monitor.LoadGeneratorMonitor.assert_called_once_with(
+            fake_runner, engine.CONF.load_generator_monitor_interval)
+        self.assertEqual(mock_monitor.LoadGeneratorMonitor.return_value,
+                         mock_result_consumer.call_args[1]["monitor"])
+
+
+class WorkloadStatisticsTestCase(test.TestCase):
+
+    def test_result(self):
+        statistics = engine.WorkloadStatistics()
+        statistics.add({"duration": 2, "timestamp": 1, "error": [],
+                        "atomic_actions": [
+                            {"name": "foo", "started_at": 1.0,
+                             "finished_at": 2.0, "children": []},
+                            {"name": "bar", "started_at": 2.0,
+                             "finished_at": 3.0, "children": []}]})
+        statistics.add({"duration": 4, "timestamp": 3,
+                        "error": ["Error", "msg", "trace"],
+                        "atomic_actions": [
+                            {"name": "foo", "started_at": 3.0,
+                             "finished_at": 6.0, "children": []}]})
+
+        result = statistics.result()
+        durations = result["statistics"]["durations"]
+        for stats, median, p90, p95 in ((durations["total"], 3, 3.8, 3.9),
+                                        (durations["atomics"][0], 2, 2.8,
+                                         2.9)):
+            self.assertAlmostEqual(median, stats.pop("median"))
+            self.assertAlmostEqual(p90, stats.pop("90%ile"))
+            self.assertAlmostEqual(p95, stats.pop("95%ile"))
+        self.assertEqual(1, durations["atomics"][1].pop("median"))
+        self.assertEqual(1, durations["atomics"][1].pop("90%ile"))
+        self.assertEqual(1, durations["atomics"][1].pop("95%ile"))
+        self.assertEqual(
+            {"total_iteration_count": 2,
+             "failed_iteration_count": 1,
+             "min_duration": 2,
+             "max_duration": 4,
+             "statistics": {"durations": {
+                 "total": {"count": 2, "min": 2, "max": 4, "avg": 3},
+                 "atomics": [
+                     {"name": "foo", "count": 2, "min": 1, "max": 3,
+                      "avg": 2},
+                     {"name": "bar", "count": 1, "min": 1, "max": 1,
+                      "avg": 1}]}}},
+            result)
+
+
+class WorkloadDataWriterTestCase(test.TestCase):
+
+    def test_write_chunks(self):
+        workload = mock.Mock(spec=objects.Workload)
+        writer = engine.WorkloadDataWriter(workload)
+        writer.put(0, {"raw": [1]})
+        writer.put(1, {"raw": [2]})
+        writer.start()
+        writer.close()
+
+        workload.add_workload_data_chunks.assert_called_once_with(
+            [(0, {"raw": [1]}), (1, {"raw": [2]})])
+        self.assertEqual(1, writer.write_duration["avg"].count)
+        self.assertFalse(writer.thread.is_alive())
+
+    @mock.patch("rally.task.engine.LOG")
+    def test_write_chunks_failed(self, mock_log):
+        workload = mock.Mock(spec=objects.Workload)
+        workload.add_workload_data_chunks.side_effect = [
+            RuntimeError("foo"), None]
+        writer = engine.WorkloadDataWriter(workload, max_queued_chunks=1)
+        writer.start()
+        writer.put(0, {"raw": [1]})
+        writer.put(1, {"raw": [2]})
+        e = self.assertRaises(RuntimeError, writer.close)
+
+        self.assertEqual("foo", str(e))
+        self.assertTrue(mock_log.error.called)
+        self.assertEqual(
+            [(0, {"raw": [1]}), (1, {"raw": [2]})],
+            [chunk
+             for call in workload.add_workload_data_chunks.mock_calls
+             for chunk in call[1][0]])
+        self.assertFalse(writer.thread.is_alive())
+
 
 class ResultConsumerTestCase(test.TestCase):
 
@@ -712,13 +1099,107 @@ class ResultConsumerTestCase(test.TestCase):
                 key, task, subtask, workload, runner, False):
             pass
 
-        self.assertFalse(workload.add_workload_data.called)
+        self.assertFalse(workload.add_workload_data_chunks.called)
         workload.set_results.assert_called_once_with({
             "full_duration": 1,
             "sla": mock_sla_results,
-            "load_duration": 0
+            "context_execution": {},
+            "load_duration": 0,
+            "total_iteration_count": 0,
+            "failed_iteration_count": 0,
+            "min_duration": 0,
+            "max_duration": 0,
+            "statistics": {"durations": {
+                "total": {"count": 0, "min": None, "median": None,
+                          "90%ile": None, "95%ile": None, "max": None,
+                          "avg": None},
+                "atomics": []}}
         })
 
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_with_profile(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque()
+        runner.event_queue = collections.deque()
+        profile = profiler.Profile(0.5)
+
+        with engine.ResultConsumer(key, mock.MagicMock(),
+                                   mock.Mock(spec=objects.Subtask), workload,
+                                   runner, False, profile=profile):
+            profile.add(("a:main", "b:run"))
+
+        results = workload.set_results.call_args[0][0]
+        self.assertEqual({"interval": 0.5, "stacks": {"a:main;b:run": 1}},
+                         results["profiling_data"])
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_with_monitor(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque()
+        runner.event_queue = collections.deque()
+        mock_monitor = mock.Mock()
+
+        with engine.ResultConsumer(key, mock.MagicMock(),
+                                   mock.Mock(spec=objects.Subtask), workload,
+                                   runner, False, monitor=mock_monitor):
+            mock_monitor.start.assert_called_once_with(callback=mock.ANY)
+            callback = mock_monitor.start.call_args[1]["callback"]
+            callback("sample")
+            sla_checker = mock_sla_checker.return_value
+            sla_checker.add_load_generator_sample.assert_called_once_with(
+                "sample")
+            self.assertFalse(mock_monitor.stop.called)
+
+        mock_monitor.stop.assert_called_once_with()
+        results = workload.set_results.call_args[0][0]
+        self.assertEqual(mock_monitor.result.return_value,
+                         results["statistics"]["load_generator"])
+
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_load_generator_sla_failure_abort(
+            self, mock_sla_checker, mock_result_consumer_wait_and_abort,
+            mock_task_get_status):
+        mock_task_get_status.return_value = consts.TaskStatus.RUNNING
+        sla_checker = mock_sla_checker.return_value
+        sla_checker.add_load_generator_sample.side_effect = [True, False,
+                                                             False]
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        task = mock.MagicMock()
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque()
+        mock_monitor = mock.Mock()
+
+        with engine.ResultConsumer(key, task, mock.Mock(spec=objects.Subtask),
+                                   mock.Mock(spec=objects.Workload), runner,
+                                   True, monitor=mock_monitor) as consumer:
+            callback = mock_monitor.start.call_args[1]["callback"]
+            callback("sample1")
+            self.assertFalse(runner.abort.called)
+            callback("sample2")
+            callback("sample3")
+
+        self.assertTrue(consumer.aborted_on_sla)
+        sla_checker.set_aborted_on_sla.assert_called_once_with()
+        runner.abort.assert_called_once_with()
+        task.update_status.assert_called_once_with(
+            consts.TaskStatus.SOFT_ABORTING)
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
@@ -802,6 +1283,28 @@ class ResultConsumerTestCase(test.TestCase):
 
         self.assertEqual(0, runner.abort.call_count)
 
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test__wait_for_data(self, mock_sla_checker):
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        runner = mock.MagicMock()
+        queue = collections.deque()
+        consumer = engine.ResultConsumer(
+            key, mock.MagicMock(), mock.Mock(spec=objects.Subtask),
+            mock.Mock(spec=objects.Workload), runner, False)
+
+        def put_data(timeout=None):
+            queue.append("data")
+        runner.data_available.wait.side_effect = put_data
+
+        self.assertTrue(consumer._wait_for_data(queue))
+        runner.data_available.wait.assert_called_once_with()
+
+        queue.clear()
+        consumer.is_done.set()
+        runner.data_available.wait.reset_mock()
+        self.assertFalse(consumer._wait_for_data(queue))
+        self.assertFalse(runner.data_available.wait.called)
+
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.threading.Thread")
     @mock.patch("rally.task.engine.threading.Event")
@@ -829,6 +1332,31 @@ class ResultConsumerTestCase(test.TestCase):
         mock_sla_instance.set_unexpected_failure.assert_has_calls(
             [mock.call(exc)])
 
+    @mock.patch("rally.common.objects.Task.get_status")
+    @mock.patch("rally.task.engine.WorkloadDataWriter")
+    @mock.patch("rally.task.engine.threading.Thread")
+    @mock.patch("rally.task.engine.threading.Event")
+    @mock.patch("rally.task.sla.SLAChecker")
+    def test_consume_results_with_failed_writer(
+            self, mock_sla_checker, mock_event, mock_thread,
+            mock_workload_data_writer, mock_task_get_status):
+        mock_sla_instance = mock_sla_checker.return_value
+        exc = MyException()
+        mock_workload_data_writer.return_value.close.side_effect = exc
+        key = {"kw": {"fake": 2}, "name": "fake", "pos": 0}
+        workload = mock.Mock(spec=objects.Workload)
+        runner = mock.MagicMock()
+        runner.result_queue = collections.deque()
+        runner.event_queue = collections.deque()
+
+        with engine.ResultConsumer(key, mock.MagicMock(),
+                                   mock.Mock(spec=objects.Subtask), workload,
+                                   runner, False):
+            pass
+
+        mock_sla_instance.set_unexpected_failure.assert_called_once_with(exc)
+        self.assertTrue(workload.set_results.called)
+
     @mock.patch("rally.task.engine.CONF")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
@@ -874,14 +1402,18 @@ class ResultConsumerTestCase(test.TestCase):
         self.assertEqual([{"duration": 7, "timestamp": 1}],
                          consumer_obj.results)
 
-        workload.add_workload_data.assert_has_calls([
-            mock.call(0, {"raw": [{"duration": 2, "timestamp": 2},
-                                  {"duration": 1, "timestamp": 3}]}),
-            mock.call(1, {"raw": [{"duration": 4, "timestamp": 2},
-                                  {"duration": 3, "timestamp": 3}]}),
-            mock.call(2, {"raw": [{"duration": 6, "timestamp": 2},
-                                  {"duration": 5, "timestamp": 3}]}),
-            mock.call(3, {"raw": [{"duration": 7, "timestamp": 1}]})])
+        # the writer can group chunks in any way
+        calls = workload.add_workload_data_chunks.mock_calls
+        saved_chunks = [chunk for call in calls for chunk in call[1][0]]
+        self.assertEqual([
+            (0, {"raw": [{"duration": 2, "timestamp": 2},
+                         {"duration": 1, "timestamp": 3}]}),
+            (1, {"raw": [{"duration": 4, "timestamp": 2},
+                         {"duration": 3, "timestamp": 3}]}),
+            (2, {"raw": [{"duration": 6, "timestamp": 2},
+                         {"duration": 5, "timestamp": 3}]}),
+            (3, {"raw": [{"duration": 7, "timestamp": 1}]})], saved_chunks)
+        self.assertFalse(workload.add_workload_data.called)
 
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.hook.HookExecutor")
@@ -931,12 +1463,22 @@ class ResultConsumerTestCase(test.TestCase):
             mock.call(event_type="iteration", value=3)
         ])
 
-        self.assertFalse(workload.add_workload_data.called)
+        self.assertFalse(workload.add_workload_data_chunks.called)
         workload.set_results.assert_called_once_with({
             "full_duration": 1,
             "sla": mock_sla_results,
+            "context_execution": {},
             "hooks": mock_hook_results,
-            "load_duration": 0
+            "load_duration": 0,
+            "total_iteration_count": 0,
+            "failed_iteration_count": 0,
+            "min_duration": 0,
+            "max_duration": 0,
+            "statistics": {"durations": {
+                "total": {"count": 0, "min": None, "median": None,
+                          "90%ile": None, "95%ile": None, "max": None,
+                          "avg": None},
+                "atomics": []}}
         })
 
     @mock.patch("rally.task.engine.threading.Thread")
@@ -0,0 +1,176 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import os
+import shutil
+import tempfile
+import threading
+
+import mock
+
+from rally.task import monitor
+from tests.unit import test
+
+MONITOR = "rally.task.monitor."
+
+
+class ReadProcessTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ReadProcessTestCase, self).setUp()
+        self.proc_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.proc_dir)
+        patcher = mock.patch(MONITOR + "PROC_DIR", self.proc_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create_process(self, pid, utime, stime, threads, rss_pages):
+        os.makedirs(os.path.join(self.proc_dir, str(pid), "task"))
+        fields = ["S"] + ["0"] * 40
+        fields[11] = str(utime)
+        fields[12] = str(stime)
+        fields[21] = str(rss_pages)
+        with open(os.path.join(self.proc_dir, str(pid), "stat"), "w") as f:
+            f.write("%s (rally (worker) 1) %s\n" % (pid, " ".join(fields)))
+        for tid, (voluntary, nonvoluntary) in threads.items():
+            os.makedirs(os.path.join(self.proc_dir, str(pid), "task",
+                                     str(tid)))
+            with open(os.path.join(self.proc_dir, str(pid), "task", str(tid),
+                                   "status"), "w") as f:
+                f.write("Name:\trally\n"
+                        "voluntary_ctxt_switches:\t%d\n"
+                        "nonvoluntary_ctxt_switches:\t%d\n"
+                        % (voluntary, nonvoluntary))
+
+    def test__read_process(self):
+        self._create_process(42, utime=150, stime=50,
+                             threads={42: (10, 1), 43: (5, 2)}, rss_pages=10)
+
+        self.assertEqual({"cpu_time": 200 / monitor._CLK_TCK,
+                          "rss": 10 * monitor._PAGE_SIZE, "threads": 2,
+                          "ctx_switches": 18},
+                         monitor._read_process(42))
+
+    def test__read_process_gone(self):
+        self.assertIsNone(monitor._read_process(42))
+
+    def test_is_supported(self):
+        self.assertFalse(monitor.is_supported())
+        os.makedirs(os.path.join(self.proc_dir, "self", "task"))
+        self.assertTrue(monitor.is_supported())
+
+
+class LoadGeneratorMonitorTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LoadGeneratorMonitorTestCase, self).setUp()
+        self.runner = mock.Mock(worker_pids=[2, 3],
+                                result_queue=collections.deque([[], []]))
+
+    @mock.patch(MONITOR + "time.time")
+    @mock.patch(MONITOR + "os.getpid", return_value=1)
+    @mock.patch(MONITOR + "_read_process")
+    def test_sample(self, mock__read_process, mock_getpid, mock_time):
+        def usage(cpu_time, ctx_switches):
+            return {"cpu_time": cpu_time, "rss": 100, "threads": 2,
+                    "ctx_switches": ctx_switches}
+
+        mock_time.side_effect = [10.0, 12.0]
+        mock__read_process.side_effect = [
+            usage(1.0, 10), usage(1.0, 10), None,
+            usage(2.0, 30), usage(1.5, 14), usage(0.0, 0)]
+        load_monitor = monitor.LoadGeneratorMonitor(self.runner)
+
+        self.assertIsNone(load_monitor.sample())
+        sample = load_monitor.sample()
+
+        self.assertEqual(
+            {"timestamp": 12.0, "queue_depth": 2,
+             "processes": [
+                 {"pid": 1, "role": "rally", "cpu": 50.0, "rss": 100,
+                  "threads": 2, "ctx_switches": 10.0},
+                 {"pid": 2, "role": "worker", "cpu": 25.0, "rss": 100,
+                  "threads": 2, "ctx_switches": 2.0}]},
+            sample)
+        self.assertEqual([sample], load_monitor.samples)
+
+    @mock.patch(MONITOR + "time.time")
+    @mock.patch(MONITOR + "_read_process")
+    def test_sample_max_samples(self, mock__read_process, mock_time):
+        mock_time.side_effect = range(6)
+        mock__read_process.side_effect = [
+            {"cpu_time": i, "rss": 1, "threads": 1, "ctx_switches": 0}
+            for i in range(6)]
+        self.runner.worker_pids = []
+        load_monitor = monitor.LoadGeneratorMonitor(self.runner, interval=1,
+                                                    max_samples=4)
+
+        for i in range(5):
+            load_monitor.sample()
+        self.assertEqual([1, 2, 3, 4],
+                         [s["timestamp"] for s in load_monitor.samples])
+        self.assertEqual(1, load_monitor.interval)
+
+        load_monitor.sample()
+        self.assertEqual([1, 3, 5],
+                         [s["timestamp"] for s in load_monitor.samples])
+        self.assertEqual(2, load_monitor.interval)
+
+    @mock.patch(MONITOR + "LoadGeneratorMonitor.sample")
+    def test_start_and_stop(self, mock_load_generator_monitor_sample):
+        sample = {"timestamp": 1}
+        # the first sample is a baseline one
+        mock_load_generator_monitor_sample.side_effect = (
+            [None] + [sample] * 1000)
+        called = threading.Event()
+        callback = mock.Mock(side_effect=lambda s: called.set())
+        load_monitor = monitor.LoadGeneratorMonitor(self.runner,
+                                                    interval=0.001)
+
+        load_monitor.start(callback=callback)
+        called.wait(5)
+        load_monitor.stop()
+
+        callback.assert_called_with(sample)
+        self.assertFalse(load_monitor._thread.is_alive())
+
+    def test_result(self):
+        load_monitor = monitor.LoadGeneratorMonitor(self.runner, interval=2)
+        load_monitor.samples = [
+            {"timestamp": 1, "queue_depth": 3,
+             "processes": [
+                 {"pid": 1, "role": "rally", "cpu": 20.0, "rss": 10},
+                 {"pid": 2, "role": "worker", "cpu": 40.0, "rss": 5}]},
+            {"timestamp": 2, "queue_depth": 1,
+             "processes": [
+                 {"pid": 1, "role": "rally", "cpu": 90.0, "rss": 30}]}]
+
+        result = load_monitor.result()
+
+        self.assertEqual(2, result["interval"])
+        self.assertEqual(load_monitor.samples, result["samples"])
+        self.assertEqual({"rally_cpu_max": 90.0, "rally_cpu_avg": 55.0,
+                          "workers_cpu_max": 40.0, "rss_max": 30,
+                          "queue_depth_max": 3},
+                         result["summary"])
+
+    def test_result_without_samples(self):
+        load_monitor = monitor.LoadGeneratorMonitor(self.runner)
+
+        self.assertEqual({"rally_cpu_max": 0, "rally_cpu_avg": 0,
+                          "workers_cpu_max": 0, "rss_max": 0,
+                          "queue_depth_max": 0},
+                         load_monitor.result()["summary"])
@@ -0,0 +1,116 @@
+# Copyright 2017: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import pickle
+import threading
+
+import mock
+
+from rally.task import profiler
+from tests.unit import test
+
+
+class ProfileTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ProfileTestCase, self).setUp()
+        self.profile = profiler.Profile(0.1)
+        for stack in [("a:main", "b:run", "c:wait"),
+                      ("a:main", "b:run", "c:wait"),
+                      ("a:main", "b:run"),
+                      ("a:main", "d:dumps")]:
+            self.profile.add(stack)
+
+    def test_functions(self):
+        functions = self.profile.functions()
+
+        self.assertEqual(["a:main", "b:run", "c:wait", "d:dumps"],
+                         sorted(functions))
+        self.assertAlmostEqual(0.4, functions["a:main"]["cumulative"])
+        self.assertAlmostEqual(0, functions["a:main"]["self"])
+        self.assertAlmostEqual(0.3, functions["b:run"]["cumulative"])
+        self.assertAlmostEqual(0.1, functions["b:run"]["self"])
+        self.assertAlmostEqual(0.2, functions["c:wait"]["self"])
+
+    def test_top(self):
+        self.assertEqual(["c:wait", "b:run", "d:dumps"],
+                         [f["function"] for f in self.profile.top(3)])
+
+    def test_top_and_idle(self):
+        for i in range(5):
+            self.profile.add(("a:main", "threading:wait"))
+        self.profile.add(("a:main", "selectors:select"))
+
+        self.assertEqual(["c:wait", "b:run", "d:dumps", "a:main"],
+                         [f["function"] for f in self.profile.top()])
+        self.assertAlmostEqual(0.6, self.profile.idle())
+        self.assertAlmostEqual(0, profiler.Profile(0.1).idle())
+
+    def test_merge(self):
+        other = profiler.Profile(0.1, {("a:main", "d:dumps"): 2})
+
+        self.profile.merge(other)
+
+        self.assertEqual(3, self.profile.stacks[("a:main", "d:dumps")])
+
+    def test_to_folded(self):
+        self.assertEqual(["w;a:main;b:run 1",
+                          "w;a:main;b:run;c:wait 2",
+                          "w;a:main;d:dumps 1"],
+                         self.profile.to_folded(prefix="w"))
+
+    def test_to_dict_and_from_dict(self):
+        data = self.profile.to_dict()
+
+        self.assertEqual(0.1, data["interval"])
+        self.assertEqual(2, data["stacks"]["a:main;b:run;c:wait"])
+        profile = profiler.Profile.from_dict(data)
+        self.assertEqual(self.profile.stacks, profile.stacks)
+
+    def test_pickle(self):
+        profile = pickle.loads(pickle.dumps(self.profile))
+        self.assertEqual(self.profile.stacks, profile.stacks)
+
+
+class StackSamplerTestCase(test.TestCase):
+
+    def test_sampling(self):
+        started = threading.Event()
+        stop = threading.Event()
+
+        def busy_function():
+            started.set()
+            stop.wait()
+
+        thread = threading.Thread(target=busy_function)
+        thread.start()
+        started.wait()
+        profile = profiler.Profile(0.001)
+        try:
+            with profiler.sampling(profile):
+                stop.wait(0.05)
+        finally:
+            stop.set()
+            thread.join()
+
+        functions = profile.functions()
+        self.assertIn("%s:busy_function" % __name__, functions)
+        self.assertNotIn("%s:_sample" % profiler.__name__, functions)
+
+    @mock.patch("rally.task.profiler.StackSampler")
+    def test_sampling_disabled(self, mock_stack_sampler):
+        with profiler.sampling(None):
+            pass
+        self.assertFalse(mock_stack_sampler.called)
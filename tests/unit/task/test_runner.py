@@ -20,6 +20,7 @@ import ddt
 import mock
 
 from rally.plugins.common.runners import serial
+from rally.task import profiler
 from rally.task import runner
 from rally.task import scenario
 from tests.unit import fakes
@@ -29,6 +30,7 @@ from tests.unit import test
 BASE = "rally.task.runner."
 
 
+@ddt.ddt
 class ScenarioRunnerHelpersTestCase(test.TestCase):
 
     @mock.patch(BASE + "utils.format_exc")
@@ -129,6 +131,157 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
         self.assertEqual(expected_error[:2],
                          ["Exception", "Something went wrong"])
 
+    def _get_result(self, **kwargs):
+        result = {
+            "duration": 1.0,
+            "timestamp": 2.0,
+            "idle_duration": 0.5,
+            "error": [],
+            "output": {"additive": [], "complete": []},
+            "atomic_actions": [
+                {"name": "foo", "started_at": 2.0, "finished_at": 2.5,
+                 "children": [{"name": "bar", "started_at": 2.1,
+                               "finished_at": 2.2, "children": []}]},
+                {"name": "foo", "started_at": 2.5, "finished_at": 3.0,
+                 "children": []}]
+        }
+        result.update(kwargs)
+        return result
+
+    def test__pack_result(self):
+        names = {}
+        record = runner._pack_result(self._get_result(), names)
+
+        self.assertEqual({"foo": 0, "bar": 1}, names)
+        self.assertEqual(
+            (1.0, 2.0, 0.5, [],
+             ((0, 2.0, 2.5, ((1, 2.1, 2.2, ()),)), (0, 2.5, 3.0, ())),
+             None),
+            record)
+
+    @ddt.data({"output": {"additive": [1], "complete": []}},
+              {"error": ["Exception", "Something went wrong", "trace"]})
+    def test__pack_and_unpack_results(self, kwargs):
+        results = [self._get_result(), self._get_result(**kwargs)]
+        names = {}
+        records = tuple(runner._pack_result(r, names) for r in results)
+
+        self.assertEqual(
+            results,
+            runner._unpack_results((tuple(sorted(names, key=names.get)),
+                                    records)))
+
+    @ddt.data({"extra": "foo"}, {"atomic_actions": [{"name": "foo"}]},
+              {"atomic_actions": [{"name": "foo", "started_at": 1.0,
+                                   "finished_at": 2.0, "children": [],
+                                   "failure": "bar"}]})
+    def test__pack_result_unexpected_format(self, kwargs):
+        result = self._get_result(**kwargs)
+
+        self.assertIs(result, runner._pack_result(result, {}))
+        self.assertEqual([result], runner._unpack_results(((), (result, ))))
+
+    def test__unpack_results_not_a_batch(self):
+        result = self._get_result()
+        self.assertEqual([result], runner._unpack_results(result))
+
+    @mock.patch(BASE + "threading.Thread")
+    @mock.patch(BASE + "time.time", return_value=10)
+    def test__result_batcher(self, mock_time, mock_thread):
+        mock_queue = mock.MagicMock()
+        batcher = runner._ResultBatcher(mock_queue, max_size=2)
+        mock_thread.assert_called_once_with(target=batcher._flush_delayed)
+        self.assertTrue(mock_thread.return_value.daemon)
+        mock_thread.return_value.start.assert_called_once_with()
+
+        batcher.put(self._get_result())
+        self.assertFalse(mock_queue.put.called)
+        batcher.put(self._get_result())
+        batcher.put(self._get_result(duration=5.0))
+        self.assertEqual(1, mock_queue.put.call_count)
+        batcher.flush()
+        batcher.flush()
+
+        self.assertEqual(2, mock_queue.put.call_count)
+        batches = [c[0][0] for c in mock_queue.put.call_args_list]
+        self.assertEqual(("foo", "bar"), batches[0][0])
+        self.assertEqual(
+            [self._get_result()] * 2 + [self._get_result(duration=5.0)],
+            [r for b in batches for r in runner._unpack_results(b)])
+
+    @mock.patch(BASE + "threading.Thread")
+    @mock.patch(BASE + "time.time")
+    def test__result_batcher_sends_delayed_results(self, mock_time,
+                                                   mock_thread):
+        mock_time.side_effect = [10, 10.5, 10.5]
+        mock_queue = mock.MagicMock()
+        batcher = runner._ResultBatcher(mock_queue, max_delay=0.1)
+
+        batcher.put(self._get_result())
+
+        self.assertEqual(1, mock_queue.put.call_count)
+
+    @mock.patch(BASE + "threading.Thread")
+    @mock.patch(BASE + "time.time")
+    def test__result_batcher_flush_delayed(self, mock_time, mock_thread):
+        mock_time.side_effect = [10, 10.05, 10.05, 10.2, 10.2]
+        mock_queue = mock.MagicMock()
+        batcher = runner._ResultBatcher(mock_queue, max_delay=0.1)
+        batcher.put(self._get_result())
+        batcher._closed = mock.Mock()
+        batcher._closed.wait.side_effect = [False, False, False, True]
+
+        batcher._flush_delayed()
+
+        batcher._closed.wait.assert_has_calls([mock.call(0.1)] * 4)
+        self.assertEqual(1, mock_queue.put.call_count)
+        self.assertEqual([self._get_result()],
+                         runner._unpack_results(
+                             mock_queue.put.call_args[0][0]))
+
+    def test__result_batcher_close(self):
+        mock_queue = mock.MagicMock()
+        batcher = runner._ResultBatcher(mock_queue, max_delay=60)
+        batcher.put(self._get_result())
+        self.assertFalse(mock_queue.put.called)
+
+        batcher.close()
+
+        self.assertFalse(batcher._flusher.is_alive())
+        self.assertEqual(1, mock_queue.put.call_count)
+
+    @mock.patch(BASE + "osclients.get_session_cache")
+    @mock.patch(BASE + "_ResultBatcher")
+    def test__batched_worker_process(self, mock___result_batcher,
+                                     mock_get_session_cache):
+        worker_process = mock.MagicMock()
+
+        runner._batched_worker_process(worker_process, "queue", "foo",
+                                       info="info")
+
+        mock___result_batcher.assert_called_once_with("queue")
+        batcher = mock___result_batcher.return_value
+        worker_process.assert_called_once_with(batcher, "foo", info="info")
+        batcher.close.assert_called_once_with()
+        mock_get_session_cache.return_value.stats.assert_called_once_with()
+
+    @mock.patch(BASE + "profiler.sampling")
+    @mock.patch(BASE + "_ResultBatcher")
+    def test__batched_worker_process_with_profile(
+            self, mock___result_batcher, mock_profiler_sampling):
+        worker_process = mock.MagicMock()
+        queue = mock.MagicMock()
+
+        runner._batched_worker_process(worker_process, queue, "foo",
+                                       info="info", profile_interval=0.5)
+
+        batcher = mock___result_batcher.return_value
+        worker_process.assert_called_once_with(batcher, "foo", info="info")
+        profile = mock_profiler_sampling.call_args[0][0]
+        self.assertIsInstance(profile, profiler.Profile)
+        self.assertEqual(0.5, profile.interval)
+        queue.put.assert_called_once_with(profile)
+
 
 @ddt.ddt
 class ScenarioRunnerTestCase(test.TestCase):
@@ -216,6 +369,8 @@ class ScenarioRunnerTestCase(test.TestCase):
         self.assertEqual(processes_to_start, len(process_pool))
         for process in process_pool:
             self.assertIsInstance(process, multiprocessing.Process)
+        self.assertEqual([p.pid for p in process_pool],
+                         runner_obj.worker_pids)
 
     @mock.patch(BASE + "ScenarioRunner._send_result")
     def test__join_processes(self, mock_scenario_runner__send_result):
@@ -237,6 +392,90 @@ class ScenarioRunnerTestCase(test.TestCase):
         self.assertEqual(processes, process.join.call_count)
         mock_result_queue.close.assert_called_once_with()
 
+    @mock.patch(BASE + "_wait_for_ready")
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_waits_for_data(
+            self, mock_scenario_runner__send_result, mock__wait_for_ready):
+        process = mock.MagicMock()
+        process.is_alive.side_effect = [True, False]
+        process_pool = collections.deque([process])
+        mock_result_queue = mock.MagicMock()
+        mock_result_queue.empty.side_effect = [False, True, True]
+        mock_event_queue = mock.MagicMock()
+        mock_event_queue.empty.side_effect = [False, True, True]
+        mock_event_queue.get.return_value = {"type": "iteration", "value": 1}
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+
+        runner_obj._join_processes(
+            process_pool, mock_result_queue, mock_event_queue)
+
+        self.assertEqual(1, mock__wait_for_ready.call_count)
+        waited_for = mock__wait_for_ready.call_args[0][0]
+        self.assertIn(mock_result_queue._reader, waited_for)
+        self.assertIn(mock_event_queue._reader, waited_for)
+        process.join.assert_called_once_with()
+        mock_scenario_runner__send_result.assert_called_once_with(
+            mock_result_queue.get.return_value)
+        self.assertEqual(
+            collections.deque([{"type": "iteration", "value": 1}]),
+            runner_obj.event_queue)
+        mock_result_queue.close.assert_called_once_with()
+        mock_event_queue.close.assert_called_once_with()
+
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__drain_queues_merges_profiles(
+            self, mock_scenario_runner__send_result):
+        worker_profile = profiler.Profile(0.5, {("a:main",): 2})
+        mock_result_queue = mock.MagicMock()
+        mock_result_queue.empty.side_effect = [False, True]
+        mock_result_queue.get.return_value = worker_profile
+        mock_event_queue = mock.MagicMock()
+        mock_event_queue.empty.return_value = True
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.profile = profiler.Profile(0.5)
+
+        runner_obj._drain_queues(mock_result_queue, mock_event_queue)
+
+        self.assertEqual({("a:main",): 2}, runner_obj.profile.stacks)
+        self.assertFalse(mock_scenario_runner__send_result.called)
+
+    def test__create_process_pool_with_profile(self):
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+        runner_obj.profile = profiler.Profile(0.5)
+
+        with mock.patch(BASE + "multiprocessing.Process") as mock_process:
+            runner_obj._create_process_pool(
+                1, "worker_process", iter([("queue",)]))
+
+        mock_process.assert_called_once_with(
+            target=runner._batched_worker_process,
+            args=("worker_process", "queue"),
+            kwargs={"profile_interval": 0.5,
+                    "info": {"processes_to_start": 1,
+                             "processes_counter": 0}})
+
+    def test__wait_for_ready(self):
+        queue = multiprocessing.Queue()
+        self.assertEqual([], runner._wait_for_ready([queue._reader], 0))
+        queue.put("foo")
+        self.assertEqual([queue._reader],
+                         runner._wait_for_ready([queue._reader], 5))
+        queue.close()
+
+    def test_send_event_notifies_consumers(self):
+        runner_ = self._get_runner(task={"uuid": "foo_uuid"})
+        runner_.data_available = mock.MagicMock()
+        runner_.send_event("iteration", 1)
+        runner_.data_available.notify_all.assert_called_once_with()
+
     def _get_runner(self, task="mock_me", config="mock_me", batch_size=0):
         class ScenarioRunner(runner.ScenarioRunner):
             def _run_scenario(self, *args, **kwargs):
@@ -56,6 +56,14 @@ class SLACheckerTestCase(test.TestCase):
                             "success": False}]
         self.assertEqual(expected_result, sla_checker.results())
 
+    def test_add_load_generator_sample(self):
+        sla_checker = sla.SLAChecker({"sla": {"test_criterion": 42}})
+        sample = {"timestamp": 1, "queue_depth": 0, "processes": []}
+
+        self.assertTrue(sla_checker.add_load_generator_sample(sample))
+        sla_checker.add_iteration(43)
+        self.assertFalse(sla_checker.add_load_generator_sample(sample))
+
     def test_set_unexpected_failure(self):
         exc = "error;("
         sla_checker = sla.SLAChecker({"sla": {}})
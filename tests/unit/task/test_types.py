@@ -115,3 +115,109 @@ class PreprocessTestCase(test.TestCase):
         mock_osclients.Clients.assert_called_once_with(
             context["admin"]["credential"])
         self.assertEqual({"a": 20, "b": 20}, result)
+
+
+class ResolutionCacheTestCase(test.TestCase):
+
+    def test_get_and_set(self):
+        cache = types.ResolutionCache()
+        self.assertIsNone(cache.get("foo"))
+        self.assertEqual("bar", cache.set("foo", "bar"))
+        self.assertEqual("bar", cache.get("foo"))
+
+    def test_resolution_cache(self):
+        self.assertIsNone(types.get_resolution_cache())
+        with types.resolution_cache() as cache:
+            self.assertIs(cache, types.get_resolution_cache())
+            with types.resolution_cache() as nested_cache:
+                self.assertIsNot(cache, nested_cache)
+            self.assertIs(cache, types.get_resolution_cache())
+        self.assertIsNone(types.get_resolution_cache())
+
+
+class CacheTransformTestCase(test.TestCase):
+
+    def _get_resource_type(self, transform):
+
+        class FakeType(types.ResourceType):
+
+            @classmethod
+            @types.cache_transform
+            def transform(cls, clients, resource_config):
+                """Fake transform."""
+                return transform(clients, resource_config)
+
+        FakeType.get_name = classmethod(lambda cls: "fake_type")
+        return FakeType
+
+    def _get_clients(self, **kwargs):
+        clients = mock.Mock()
+        credential = {"auth_url": "http://example.com", "region_name": None,
+                      "username": "user", "tenant_name": "tenant"}
+        credential.update(kwargs)
+        clients.credential = mock.Mock(**credential)
+        return clients
+
+    def test_transform(self):
+        transform = mock.Mock(return_value="id")
+        fake_type = self._get_resource_type(transform)
+        clients = self._get_clients()
+
+        with types.resolution_cache():
+            for i in range(3):
+                self.assertEqual("id", fake_type.transform(
+                    clients=clients, resource_config={"name": "foo"}))
+            transform.assert_called_once_with(clients, {"name": "foo"})
+            self.assertEqual("Fake transform.", fake_type.transform.__doc__)
+
+            # the same user of the same cloud
+            fake_type.transform(clients=self._get_clients(),
+                                resource_config={"name": "foo"})
+            self.assertEqual(1, transform.call_count)
+
+            # another resource
+            fake_type.transform(clients=clients,
+                                resource_config={"name": "bar"})
+            # another cloud, user and project
+            for kwargs in ({"auth_url": "http://example.org"},
+                           {"username": "another_user"},
+                           {"tenant_name": "another_tenant"}):
+                fake_type.transform(clients=self._get_clients(**kwargs),
+                                    resource_config={"name": "foo"})
+            self.assertEqual(5, transform.call_count)
+
+        # another task run
+        with types.resolution_cache():
+            fake_type.transform(clients=clients,
+                                resource_config={"name": "foo"})
+        self.assertEqual(6, transform.call_count)
+
+    def test_transform_without_cache(self):
+        transform = mock.Mock(return_value="id")
+        fake_type = self._get_resource_type(transform)
+        clients = self._get_clients()
+
+        fake_type.transform(clients=clients, resource_config={"name": "foo"})
+        fake_type.transform(clients=clients, resource_config={"name": "foo"})
+        self.assertEqual(2, transform.call_count)
+
+    def test_transform_fails(self):
+        transform = mock.Mock(side_effect=[RuntimeError, "id"])
+        fake_type = self._get_resource_type(transform)
+        clients = self._get_clients()
+
+        with types.resolution_cache():
+            self.assertRaises(RuntimeError, fake_type.transform,
+                              clients=clients,
+                              resource_config={"name": "foo"})
+            self.assertEqual("id", fake_type.transform(
+                clients=clients, resource_config={"name": "foo"}))
+
+    def test_transform_not_cacheable(self):
+        transform = mock.Mock(return_value="id")
+        fake_type = self._get_resource_type(transform)
+
+        with types.resolution_cache():
+            fake_type.transform(clients=object(), resource_config={})
+            fake_type.transform(clients=object(), resource_config={})
+        self.assertEqual(2, transform.call_count)
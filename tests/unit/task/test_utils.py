@@ -15,6 +15,8 @@
 
 import collections
 import datetime as dt
+import gc
+import threading
 
 import ddt
 from jsonschema import exceptions as schema_exceptions
@@ -191,6 +193,85 @@ class BenchmarkUtilsTestCase(test.TestCase):
         self.assertTrue(client.services.list.called)
 
 
+@ddt.ddt
+class BatchStatusPollerTestCase(test.TestCase):
+
+    def test_get_poller(self):
+        list_resources = mock.Mock()
+        poller = utils.BatchStatusPoller.get_poller(
+            ("foo", "test_get_poller"), list_resources, interval=3)
+        self.assertIs(poller, utils.BatchStatusPoller.get_poller(
+            ("foo", "test_get_poller"), mock.Mock()))
+        self.assertIs(list_resources, poller.list_resources)
+        self.assertEqual(3, poller.interval)
+        self.assertIsNot(poller, utils.BatchStatusPoller.get_poller(
+            ("bar", "test_get_poller"), list_resources))
+
+    def test_get_poller_dropped_when_unused(self):
+        key = ("foo", "test_get_poller_dropped_when_unused")
+        poller = utils.BatchStatusPoller.get_poller(key, mock.Mock())
+        self.assertIn(key, utils.BatchStatusPoller._pollers)
+
+        del poller
+        gc.collect()
+
+        self.assertNotIn(key, utils.BatchStatusPoller._pollers)
+
+    def test_get_concurrently(self):
+        resources = [fakes.FakeResource(name="r%d" % i) for i in range(20)]
+        list_resources = mock.Mock(return_value=resources)
+        poller = utils.BatchStatusPoller(list_resources, interval=0.01)
+        results = {}
+
+        def get(resource):
+            results[resource.id] = poller.get(resource.id)
+
+        threads = [threading.Thread(target=get, args=(r,))
+                   for r in resources]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(dict((r.id, r) for r in resources), results)
+        self.assertLess(list_resources.call_count, len(resources))
+
+    def test_get_reuses_recent_list(self):
+        resource = fakes.FakeResource()
+        list_resources = mock.Mock(return_value=[resource])
+        poller = utils.BatchStatusPoller(list_resources, interval=60)
+        self.assertEqual(resource, poller.get(resource.id))
+        self.assertEqual(resource, poller.get(resource.id))
+        list_resources.assert_called_once_with()
+
+    def test_get_not_found(self):
+        poller = utils.BatchStatusPoller(mock.Mock(return_value=[]),
+                                         interval=0)
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          poller.get, "foo_id")
+
+    def test_get_list_failure(self):
+        poller = utils.BatchStatusPoller(
+            mock.Mock(side_effect=RuntimeError("boom")), interval=0)
+        self.assertRaises(exceptions.GetResourceFailure,
+                          poller.get, "foo_id")
+
+    @ddt.data(("ACTIVE", None),
+              ("ERROR", exceptions.GetResourceErrorStatus),
+              ("DELETED", exceptions.GetResourceNotFound))
+    @ddt.unpack
+    def test_get_from_poller(self, status, error):
+        resource = fakes.FakeResource(status=status)
+        poller = mock.Mock()
+        poller.get.return_value = resource
+        get_from_poller = utils.get_from_poller(poller)
+        if error:
+            self.assertRaises(error, get_from_poller, resource)
+        else:
+            self.assertEqual(resource, get_from_poller(resource))
+        poller.get.assert_called_once_with(resource.id)
+
+
 class WaitForTestCase(test.TestCase):
 
     def setUp(self):
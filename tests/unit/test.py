@@ -22,6 +22,7 @@ from oslotest import base
 from oslotest import mockpatch
 
 from rally.common import db
+from rally import osclients
 from rally import plugins
 from rally.task import utils as tutils
 from tests.unit import fakes
@@ -45,6 +46,7 @@ class TestCase(base.BaseTestCase):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
         plugins.load()
+        osclients.get_session_cache().clear()
 
     def _test_atomic_action_timer(self, atomic_actions, name):
         atomic_wrapper = tutils.WrapperForAtomicActions(atomic_actions)
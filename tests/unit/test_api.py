@@ -27,6 +27,7 @@ from rally import api
 from rally.common import objects
 from rally import consts
 from rally import exceptions
+from rally.task import types
 from tests.unit import fakes
 from tests.unit import test
 
@@ -232,17 +233,27 @@ class TaskAPITestCase(test.TestCase):
         mock_deployment_get.return_value = fakes.FakeDeployment(
             uuid="deployment_uuid", admin="fake_admin", users=["fake_user"],
             status=consts.DeployStatus.DEPLOY_FINISHED)
+        caches = []
+
+        def save_cache():
+            caches.append(types.get_resolution_cache())
+
+        mock_task_engine.return_value.validate.side_effect = save_cache
+        mock_task_engine.return_value.run.side_effect = save_cache
 
         self.assertEqual(
             (fake_task["uuid"], fake_task.get_status.return_value),
             self.task_inst.start(
                 mock_deployment_get.return_value["uuid"], "config")
         )
+        self.assertIsNotNone(caches[0])
+        self.assertEqual([caches[0]] * 2, caches)
+        self.assertIsNone(types.get_resolution_cache())
 
         mock_task_engine.assert_has_calls([
             mock.call("config", mock_task.return_value,
                       mock_deployment_get.return_value,
-                      abort_on_sla_failure=False),
+                      abort_on_sla_failure=False, profile=False),
             mock.call().run(),
         ])
 
@@ -392,7 +403,17 @@ class TaskAPITestCase(test.TestCase):
         mock_task.get_detailed.return_value = "detailed_task_data"
         self.assertEqual("detailed_task_data",
                          self.task_inst.get_detailed("task_uuid"))
-        mock_task.get_detailed.assert_called_once_with("task_uuid")
+        mock_task.get_detailed.assert_called_once_with("task_uuid",
+                                                       lazy_results=False)
+
+    @mock.patch("rally.api.objects.Task")
+    def test_get_detailed_lazy_results(self, mock_task):
+        mock_task.get_detailed.return_value = "detailed_task_data"
+        self.assertEqual("detailed_task_data",
+                         self.task_inst.get_detailed("task_uuid",
+                                                     lazy_results=True))
+        mock_task.get_detailed.assert_called_once_with("task_uuid",
+                                                       lazy_results=True)
 
     @mock.patch("rally.api.objects.Task")
     def test_list(self, mock_task):
@@ -411,7 +432,8 @@ class TaskAPITestCase(test.TestCase):
         self.assertEqual({"uuid": "foo_uuid", "results": "extended_results"},
                          self.task_inst.get_detailed("foo_uuid",
                                                      extended_results=True))
-        mock_task.get_detailed.assert_called_once_with("foo_uuid")
+        mock_task.get_detailed.assert_called_once_with("foo_uuid",
+                                                       lazy_results=False)
         mock_task.extend_results.assert_called_once_with("raw_results")
 
 
@@ -23,6 +23,23 @@ from tests.unit import test
 
 class LogTestCase(test.TestCase):
 
+    def setUp(self):
+        super(LogTestCase, self).setUp()
+        self.root_handlers = list(logging.getLogger().handlers)
+
+    def tearDown(self):
+        # setup() may route handlers of the real root logger through
+        # a QueueHandler, it should not leak to other tests
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if handler not in self.root_handlers:
+                root.removeHandler(handler)
+                handler.close()
+        for handler in self.root_handlers:
+            if handler not in root.handlers:
+                root.addHandler(handler)
+        super(LogTestCase, self).tearDown()
+
     @mock.patch("rally.common.logging.CONF")
     @mock.patch("rally.common.logging.handlers")
     @mock.patch("rally.common.logging.oslogging")
@@ -33,6 +50,7 @@ class LogTestCase(test.TestCase):
         mock_handlers.ColorHandler.LEVEL_COLORS = {
             logging.DEBUG: "debug_color"}
         mock_conf.rally_debug = True
+        mock_conf.async_logging = False
 
         log.setup(proj, version)
 
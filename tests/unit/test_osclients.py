@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import ddt
 from keystoneclient import exceptions as keystone_exceptions
 import mock
@@ -160,6 +162,87 @@ class CachedTestCase(test.TestCase):
         self.assertEqual({}, clients.cache)
 
 
+class SessionCacheTestCase(test.TestCase):
+
+    def test_get_and_set(self):
+        cache = osclients.SessionCache(2)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(1, cache.set("a", 1))
+        cache.set("b", 2)
+        self.assertEqual(1, cache.get("a"))
+        # "b" is the least recently used one
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(3, cache.get("c"))
+        self.assertEqual(2, len(cache))
+        cache.clear()
+        self.assertEqual(0, len(cache))
+
+    def test_set_disabled(self):
+        cache = osclients.SessionCache(0)
+        self.assertEqual(1, cache.set("a", 1))
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(2, cache.get_or_create("a", lambda: 2))
+        self.assertEqual(0, len(cache))
+
+    def test_stats(self):
+        cache = osclients.SessionCache(1)
+        cache.get("a")
+        cache.set("a", 1)
+        cache.get("a")
+        cache.set("b", 2)
+        self.assertEqual({"size": 1, "hits": 1, "misses": 1,
+                          "evictions": 1},
+                         cache.stats())
+
+    def test_get_or_create(self):
+        cache = osclients.SessionCache(2)
+        create = mock.Mock(return_value="value")
+        self.assertEqual("value", cache.get_or_create("a", create))
+        self.assertEqual("value", cache.get_or_create("a", create))
+        create.assert_called_once_with()
+        self.assertEqual({"size": 1, "hits": 1, "misses": 1,
+                          "evictions": 0},
+                         cache.stats())
+
+    def test_get_or_create_concurrently(self):
+        cache = osclients.SessionCache(2)
+        started = threading.Event()
+        release = threading.Event()
+        create = mock.Mock(return_value="value")
+
+        def slow_create():
+            started.set()
+            self.assertTrue(release.wait(5))
+            return create()
+
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(
+                cache.get_or_create("a", slow_create)))
+            for i in range(3)]
+        threads[0].start()
+        self.assertTrue(started.wait(5))
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(["value"] * 3, results)
+        create.assert_called_once_with()
+        self.assertEqual(1, cache.stats()["misses"])
+
+    @mock.patch("rally.osclients.os.getpid")
+    def test_get_session_cache(self, mock_getpid):
+        mock_getpid.return_value = 1
+        cache = osclients.get_session_cache()
+        self.assertIs(cache, osclients.get_session_cache())
+        # forked process
+        mock_getpid.return_value = 2
+        self.assertIsNot(cache, osclients.get_session_cache())
+
+
 @ddt.ddt
 class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
 
@@ -266,17 +349,53 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
         session = mock.MagicMock()
         auth_plugin = mock.MagicMock()
         mock_keystone_get_session.return_value = (session, auth_plugin)
+        auth_ref = auth_plugin.get_access.return_value
+        auth_ref.will_expire_soon.return_value = False
         cache = {}
         keystone = osclients.Keystone(None, None, cache)
 
-        self.assertEqual(auth_plugin.get_access.return_value,
-                         keystone.auth_ref)
-        self.assertEqual(auth_plugin.get_access.return_value,
-                         cache["keystone_auth_ref"])
+        self.assertEqual(auth_ref, keystone.auth_ref)
+        self.assertEqual(auth_ref, cache["keystone_auth_ref"])
 
         # check that auth_ref was cached.
         keystone.auth_ref
         mock_keystone_get_session.assert_called_once_with()
+        auth_ref.will_expire_soon.assert_called_once_with(
+            osclients.Keystone.TOKEN_STALE_DURATION)
+
+    @mock.patch("rally.osclients.Keystone.get_session")
+    def test_auth_ref_expiring(self, mock_keystone_get_session):
+        auth_plugin = mock.MagicMock()
+        mock_keystone_get_session.return_value = ("session", auth_plugin)
+        old_auth_ref = mock.Mock()
+        old_auth_ref.will_expire_soon.return_value = True
+        keystone = osclients.Keystone(
+            None, None, {"keystone_auth_ref": old_auth_ref})
+
+        self.assertEqual(auth_plugin.get_access.return_value,
+                         keystone.auth_ref)
+        auth_plugin.get_access.assert_called_once_with("session")
+
+    @mock.patch("rally.osclients.Keystone._create_session")
+    def test_get_session_shared(self, mock_keystone__create_session):
+        keystone = osclients.Keystone(self.credential, {}, {})
+        self.assertEqual(mock_keystone__create_session.return_value,
+                         keystone.get_session())
+
+        # new keystone object with new cache for the same credential
+        credential = oscredential.OpenStackCredential(
+            "http://auth_url/v2.0", "user", "pass", "tenant")
+        keystone = osclients.Keystone(credential, {}, {})
+        self.assertEqual(mock_keystone__create_session.return_value,
+                         keystone.get_session())
+        mock_keystone__create_session.assert_called_once_with(None)
+
+        # another user
+        credential.username = "another_user"
+        keystone = osclients.Keystone(credential, {}, {})
+        keystone.get_session()
+        self.assertEqual(2, mock_keystone__create_session.call_count)
+        self.assertEqual(2, len(osclients.get_session_cache()))
 
 
 @ddt.ddt